@@ -0,0 +1,98 @@
+#!/usr/bin/env bash
+#
+# run_benchmarks.sh - Micro-benchmarks for Ninja MCP hot paths
+#
+# Results are compared with the latest stored baseline (.benchmarks/); the run
+# fails if any benchmark's mean is more than 25% slower.
+#
+# Usage:
+#   ./scripts/run_benchmarks.sh                # Compare with the stored baseline
+#   ./scripts/run_benchmarks.sh --save         # Also store this run as the new baseline
+#   ./scripts/run_benchmarks.sh --quick        # Small fixtures (smoke check, not comparable)
+#   ./scripts/run_benchmarks.sh -k parse       # Extra arguments go to pytest
+#
+
+set -euo pipefail
+
+# Colors
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+BLUE='\033[0;34m'
+BOLD='\033[1m'
+NC='\033[0m'
+
+# Get script directory and project root
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
+cd "$PROJECT_ROOT"
+
+STORAGE="$PROJECT_ROOT/.benchmarks"
+THRESHOLD="${NINJA_BENCH_THRESHOLD:-mean:25%}"
+SAVE=""
+EXTRA_ARGS=()
+
+while [[ $# -gt 0 ]]; do
+    case $1 in
+        --save)
+            SAVE="1"
+            shift
+            ;;
+        --quick)
+            export NINJA_BENCH_SCALE="0.05"
+            shift
+            ;;
+        --help|-h)
+            echo "Usage: $0 [OPTIONS] [PYTEST ARGS]"
+            echo ""
+            echo "Options:"
+            echo "  --save     Store this run as the new baseline"
+            echo "  --quick    Use small fixtures (results are not compared)"
+            echo "  --help     Show this help"
+            echo ""
+            echo "Environment:"
+            echo "  NINJA_BENCH_THRESHOLD   Regression threshold (default: mean:25%)"
+            exit 0
+            ;;
+        *)
+            EXTRA_ARGS+=("$1")
+            shift
+            ;;
+    esac
+done
+
+PYTEST_ARGS=(
+    "tests/benchmarks/"
+    "--benchmark-only"
+    "--benchmark-storage=file://$STORAGE"
+    "--benchmark-columns=min,mean,median,stddev,rounds"
+    "--no-cov"
+    "-p" "no:cacheprovider"
+)
+
+if [[ -n "${NINJA_BENCH_SCALE:-}" ]]; then
+    echo -e "${BLUE}→ Quick run (fixture scale ${NINJA_BENCH_SCALE}), not compared${NC}"
+elif compgen -G "$STORAGE/*/[0-9][0-9][0-9][0-9]_*.json" > /dev/null; then
+    echo -e "${BLUE}→ Comparing with the latest baseline in ${BOLD}.benchmarks/${NC}"
+    PYTEST_ARGS+=("--benchmark-compare" "--benchmark-compare-fail=$THRESHOLD")
+else
+    echo -e "${BLUE}→ No baseline yet (store one with --save)${NC}"
+fi
+
+if [[ -n "$SAVE" ]]; then
+    if [[ -n "${NINJA_BENCH_SCALE:-}" ]]; then
+        echo -e "${RED}Error: --quick runs cannot be saved as a baseline${NC}"
+        exit 1
+    fi
+    PYTEST_ARGS+=("--benchmark-autosave")
+fi
+
+echo ""
+if pytest "${PYTEST_ARGS[@]}" "${EXTRA_ARGS[@]}"; then
+    echo ""
+    echo -e "${GREEN}${BOLD}✓ No performance regressions${NC}"
+    exit 0
+else
+    echo ""
+    echo -e "${RED}${BOLD}✗ Benchmarks failed or regressed${NC}"
+    exit 1
+fi
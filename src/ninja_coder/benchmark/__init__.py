@@ -2,14 +2,31 @@
 Benchmark framework for comparing CLI tools and models.
 
 This package provides tools for benchmarking different CLI implementations
-(Aider, OpenCode) and models across various task types.
+(Aider, OpenCode) and models across various task types, and a stub CLI
+strategy for measuring the pipeline's own overhead (see ``benchmark.load``).
 """
 
-from ninja_coder.benchmark.framework import BenchmarkResult, BenchmarkRunner, BenchmarkTask
+from ninja_coder.benchmark.framework import (
+    BenchmarkResult,
+    BenchmarkRunner,
+    BenchmarkSummary,
+    BenchmarkTask,
+    compare_runs,
+    load_results,
+    summarize,
+)
+from ninja_coder.benchmark.stub import StubScenario, StubStrategy, register_stub_strategy
 
 
 __all__ = [
     "BenchmarkResult",
     "BenchmarkRunner",
+    "BenchmarkSummary",
     "BenchmarkTask",
+    "StubScenario",
+    "StubStrategy",
+    "compare_runs",
+    "load_results",
+    "register_stub_strategy",
+    "summarize",
 ]
@@ -3,22 +3,57 @@ Core benchmark framework for comparing CLI tools and models.
 
 This module provides the infrastructure for running benchmarks and
 generating comparison reports.
+
+A comparison runs every (task, CLI tool, model, trial) cell of the matrix
+in its own worker process, a bounded number at a time. Each cell works on
+a private copy of the repository, so cells cannot see each other's edits,
+and the worker's resource usage gives the cell's CPU time and peak RSS.
+Results are appended to ``results.jsonl`` under a run ID, so runs can be
+compared over time (see ``compare_runs``).
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+import math
+import multiprocessing
+import shutil
+import statistics
+import sys
+import tempfile
 import time
-from dataclasses import dataclass, field
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any
 
 from ninja_coder.driver import InstructionBuilder, NinjaConfig, NinjaDriver
 from ninja_coder.models import ExecutionMode
 from ninja_common.logging_utils import get_logger
+from ninja_common.metrics import MetricsTracker, extract_token_usage
+
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
 
 
 logger = get_logger(__name__)
 
+# Two-sided 95% Student t critical values by degrees of freedom
+_T95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+    9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042,
+}  # fmt: skip
+
+# Not copied into a cell's private repository
+_COPY_IGNORE = shutil.ignore_patterns(
+    "__pycache__", ".venv", "venv", "node_modules", ".mypy_cache", ".ruff_cache"
+)
+
 
 @dataclass
 class BenchmarkTask:
@@ -66,10 +101,10 @@ class BenchmarkResult:
     """Duration in seconds."""
 
     tokens_used: int = 0
-    """Tokens used (estimated)."""
+    """Tokens used, as reported in the CLI output."""
 
     cost_estimate: float = 0.0
-    """Estimated cost in USD."""
+    """Cost in USD for the tokens used."""
 
     files_created: list[str] = field(default_factory=list)
     """Files created/modified."""
@@ -80,6 +115,184 @@ class BenchmarkResult:
     error_message: str = ""
     """Error message if failed."""
 
+    trial: int = 0
+    """Trial number within the run."""
+
+    input_tokens: int = 0
+    """Input tokens used."""
+
+    output_tokens: int = 0
+    """Output tokens used."""
+
+    cpu_sec: float = 0.0
+    """CPU time (user + system) of the run, including the CLI process."""
+
+    peak_rss_mb: float = 0.0
+    """Peak resident memory of the run's largest process, in MiB."""
+
+
+@dataclass
+class BenchmarkSummary:
+    """Statistics over the trials of one (task, CLI tool, model) cell."""
+
+    task_id: str
+    cli_tool: str
+    model: str
+    trials: int
+    success_rate: float
+    validation_rate: float
+    """Share of trials whose output passed validation."""
+    mean_duration_sec: float
+    duration_ci95_sec: float
+    """Half-width of the 95% confidence interval of the mean duration."""
+    mean_tokens: float
+    mean_cost: float
+    mean_cpu_sec: float
+    max_peak_rss_mb: float
+
+
+def confidence_interval(values: list[float]) -> tuple[float, float]:
+    """Mean and 95% confidence half-width (Student t) of a sample.
+
+    Args:
+        values: Sample values.
+
+    Returns:
+        (mean, half-width); the half-width is 0 for fewer than two values.
+    """
+    if not values:
+        return 0.0, 0.0
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, 0.0
+    # Nearest tabulated degrees of freedom at or below ours (conservative)
+    dof = max(d for d in _T95 if d <= len(values) - 1)
+    t = _T95[dof]
+    return mean, t * statistics.stdev(values) / math.sqrt(len(values))
+
+
+def summarize(results: list[BenchmarkResult]) -> list[BenchmarkSummary]:
+    """Group results by (task, CLI tool, model) and compute trial statistics.
+
+    Args:
+        results: Results of any number of trials.
+
+    Returns:
+        One summary per cell, in first-seen order.
+    """
+    groups: dict[tuple[str, str, str], list[BenchmarkResult]] = {}
+    for result in results:
+        groups.setdefault((result.task_id, result.cli_tool, result.model), []).append(result)
+
+    summaries = []
+    for (task_id, cli_tool, model), group in groups.items():
+        mean_duration, ci = confidence_interval([r.duration_sec for r in group])
+        summaries.append(
+            BenchmarkSummary(
+                task_id=task_id,
+                cli_tool=cli_tool,
+                model=model,
+                trials=len(group),
+                success_rate=sum(r.success for r in group) / len(group),
+                validation_rate=sum(r.validation_passed for r in group) / len(group),
+                mean_duration_sec=mean_duration,
+                duration_ci95_sec=ci,
+                mean_tokens=statistics.fmean(r.tokens_used for r in group),
+                mean_cost=statistics.fmean(r.cost_estimate for r in group),
+                mean_cpu_sec=statistics.fmean(r.cpu_sec for r in group),
+                max_peak_rss_mb=max(r.peak_rss_mb for r in group),
+            )
+        )
+    return summaries
+
+
+def load_results(results_file: Path, run_id: str | None = None) -> list[BenchmarkResult]:
+    """Load persisted results.
+
+    Args:
+        results_file: A ``results.jsonl`` file written by ``BenchmarkRunner``.
+        run_id: Only load this run (default: all runs).
+
+    Returns:
+        The results, in file order.
+    """
+    known = set(BenchmarkResult.__dataclass_fields__)
+    results = []
+    with Path(results_file).open() as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if run_id is None or record.get("run_id") == run_id:
+                results.append(BenchmarkResult(**{k: v for k, v in record.items() if k in known}))
+    return results
+
+
+def compare_runs(results_file: Path, baseline_run: str, current_run: str) -> list[dict[str, Any]]:
+    """Find cells that got slower or less reliable between two runs.
+
+    A cell regressed when its duration confidence intervals do not overlap
+    and the current run is slower, or when its success rate dropped.
+
+    Args:
+        results_file: The ``results.jsonl`` file holding both runs.
+        baseline_run: Run ID to compare against.
+        current_run: Run ID to check.
+
+    Returns:
+        One dict per regressed cell with the baseline and current statistics.
+    """
+    baseline = {
+        (s.task_id, s.cli_tool, s.model): s
+        for s in summarize(load_results(results_file, baseline_run))
+    }
+    regressions = []
+    for current in summarize(load_results(results_file, current_run)):
+        before = baseline.get((current.task_id, current.cli_tool, current.model))
+        if before is None:
+            continue
+        slower = (current.mean_duration_sec - current.duration_ci95_sec) > (
+            before.mean_duration_sec + before.duration_ci95_sec
+        )
+        less_reliable = current.success_rate < before.success_rate
+        if slower or less_reliable:
+            regressions.append(
+                {
+                    "task_id": current.task_id,
+                    "cli_tool": current.cli_tool,
+                    "model": current.model,
+                    "baseline": asdict(before),
+                    "current": asdict(current),
+                }
+            )
+    return regressions
+
+
+def _run_cell(
+    runner: BenchmarkRunner, task: BenchmarkTask, cli_bin: str, model: str, repo_root: str
+) -> BenchmarkResult:
+    """Run one matrix cell in a worker process, on a private copy of the repo.
+
+    The worker runs a single cell, so its own and its children's resource
+    usage belong to that cell.
+    """
+    workdir = Path(tempfile.mkdtemp(prefix=f"ninja-bench-{task.id}-"))
+    try:
+        cell_repo = workdir / "repo"
+        shutil.copytree(repo_root, cell_repo, symlinks=True, ignore=_COPY_IGNORE)
+        result = asyncio.run(runner.run_benchmark(task, cli_bin, model, str(cell_repo)))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if resource is not None:
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        result.cpu_sec = own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        result.peak_rss_mb = max(own.ru_maxrss, children.ru_maxrss) / scale
+    return result
+
 
 class BenchmarkRunner:
     """Runner for executing benchmarks and generating reports.
@@ -96,6 +309,7 @@ class BenchmarkRunner:
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.results_file = self.output_dir / "results.jsonl"
 
     async def run_benchmark(
         self,
@@ -115,7 +329,7 @@ class BenchmarkRunner:
         Returns:
             BenchmarkResult with performance metrics.
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             # Create driver with specific CLI and model
@@ -142,7 +356,7 @@ class BenchmarkRunner:
                 task_type=task.complexity,
             )
 
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             # Validate result
             validation_passed = self._validate_result(
@@ -152,8 +366,13 @@ class BenchmarkRunner:
                 repo_root,
             )
 
-            # Estimate cost (placeholder - would need actual token counts)
-            cost_estimate = self._estimate_cost(model, duration)
+            # Token usage as reported by the CLI
+            input_tokens, output_tokens, cache_read, cache_write = extract_token_usage(
+                f"{result.stdout}\n{result.stderr}"
+            )
+            *_, cost = MetricsTracker(Path(repo_root)).calculate_cost(
+                model, input_tokens, output_tokens, cache_read, cache_write
+            )
 
             return BenchmarkResult(
                 task_id=task.id,
@@ -161,15 +380,17 @@ class BenchmarkRunner:
                 model=model,
                 success=result.success,
                 duration_sec=duration,
-                tokens_used=0,  # Would need actual token tracking
-                cost_estimate=cost_estimate,
+                tokens_used=input_tokens + output_tokens + cache_read + cache_write,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost_estimate=cost,
                 files_created=result.suspected_touched_paths,
                 validation_passed=validation_passed,
                 error_message=result.notes if not result.success else "",
             )
 
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             logger.error(f"Benchmark failed for {task.id}: {e}")
 
             return BenchmarkResult(
@@ -187,36 +408,82 @@ class BenchmarkRunner:
         cli_tools: list[str],
         models: list[str],
         repo_root: str,
+        *,
+        trials: int = 1,
+        concurrency: int = 4,
     ) -> dict[str, list[BenchmarkResult]]:
         """Run full comparison across tasks, tools, and models.
 
+        Every (task, tool, model, trial) cell runs in its own worker process
+        on a private copy of ``repo_root``, at most ``concurrency`` at a time.
+        Results are appended to ``results.jsonl`` as cells finish.
+
         Args:
             tasks: List of benchmark tasks.
             cli_tools: List of CLI tools to test.
             models: List of models to test.
-            repo_root: Repository root path.
+            repo_root: Repository root path (copied for each cell, not modified).
+            trials: Runs per cell, for confidence intervals.
+            concurrency: Maximum number of cells running at once.
 
         Returns:
             Dictionary mapping task IDs to lists of results.
         """
-        results = {}
-
-        for task in tasks:
-            logger.info(f"Running benchmark task: {task.name}")
-            task_results = []
+        run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        cells = [
+            (task, cli_tool, model, trial)
+            for task in tasks
+            for cli_tool in cli_tools
+            for model in models
+            for trial in range(trials)
+        ]
+        logger.info(f"Benchmark run {run_id}: {len(cells)} cells, concurrency {concurrency}")
+
+        loop = asyncio.get_running_loop()
+        results: dict[tuple[str, str, str, int], BenchmarkResult] = {}
+        # One cell per worker process, so per-process resource usage is per cell
+        with ProcessPoolExecutor(
+            max_workers=concurrency,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=1,
+        ) as pool:
+
+            async def run_cell(task: BenchmarkTask, cli_tool: str, model: str, trial: int):
+                logger.info(f"  {task.id}: {cli_tool} with {model} (trial {trial + 1})")
+                try:
+                    result = await loop.run_in_executor(
+                        pool, _run_cell, self, task, cli_tool, model, repo_root
+                    )
+                except Exception as e:
+                    logger.error(f"Benchmark cell failed for {task.id}: {e}")
+                    result = BenchmarkResult(
+                        task_id=task.id,
+                        cli_tool=cli_tool,
+                        model=model,
+                        success=False,
+                        duration_sec=0.0,
+                        error_message=str(e),
+                    )
+                result.trial = trial
+                self._append_result(run_id, result)
+                results[task.id, cli_tool, model, trial] = result
 
-            for cli_tool in cli_tools:
-                for model in models:
-                    logger.info(f"  Testing {cli_tool} with {model}")
-                    result = await self.run_benchmark(task, cli_tool, model, repo_root)
-                    task_results.append(result)
+            await asyncio.gather(*(run_cell(*cell) for cell in cells))
 
-            results[task.id] = task_results
+        by_task: dict[str, list[BenchmarkResult]] = {}
+        for task, cli_tool, model, trial in cells:
+            by_task.setdefault(task.id, []).append(results[task.id, cli_tool, model, trial])
 
         # Generate comparison report
-        self._generate_report(results, tasks)
+        self._generate_report(by_task, tasks, run_id)
 
-        return results
+        return by_task
+
+    def _append_result(self, run_id: str, result: BenchmarkResult) -> None:
+        """Persist one result as a JSONL record."""
+        record = {"run_id": run_id, "recorded_at": time.time(), **asdict(result)}
+        with self.results_file.open("a") as f:
+            f.write(json.dumps(record) + "\n")
 
     def _validate_result(
         self,
@@ -251,47 +518,26 @@ class BenchmarkRunner:
 
         return True
 
-    def _estimate_cost(self, model: str, duration: float) -> float:
-        """Estimate cost based on model and duration.
-
-        This is a rough estimate. Real cost tracking would require
-        actual token counts from the API.
-
-        Args:
-            model: Model name.
-            duration: Duration in seconds.
-
-        Returns:
-            Estimated cost in USD.
-        """
-        # Rough cost estimates per second of execution
-        cost_per_second = {
-            "glm-4.6v": 0.0001,
-            "glm-4.7": 0.0005,
-            "glm-4.0": 0.0002,
-            "anthropic/claude-haiku-4.5": 0.0003,
-            "anthropic/claude-sonnet-4-5": 0.0008,
-            "anthropic/claude-opus-4": 0.0015,
-        }.get(model, 0.0002)
-
-        return duration * cost_per_second
-
     def _generate_report(
         self,
         results: dict[str, list[BenchmarkResult]],
         tasks: list[BenchmarkTask],
+        run_id: str = "",
     ) -> None:
         """Generate markdown comparison report.
 
         Args:
             results: Benchmark results.
             tasks: Benchmark tasks.
+            run_id: Run the results belong to.
         """
         report_path = self.output_dir / "benchmark_report.md"
 
         with open(report_path, "w") as f:
             f.write("# Ninja Coder Benchmark Report\n\n")
             f.write(f"Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            if run_id:
+                f.write(f"Run: `{run_id}` (raw results in {self.results_file.name})\n\n")
 
             for task in tasks:
                 task_results = results.get(task.id, [])
@@ -302,19 +548,25 @@ class BenchmarkRunner:
                 f.write(f"**Description:** {task.description}\n\n")
                 f.write(f"**Complexity:** {task.complexity}\n\n")
 
-                f.write("| CLI Tool | Model | Success | Duration | Cost | Validation |\n")
-                f.write("|----------|-------|---------|----------|------|------------|\n")
-
-                for result in task_results:
-                    success_icon = "✅" if result.success else "❌"
-                    validation_icon = "✅" if result.validation_passed else "❌"
+                f.write(
+                    "| CLI Tool | Model | Trials | Success | Validation | Duration (95% CI) "
+                    "| Tokens | Cost | CPU | Peak RSS |\n"
+                )
+                f.write(
+                    "|----------|-------|--------|---------|------------|-------------------"
+                    "|--------|------|-----|----------|\n"
+                )
 
+                for summary in summarize(task_results):
                     f.write(
-                        f"| {result.cli_tool} | {result.model} | "
-                        f"{success_icon} | "
-                        f"{result.duration_sec:.2f}s | "
-                        f"${result.cost_estimate:.4f} | "
-                        f"{validation_icon} |\n"
+                        f"| {summary.cli_tool} | {summary.model} | {summary.trials} | "
+                        f"{summary.success_rate:.0%} | "
+                        f"{summary.validation_rate:.0%} | "
+                        f"{summary.mean_duration_sec:.2f}s ± {summary.duration_ci95_sec:.2f}s | "
+                        f"{summary.mean_tokens:.0f} | "
+                        f"${summary.mean_cost:.4f} | "
+                        f"{summary.mean_cpu_sec:.1f}s | "
+                        f"{summary.max_peak_rss_mb:.0f} MiB |\n"
                     )
 
                 f.write("\n")
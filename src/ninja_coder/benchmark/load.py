@@ -0,0 +1,330 @@
+"""
+Load generator for the coder pipeline.
+
+Drives N concurrent ``coder_simple_task`` calls through ``ToolExecutor`` (the
+entry point the MCP server's call_tool handler uses) with the stub CLI in
+place of a real one. Every call runs the whole pipeline (input validation,
+scheduling, safety check, task file, prompt build, spawn, parse, logs,
+metrics), so the report shows the overhead the pipeline adds around the CLI,
+and how it behaves under concurrency.
+
+The stub reports when it started, first wrote and exited, which splits each
+call into stages:
+
+- ``before_spawn``: call start to stub start (validation, queueing, safety
+  check, task file, prompt, spawn and interpreter startup)
+- ``first_output``: stub start to its first output (the scenario's delay)
+- ``cli``: time spent in stub runs (all attempts)
+- ``after_exit``: last stub exit to call return (read, parse, logs, metrics)
+- ``overhead``: call time not spent in the CLI (includes retry backoff)
+- ``total``: whole call
+
+Each stage is reported as p50/p90/p99/max over all calls, followed by the
+pipeline's own spans (see ``ninja_common.spans``) read back from the
+structured log, which break ``overhead`` down further.
+
+Usage:
+    python -m ninja_coder.benchmark.load --calls 200 --concurrency 8
+    python -m ninja_coder.benchmark.load --size 1M --rate 256K --delay 0.2 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ninja_coder.benchmark.stub import (
+    STUB_CLI_PATH,
+    StubScenario,
+    StubStrategy,
+    register_stub_strategy,
+    stub_runs,
+)
+from ninja_coder.benchmark.stub_cli import TOUCHED_FILES, parse_size, touched_path
+from ninja_coder.models import SimpleTaskRequest
+from ninja_common.spans import PERCENTILES, percentile
+
+
+if TYPE_CHECKING:
+    from ninja_coder.tools import ToolExecutor
+
+
+STAGES = ("before_spawn", "first_output", "cli", "after_exit", "overhead", "total")
+
+
+@dataclass
+class CallRecord:
+    """Timeline of one tool call (epoch seconds)."""
+
+    call: int
+    started: float
+    finished: float = 0.0
+    status: str = ""
+    runs: list[dict[str, float]] = field(default_factory=list)
+
+    def stages(self) -> dict[str, float]:
+        """Stage durations of the call (stages without data are left out)."""
+        total = self.finished - self.started
+        stages = {"total": total}
+        if self.runs:
+            first, last = self.runs[0], self.runs[-1]
+            cli = sum(run["exited"] - run["started"] for run in self.runs)
+            stages["before_spawn"] = first["started"] - self.started
+            if first.get("first_output"):
+                stages["first_output"] = first["first_output"] - first["started"]
+            stages["cli"] = cli
+            stages["after_exit"] = self.finished - last["exited"]
+            stages["overhead"] = total - cli
+        return stages
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a load run."""
+
+    calls: int
+    concurrency: int
+    wall_sec: float
+    statuses: dict[str, int]
+    stages: dict[str, dict[str, float]]
+    cli_runs: int
+    scheduler: dict[str, Any] = field(default_factory=dict)
+    spans: dict[str, dict[str, float]] = field(default_factory=dict)
+    """Pipeline span statistics in milliseconds, from the structured log."""
+
+    @property
+    def throughput(self) -> float:
+        """Completed calls per second."""
+        return self.calls / self.wall_sec if self.wall_sec > 0 else 0.0
+
+    @classmethod
+    def from_records(
+        cls,
+        records: list[CallRecord],
+        concurrency: int,
+        wall_sec: float,
+        scheduler: dict[str, Any] | None = None,
+        spans: dict[str, dict[str, float]] | None = None,
+    ) -> LoadReport:
+        """Aggregate call records into stage percentiles."""
+        samples: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        for record in records:
+            for stage, value in record.stages().items():
+                samples[stage].append(value)
+
+        stages = {}
+        for stage, values in samples.items():
+            if not values:
+                continue
+            stats = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+            stats["max"] = max(values)
+            stats["mean"] = sum(values) / len(values)
+            stages[stage] = stats
+
+        return cls(
+            calls=len(records),
+            concurrency=concurrency,
+            wall_sec=wall_sec,
+            statuses=dict(Counter(record.status for record in records)),
+            stages=stages,
+            cli_runs=sum(len(record.runs) for record in records),
+            scheduler=scheduler or {},
+            spans=spans or {},
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form."""
+        return {**asdict(self), "throughput": self.throughput}
+
+    def format(self) -> str:
+        """Human-readable report."""
+        statuses = ", ".join(f"{status}: {n}" for status, n in sorted(self.statuses.items()))
+        lines = [
+            f"{self.calls} calls, concurrency {self.concurrency}, {self.cli_runs} CLI runs",
+            f"wall time {self.wall_sec:.2f}s, throughput {self.throughput:.2f} calls/s",
+            f"statuses: {statuses}",
+            "",
+            f"{'stage (ms)':<14}" + "".join(f"{name:>10}" for name in ("p50", "p90", "p99", "max")),
+        ]
+        for stage in STAGES:
+            if stage in self.stages:
+                stats = self.stages[stage]
+                lines.append(
+                    f"{stage:<14}"
+                    + "".join(
+                        f"{stats[name] * 1000:>10.1f}" for name in ("p50", "p90", "p99", "max")
+                    )
+                )
+        if self.spans:
+            lines.append("")
+            lines.append(
+                f"{'span (ms)':<22}"
+                + "".join(f"{name:>10}" for name in ("p50", "p90", "p99", "max"))
+            )
+            for name, stats in sorted(self.spans.items(), key=lambda item: -item[1]["p50"]):
+                lines.append(
+                    f"{name:<22}"
+                    + "".join(f"{stats[key]:>10.1f}" for key in ("p50", "p90", "p99", "max"))
+                )
+        if self.scheduler:
+            lines.append("")
+            lines.append(
+                f"scheduler: average wait {self.scheduler.get('average_wait_sec', 0) * 1000:.1f} ms, "
+                f"max wait {self.scheduler.get('max_wait_sec', 0) * 1000:.1f} ms"
+            )
+        return "\n".join(lines)
+
+
+def prepare_repos(root: Path, count: int) -> list[Path]:
+    """
+    Create repositories for a load run.
+
+    Each holds the files the stub edits and, when git is available, is a git
+    repository with one commit (so the safety check does its usual git work).
+
+    Args:
+        root: Directory to create them in.
+        count: Number of repositories.
+
+    Returns:
+        Repository paths.
+    """
+    repos = []
+    for i in range(count):
+        repo = root / f"repo-{i}"
+        for n in range(TOUCHED_FILES):
+            path = repo / touched_path(n)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f'"""Module {n}."""\n\n\ndef handler(request):\n    return request\n')
+        if shutil.which("git"):
+            for cmd in (
+                ["git", "init", "-q"],
+                ["git", "add", "-A"],
+                ["git", "commit", "-qm", "init"],
+            ):
+                subprocess.run(cmd, cwd=repo, capture_output=True, check=False)
+        repos.append(repo)
+    return repos
+
+
+async def run_load(
+    executor: ToolExecutor,
+    repos: list[Path],
+    calls: int,
+    concurrency: int,
+) -> LoadReport:
+    """
+    Run ``calls`` simple tasks, ``concurrency`` at a time.
+
+    Worker ``i`` works on ``repos[i % len(repos)]``; give each worker its own
+    repository, or the scheduler runs tasks on a shared one one at a time.
+
+    Args:
+        executor: Tool executor whose driver uses the stub CLI.
+        repos: Repositories to run tasks in.
+        calls: Total number of calls.
+        concurrency: Calls in flight at once.
+
+    Returns:
+        The load report.
+    """
+    records: list[CallRecord] = []
+    pending = iter(range(calls))
+
+    async def worker(index: int) -> None:
+        repo = repos[index % len(repos)]
+        for call in pending:
+            record = CallRecord(call=call, started=time.time())
+            stub_runs.set(record.runs)
+            request = SimpleTaskRequest(
+                task=f"Add request timeouts to the handlers (load call {call})",
+                repo_root=str(repo),
+                context_paths=[touched_path(call)],
+            )
+            try:
+                # One client per call, so the per-client rate limit does not apply
+                result = await executor.simple_task(request, client_id=f"load-{call}")
+                record.status = result.status
+            except Exception as e:
+                record.status = type(e).__name__
+            record.finished = time.time()
+            records.append(record)
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    wall_sec = time.monotonic() - started
+    spans = executor.driver.structured_logger.timing_stats(limit=calls)
+    return LoadReport.from_records(
+        records, concurrency, wall_sec, executor.scheduler.get_stats(), spans
+    )
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Load-test the coder pipeline with a stub CLI")
+    parser.add_argument("--calls", type=int, default=100, help="Total tool calls")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight at once")
+    parser.add_argument("--size", type=parse_size, default=parse_size("64K"), help="Output size")
+    parser.add_argument("--rate", type=parse_size, default=0, help="Output bytes per second")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to first output")
+    parser.add_argument("--touch", type=int, default=1, help="Files modified per run")
+    parser.add_argument(
+        "--exit-codes", default="0", help="Comma-separated exit codes, cycled per run"
+    )
+    parser.add_argument("--script", type=Path, help="Transcript for the stub to replay")
+    parser.add_argument("--workdir", type=Path, help="Keep repositories and caches here")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="ninja-load-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    # Logs, metrics and task files of the run stay out of the real cache
+    os.environ["XDG_CACHE_HOME"] = str(workdir / "cache")
+    for var, value in (
+        ("GIT_AUTHOR_NAME", "ninja-load"),
+        ("GIT_AUTHOR_EMAIL", "ninja-load@localhost"),
+        ("GIT_COMMITTER_NAME", "ninja-load"),
+        ("GIT_COMMITTER_EMAIL", "ninja-load@localhost"),
+    ):
+        os.environ.setdefault(var, value)
+
+    from ninja_coder.driver import NinjaConfig, NinjaDriver
+    from ninja_coder.scheduler import TaskScheduler
+    from ninja_coder.tools import ToolExecutor
+
+    register_stub_strategy()
+    StubStrategy.scenario = StubScenario(
+        size=args.size,
+        rate=args.rate,
+        delay=args.delay,
+        touch=args.touch,
+        exit_codes=tuple(int(code) for code in args.exit_codes.split(",")),
+        script=args.script,
+    )
+    driver = NinjaDriver(NinjaConfig(bin_path=str(STUB_CLI_PATH)))
+    executor = ToolExecutor(driver, TaskScheduler(max_workers=args.concurrency))
+    repos = prepare_repos(workdir / "repos", args.concurrency)
+
+    try:
+        report = asyncio.run(run_load(executor, repos, args.calls, args.concurrency))
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report.format())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
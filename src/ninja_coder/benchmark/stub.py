@@ -0,0 +1,188 @@
+"""
+Stub CLI strategy for end-to-end pipeline tests.
+
+``StubStrategy`` runs ``stub_cli.py`` instead of a real AI code CLI, so
+``NinjaDriver.execute_async`` goes through its whole pipeline (safety check,
+task file, prompt build, spawn, parse, logs, metrics) without a model. What
+the stub does is set by a ``StubScenario``: output size and rate, time to
+first output, files touched and exit codes.
+
+Output is parsed with the aider parser (the stub prints aider-style
+transcripts), after removing the stub's timing line. Those timings are
+appended to the list in ``stub_runs``, if the caller set one, which is how
+the load generator learns when each CLI run started and ended.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import sys
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ninja_coder.benchmark.stub_cli import TIMING_PREFIX
+from ninja_coder.strategies import CLIStrategyRegistry
+from ninja_coder.strategies.aider_strategy import AiderStrategy
+from ninja_coder.strategies.base import CLICommandResult, ParsedResult
+
+
+if TYPE_CHECKING:
+    from ninja_coder.change_detection import WorkspaceSnapshot
+
+
+STUB_CLI_PATH = Path(__file__).with_name("stub_cli.py")
+
+# Timings of the stub runs made in the current context (set by the caller)
+stub_runs: ContextVar[list[dict[str, float]] | None] = ContextVar("stub_runs", default=None)
+
+
+@dataclass
+class StubScenario:
+    """What each stub CLI run does."""
+
+    size: int = 64 * 1024
+    """Transcript size in bytes (ignored with a script)."""
+
+    rate: int = 0
+    """Output rate in bytes per second (0: as fast as possible)."""
+
+    delay: float = 0.0
+    """Seconds before the first output (the model's time to first token)."""
+
+    touch: int = 1
+    """Files modified in the repository per run."""
+
+    exit_codes: tuple[int, ...] = (0,)
+    """Exit codes used by successive runs, cycled."""
+
+    script: Path | None = None
+    """Transcript to replay instead of a synthetic one."""
+
+    def cli_args(self, exit_code: int) -> list[str]:
+        """Stub CLI arguments for one run."""
+        args = [
+            f"--size={self.size}",
+            f"--rate={self.rate}",
+            f"--delay={self.delay}",
+            f"--touch={self.touch}",
+            f"--exit-code={exit_code}",
+            "--timing",
+        ]
+        if self.script is not None:
+            args.append(f"--script={self.script}")
+        return args
+
+
+def split_timing(stderr: str) -> tuple[str, dict[str, float] | None]:
+    """
+    Remove the stub's timing line from its stderr.
+
+    Args:
+        stderr: Stub stderr.
+
+    Returns:
+        (stderr without the line, parsed timings or None if absent).
+    """
+    head, sep, tail = stderr.rpartition(TIMING_PREFIX)
+    if not sep:
+        return stderr, None
+    line, _, rest = tail.partition("\n")
+    try:
+        timing = json.loads(line)
+    except ValueError:
+        return stderr, None
+    return head + rest, timing
+
+
+class StubStrategy(AiderStrategy):
+    """Runs the stub CLI; output is parsed like aider's."""
+
+    scenario = StubScenario()
+    """Scenario of all stub runs (replace it to change what the stub does)."""
+
+    _runs = itertools.count()
+
+    @property
+    def name(self) -> str:
+        """CLI tool name."""
+        return "stub"
+
+    def build_command(
+        self,
+        prompt: str,
+        repo_root: str,
+        file_paths: list[str] | None = None,
+        model: str | None = None,
+        additional_flags: dict[str, Any] | None = None,
+        session_id: str | None = None,
+        continue_last: bool = False,
+        task_type: str = "quick",
+    ) -> CLICommandResult:
+        """Build the stub CLI command for the current scenario.
+
+        Args:
+            prompt: The instruction prompt (passed like aider's --message).
+            repo_root: Repository root path.
+            file_paths: Files to include in context.
+            model: Model name (passed through, unused by the stub).
+            additional_flags: Unused.
+            session_id: Unused.
+            continue_last: Unused.
+            task_type: Unused.
+
+        Returns:
+            CLICommandResult with command, env, and metadata.
+        """
+        scenario = self.scenario
+        exit_code = scenario.exit_codes[next(self._runs) % len(scenario.exit_codes)]
+        if self.bin_path.endswith(".py"):
+            cmd = [sys.executable, self.bin_path]
+        else:
+            cmd = [self.bin_path]
+        cmd.extend(scenario.cli_args(exit_code))
+        cmd.extend(["--model", model or self.config.model])
+        for file_path in file_paths or []:
+            cmd.extend(["--file", file_path])
+        cmd.extend(["--message", prompt])
+
+        return CLICommandResult(
+            command=cmd,
+            env=os.environ.copy(),
+            working_dir=Path(repo_root),
+            metadata={"model": model or self.config.model},
+        )
+
+    def parse_output(
+        self,
+        stdout: str,
+        stderr: str,
+        exit_code: int,
+        repo_root: str | None = None,
+        snapshot: WorkspaceSnapshot | None = None,
+    ) -> ParsedResult:
+        """Record the run's timings, then parse the output like aider's.
+
+        Args:
+            stdout: Standard output of the stub.
+            stderr: Standard error of the stub.
+            exit_code: Exit code of the stub.
+            repo_root: Repository root path.
+            snapshot: Workspace snapshot taken before the run.
+
+        Returns:
+            ParsedResult with success status, summary, and file changes.
+        """
+        stderr, timing = split_timing(stderr)
+        runs = stub_runs.get()
+        if timing is not None and runs is not None:
+            runs.append(timing)
+        return super().parse_output(stdout, stderr, exit_code, repo_root, snapshot)
+
+
+def register_stub_strategy() -> None:
+    """Make CLI binaries named like ``*stub*`` run through ``StubStrategy``."""
+    CLIStrategyRegistry.register("stub", StubStrategy)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Stub AI code CLI for benchmarks and load tests.
+
+Prints a synthetic transcript shaped like real aider / Claude Code / OpenCode
+output (ANSI status lines, tool calls, diffs, "Applied edit to ..." lines, an
+occasional secret for the redactor) and exits with a chosen code. No model is
+involved, so the cost of everything around the CLI can be measured on its own.
+
+The output can be throttled to a byte rate after an initial delay (a model's
+time to first token), a scripted transcript can be replayed instead of the
+synthetic one, and files can be touched in the working directory like a real
+edit would. With ``--timing`` the stub reports when it started, first wrote
+and exited as a last stderr line (see ``TIMING_PREFIX``).
+
+The script only uses the standard library and is run by path, so its
+startup cost stays close to a bare interpreter's.
+
+Usage:
+    python src/ninja_coder/benchmark/stub_cli.py --size 10M
+    python src/ninja_coder/benchmark/stub_cli.py --size 64K --exit-code 1
+    python src/ninja_coder/benchmark/stub_cli.py --delay 0.5 --rate 200K --touch 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+
+_STARTED = time.time()
+
+
+_UNITS = {"": 1, "K": 1024, "M": 1024 * 1024, "G": 1024 * 1024 * 1024}
+
+# Distinct file names a transcript mentions (real runs touch a handful of files)
+TOUCHED_FILES = 40
+
+# Prefix of the stderr line carrying the stub's timestamps (JSON, epoch seconds)
+TIMING_PREFIX = "ninja-stub-timing: "
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte count with an optional K/M/G suffix ("10M", "512K", "4096")."""
+    value = value.strip().upper().removesuffix("B")
+    unit = value[-1:] if value[-1:] in _UNITS else ""
+    return int(float(value[: len(value) - len(unit)]) * _UNITS[unit])
+
+
+def touched_path(i: int) -> str:
+    """Relative path of the i-th file a transcript edits."""
+    return f"src/pkg/module_{i % TOUCHED_FILES}.py"
+
+
+def _block(i: int) -> str:
+    """One tool-call round of a transcript."""
+    # Numbers stay below 400 so no line reads like an HTTP 401/403 error
+    n = i % 400
+    path = touched_path(i)
+    lines = [
+        f"\x1b[1;34m> Thinking about handler_{n}\x1b[0m",
+        f"| Read     {path}",
+        f"| Edit     {path}",
+        f"--- a/{path}",
+        f"+++ b/{path}",
+        f"@@ -{n},7 +{n},9 @@ def handler_{n}(request):",
+        "-    result = compute(request.payload)",
+        "+    result = compute(request.payload, timeout=30)",
+        "+    if result is None:",
+        "+        raise ValueError('empty result')",
+        "     return result",
+        f"Applied edit to {path}",
+        f"Tokens: {1000 + n % 399} sent, {200 + n % 199} received.",
+    ]
+    if i % 50 == 0:
+        lines.append(f"export OPENROUTER_API_KEY=sk-or-v1-{n:0>32}")
+    if i % 75 == 0:
+        lines.append(f'config = {{"password": "hunter{n}", "user": "dev{n}@example.com"}}')
+    return "\n".join(lines) + "\n"
+
+
+def synthetic_transcript(size: int) -> str:
+    """
+    Build a transcript of about ``size`` characters.
+
+    Args:
+        size: Target length.
+
+    Returns:
+        The transcript, ending with a completion line.
+    """
+    parts = []
+    total = 0
+    i = 0
+    while total < size:
+        block = _block(i)
+        parts.append(block)
+        total += len(block)
+        i += 1
+    parts.append(f"Task completed. Modified {min(i, TOUCHED_FILES)} files.\n")
+    return "".join(parts)
+
+
+def _touch(count: int) -> None:
+    """Append a line to the first ``count`` transcript files in the working directory."""
+    for i in range(min(count, TOUCHED_FILES)):
+        path = Path(touched_path(i))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a") as f:
+            f.write(f"# edited by stub run at {time.time():.6f}\n")
+
+
+def _emit(output: str, rate: int, chunk_size: int) -> float | None:
+    """
+    Write output to stdout, at most ``rate`` bytes per second (0: unthrottled).
+
+    Returns:
+        Time of the first write (None if there was no output).
+    """
+    data = output.encode()
+    stdout = sys.stdout.buffer
+    first_output = None
+    start = time.monotonic()
+    for offset in range(0, len(data), chunk_size):
+        if rate:
+            ahead = offset / rate - (time.monotonic() - start)
+            if ahead > 0:
+                time.sleep(ahead)
+        stdout.write(data[offset : offset + chunk_size])
+        stdout.flush()
+        if first_output is None:
+            first_output = time.time()
+    return first_output
+
+
+def main(argv: list[str] | None = None) -> int:
+    """CLI entry point. Unknown arguments (the real CLI's flags) are ignored."""
+    parser = argparse.ArgumentParser(description="Stub AI code CLI")
+    parser.add_argument("--size", type=parse_size, default=parse_size("64K"))
+    parser.add_argument("--script", type=Path, help="Replay this transcript instead")
+    parser.add_argument("--rate", type=parse_size, default=0, help="Bytes per second")
+    parser.add_argument("--chunk", type=parse_size, default=parse_size("4K"))
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds before output")
+    parser.add_argument("--touch", type=int, default=0, help="Files to modify")
+    parser.add_argument("--exit-code", type=int, default=0)
+    parser.add_argument("--timing", action="store_true", help="Report timestamps on stderr")
+    args, _ = parser.parse_known_args(argv)
+
+    output = args.script.read_text() if args.script else synthetic_transcript(args.size)
+    if args.delay > 0:
+        time.sleep(args.delay)
+    _touch(args.touch)
+    first_output = _emit(output, args.rate, max(1, args.chunk))
+
+    if args.timing:
+        timing = {"started": _STARTED, "first_output": first_output, "exited": time.time()}
+        sys.stderr.write(TIMING_PREFIX + json.dumps(timing) + "\n")
+        sys.stderr.flush()
+    return args.exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
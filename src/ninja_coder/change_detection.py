@@ -0,0 +1,232 @@
+"""
+Snapshot-based detection of files touched by a CLI run.
+
+Strategies first extract modified paths from CLI output. When that finds
+nothing, the driver needs a reliable fallback that does not walk the whole
+repository: a ``WorkspaceSnapshot`` is captured right before the CLI starts
+and diffed against the workspace state after it exits.
+
+In git repositories the snapshot records ``git status --porcelain`` (dirty
+and untracked paths) plus a stat fingerprint of each dirty path and the
+HEAD commit. Both capture and diff cost time proportional to the change
+set, not the repository size, and paths that were already dirty before the
+run are only reported if the run changed them again.
+
+Outside git, the snapshot only records its start time; the diff walks the
+tree once and reports files modified since then.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ninja_common.logging_utils import get_logger
+
+
+logger = get_logger(__name__)
+
+# Timeout for each git invocation (seconds)
+_GIT_TIMEOUT_SEC = 10
+
+# Slack for filesystems with coarse mtime resolution (seconds)
+_MTIME_SLACK_SEC = 1.0
+
+Fingerprint = tuple[int, int] | None
+"""(mtime_ns, size) of a path, or None if it does not exist."""
+
+
+def _run_git(repo_root: str, *args: str) -> str | None:
+    """Run a git command and return stdout, or None if it failed."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+            timeout=_GIT_TIMEOUT_SEC,
+            check=False,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug(f"git {args[0]} failed: {e}")
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _git_head(repo_root: str) -> str | None:
+    """Return the HEAD commit, or None outside git or before the first commit."""
+    output = _run_git(repo_root, "rev-parse", "-q", "--verify", "HEAD")
+    return output.strip() if output else None
+
+
+def _fingerprint(path: Path) -> Fingerprint:
+    """Return the stat fingerprint of a path."""
+    try:
+        stat = path.stat()
+    except (OSError, ValueError):
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _parse_porcelain(output: str, prefix: str) -> list[str]:
+    """Parse ``git status --porcelain -z`` output into repo_root-relative paths.
+
+    Args:
+        output: Raw NUL-separated porcelain v1 output.
+        prefix: Path of repo_root relative to the git top level ("" or "sub/").
+
+    Returns:
+        Paths relative to repo_root (entries outside it are dropped).
+    """
+    paths: list[str] = []
+    entries = output.split("\0")
+    i = 0
+    while i < len(entries):
+        entry = entries[i]
+        i += 1
+        if len(entry) < 4:
+            continue
+        status, path = entry[:2], entry[3:]
+        if "R" in status or "C" in status:
+            i += 1  # Skip the rename/copy source path
+        if path.endswith("/"):
+            continue  # Untracked directory (only without --untracked-files=all)
+        if prefix:
+            if not path.startswith(prefix):
+                continue
+            path = path[len(prefix) :]
+        paths.append(path)
+    return paths
+
+
+@dataclass
+class WorkspaceSnapshot:
+    """Workspace state captured before a CLI run."""
+
+    repo_root: str
+    """Directory the snapshot covers."""
+
+    started_at: float
+    """Wall-clock time when the snapshot was taken."""
+
+    is_git: bool = False
+    """Whether the snapshot is backed by git status."""
+
+    git_prefix: str = ""
+    """repo_root relative to the git top level ("" when it is the top level)."""
+
+    head: str | None = None
+    """HEAD commit at snapshot time (None without commits or outside git)."""
+
+    dirty: dict[str, Fingerprint] = field(default_factory=dict)
+    """Fingerprints of paths that were dirty or untracked at snapshot time."""
+
+    @classmethod
+    def capture(cls, repo_root: str) -> WorkspaceSnapshot:
+        """Capture the current workspace state.
+
+        Args:
+            repo_root: Repository root path.
+
+        Returns:
+            Snapshot to diff against after the run.
+        """
+        started_at = time.time()
+        prefix = _run_git(repo_root, "rev-parse", "--show-prefix")
+        if prefix is None:
+            return cls(repo_root=repo_root, started_at=started_at)
+
+        snapshot = cls(
+            repo_root=repo_root,
+            started_at=started_at,
+            is_git=True,
+            git_prefix=prefix.strip(),
+            head=_git_head(repo_root),
+        )
+        dirty = snapshot._dirty_paths()
+        if dirty is None:
+            return cls(repo_root=repo_root, started_at=started_at)
+
+        root = Path(repo_root)
+        snapshot.dirty = {path: _fingerprint(root / path) for path in dirty}
+        return snapshot
+
+    def _dirty_paths(self) -> list[str] | None:
+        """List dirty and untracked paths under repo_root via git status."""
+        output = _run_git(
+            self.repo_root,
+            "status",
+            "--porcelain=v1",
+            "-z",
+            "--untracked-files=all",
+            "--no-renames",
+            "--",
+            ".",
+        )
+        if output is None:
+            return None
+        return _parse_porcelain(output, self.git_prefix)
+
+    def changed_paths(self) -> list[str]:
+        """Return paths changed since the snapshot was captured.
+
+        Returns:
+            Sorted paths relative to repo_root. Only files that still exist
+            are reported; deletions are not touched files.
+        """
+        if self.is_git:
+            changed = self._git_changed_paths()
+            if changed is not None:
+                return changed
+        return self._mtime_changed_paths()
+
+    def _git_changed_paths(self) -> list[str] | None:
+        """Diff the git-backed snapshot against the current state."""
+        dirty_now = self._dirty_paths()
+        if dirty_now is None:
+            return None
+
+        root = Path(self.repo_root)
+        after = {path: _fingerprint(root / path) for path in dirty_now}
+        changed: set[str] = set()
+        for path in self.dirty.keys() | after.keys():
+            # Paths dirty before but clean now were reverted or committed
+            now = after[path] if path in after else _fingerprint(root / path)
+            if self.dirty.get(path) != now:
+                changed.add(path)
+
+        # The CLI may have committed its own changes
+        head_now = _git_head(self.repo_root)
+        if self.head and head_now and head_now != self.head:
+            committed = _run_git(
+                self.repo_root, "diff", "--name-only", "--relative", self.head, head_now
+            )
+            if committed:
+                changed.update(line for line in committed.splitlines() if line)
+
+        return sorted(path for path in changed if (root / path).is_file())
+
+    def _mtime_changed_paths(self) -> list[str]:
+        """Walk repo_root for files modified since the snapshot (non-git fallback)."""
+        cutoff = self.started_at - _MTIME_SLACK_SEC
+        changed: list[str] = []
+        try:
+            for root, dirs, files in os.walk(self.repo_root):
+                # Skip hidden directories (including .git, .cache, etc.)
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+                for file in files:
+                    file_path = Path(root) / file
+                    try:
+                        if file_path.stat().st_mtime >= cutoff:
+                            changed.append(str(file_path.relative_to(self.repo_root)))
+                    except (OSError, ValueError):
+                        # Skip files we can't stat (permission errors, etc.)
+                        continue
+        except Exception as e:
+            logger.warning(f"Filesystem scan failed: {e}")
+        return sorted(changed)
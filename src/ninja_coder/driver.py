@@ -25,11 +25,18 @@ import shutil
 import signal
 import subprocess
 import tempfile
+import time
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from ninja_coder.change_detection import WorkspaceSnapshot
+from ninja_coder.model_router import (
+    adaptive_routing_enabled,
+    estimate_run_cost,
+    get_model_router,
+)
 from ninja_coder.model_selector import ModelSelector
 from ninja_coder.models import (
     ExecutionMode,
@@ -39,6 +46,8 @@ from ninja_coder.models import (
 from ninja_coder.safety import validate_task_safety
 from ninja_coder.sessions import SessionManager
 from ninja_coder.strategies import CLIStrategyRegistry
+from ninja_coder.strategies.matcher import PatternMatcher, error_context
+from ninja_coder.timeouts import CLITimeoutError, RunProfile, TimeoutEstimator
 from ninja_common.defaults import (
     DEFAULT_CODE_BIN,
     DEFAULT_CODER_MODEL,
@@ -46,12 +55,45 @@ from ninja_common.defaults import (
     DEFAULT_TIMEOUT_SEC,
     FALLBACK_CODER_MODELS,
 )
-from ninja_common.logging_utils import create_task_logger, get_logger
+from ninja_common.logging_utils import TaskLogger, create_task_logger, get_logger
 from ninja_common.path_utils import ensure_internal_dirs, safe_join
+from ninja_common.spans import record_span, span
 
 
 logger = get_logger(__name__)
 
+# Patterns for the deprecated NinjaDriver._parse_output (strategies own theirs)
+_LEGACY_AIDER_ERROR_MATCHER = PatternMatcher(
+    [
+        # Summarization failures (most common)
+        r"summarization\s+failed",
+        r"summarizer\s+.*?\s+failed",
+        r"cannot\s+schedule\s+new\s+futures\s+after\s+shutdown",
+        r"unexpectedly\s+failed\s+for\s+all\s+models",
+        # Threading/async errors (often fatal but hidden)
+        r"thread\s+.*?\s+error",
+        r"event\s+loop\s+.*?\s+closed",
+        r"event\s+loop\s+is\s+closed",
+        # Model response errors
+        r"incomplete\s+response",
+        r"response\s+.*?\s+truncated",
+        # File operation errors
+        r"failed\s+to\s+(write|create|modify)",
+        r"permission\s+denied.*?(writing|creating|modifying)",
+        # Git errors (when --no-git might not work)
+        r"git\s+.*?\s+error",
+        r"repository\s+.*?\s+error",
+    ]
+)
+
+_LEGACY_FILE_CHANGE_MATCHER = PatternMatcher(
+    [
+        r"(?:wrote|created|modified|updated|edited)\s+['\"]?([^\s'\"]+)['\"]?",
+        r"(?:writing|creating|modifying|updating|editing)\s+['\"]?([^\s'\"]+)['\"]?",
+        r"file:\s*['\"]?([^\s'\"]+)['\"]?",
+    ]
+)
+
 
 @dataclass
 class NinjaConfig:
@@ -138,6 +180,22 @@ class NinjaResult:
     session_id: str | None = None  # Session ID if session was used
 
 
+@dataclass
+class PreparedTask:
+    """Task artifacts reused across retry attempts of the same instruction.
+
+    Pass the same (initially empty) instance to every ``execute_async``
+    attempt: the first attempt runs the safety check, writes the task file
+    and builds the prompt; later attempts reuse them.
+    """
+
+    task_file: Path | None = None
+    """Task file written by the first attempt."""
+
+    prompt: str | None = None
+    """Prompt built from the task file."""
+
+
 class InstructionBuilder:
     """
     Builds instruction documents for the AI code CLI.
@@ -515,6 +573,9 @@ class NinjaDriver:
         log_dir = cache_dir / "logs"
         self.structured_logger = StructuredLogger("ninja-coder", log_dir)
 
+        # Per-repo run duration history for adaptive timeouts
+        self._timeout_estimators: dict[str, TimeoutEstimator] = {}
+
         logger.info(f"Initialized NinjaDriver with {self._strategy.name} strategy")
         self.structured_logger.info(
             "Driver initialized",
@@ -522,6 +583,136 @@ class NinjaDriver:
             model=self.config.model,
         )
 
+    def _get_timeout_estimator(self, repo_root: str) -> TimeoutEstimator:
+        """Get the run duration history for a repository."""
+        key = str(Path(repo_root).resolve())
+        if key not in self._timeout_estimators:
+            self._timeout_estimators[key] = TimeoutEstimator.for_repo(repo_root)
+        return self._timeout_estimators[key]
+
+    def _estimate_timeout(self, repo_root: str, profile: RunProfile, default: int) -> int:
+        """Estimate the maximum timeout for a run from its history.
+
+        Args:
+            repo_root: Repository root path.
+            profile: Run profile (cli, model, task type, size).
+            default: Static timeout used until enough history exists.
+
+        Returns:
+            Timeout in seconds.
+        """
+        if os.environ.get("NINJA_ADAPTIVE_TIMEOUTS", "true").lower() in ("false", "0", "no"):
+            return default
+        try:
+            return self._get_timeout_estimator(repo_root).estimate(profile, default)
+        except Exception as e:
+            logger.warning(f"Timeout estimation failed, using default {default}s: {e}")
+            return default
+
+    def _record_duration(
+        self, repo_root: str, profile: RunProfile, duration_sec: float, timed_out: bool = False
+    ) -> None:
+        """Record a run duration for future timeout estimates."""
+        try:
+            self._get_timeout_estimator(repo_root).record(profile, duration_sec, timed_out)
+        except Exception as e:
+            logger.debug(f"Failed to record run duration: {e}")
+
+    def _get_inactivity_timeout(self, task_type: str) -> float | None:
+        """Get the output inactivity timeout for the current strategy.
+
+        Strategies may define ``get_inactivity_timeout(task_type)``; otherwise
+        NINJA_INACTIVITY_TIMEOUT_SEC applies. It is off by default (0): CLIs
+        that do not stream (aider with --no-stream, and Gemini or OpenCode
+        during long model calls) print nothing while the model is working.
+
+        Args:
+            task_type: Type of task.
+
+        Returns:
+            Seconds without output before the run is killed, or None to disable.
+        """
+        if hasattr(self._strategy, "get_inactivity_timeout"):
+            return self._strategy.get_inactivity_timeout(task_type)
+        timeout = float(os.environ.get("NINJA_INACTIVITY_TIMEOUT_SEC", "0"))
+        return timeout if timeout > 0 else None
+
+    async def _communicate_with_timeouts(
+        self,
+        process: asyncio.subprocess.Process,
+        max_timeout: float,
+        inactivity_timeout: float | None,
+    ) -> tuple[bytes, bytes]:
+        """Read a process's output until exit, enforcing both timeouts.
+
+        Output on either stream resets the inactivity timer; the maximum
+        timeout bounds the whole run regardless of activity.
+
+        Args:
+            process: Running subprocess with piped stdout/stderr.
+            max_timeout: Maximum total run time in seconds.
+            inactivity_timeout: Maximum time without output (None disables).
+
+        Returns:
+            Tuple of (stdout, stderr) bytes.
+
+        Raises:
+            CLITimeoutError: If either timeout is exceeded.
+        """
+        loop = asyncio.get_running_loop()
+        start = last_activity = loop.time()
+        started = time.perf_counter()
+        first_output = False
+        stdout_chunks: list[bytes] = []
+        stderr_chunks: list[bytes] = []
+
+        async def pump(stream: asyncio.StreamReader | None, sink: list[bytes]) -> None:
+            nonlocal last_activity, first_output
+            if stream is None:
+                return
+            while True:
+                chunk = await stream.read(65536)
+                if not chunk:
+                    return
+                if not first_output:
+                    first_output = True
+                    record_span("first_output", started)
+                sink.append(chunk)
+                last_activity = loop.time()
+
+        readers = asyncio.gather(
+            pump(process.stdout, stdout_chunks), pump(process.stderr, stderr_chunks)
+        )
+        try:
+            while not readers.done():
+                now = loop.time()
+                wait = max_timeout - (now - start)
+                if wait <= 0:
+                    raise CLITimeoutError(f"Exceeded maximum timeout of {max_timeout}s")
+                if inactivity_timeout is not None:
+                    idle_left = inactivity_timeout - (now - last_activity)
+                    if idle_left <= 0:
+                        raise CLITimeoutError(
+                            f"No output activity for {inactivity_timeout:.0f}s "
+                            "(inactivity timeout)",
+                            inactive=True,
+                        )
+                    wait = min(wait, idle_left)
+                await asyncio.wait({readers}, timeout=wait)
+            readers.result()
+        except BaseException:
+            readers.cancel()
+            raise
+
+        # Streams are closed; the process should be exiting
+        remaining = max(max_timeout - (loop.time() - start), 1.0)
+        try:
+            await asyncio.wait_for(process.wait(), timeout=remaining)
+        except TimeoutError as e:
+            raise CLITimeoutError(f"Exceeded maximum timeout of {max_timeout}s") from e
+
+        return b"".join(stdout_chunks), b"".join(stderr_chunks)
+
     def _get_env(self) -> dict[str, str]:
         """Get environment variables for Ninja Code CLI subprocess with security filtering."""
         env = os.environ.copy()
@@ -596,7 +787,7 @@ class NinjaDriver:
         ) as tmp_file:
             # Add model info to instruction
             instruction["model"] = self.config.model
-            json.dump(instruction, tmp_file, indent=2)
+            json.dump(instruction, tmp_file, separators=(",", ":"))
             tmp_file.flush()
             os.fsync(tmp_file.fileno())
             temp_path = Path(tmp_file.name)
@@ -634,6 +825,40 @@ class NinjaDriver:
         else:
             return "generic"
 
+    @staticmethod
+    def _task_complexity(task_type: str) -> TaskComplexity:
+        """Map a task type (including the plan tools' ``*_plan`` types) to a complexity."""
+        if task_type in ("parallel", "parallel_plan"):
+            return TaskComplexity.PARALLEL
+        if task_type in ("sequential", "sequential_plan"):
+            return TaskComplexity.SEQUENTIAL
+        return TaskComplexity.QUICK
+
+    def _record_model_outcome(
+        self,
+        task_type: str,
+        model: str,
+        duration_sec: float,
+        success: bool,
+        *,
+        retryable_error: bool,
+        output: str = "",
+    ) -> None:
+        """Feed a run outcome to the adaptive model router (if enabled)."""
+        if not adaptive_routing_enabled():
+            return
+        try:
+            get_model_router().record(
+                self._task_complexity(task_type).value,
+                model,
+                duration_sec,
+                success,
+                retryable_error=retryable_error,
+                cost_usd=estimate_run_cost(model, output),
+            )
+        except Exception as e:
+            logger.debug(f"Failed to record model outcome: {e}")
+
     def _select_model_for_task(
         self,
         instruction: dict[str, Any],
@@ -648,19 +873,18 @@ class NinjaDriver:
         Returns:
             Tuple of (model_name, use_coding_plan_api).
         """
-        # Determine task complexity
-        if task_type == "parallel":
-            complexity = TaskComplexity.PARALLEL
+        complexity = self._task_complexity(task_type)
+        if complexity == TaskComplexity.PARALLEL:
             fanout = instruction.get("parallel_context", {}).get("total_steps", 1)
-        elif task_type == "sequential":
-            complexity = TaskComplexity.SEQUENTIAL
-            fanout = 1
         else:
-            complexity = TaskComplexity.QUICK
             fanout = 1
 
         # Select model using model selector directly
-        model_selector = ModelSelector(default_model=self.config.model)
+        model_selector = ModelSelector(
+            default_model=self.config.model,
+            router=get_model_router() if adaptive_routing_enabled() else None,
+            capabilities=self._strategy.capabilities,
+        )
         recommendation = model_selector.select_model(
             complexity,
             fanout=fanout,
@@ -955,43 +1179,17 @@ class NinjaDriver:
         """
         success = exit_code == 0
         combined_output = stdout + "\n" + stderr
+        lowered_output = combined_output.lower()
 
         # ENHANCED: Detect aider-specific errors even with exit_code=0
-        aider_error_patterns = [
-            # Summarization failures (most common)
-            r"summarization\s+failed",
-            r"summarizer\s+.*?\s+failed",
-            r"cannot\s+schedule\s+new\s+futures\s+after\s+shutdown",
-            r"unexpectedly\s+failed\s+for\s+all\s+models",
-            # Threading/async errors (often fatal but hidden)
-            r"thread\s+.*?\s+error",
-            r"event\s+loop\s+.*?\s+closed",
-            r"event\s+loop\s+is\s+closed",
-            # Model response errors
-            r"incomplete\s+response",
-            r"response\s+.*?\s+truncated",
-            # File operation errors
-            r"failed\s+to\s+(write|create|modify)",
-            r"permission\s+denied.*?(writing|creating|modifying)",
-            # Git errors (when --no-git might not work)
-            r"git\s+.*?\s+error",
-            r"repository\s+.*?\s+error",
-        ]
-
         aider_error_detected = False
         aider_error_msg = ""
 
-        for pattern in aider_error_patterns:
-            match = re.search(pattern, combined_output, re.IGNORECASE)
-            if match:
-                aider_error_detected = True
-                # Extract context around the error (80 chars before/after for context)
-                start = max(0, match.start() - 80)
-                end = min(len(combined_output), match.end() + 80)
-                aider_error_msg = combined_output[start:end].strip()
-                # Clean up extra whitespace
-                aider_error_msg = " ".join(aider_error_msg.split())
-                break
+        error_hit = _LEGACY_AIDER_ERROR_MATCHER.first(combined_output, lowered_output)
+        if error_hit:
+            aider_error_detected = True
+            # Extract context around the error (80 chars before/after for context)
+            aider_error_msg = error_context(combined_output, error_hit, 80)
 
         # Override success if aider error detected
         if aider_error_detected:
@@ -1002,16 +1200,9 @@ class NinjaDriver:
 
         # Extract file changes (what was modified)
         suspected_paths: list[str] = []
-        file_patterns = [
-            r"(?:wrote|created|modified|updated|edited)\s+['\"]?([^\s'\"]+)['\"]?",
-            r"(?:writing|creating|modifying|updating|editing)\s+['\"]?([^\s'\"]+)['\"]?",
-            r"file:\s*['\"]?([^\s'\"]+)['\"]?",
-        ]
-        for pattern in file_patterns:
-            matches = re.findall(pattern, combined_output, re.IGNORECASE)
-            for match in matches:
-                if match and ("/" in match or "." in match):
-                    suspected_paths.append(match)
+        for match in _LEGACY_FILE_CHANGE_MATCHER.values(combined_output, lowered_output):
+            if match and ("/" in match or "." in match):
+                suspected_paths.append(match)
 
         # Deduplicate paths
         suspected_paths = list(set(suspected_paths))
@@ -1054,14 +1245,11 @@ class NinjaDriver:
                     notes = error_lines[-1][:200]  # Last line, max 200 chars
 
             # Detect specific OpenRouter/API errors
-            if "finish_reason" in combined_output.lower():
+            if "finish_reason" in lowered_output:
                 notes = "⚠️ Incomplete API response (token limit or timeout). Try smaller context or different model."
 
             # Detect invalid model ID errors
-            if (
-                "is not a valid model" in combined_output.lower()
-                or "model not found" in combined_output.lower()
-            ):
+            if "is not a valid model" in lowered_output or "model not found" in lowered_output:
                 model_match = re.search(
                     r"['\"]?([a-z]+/[a-z0-9._-]+)['\"]?\s+is not a valid",
                     combined_output,
@@ -1073,8 +1261,8 @@ class NinjaDriver:
                 summary = f"❌ Model '{bad_model}' not found on OpenRouter"
 
             # Detect API key errors
-            if "api key" in combined_output.lower() and (
-                "not found" in combined_output.lower() or "invalid" in combined_output.lower()
+            if "api key" in lowered_output and (
+                "not found" in lowered_output or "invalid" in lowered_output
             ):
                 notes = "❌ OpenRouter API key missing or invalid. Set OPENROUTER_API_KEY in ~/.ninja-mcp.env"
                 summary = "❌ API key error"
@@ -1157,6 +1345,9 @@ class NinjaDriver:
             # Get timeout from strategy
             timeout = timeout_sec or self._strategy.get_timeout("quick")
 
+            # Snapshot the workspace so touched files can be diffed after the run
+            snapshot = WorkspaceSnapshot.capture(repo_root)
+
             # Execute
             process = subprocess.run(
                 cli_result.command,
@@ -1175,7 +1366,11 @@ class NinjaDriver:
 
             # Parse output using strategy
             parsed = self._strategy.parse_output(
-                process.stdout, process.stderr, process.returncode, repo_root=repo_root
+                process.stdout,
+                process.stderr,
+                process.returncode,
+                repo_root=repo_root,
+                snapshot=snapshot,
             )
 
             # Build result from parsed output
@@ -1232,6 +1427,67 @@ class NinjaDriver:
                 model_used=self.config.model,
             )
 
+    def _check_task_safety(
+        self,
+        repo_root: str,
+        task_desc: str,
+        context_paths: list[str],
+        task_logger: TaskLogger,
+    ) -> NinjaResult | None:
+        """Run the pre-task safety check.
+
+        Args:
+            repo_root: Repository root path.
+            task_desc: Task description.
+            context_paths: Files the task will read.
+            task_logger: Logger of the task.
+
+        Returns:
+            A failed result if the task must not run, else None.
+        """
+        # Safety check with automatic enforcement (AUTO mode by default)
+        safety_results = validate_task_safety(
+            repo_root=repo_root,
+            task_description=task_desc,
+            context_paths=context_paths,
+        )
+
+        # Log all warnings
+        for warning in safety_results.get("warnings", []):
+            task_logger.warning(warning)
+            logger.warning(warning)
+
+        # Log recommendations
+        for rec in safety_results.get("recommendations", []):
+            task_logger.info(f"💡 {rec}")
+
+        # Log action taken
+        action_taken = safety_results.get("action_taken")
+        if action_taken == "auto_committed":
+            logger.info("✅ Automatic safety commit created")
+
+        # ENFORCE SAFETY: Refuse to run if safety check failed
+        if not safety_results.get("safe", True):
+            logs_path = task_logger.save()
+            error_msg = "Safety check failed - refusing to run task"
+            task_logger.error(error_msg)
+            return NinjaResult(
+                success=False,
+                summary="❌ Safety check failed",
+                notes="\n".join(safety_results.get("warnings", [])),
+                raw_logs_path=logs_path,
+                exit_code=-2,
+                model_used=self.config.model,
+            )
+
+        # Store git info for recovery
+        git_info = safety_results.get("git_info", {})
+        if git_info.get("safety_tag"):
+            recovery_cmd = f"git reset --hard {git_info['safety_tag']}"
+            task_logger.info(f"🔖 Recovery point: {recovery_cmd}")
+            logger.info(f"🔖 Recovery point: {recovery_cmd}")
+        return None
+
     async def execute_async(
         self,
         repo_root: str,
@@ -1240,6 +1496,10 @@ class NinjaDriver:
         timeout_sec: int | None = None,
         task_type: str = "quick",
         session_id: str | None = None,
+        *,
+        step_count: int = 1,
+        model: str | None = None,
+        prepared: PreparedTask | None = None,
     ) -> NinjaResult:
         """
         Execute a task asynchronously.
@@ -1248,9 +1508,15 @@ class NinjaDriver:
             repo_root: Repository root path.
             step_id: Step identifier.
             instruction: Instruction document.
-            timeout_sec: Timeout in seconds.
+            timeout_sec: Default maximum timeout in seconds (the strategy's when
+                None). Replaced by a learned estimate once enough history exists.
             task_type: Type of task for model selection ('quick', 'sequential', 'parallel').
             session_id: Optional session ID for logging.
+            step_count: Number of plan steps in the instruction (for timeout history).
+            model: Model to use instead of automatic selection (e.g. a retry
+                failing over to a fallback model).
+            prepared: Artifacts shared between retry attempts of the same
+                instruction (safety check and task file run only once).
 
         Returns:
             Execution result.
@@ -1258,57 +1524,33 @@ class NinjaDriver:
         task_logger = create_task_logger(repo_root, step_id)
 
         try:
-            # Safety check with automatic enforcement (AUTO mode by default)
             task_desc = instruction.get("task", "")
             context_paths = instruction.get("file_scope", {}).get("context_paths", [])
 
-            safety_results = validate_task_safety(
-                repo_root=repo_root,
-                task_description=task_desc,
-                context_paths=context_paths,
-            )
-
-            # Log all warnings
-            for warning in safety_results.get("warnings", []):
-                task_logger.warning(warning)
-                logger.warning(warning)
-
-            # Log recommendations
-            for rec in safety_results.get("recommendations", []):
-                task_logger.info(f"💡 {rec}")
-
-            # Log action taken
-            action_taken = safety_results.get("action_taken")
-            if action_taken == "auto_committed":
-                logger.info("✅ Automatic safety commit created")
-
-            # ENFORCE SAFETY: Refuse to run if safety check failed
-            if not safety_results.get("safe", True):
-                logs_path = task_logger.save()
-                error_msg = "Safety check failed - refusing to run task"
-                task_logger.error(error_msg)
-                return NinjaResult(
-                    success=False,
-                    summary="❌ Safety check failed",
-                    notes="\n".join(safety_results.get("warnings", [])),
-                    raw_logs_path=logs_path,
-                    exit_code=-2,
-                    model_used=self.config.model,
-                )
-
-            # Store git info for recovery
-            git_info = safety_results.get("git_info", {})
-            if git_info.get("safety_tag"):
-                recovery_cmd = f"git reset --hard {git_info['safety_tag']}"
-                task_logger.info(f"🔖 Recovery point: {recovery_cmd}")
-                logger.info(f"🔖 Recovery point: {recovery_cmd}")
-
-            # Write task file
-            task_file = self._write_task_file(repo_root, step_id, instruction)
-            task_logger.info(f"Wrote task file: {task_file}")
-
-            # Select model intelligently based on task type
-            model, use_coding_plan = self._select_model_for_task(instruction, task_type)
+            if prepared is not None and prepared.task_file is not None:
+                task_file = prepared.task_file
+                task_logger.info(f"Reusing prepared task file: {task_file}")
+            else:
+                with span("safety_check"):
+                    failure = self._check_task_safety(
+                        repo_root, task_desc, context_paths, task_logger
+                    )
+                if failure is not None:
+                    return failure
+
+                # Write task file
+                with span("write_task_file"):
+                    task_file = self._write_task_file(repo_root, step_id, instruction)
+                task_logger.info(f"Wrote task file: {task_file}")
+                if prepared is not None:
+                    prepared.task_file = task_file
+
+            # Select model intelligently based on task type (unless overridden)
+            if model is not None:
+                use_coding_plan = False
+            else:
+                with span("select_model"):
+                    model, use_coding_plan = self._select_model_for_task(instruction, task_type)
 
             task_logger.info(f"Starting async task execution with model: {model}")
             task_logger.set_metadata("instruction", instruction)
@@ -1328,12 +1570,15 @@ class NinjaDriver:
             )
 
             # Build prompt from instruction
-            with Path(task_file).open() as f:
-                instruction_data = json.load(f)
-
-            prompt = self._build_prompt_text(instruction_data, repo_root)
-            file_scope = instruction_data.get("file_scope", {})
-            context_paths = file_scope.get("context_paths", [])
+            if prepared is not None and prepared.prompt is not None:
+                prompt = prepared.prompt
+            else:
+                with span("build_prompt"):
+                    with Path(task_file).open() as f:
+                        instruction_data = json.load(f)
+                    prompt = self._build_prompt_text(instruction_data, repo_root)
+                if prepared is not None:
+                    prepared.prompt = prompt
 
             # Check if multi-agent orchestration is needed
             enable_multi_agent = False
@@ -1341,12 +1586,14 @@ class NinjaDriver:
                 # Import multi-agent orchestrator
                 from ninja_coder.multi_agent import MultiAgentOrchestrator
 
-                orchestrator = MultiAgentOrchestrator(self._strategy)
-                analysis = orchestrator.analyze_task(prompt, context_paths)
+                with span("multi_agent_analysis"):
+                    orchestrator = MultiAgentOrchestrator(self._strategy)
+                    analysis = orchestrator.analyze_task(prompt, context_paths)
+                    if orchestrator.should_use_multi_agent(analysis):
+                        enable_multi_agent = True
+                        agents = orchestrator.select_agents(prompt, analysis)
 
-                if orchestrator.should_use_multi_agent(analysis):
-                    enable_multi_agent = True
-                    agents = orchestrator.select_agents(prompt, analysis)
+                if enable_multi_agent:
                     task_logger.info(
                         f"🤖 Multi-agent mode activated with {len(agents)} agents: "
                         f"{', '.join(agents)}"
@@ -1375,32 +1622,35 @@ class NinjaDriver:
                 task_logger.info("Using atomic mode (subprocess per step)")
 
             # Build command using strategy
-            if enable_multi_agent:
-                # Use multi-agent command builder
-                context = {
-                    "complexity": analysis.complexity,
-                    "task_type": analysis.task_type,
-                    "estimated_files": analysis.estimated_files,
-                }
-                cli_result = self._strategy.build_command_with_multi_agent(
-                    prompt=prompt,
-                    repo_root=repo_root,
-                    agents=agents,
-                    context=context,
-                    file_paths=context_paths,
-                    model=model,
-                )
-            else:
-                # Use standard command builder
-                additional_flags = {"use_coding_plan": use_coding_plan} if use_coding_plan else None
+            with span("build_command"):
+                if enable_multi_agent:
+                    # Use multi-agent command builder
+                    context = {
+                        "complexity": analysis.complexity,
+                        "task_type": analysis.task_type,
+                        "estimated_files": analysis.estimated_files,
+                    }
+                    cli_result = self._strategy.build_command_with_multi_agent(
+                        prompt=prompt,
+                        repo_root=repo_root,
+                        agents=agents,
+                        context=context,
+                        file_paths=context_paths,
+                        model=model,
+                    )
+                else:
+                    # Use standard command builder
+                    additional_flags = (
+                        {"use_coding_plan": use_coding_plan} if use_coding_plan else None
+                    )
 
-                cli_result = self._strategy.build_command(
-                    prompt=prompt,
-                    repo_root=repo_root,
-                    file_paths=context_paths,
-                    model=model,
-                    additional_flags=additional_flags,
-                )
+                    cli_result = self._strategy.build_command(
+                        prompt=prompt,
+                        repo_root=repo_root,
+                        file_paths=context_paths,
+                        model=model,
+                        additional_flags=additional_flags,
+                    )
 
             # Log command (redact sensitive data)
             safe_cmd = [
@@ -1419,33 +1669,50 @@ class NinjaDriver:
                 working_dir=str(cli_result.working_dir),
             )
 
-            # Get timeout from strategy
-            max_timeout = timeout_sec or self._strategy.get_timeout(task_type)
+            # Maximum timeout learned from run history (static default until then)
+            run_profile = RunProfile(
+                cli=self._strategy.name,
+                model=model,
+                task_type=task_type,
+                steps=step_count,
+                context_chars=len(prompt),
+            )
+            default_timeout = timeout_sec or self._strategy.get_timeout(task_type)
+            with span("estimate_timeout"):
+                max_timeout = self._estimate_timeout(repo_root, run_profile, default_timeout)
+            inactivity_timeout = self._get_inactivity_timeout(task_type)
+
+            # Snapshot the workspace so touched files can be diffed after the run
+            with span("snapshot"):
+                snapshot = await asyncio.to_thread(WorkspaceSnapshot.capture, repo_root)
 
             # Execute asynchronously using strategy-built command
-            process = await asyncio.create_subprocess_exec(
-                *cli_result.command,
-                cwd=str(cli_result.working_dir),
-                env=cli_result.env,
-                stdin=asyncio.subprocess.DEVNULL,  # Prevent stdin blocking
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
+            with span("spawn"):
+                process = await asyncio.create_subprocess_exec(
+                    *cli_result.command,
+                    cwd=str(cli_result.working_dir),
+                    env=cli_result.env,
+                    stdin=asyncio.subprocess.DEVNULL,  # Prevent stdin blocking
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
 
             try:
                 # Use communicate() with timeout for proper process lifecycle management
                 # This ensures both stream reading AND process exit are within timeout
                 start_time = asyncio.get_event_loop().time()
 
-                task_logger.debug(f"Starting subprocess with {max_timeout}s timeout")
-
-                # communicate() reads all output AND waits for process exit
-                # Single timeout for entire operation prevents hanging
-                stdout_bytes, stderr_bytes = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=max_timeout,
+                task_logger.debug(
+                    f"Starting subprocess with {max_timeout}s timeout "
+                    f"(inactivity: {inactivity_timeout or 'off'})"
                 )
 
+                # Read all output AND wait for process exit, killing hung runs early
+                with span("cli_run"):
+                    stdout_bytes, stderr_bytes = await self._communicate_with_timeouts(
+                        process, max_timeout, inactivity_timeout
+                    )
+
                 stdout = stdout_bytes.decode(errors="replace") if stdout_bytes else ""
                 stderr = stderr_bytes.decode(errors="replace") if stderr_bytes else ""
                 exit_code = process.returncode or 0
@@ -1454,7 +1721,17 @@ class NinjaDriver:
                 task_logger.info(f"Task completed in {total_time:.1f}s")
 
             except TimeoutError as e:
-                task_logger.warning(f"Task timed out after {max_timeout}s, killing process")
+                task_logger.warning(f"Task timed out ({e}), killing process")
+                if not getattr(e, "inactive", False):
+                    # Duration is a lower bound; it still pushes future estimates up
+                    self._record_duration(repo_root, run_profile, max_timeout, timed_out=True)
+                self._record_model_outcome(
+                    task_type,
+                    model,
+                    asyncio.get_event_loop().time() - start_time,
+                    success=False,
+                    retryable_error=True,
+                )
                 process.kill()
                 # Give process 5 seconds to die gracefully after kill signal
                 try:
@@ -1477,10 +1754,22 @@ class NinjaDriver:
                     model_used=model,
                 )
 
-            task_logger.log_subprocess(cli_result.command, exit_code, stdout, stderr)
+            with span("save_logs"):
+                task_logger.log_subprocess(cli_result.command, exit_code, stdout, stderr)
 
             # Parse output using strategy
-            parsed = self._strategy.parse_output(stdout, stderr, exit_code, repo_root=repo_root)
+            with span("parse_output"):
+                parsed = await asyncio.to_thread(
+                    self._strategy.parse_output,
+                    stdout,
+                    stderr,
+                    exit_code,
+                    repo_root=repo_root,
+                    snapshot=snapshot,
+                )
+
+            with span("save_logs"):
+                logs_path = task_logger.save()
 
             # Build result from parsed output
             result = NinjaResult(
@@ -1488,7 +1777,7 @@ class NinjaDriver:
                 summary=parsed.summary,
                 notes=parsed.notes,
                 suspected_touched_paths=parsed.touched_paths,
-                raw_logs_path=task_logger.save(),
+                raw_logs_path=logs_path,
                 exit_code=exit_code,
                 stdout=stdout,
                 stderr=stderr,
@@ -1496,6 +1785,18 @@ class NinjaDriver:
                 aider_error_detected=parsed.retryable_error,  # Generic retryable error flag
             )
 
+            with span("record_outcome"):
+                if result.success:
+                    self._record_duration(repo_root, run_profile, total_time)
+                self._record_model_outcome(
+                    task_type,
+                    model,
+                    total_time,
+                    result.success,
+                    retryable_error=parsed.retryable_error,
+                    output=stdout,
+                )
+
             task_logger.info(
                 f"Task {'succeeded' if result.success else 'failed'}: {result.summary}"
             )
@@ -1614,11 +1915,12 @@ class NinjaDriver:
             task_desc = instruction.get("task", "")
             context_paths = instruction.get("file_scope", {}).get("context_paths", [])
 
-            safety_results = validate_task_safety(
-                repo_root=repo_root,
-                task_description=task_desc,
-                context_paths=context_paths,
-            )
+            with span("safety_check"):
+                safety_results = validate_task_safety(
+                    repo_root=repo_root,
+                    task_description=task_desc,
+                    context_paths=context_paths,
+                )
 
             # Log all warnings
             for warning in safety_results.get("warnings", []):
@@ -1656,11 +1958,13 @@ class NinjaDriver:
                 logger.info(f"🔖 Recovery point: {recovery_cmd}")
 
             # Write task file
-            task_file = self._write_task_file(repo_root, step_id, instruction)
+            with span("write_task_file"):
+                task_file = self._write_task_file(repo_root, step_id, instruction)
             task_logger.info(f"Wrote task file: {task_file}")
 
             # Select model intelligently based on task type
-            model, use_coding_plan = self._select_model_for_task(instruction, task_type)
+            with span("select_model"):
+                model, use_coding_plan = self._select_model_for_task(instruction, task_type)
 
             task_logger.info(
                 f"Starting OpenCode session task with model: {model} "
@@ -1696,15 +2000,16 @@ class NinjaDriver:
             # Build command using strategy with session parameters
             additional_flags = {"use_coding_plan": use_coding_plan} if use_coding_plan else None
 
-            cli_result = self._strategy.build_command(
-                prompt=prompt,
-                repo_root=repo_root,
-                file_paths=context_paths,
-                model=model,
-                additional_flags=additional_flags,
-                session_id=opencode_session_id,
-                continue_last=(not is_initial and not opencode_session_id),
-            )
+            with span("build_command"):
+                cli_result = self._strategy.build_command(
+                    prompt=prompt,
+                    repo_root=repo_root,
+                    file_paths=context_paths,
+                    model=model,
+                    additional_flags=additional_flags,
+                    session_id=opencode_session_id,
+                    continue_last=(not is_initial and not opencode_session_id),
+                )
 
             # Log command (redact sensitive data)
             safe_cmd = [
@@ -1726,21 +2031,27 @@ class NinjaDriver:
             # Get timeout from strategy
             timeout = timeout_sec or self._strategy.get_timeout(task_type)
 
+            # Snapshot the workspace so touched files can be diffed after the run
+            with span("snapshot"):
+                snapshot = await asyncio.to_thread(WorkspaceSnapshot.capture, repo_root)
+
             # Execute asynchronously using strategy-built command
-            process = await asyncio.create_subprocess_exec(
-                *cli_result.command,
-                cwd=str(cli_result.working_dir),
-                env=cli_result.env,
-                stdin=asyncio.subprocess.DEVNULL,  # Prevent stdin blocking
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
+            with span("spawn"):
+                process = await asyncio.create_subprocess_exec(
+                    *cli_result.command,
+                    cwd=str(cli_result.working_dir),
+                    env=cli_result.env,
+                    stdin=asyncio.subprocess.DEVNULL,  # Prevent stdin blocking
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
 
             try:
-                stdout_bytes, stderr_bytes = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=timeout,
-                )
+                with span("cli_run"):
+                    stdout_bytes, stderr_bytes = await asyncio.wait_for(
+                        process.communicate(),
+                        timeout=timeout,
+                    )
                 stdout = stdout_bytes.decode() if stdout_bytes else ""
                 stderr = stderr_bytes.decode() if stderr_bytes else ""
                 exit_code = process.returncode or 0
@@ -1759,10 +2070,22 @@ class NinjaDriver:
                     model_used=model,
                 )
 
-            task_logger.log_subprocess(cli_result.command, exit_code, stdout, stderr)
+            with span("save_logs"):
+                task_logger.log_subprocess(cli_result.command, exit_code, stdout, stderr)
 
             # Parse output using strategy (includes session_id extraction)
-            parsed = self._strategy.parse_output(stdout, stderr, exit_code, repo_root=repo_root)
+            with span("parse_output"):
+                parsed = await asyncio.to_thread(
+                    self._strategy.parse_output,
+                    stdout,
+                    stderr,
+                    exit_code,
+                    repo_root=repo_root,
+                    snapshot=snapshot,
+                )
+
+            with span("save_logs"):
+                logs_path = task_logger.save()
 
             # Build result from parsed output with session_id
             result = NinjaResult(
@@ -1770,7 +2093,7 @@ class NinjaDriver:
                 summary=parsed.summary,
                 notes=parsed.notes,
                 suspected_touched_paths=parsed.touched_paths,
-                raw_logs_path=task_logger.save(),
+                raw_logs_path=logs_path,
                 exit_code=exit_code,
                 stdout=stdout,
                 stderr=stderr,
@@ -1887,10 +2210,11 @@ class NinjaDriver:
         Returns:
             NinjaResult with session_id if session was used.
         """
-        # Load or create session
+        # Load or create session (the run itself is spanned by execute_async)
         session = None
         if session_id:
-            session = self.session_manager.load_session(session_id)
+            with span("load_session"):
+                session = self.session_manager.load_session(session_id)
             if not session:
                 # Structured logging: Session load failed
                 self.structured_logger.error(
@@ -1933,7 +2257,8 @@ class NinjaDriver:
         # Add user message to session
         if session:
             session.add_message("user", task)
-            self.session_manager.save_session(session)
+            with span("save_session"):
+                self.session_manager.save_session(session)
             logger.info(f"📝 Added user message to session {session.session_id}")
 
             # Structured logging: Session updated
@@ -1974,7 +2299,8 @@ class NinjaDriver:
                     "model": result.model_used,
                 },
             )
-            self.session_manager.save_session(session)
+            with span("save_session"):
+                self.session_manager.save_session(session)
             result.session_id = session.session_id
             logger.info(f"💾 Saved assistant response to session {session.session_id}")
 
@@ -9,12 +9,15 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from ninja_common.hooks_base import (
     HookCommand,
     HookResult,
+    ResultCache,
     detect_file_type,
+    get_changed_files,
     get_repo_root,
     get_staged_files,
     run_subprocess,
@@ -114,7 +117,13 @@ class FormatFileCommand(HookCommand):
 
 
 class LintCheckCommand(HookCommand):
-    """Check files for linting issues."""
+    """Check files for linting issues.
+
+    Only changed files are linted: staged files with ``staged``, otherwise
+    all uncommitted changes. Results are cached by file content, so files
+    that did not change since they were last checked are not re-linted.
+    Outside a git repository the whole ``src/`` tree is checked.
+    """
 
     def __init__(
         self,
@@ -128,32 +137,27 @@ class LintCheckCommand(HookCommand):
         self.fix = fix
         self.repo_root = repo_root or str(get_repo_root() or Path.cwd())
 
-    def execute(self) -> HookResult:
-        """Execute lint check."""
-        files_to_check: list[str] = []
-
+    def _files_to_check(self) -> list[str] | None:
+        """Python files to lint ([] if none changed, None if unknown)."""
         if self.staged:
-            staged_files = get_staged_files(self.repo_root)
-            files_to_check = [f for f in staged_files if f.endswith(".py")]
-
-        if not files_to_check:
-            # Check all Python files in src/
-            files_to_check = ["src/"]
-
-        cmd = ["ruff", "check"]
-        if self.fix:
-            cmd.append("--fix")
-        cmd.append("--output-format=json")
-        cmd.extend(files_to_check)
+            changed: list[str] | None = get_staged_files(self.repo_root)
+        else:
+            changed = get_changed_files(self.repo_root)
+        if changed is None:
+            return None
+        return [f for f in changed if f.endswith(".py")]
 
-        exit_code, stdout, _stderr = run_subprocess(cmd, cwd=self.repo_root, timeout=60.0)
+    def execute(self) -> HookResult:
+        """Execute lint check."""
+        files_to_check = self._files_to_check()
+        if files_to_check == []:
+            return HookResult(status="pass", data={"issues": [], "total_issues": 0, "fixed": 0})
 
-        issues = []
-        try:
-            if stdout.strip():
-                issues = json.loads(stdout)
-        except json.JSONDecodeError:
-            pass
+        if files_to_check is None or self.fix:
+            # Check all Python files in src/ (or fix the changed files), uncached
+            exit_code, issues = self._run_ruff(files_to_check or ["src/"])
+        else:
+            exit_code, issues = self._check_cached(files_to_check)
 
         if exit_code == 0:
             return HookResult(status="pass", data={"issues": [], "total_issues": 0, "fixed": 0})
@@ -178,46 +182,121 @@ class LintCheckCommand(HookCommand):
                 },
             )
 
+    def _run_ruff(self, paths: list[str]) -> tuple[int, list[dict]]:
+        """Run ruff check on paths; returns (exit code, raw JSON issues)."""
+        cmd = ["ruff", "check"]
+        if self.fix:
+            cmd.append("--fix")
+        cmd.append("--output-format=json")
+        cmd.extend(paths)
+
+        exit_code, stdout, _stderr = run_subprocess(cmd, cwd=self.repo_root, timeout=60.0)
+
+        issues = []
+        try:
+            if stdout.strip():
+                issues = json.loads(stdout)
+        except json.JSONDecodeError:
+            pass
+        return exit_code, issues
+
+    def _check_cached(self, files: list[str]) -> tuple[int, list[dict]]:
+        """Lint files, reusing cached results for unchanged content."""
+        cache = ResultCache(self.repo_root, "lint")
+        keys = {f: cache.key(f) for f in files}
+        issues: list[dict] = []
+        misses = []
+        for f in files:
+            cached = cache.get(keys[f])
+            if cached is None:
+                misses.append(f)
+            else:
+                issues.extend(cached)
+
+        exit_code = 1 if issues else 0
+        if misses:
+            miss_code, new_issues = self._run_ruff(misses)
+            issues.extend(new_issues)
+            exit_code = max(exit_code, miss_code)
+            if miss_code in (0, 1):  # ruff ran; anything else is an error
+                root = Path(self.repo_root).resolve()
+                per_file: dict[str, list[dict]] = {f: [] for f in misses}
+                for issue in new_issues:
+                    path = Path(root, issue.get("filename", ""))
+                    rel = path.resolve().relative_to(root) if path.is_relative_to(root) else path
+                    per_file.setdefault(rel.as_posix(), []).append(issue)
+                for f in misses:
+                    cache.put(keys[f], per_file[f])
+                cache.save()
+        return exit_code, issues
+
 
 class PreCommitCommand(HookCommand):
-    """Run pre-commit checks (lint + format check)."""
+    """Run pre-commit checks (lint + format check).
 
-    def __init__(self, repo_root: str | None = None, json_output: bool = False):
+    Lint and per-file format checks run concurrently on the staged files.
+    Files whose content already passed the format check are skipped. With
+    ``stream``, each check's result is printed as a JSON line as soon as it
+    finishes.
+    """
+
+    def __init__(
+        self, repo_root: str | None = None, json_output: bool = False, stream: bool = False
+    ):
         super().__init__(json_output)
         self.repo_root = repo_root or str(get_repo_root() or Path.cwd())
+        self.stream = stream
 
-    def execute(self) -> HookResult:
-        """Execute pre-commit checks."""
-        checks = {}
-        all_passed = True
+    def _emit(self, check: str, result: dict) -> None:
+        if self.stream:
+            print(json.dumps({"check": check, **result}), flush=True)
 
-        # Lint check
-        lint_cmd = LintCheckCommand(staged=True, repo_root=self.repo_root)
-        lint_result = lint_cmd.execute()
-        checks["lint"] = {
+    def _lint(self) -> dict:
+        lint_result = LintCheckCommand(staged=True, repo_root=self.repo_root).execute()
+        return {
             "status": lint_result.status,
             "issues": lint_result.data.get("total_issues", 0),
+            "success": lint_result.success,
         }
-        if not lint_result.success:
-            all_passed = False
-
-        # Format check on staged Python files
-        staged_files = get_staged_files(self.repo_root)
-        format_issues = 0
-        for f in staged_files:
-            if f.endswith(".py"):
-                format_cmd = FormatFileCommand(str(Path(self.repo_root) / f), check_only=True)
-                format_result = format_cmd.execute()
-                if not format_result.success:
-                    format_issues += 1
-
-        checks["format"] = {
-            "status": "pass" if format_issues == 0 else "fail",
-            "issues": format_issues,
+
+    def _format_check(self, rel_path: str, cache: ResultCache) -> bool:
+        key = cache.key(rel_path)
+        if cache.get(key):
+            return True
+        format_cmd = FormatFileCommand(str(Path(self.repo_root) / rel_path), check_only=True)
+        passed = format_cmd.execute().success
+        if passed:
+            cache.put(key, True)
+        return passed
+
+    def execute(self) -> HookResult:
+        """Execute pre-commit checks."""
+        staged_files = [f for f in get_staged_files(self.repo_root) if f.endswith(".py")]
+        format_cache = ResultCache(self.repo_root, "format")
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            lint_future = pool.submit(self._lint)
+            format_futures = [
+                pool.submit(self._format_check, f, format_cache) for f in staged_files
+            ]
+
+            lint = lint_future.result()
+            lint_passed = lint.pop("success")
+            self._emit("lint", lint)
+
+            format_issues = sum(not future.result() for future in format_futures)
+        format_cache.save()
+
+        checks = {
+            "lint": lint,
+            "format": {
+                "status": "pass" if format_issues == 0 else "fail",
+                "issues": format_issues,
+            },
         }
-        if format_issues > 0:
-            all_passed = False
+        self._emit("format", checks["format"])
 
+        all_passed = lint_passed and format_issues == 0
         return HookResult(status="pass" if all_passed else "fail", data={"checks": checks})
 
 
@@ -244,6 +323,9 @@ def main() -> int:
     # pre-commit command
     precommit_parser = subparsers.add_parser("pre-commit", help="Run pre-commit checks")
     precommit_parser.add_argument("--repo-root", help="Repository root")
+    precommit_parser.add_argument(
+        "--stream", action="store_true", help="Print each check as a JSON line when it finishes"
+    )
 
     args = parser.parse_args()
 
@@ -253,7 +335,7 @@ def main() -> int:
     elif args.command == "lint-check":
         cmd = LintCheckCommand(args.staged, args.fix, args.repo_root, args.json)
     elif args.command == "pre-commit":
-        cmd = PreCommitCommand(args.repo_root, args.json)
+        cmd = PreCommitCommand(args.repo_root, args.json, args.stream)
     else:
         print(f"Unknown command: {args.command}", file=sys.stderr)
         return 1
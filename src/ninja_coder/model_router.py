@@ -0,0 +1,305 @@
+"""
+Telemetry-driven model routing.
+
+``ModelRouter`` keeps rolling per-(task type, model) statistics of real CLI
+runs: duration percentiles, failure and retryable-error rates, and cost per
+task. It picks models with Thompson sampling: each candidate's success
+probability is drawn from a Beta posterior over its recent outcomes, then
+penalized by its relative cost and median latency. Untried models keep an
+uninformative prior, so they still get explored.
+
+State is persisted as JSON in the shared cache directory so routing
+survives daemon restarts. Each ``record`` re-reads the file, adds its
+outcome and rewrites it under an exclusive file lock, so the workers of a
+multi-worker server add to one shared history instead of overwriting each
+other's. Enable with ``NINJA_MODEL_ROUTING=adaptive``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import statistics
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from ninja_common.logging_utils import get_logger
+from ninja_common.metrics import DEFAULT_PRICING, MODEL_PRICING, extract_token_usage
+from ninja_common.path_utils import get_cache_dir
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+
+logger = get_logger(__name__)
+
+# Outcomes kept per (task type, model)
+_WINDOW = 100
+
+
+@dataclass
+class ModelStats:
+    """Rolling outcome statistics for one model on one task type."""
+
+    outcomes: deque[tuple[float, bool, bool, float]] = field(
+        default_factory=lambda: deque(maxlen=_WINDOW)
+    )
+    """Recent (duration_sec, success, retryable_error, cost_usd) tuples."""
+
+    @property
+    def runs(self) -> int:
+        """Number of outcomes in the window."""
+        return len(self.outcomes)
+
+    @property
+    def successes(self) -> int:
+        """Number of successful runs in the window."""
+        return sum(1 for _, success, _, _ in self.outcomes if success)
+
+    @property
+    def failure_rate(self) -> float:
+        """Fraction of failed runs."""
+        return 1 - self.successes / self.runs if self.runs else 0.0
+
+    @property
+    def retryable_rate(self) -> float:
+        """Fraction of runs that hit a retryable (rate limit, timeout...) error."""
+        return sum(1 for _, _, retryable, _ in self.outcomes if retryable) / max(self.runs, 1)
+
+    @property
+    def cost_per_task(self) -> float:
+        """Average cost per run in USD."""
+        return sum(cost for *_, cost in self.outcomes) / max(self.runs, 1)
+
+    def duration_percentile(self, percentile: float) -> float:
+        """Duration percentile (0-100) of the window, 0 without data."""
+        durations = sorted(duration for duration, *_ in self.outcomes)
+        if not durations:
+            return 0.0
+        if len(durations) == 1:
+            return durations[0]
+        return statistics.quantiles(durations, n=100, method="inclusive")[
+            min(max(int(percentile) - 1, 0), 98)
+        ]
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize the window for logs and stats."""
+        return {
+            "runs": self.runs,
+            "failure_rate": round(self.failure_rate, 3),
+            "retryable_rate": round(self.retryable_rate, 3),
+            "p50_sec": round(self.duration_percentile(50), 1),
+            "p95_sec": round(self.duration_percentile(95), 1),
+            "cost_per_task": round(self.cost_per_task, 4),
+        }
+
+
+class ModelRouter:
+    """Bandit-style model router over observed production outcomes."""
+
+    def __init__(
+        self,
+        state_file: Path | None = None,
+        cost_weight: float | None = None,
+        latency_weight: float | None = None,
+        rng: random.Random | None = None,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            state_file: JSON file for persisted stats (default: <cache>/model_router.json).
+            cost_weight: Penalty weight for relative cost
+                (default: NINJA_ROUTER_COST_WEIGHT or 0.3).
+            latency_weight: Penalty weight for relative median latency
+                (default: NINJA_ROUTER_LATENCY_WEIGHT or 0.2).
+            rng: Random generator for posterior sampling.
+        """
+        self.state_file = state_file or get_cache_dir() / "model_router.json"
+        self.cost_weight = (
+            cost_weight
+            if cost_weight is not None
+            else float(os.environ.get("NINJA_ROUTER_COST_WEIGHT", "0.3"))
+        )
+        self.latency_weight = (
+            latency_weight
+            if latency_weight is not None
+            else float(os.environ.get("NINJA_ROUTER_LATENCY_WEIGHT", "0.2"))
+        )
+        self.rng = rng or random.Random()
+        self._stats: dict[str, dict[str, ModelStats]] = defaultdict(dict)
+        self._load()
+
+    def choose(self, task_type: str, candidates: Iterable[str]) -> tuple[str, ModelStats]:
+        """
+        Choose a model for a task type.
+
+        Args:
+            task_type: Task type ('quick', 'sequential', 'parallel').
+            candidates: Models allowed for this task.
+
+        Returns:
+            Tuple of (model, its current stats).
+        """
+        models = list(dict.fromkeys(candidates))
+        if not models:
+            raise ValueError("No candidate models to route between")
+
+        stats = {model: self.stats(task_type, model) for model in models}
+        max_cost = max((s.cost_per_task for s in stats.values()), default=0.0) or 1.0
+        max_p50 = max((s.duration_percentile(50) for s in stats.values()), default=0.0) or 1.0
+
+        def utility(model: str) -> float:
+            s = stats[model]
+            successes = s.successes
+            sampled_success = self.rng.betavariate(1 + successes, 1 + s.runs - successes)
+            return (
+                sampled_success
+                - self.cost_weight * s.cost_per_task / max_cost
+                - self.latency_weight * s.duration_percentile(50) / max_p50
+            )
+
+        best = max(models, key=utility)
+        return best, stats[best]
+
+    def record(
+        self,
+        task_type: str,
+        model: str,
+        duration_sec: float,
+        success: bool,
+        *,
+        retryable_error: bool = False,
+        cost_usd: float = 0.0,
+    ) -> None:
+        """
+        Record the outcome of a run and persist the updated state.
+
+        The persisted state is reloaded first (under the file lock), so
+        outcomes recorded by other processes are kept and become visible here.
+
+        Args:
+            task_type: Task type the model was routed for.
+            model: Model used.
+            duration_sec: Wall-clock duration of the run.
+            success: Whether the run succeeded.
+            retryable_error: Whether it failed with a retryable error.
+            cost_usd: Cost of the run.
+        """
+        with self._locked():
+            self._stats.clear()
+            self._load()
+            self.stats(task_type, model).outcomes.append(
+                (round(duration_sec, 2), success, retryable_error, round(cost_usd, 6))
+            )
+            self._save()
+
+    def stats(self, task_type: str, model: str) -> ModelStats:
+        """Get (creating if needed) the stats for a model on a task type."""
+        per_model = self._stats[task_type]
+        if model not in per_model:
+            per_model[model] = ModelStats()
+        return per_model[model]
+
+    def get_stats(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Summaries for every tracked (task type, model)."""
+        return {
+            task_type: {model: s.summary() for model, s in per_model.items()}
+            for task_type, per_model in self._stats.items()
+        }
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold an exclusive lock on the state file across processes."""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            lock_f = self.state_file.with_suffix(".lock").open("a")
+        except OSError as e:
+            logger.debug(f"Model router state lock unavailable: {e}")
+            yield
+            return
+        with lock_f:
+            try:
+                import fcntl
+
+                fcntl.flock(lock_f.fileno(), fcntl.LOCK_EX)
+            except ImportError:
+                pass  # fcntl not available (Windows)
+            yield
+
+    def _load(self) -> None:
+        """Load persisted stats, ignoring unreadable state."""
+        if not self.state_file.exists():
+            return
+        try:
+            data = json.loads(self.state_file.read_text())
+            for task_type, per_model in data.get("stats", {}).items():
+                for model, outcomes in per_model.items():
+                    self.stats(task_type, model).outcomes.extend(
+                        (float(d), bool(s), bool(r), float(c)) for d, s, r, c in outcomes
+                    )
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable model router state {self.state_file}: {e}")
+
+    def _save(self) -> None:
+        """Persist stats atomically."""
+        data = {
+            "version": 1,
+            "stats": {
+                task_type: {model: list(s.outcomes) for model, s in per_model.items()}
+                for task_type, per_model in self._stats.items()
+            },
+        }
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(data, separators=(",", ":")))
+            tmp_file.replace(self.state_file)
+        except OSError as e:
+            logger.warning(f"Failed to persist model router state: {e}")
+
+
+def estimate_run_cost(model: str, output: str) -> float:
+    """
+    Estimate the cost of a run from token usage reported in its output.
+
+    Uses static pricing only (no network lookups on the execution path).
+
+    Args:
+        model: Model identifier.
+        output: Raw CLI output.
+
+    Returns:
+        Estimated cost in USD (output tokens are approximated from the
+        output length when the CLI reports no usage).
+    """
+    input_tokens, output_tokens, cache_read, cache_write = extract_token_usage(output)
+    pricing = {**DEFAULT_PRICING, **MODEL_PRICING.get(model.removeprefix("openrouter/"), {})}
+    return (
+        input_tokens * pricing["input"]
+        + output_tokens * pricing["output"]
+        + cache_read * pricing["cache_read"]
+        + cache_write * pricing["cache_write"]
+    ) / 1_000_000
+
+
+def adaptive_routing_enabled() -> bool:
+    """Whether NINJA_MODEL_ROUTING selects the adaptive router."""
+    return os.environ.get("NINJA_MODEL_ROUTING", "static").lower() == "adaptive"
+
+
+# Global router shared by all drivers in the process
+_model_router: ModelRouter | None = None
+
+
+def get_model_router() -> ModelRouter:
+    """Get the global model router instance."""
+    global _model_router
+    if _model_router is None:
+        _model_router = ModelRouter()
+    return _model_router
@@ -9,13 +9,19 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from ninja_coder.model_router import adaptive_routing_enabled, get_model_router
 from ninja_coder.models import TaskComplexity
 from ninja_common.defaults import MODEL_DATABASE
 from ninja_common.logging_utils import get_logger
 
 
+if TYPE_CHECKING:
+    from ninja_coder.model_router import ModelRouter
+    from ninja_coder.strategies.base import CLICapabilities
+
+
 logger = get_logger(__name__)
 
 
@@ -46,14 +52,25 @@ class ModelSelector:
     capabilities, costs, and performance metrics.
     """
 
-    def __init__(self, default_model: str | None = None):
+    def __init__(
+        self,
+        default_model: str | None = None,
+        router: ModelRouter | None = None,
+        capabilities: CLICapabilities | None = None,
+    ):
         """Initialize model selector.
 
         Args:
             default_model: Default model to use if no preference is set.
+            router: Adaptive router choosing from observed outcomes
+                (None for static selection).
+            capabilities: Capabilities of the CLI that will run the model; the
+                router only picks models it supports (None: default model only).
         """
         self.default_model = default_model
         self.model_db = MODEL_DATABASE
+        self.router = router
+        self.capabilities = capabilities
 
     def select_model(
         self,
@@ -85,6 +102,9 @@ class ModelSelector:
         if task_specific_model:
             return self._recommend_specific_model(task_specific_model, f"task-specific env var for {complexity.value}")
 
+        if self.router is not None:
+            return self._select_adaptive(complexity)
+
         # If default model is set and no preference, use it
         if self.default_model and not (prefer_cost or prefer_quality):
             return self._recommend_default()
@@ -108,6 +128,53 @@ class ModelSelector:
         else:  # QUICK
             return self._select_for_quick(suitable_models, prefer_cost)
 
+    def _select_adaptive(self, complexity: TaskComplexity) -> ModelRecommendation:
+        """Select a model with the adaptive router.
+
+        Candidates are NINJA_ROUTER_MODELS (comma-separated) if set, otherwise
+        the default model plus the database models suited to the task. Models
+        other than the default are kept only if the CLI's capabilities are known
+        and it can run them.
+
+        Args:
+            complexity: Type of task (parallel, sequential, quick).
+
+        Returns:
+            ModelRecommendation for the routed model.
+        """
+        configured = os.environ.get("NINJA_ROUTER_MODELS", "")
+        candidates = [m.strip() for m in configured.split(",") if m.strip()]
+        if not candidates:
+            if self.default_model:
+                candidates.append(self.default_model)
+            candidates.extend(
+                name for name, info in self.model_db.items() if complexity.value in info["best_for"]
+            )
+        candidates = [
+            m
+            for m in dict.fromkeys(candidates)
+            if m == self.default_model
+            or (self.capabilities is not None and self.capabilities.supports_model(m))
+        ]
+        if not candidates:
+            return self._recommend_default()
+
+        model, stats = self.router.choose(complexity.value, candidates)
+        if stats.runs:
+            reason = (
+                f"Adaptive routing for {complexity.value}: {stats.runs} runs, "
+                f"{stats.failure_rate:.0%} failures, p50 {stats.duration_percentile(50):.0f}s, "
+                f"${stats.cost_per_task:.3f}/task"
+            )
+        else:
+            reason = f"Adaptive routing for {complexity.value}: exploring untried model"
+        logger.debug(reason)
+
+        recommendation = self._recommend_specific_model(model, reason)
+        if stats.runs:
+            recommendation.cost_estimate = f"~${stats.cost_per_task:.3f} per task (observed)"
+        return recommendation
+
     def _select_for_parallel(
         self,
         models: dict[str, Any],
@@ -319,4 +386,5 @@ class ModelSelector:
             ModelSelector instance configured from environment.
         """
         default_model = os.environ.get("NINJA_MODEL")
-        return cls(default_model=default_model)
+        router = get_model_router() if adaptive_routing_enabled() else None
+        return cls(default_model=default_model, router=router)
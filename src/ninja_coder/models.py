@@ -104,6 +104,10 @@ class SimpleTaskRequest(BaseModel):
         default="quick",
         description="Execution mode (future-proof)",
     )
+    idempotency_key: str | None = Field(
+        None,
+        description="Key identifying retries of the same request (derived from inputs if unset)",
+    )
 
 
 class SequentialPlanRequest(BaseModel):
@@ -330,6 +334,10 @@ class QueryLogsRequest(BaseModel):
     level: str | None = Field(None, description="Filter by log level (INFO, DEBUG, WARNING, ERROR)")
     limit: int = Field(100, ge=1, le=1000, description="Maximum entries to return")
     offset: int = Field(0, ge=0, description="Number of entries to skip")
+    timings: bool = Field(
+        False,
+        description="Also summarize per-stage latency of the matching tool calls",
+    )
 
 
 class QueryLogsResult(BaseModel):
@@ -342,4 +350,8 @@ class QueryLogsResult(BaseModel):
     )
     total_count: int = Field(..., description="Total matching entries")
     returned_count: int = Field(..., description="Number of entries returned")
+    timings: dict[str, dict[str, float]] = Field(
+        default_factory=dict,
+        description="Stage -> count/p50/p90/p99/max/mean in ms (when requested)",
+    )
     message: str = Field(..., description="Result message")
@@ -0,0 +1,231 @@
+"""
+Retry policy for coder CLI runs.
+
+A failed run is classified from its output:
+
+- ``RATE_LIMIT``: the provider throttled us (429, quota, overloaded). Retry
+  after a backoff with a guaranteed minimum wait, on the next fallback model
+  when one is available (the provider is likely browning out), otherwise on
+  the same model.
+- ``MODEL_UNAVAILABLE``: the model id is invalid or has no endpoints. Fail over
+  to the next fallback model immediately; retrying the same model is useless.
+- ``TRANSIENT``: connection errors, 5xx, stalled output. Retry the same model
+  after a fully jittered exponential backoff.
+- ``PERMANENT``: anything else (auth, billing, validation, a run that hit its
+  maximum timeout). Not retried.
+
+Fallback models are limited to the ones the running CLI can use
+(``RetryPolicy.for_cli``): no failover for CLIs without model routing, and only
+model ids with a provider prefix the CLI accepts.
+
+Jitter spreads retries of concurrent tasks hitting the same outage, so they
+don't all come back at the same instant.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+from dataclasses import dataclass, field, replace
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from ninja_coder.strategies.matcher import PatternMatcher
+from ninja_common.defaults import FALLBACK_CODER_MODELS
+
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from ninja_coder.driver import NinjaResult
+    from ninja_coder.strategies.base import CLICapabilities
+
+
+class FailureKind(str, Enum):
+    """Why a CLI run failed, as far as retrying is concerned."""
+
+    RATE_LIMIT = "rate_limit"
+    MODEL_UNAVAILABLE = "model_unavailable"
+    TRANSIENT = "transient"
+    PERMANENT = "permanent"
+
+
+# Highest priority first: an auth error mentioning a timeout is still permanent
+_FAILURE_MATCHER = PatternMatcher(
+    [
+        (FailureKind.PERMANENT.value, r"AuthenticationError"),
+        (FailureKind.PERMANENT.value, r"invalid\s+api\s+key"),
+        (FailureKind.PERMANENT.value, r"api\s+key\s+(?:missing|invalid|not\s+found)"),
+        (FailureKind.PERMANENT.value, r"insufficient\s+credits"),
+        (FailureKind.PERMANENT.value, r"payment\s+required"),
+        (FailureKind.PERMANENT.value, r"Exceeded\s+maximum\s+timeout"),
+        (FailureKind.MODEL_UNAVAILABLE.value, r"is\s+not\s+a\s+valid\s+model"),
+        (FailureKind.MODEL_UNAVAILABLE.value, r"Invalid\s+model\s+ID"),
+        (FailureKind.MODEL_UNAVAILABLE.value, r"model\s+not\s+found"),
+        (
+            FailureKind.MODEL_UNAVAILABLE.value,
+            r"model\s+['\"]?[\w./:-]+['\"]?\s+(?:not\s+found|does\s+not\s+exist)",
+        ),
+        (FailureKind.MODEL_UNAVAILABLE.value, r"No\s+endpoints\s+found"),
+        (FailureKind.MODEL_UNAVAILABLE.value, r"model\s+(?:is\s+)?(?:not\s+available|unavailable)"),
+        (FailureKind.RATE_LIMIT.value, r"rate[\s_-]?limit"),
+        (FailureKind.RATE_LIMIT.value, r"too\s+many\s+requests"),
+        (FailureKind.RATE_LIMIT.value, r"\b429\b"),
+        (FailureKind.RATE_LIMIT.value, r"quota\s+exceeded"),
+        (FailureKind.RATE_LIMIT.value, r"overloaded"),
+        (FailureKind.TRANSIENT.value, r"inactivity\s+timeout"),
+        (FailureKind.TRANSIENT.value, r"timed?\s*out"),
+        (FailureKind.TRANSIENT.value, r"connection\s+(?:reset|refused|error|aborted)"),
+        (FailureKind.TRANSIENT.value, r"service\s+unavailable"),
+        (FailureKind.TRANSIENT.value, r"bad\s+gateway"),
+        (FailureKind.TRANSIENT.value, r"\b50[234]\b"),
+    ]
+)
+
+# Only the tail of long outputs is classified (errors are printed last)
+_OUTPUT_TAIL_CHARS = 8000
+
+
+def classify_failure(result: NinjaResult) -> FailureKind:
+    """
+    Classify a failed run for the retry policy.
+
+    Args:
+        result: Failed run result.
+
+    Returns:
+        Failure kind. Raw CLI output is only inspected when the strategy
+        flagged a retryable error (``aider_error_detected``), since agent
+        transcripts routinely mention "timeout" or "429" in code; flagged runs
+        without a more specific match are transient.
+    """
+    parts = [result.summary, result.notes]
+    if result.aider_error_detected:
+        parts += [result.stderr[-_OUTPUT_TAIL_CHARS:], result.stdout[-_OUTPUT_TAIL_CHARS:]]
+    text = "\n".join(parts)
+    hit = _FAILURE_MATCHER.first(text)
+    if hit is not None:
+        return FailureKind(hit.label)
+    if result.aider_error_detected:
+        return FailureKind.TRANSIENT
+    return FailureKind.PERMANENT
+
+
+@dataclass
+class RetryDecision:
+    """What to do after a failed attempt."""
+
+    delay_sec: float
+    """Seconds to wait before the next attempt."""
+
+    model: str | None = None
+    """Model for the next attempt (None keeps the current one)."""
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with jitter and model failover."""
+
+    max_retries: int = 2
+    """Retries after the initial attempt."""
+
+    base_delay_sec: float = 5.0
+    """Backoff cap for the first retry (doubled for each further retry)."""
+
+    max_delay_sec: float = 60.0
+    """Upper bound for any backoff."""
+
+    fallback_models: list[str] = field(default_factory=lambda: list(FALLBACK_CODER_MODELS))
+    """Models to fail over to, in order of preference (empty disables failover)."""
+
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+    """Random generator for jitter."""
+
+    @classmethod
+    def from_env(cls) -> RetryPolicy:
+        """
+        Create a policy from environment variables.
+
+        NINJA_MAX_RETRIES, NINJA_RETRY_DELAY_SEC (base delay) and
+        NINJA_RETRY_MAX_DELAY_SEC configure the backoff. NINJA_FALLBACK_MODELS
+        (comma-separated) replaces the default fallback list;
+        NINJA_MODEL_FAILOVER=false disables failover.
+
+        Returns:
+            RetryPolicy instance.
+        """
+        fallback_models = list(FALLBACK_CODER_MODELS)
+        configured = os.environ.get("NINJA_FALLBACK_MODELS")
+        if configured is not None:
+            fallback_models = [m.strip() for m in configured.split(",") if m.strip()]
+        if os.environ.get("NINJA_MODEL_FAILOVER", "true").lower() in ("false", "0", "no"):
+            fallback_models = []
+
+        return cls(
+            max_retries=int(os.environ.get("NINJA_MAX_RETRIES", "2")),
+            base_delay_sec=float(os.environ.get("NINJA_RETRY_DELAY_SEC", "5")),
+            max_delay_sec=float(os.environ.get("NINJA_RETRY_MAX_DELAY_SEC", "60")),
+            fallback_models=fallback_models,
+        )
+
+    def for_cli(self, capabilities: CLICapabilities) -> RetryPolicy:
+        """
+        Restrict failover to models a CLI can run.
+
+        Args:
+            capabilities: Capabilities of the CLI that runs the retries.
+
+        Returns:
+            Copy of this policy without the fallback models the CLI cannot use.
+        """
+        usable = [m for m in self.fallback_models if capabilities.supports_model(m)]
+        return replace(self, fallback_models=usable)
+
+    def backoff(self, retry: int, kind: FailureKind) -> float:
+        """
+        Delay before a retry.
+
+        Transient failures use full jitter (uniform in [0, cap]); rate limits
+        use equal jitter (at least half the cap) so throttled callers really
+        back off.
+
+        Args:
+            retry: Retry number (1 for the first retry).
+            kind: Failure kind of the previous attempt.
+
+        Returns:
+            Delay in seconds.
+        """
+        if kind == FailureKind.MODEL_UNAVAILABLE:
+            return 0.0
+        cap: float = min(self.max_delay_sec, self.base_delay_sec * 2 ** (retry - 1))
+        if kind == FailureKind.RATE_LIMIT:
+            return cap / 2 + self.rng.uniform(0, cap / 2)
+        return self.rng.uniform(0, cap)
+
+    def next_model(self, tried: Sequence[str]) -> str | None:
+        """First fallback model not tried yet, or None."""
+        return next((m for m in self.fallback_models if m not in tried), None)
+
+    def decide(self, retry: int, kind: FailureKind, tried: Sequence[str]) -> RetryDecision | None:
+        """
+        Decide whether and how to retry after a failure.
+
+        Args:
+            retry: Number of the retry being considered (1 for the first).
+            kind: Failure kind of the previous attempt.
+            tried: Models already tried, in order.
+
+        Returns:
+            Retry decision, or None to give up.
+        """
+        if kind == FailureKind.PERMANENT or retry > self.max_retries:
+            return None
+
+        model = None
+        if kind in (FailureKind.MODEL_UNAVAILABLE, FailureKind.RATE_LIMIT):
+            model = self.next_model(tried)
+            if model is None and kind == FailureKind.MODEL_UNAVAILABLE:
+                return None  # Nothing left to fail over to
+
+        return RetryDecision(delay_sec=self.backoff(retry, kind), model=model)
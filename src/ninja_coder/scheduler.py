@@ -0,0 +1,263 @@
+"""
+Admission control for coder CLI executions.
+
+Every coder tool ends in ``NinjaDriver.execute_async``, which spawns a
+heavyweight CLI process. ``TaskScheduler`` sits in front of it and admits
+executions one by one:
+
+- at most ``max_workers`` CLI processes run at once;
+- waiting executions are admitted by priority (interactive quick tasks
+  ahead of plans), then in arrival order;
+- only one execution per repository runs at a time, so concurrent tasks
+  never race on the same working tree;
+- while system memory is above the high watermark, new executions wait
+  (unless nothing is running, so the queue always makes progress).
+
+In a multi-worker server (shared state enabled, see
+``ninja_common.shared_state``) an admitted execution also takes a slot in
+the shared store before it runs, so the limit and the per-repository
+serialization hold across all workers; it polls every ``poll_interval``
+seconds until a slot is free. Priorities only order executions within a
+worker.
+
+Queue depth and wait times are available from ``get_stats()``; ToolExecutor
+also writes each admission with a snapshot of them to the structured log
+(event ``scheduler_admission``, readable with ``coder_query_logs``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from ninja_common.logging_utils import get_logger
+from ninja_common.security import ResourceMonitor, get_resource_monitor
+from ninja_common.shared_state import SharedStore, get_shared_store
+
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+logger = get_logger(__name__)
+
+
+class TaskPriority(IntEnum):
+    """Scheduling priority (lower runs first)."""
+
+    INTERACTIVE = 0  # Single quick tasks the user is waiting on
+    PLAN = 1  # Multi-step plans and multi-agent orchestration
+    BACKGROUND = 2  # Batch work (benchmarks, evaluations)
+
+
+@dataclass
+class _Ticket:
+    """A waiting or running execution."""
+
+    priority: int
+    seq: int
+    repo: str
+    enqueued_at: float
+    future: asyncio.Future[None] = field(repr=False)
+
+
+class TaskScheduler:
+    """Bounded, priority-ordered, per-repo-serialized admission of CLI runs."""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        memory_high_watermark: float | None = None,
+        serialize_repos: bool = True,
+        poll_interval: float = 1.0,
+        monitor: ResourceMonitor | None = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers: Maximum concurrent CLI executions
+                (default: NINJA_MAX_CONCURRENT_TASKS or 4).
+            memory_high_watermark: Memory usage percentage above which new
+                executions wait (default: NINJA_MEMORY_HIGH_WATERMARK or 90).
+            serialize_repos: Run at most one execution per repository.
+            poll_interval: Seconds between memory re-checks under pressure
+                and between shared slot attempts.
+            monitor: Resource monitor used for memory checks.
+        """
+        self.max_workers = max(
+            1, max_workers or int(os.environ.get("NINJA_MAX_CONCURRENT_TASKS", "4"))
+        )
+        self.memory_high_watermark = memory_high_watermark or float(
+            os.environ.get("NINJA_MEMORY_HIGH_WATERMARK", "90")
+        )
+        self.serialize_repos = serialize_repos
+        self.poll_interval = poll_interval
+        self.monitor = monitor or get_resource_monitor()
+
+        self._waiting: list[_Ticket] = []
+        self._running = 0
+        self._busy_repos: set[str] = set()
+        self._seq = itertools.count()
+        self._recheck: asyncio.TimerHandle | None = None
+
+        # Metrics
+        self.admitted = 0
+        self.total_wait_sec = 0.0
+        self.max_wait_sec = 0.0
+        self.backpressure_events = 0
+
+    @asynccontextmanager
+    async def slot(
+        self, repo_root: str, priority: int = TaskPriority.INTERACTIVE
+    ) -> AsyncIterator[float]:
+        """
+        Wait for admission, then hold an execution slot for the block.
+
+        Args:
+            repo_root: Repository the execution works on.
+            priority: Scheduling priority (see TaskPriority).
+
+        Yields:
+            Seconds spent waiting in the queue.
+        """
+        ticket = _Ticket(
+            priority=int(priority),
+            seq=next(self._seq),
+            repo=os.path.realpath(repo_root),
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._waiting.append(ticket)
+        self._dispatch()
+
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+            elif ticket.future.done() and not ticket.future.cancelled():
+                self._release(ticket)  # Admitted just as the caller gave up
+            raise
+
+        shared = get_shared_store()
+        holder = uuid.uuid4().hex
+        if shared is not None:
+            try:
+                await self._acquire_shared_slot(shared, holder, ticket.repo)
+            except BaseException:
+                self._release(ticket)
+                raise
+
+        wait_sec = time.monotonic() - ticket.enqueued_at
+        if wait_sec >= 1.0:
+            logger.info(
+                f"⏳ Task admitted after {wait_sec:.1f}s in queue "
+                f"(priority={ticket.priority}, queue_depth={len(self._waiting)})"
+            )
+        try:
+            yield wait_sec
+        finally:
+            try:
+                if shared is not None:
+                    await asyncio.to_thread(shared.release_slot, holder)
+            finally:
+                self._release(ticket)
+
+    async def _acquire_shared_slot(self, shared: SharedStore, holder: str, repo: str) -> None:
+        """Wait for a slot in the store shared with the other workers."""
+        while True:
+            attempt = asyncio.ensure_future(
+                asyncio.to_thread(
+                    shared.try_acquire_slot, holder, repo, self.max_workers, self.serialize_repos
+                )
+            )
+            try:
+                if await asyncio.shield(attempt):
+                    return
+            except asyncio.CancelledError:
+                # The slot may still be taken by the running attempt; give it back then
+                attempt.add_done_callback(lambda _: shared.release_slot(holder))
+                raise
+            await asyncio.sleep(self.poll_interval)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get queue metrics."""
+        return {
+            "queue_depth": len(self._waiting),
+            "running": self._running,
+            "max_workers": self.max_workers,
+            "busy_repos": len(self._busy_repos),
+            "admitted": self.admitted,
+            "average_wait_sec": self.total_wait_sec / max(self.admitted, 1),
+            "max_wait_sec": self.max_wait_sec,
+            "backpressure_events": self.backpressure_events,
+        }
+
+    def _release(self, ticket: _Ticket) -> None:
+        """Free the slot and repo held by an admitted ticket."""
+        self._running -= 1
+        self._busy_repos.discard(ticket.repo)
+        self._dispatch()
+
+    def _under_memory_pressure(self) -> bool:
+        """Whether memory usage is above the high watermark."""
+        percent = self.monitor.memory_percent()
+        return percent is not None and percent >= self.memory_high_watermark
+
+    def _dispatch(self) -> None:
+        """Admit as many waiting tickets as capacity allows."""
+        while self._waiting and self._running < self.max_workers:
+            if self._running > 0 and self._under_memory_pressure():
+                self.backpressure_events += 1
+                logger.warning(
+                    f"Memory above {self.memory_high_watermark:.0f}%, holding "
+                    f"{len(self._waiting)} queued task(s)"
+                )
+                self._schedule_recheck()
+                return
+
+            eligible = [
+                t
+                for t in self._waiting
+                if not (self.serialize_repos and t.repo in self._busy_repos)
+            ]
+            if not eligible:
+                return
+            ticket = min(eligible, key=lambda t: (t.priority, t.seq))
+            self._waiting.remove(ticket)
+            if ticket.future.done():
+                continue  # Caller already cancelled
+
+            self._running += 1
+            self._busy_repos.add(ticket.repo)
+            wait_sec = time.monotonic() - ticket.enqueued_at
+            self.admitted += 1
+            self.total_wait_sec += wait_sec
+            self.max_wait_sec = max(self.max_wait_sec, wait_sec)
+            ticket.future.set_result(None)
+
+    def _schedule_recheck(self) -> None:
+        """Retry dispatching after the poll interval (memory backpressure)."""
+        if self._recheck is not None and not self._recheck.cancelled():
+            self._recheck.cancel()
+        self._recheck = asyncio.get_running_loop().call_later(self.poll_interval, self._dispatch)
+
+
+# Global scheduler shared by all tool executors in the process
+_task_scheduler: TaskScheduler | None = None
+
+
+def get_task_scheduler() -> TaskScheduler:
+    """Get the global task scheduler instance."""
+    global _task_scheduler
+    if _task_scheduler is None:
+        _task_scheduler = TaskScheduler()
+    return _task_scheduler
@@ -39,7 +39,6 @@ from ninja_coder.models import (
     SequentialPlanRequest,
     SimpleTaskRequest,
 )
-from ninja_coder.tools import get_executor
 from ninja_common.logging_utils import get_logger, setup_logging
 
 
@@ -47,18 +46,6 @@ if TYPE_CHECKING:
     from collections.abc import Sequence
 
 
-# Load config from ~/.ninja-mcp.env into environment variables
-try:
-    from ninja_common.config_manager import ConfigManager
-
-    ConfigManager().export_env()
-except FileNotFoundError:
-    pass  # Config file may not exist, will use env vars directly
-except Exception as e:
-    import sys
-
-    print(f"WARNING: Failed to load config from ~/.ninja-mcp.env: {e}", file=sys.stderr)
-
 # Set up logging to stderr (stdout is for MCP protocol)
 setup_logging(level=logging.INFO)
 logger = get_logger(__name__)
@@ -121,6 +108,13 @@ TOOLS: list[Tool] = [
                     "description": "Execution mode (always 'quick' for single-pass code writing)",
                     "default": "quick",
                 },
+                "idempotency_key": {
+                    "type": "string",
+                    "description": (
+                        "Optional key for safe retries: a call with the same key attaches to the "
+                        "running task or returns its recent result instead of running again"
+                    ),
+                },
             },
             "required": ["task", "repo_root"],
         },
@@ -464,7 +458,11 @@ TOOLS: list[Tool] = [
             "monitoring system behavior, finding errors. "
             "\n\n"
             "💡 FILTERS: Combine session_id, task_id, cli_name, and level to narrow results. "
-            "Use limit/offset for pagination."
+            "Use limit/offset for pagination. "
+            "\n\n"
+            "⏱️ TIMINGS: Set timings=true to also get p50/p90/p99 latency of each execution "
+            "stage (safety check, task file, model selection, spawn, first output, CLI run, "
+            "parsing, log saving, metrics) over the matching tool calls."
         ),
         inputSchema={
             "type": "object",
@@ -502,6 +500,11 @@ TOOLS: list[Tool] = [
                     "default": 0,
                     "minimum": 0,
                 },
+                "timings": {
+                    "type": "boolean",
+                    "description": "Also summarize per-stage latency of matching tool calls",
+                    "default": False,
+                },
             },
             "required": [],
         },
@@ -637,6 +640,9 @@ You:
         logger.info(f"[{client_id}] Tool called: {name}")
         logger.debug(f"[{client_id}] Arguments: {json.dumps(arguments, indent=2)}")
 
+        # Imported on first call: the executor pulls in the driver and every strategy
+        from ninja_coder.tools import get_executor
+
         executor = get_executor()
 
         try:
@@ -726,17 +732,19 @@ async def main_stdio() -> None:
         )
 
 
-async def main_http(host: str, port: int) -> None:
-    """Run the MCP server over HTTP with SSE."""
-    import uvicorn
+async def main_http(host: str, port: int, uds: str | None = None) -> None:
+    """Run the MCP server over HTTP with SSE (on a Unix socket if ``uds`` is given)."""
     from mcp.server.sse import SseServerTransport
     from starlette.requests import Request
     from starlette.responses import Response
 
-    logger.info(f"Starting ninja-coder server (HTTP/SSE mode) on {host}:{port}")
+    from ninja_common.http_server import message_path, serve_asgi
+
+    address = uds or f"{host}:{port}"
+    logger.info(f"Starting ninja-coder server (HTTP/SSE mode) on {address}")
 
     server = create_server()
-    sse = SseServerTransport("/messages")
+    sse = SseServerTransport(message_path("/messages"))
 
     async def handle_sse(request):
         async with sse.connect_sse(request.scope, request.receive, request._send) as streams:
@@ -756,9 +764,7 @@ async def main_http(host: str, port: int) -> None:
         else:
             await Response("Not Found", status_code=404)(scope, receive, send)
 
-    config = uvicorn.Config(app, host=host, port=port, log_level="info")
-    server_instance = uvicorn.Server(config)
-    await server_instance.serve()
+    await serve_asgi(app, host, port, uds=uds)
 
 
 def run() -> None:
@@ -783,21 +789,38 @@ def run() -> None:
         default="127.0.0.1",
         help="Host to bind to (default: 127.0.0.1)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="HTTP worker processes (default: NINJA_HTTP_WORKERS or 1)",
+    )
+    parser.add_argument(
+        "--uds",
+        type=str,
+        default=None,
+        help="Serve HTTP on this Unix domain socket instead of a TCP port",
+    )
 
     args = parser.parse_args()
 
     # Load config from ~/.ninja-mcp.env into environment variables
-    # This ensures settings like NINJA_CODE_BIN are available
+    # This ensures settings like NINJA_CODE_BIN are available (done here rather
+    # than at import time, so importing the server stays cheap)
     try:
         from ninja_common.config_manager import ConfigManager
 
         ConfigManager().export_env()
-    except Exception:
-        pass  # Config file may not exist, continue with env vars
+    except Exception as e:
+        print(f"WARNING: Failed to load config from ~/.ninja-mcp.env: {e}", file=sys.stderr)
 
     try:
         if args.http:
-            asyncio.run(main_http(args.host, args.port))
+            from ninja_common.http_server import default_workers, run_http
+
+            run_http(
+                main_http, args.host, args.port, args.workers or default_workers(), uds=args.uds
+            )
         else:
             asyncio.run(main_stdio())
     except KeyboardInterrupt:
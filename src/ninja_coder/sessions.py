@@ -3,12 +3,24 @@ Session management for persistent conversations across tasks.
 
 Provides session creation, persistence, and retrieval for maintaining
 conversation history in multi-turn coding workflows.
+
+Storage layout (in ``<cache_dir>/sessions``):
+
+- ``<session_id>.json``: small header with repo, model, timestamps, metadata
+  and per-role message counts. Rewritten atomically on each save.
+- ``<session_id>.jsonl``: append-only message log, one JSON object per line.
+  Saving a session appends only the messages added since the last save.
+
+Listing and summarizing sessions read headers only. Sessions saved by older
+versions (messages embedded in the ``.json`` file) are still read and are
+converted on their next save.
 """
 
 from __future__ import annotations
 
 import json
 import uuid
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
@@ -63,6 +75,8 @@ class Session:
     updated_at: datetime
     messages: list[SessionMessage] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Number of messages already in the on-disk log (managed by SessionManager)
+    _persisted: int = field(default=0, init=False, repr=False, compare=False)
 
     def add_message(self, role: str, content: str, metadata: dict[str, Any] | None = None) -> None:
         """Add message to session.
@@ -176,21 +190,27 @@ class SessionManager:
         Returns:
             Session instance or None if not found.
         """
-        session_file = self.sessions_dir / f"{session_id}.json"
-        if not session_file.exists():
+        header = self._read_header(session_id)
+        if header is None:
             logger.warning(f"Session {session_id} not found")
             return None
 
         try:
-            with open(session_file) as f:
-                data = json.load(f)
-                session = Session.from_dict(data)
-                logger.info(f"📂 Loaded session {session_id} ({len(session.messages)} messages)")
-                return session
-        except (json.JSONDecodeError, KeyError) as e:
+            if "messages" in header:
+                # Legacy single-file session
+                session = Session.from_dict(header)
+            else:
+                messages, intact = self._read_log(session_id)
+                session = Session.from_dict({**header, "messages": messages})
+                # A damaged log is rewritten on the next save instead of appended to
+                session._persisted = len(session.messages) if intact else 0
+        except (KeyError, TypeError, ValueError) as e:
             logger.error(f"Failed to load session {session_id}: {e}")
             return None
 
+        logger.info(f"📂 Loaded session {session_id} ({len(session.messages)} messages)")
+        return session
+
     def save_session(self, session: Session) -> None:
         """Save session to disk.
 
@@ -201,11 +221,24 @@ class SessionManager:
         logger.debug(f"Saved session {session.session_id}")
 
     def _save_session(self, session: Session) -> None:
-        """Internal save implementation."""
-        session_file = self.sessions_dir / f"{session.session_id}.json"
+        """Internal save implementation: append new messages, then rewrite the header."""
+        log_file = self.sessions_dir / f"{session.session_id}.jsonl"
         try:
-            with open(session_file, "w") as f:
-                json.dump(session.to_dict(), f, indent=2)
+            if session._persisted == 0 or session._persisted > len(session.messages):
+                # New, converted or truncated session: write the whole log
+                mode, new_messages = "w", session.messages
+            else:
+                mode, new_messages = "a", session.messages[session._persisted :]
+
+            if new_messages or mode == "w":
+                lines = "".join(
+                    json.dumps(msg.to_dict(), separators=(",", ":")) + "\n" for msg in new_messages
+                )
+                with open(log_file, mode) as f:
+                    f.write(lines)
+            session._persisted = len(session.messages)
+
+            self._write_header(session)
         except Exception as e:
             logger.error(f"Failed to save session {session.session_id}: {e}")
             raise
@@ -213,6 +246,9 @@ class SessionManager:
     def list_sessions(self, repo_root: str | None = None) -> list[Session]:
         """List all sessions, optionally filtered by repo.
 
+        Filtering and sorting use the headers; message logs are only read for
+        the sessions returned.
+
         Args:
             repo_root: Optional repo root to filter by.
 
@@ -220,21 +256,24 @@ class SessionManager:
             List of Session instances sorted by updated_at (newest first).
         """
         sessions = []
-        for session_file in self.sessions_dir.glob("*.json"):
-            try:
-                with open(session_file) as f:
-                    data = json.load(f)
-                    if repo_root is None or data["repo_root"] == repo_root:
-                        sessions.append(Session.from_dict(data))
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.warning(f"Skipping invalid session file {session_file}: {e}")
-                continue
-
-        # Sort by updated_at (most recent first)
-        sessions.sort(key=lambda s: s.updated_at, reverse=True)
+        for header in self._list_headers(repo_root):
+            session = self.load_session(header["session_id"])
+            if session is not None:
+                sessions.append(session)
         logger.debug(f"Listed {len(sessions)} sessions")
         return sessions
 
+    def list_session_summaries(self, repo_root: str | None = None) -> list[dict[str, Any]]:
+        """List session summaries without reading any messages.
+
+        Args:
+            repo_root: Optional repo root to filter by.
+
+        Returns:
+            Summaries (see ``get_session_summary``), newest first.
+        """
+        return [self._summary(header) for header in self._list_headers(repo_root)]
+
     def delete_session(self, session_id: str) -> bool:
         """Delete session.
 
@@ -247,6 +286,7 @@ class SessionManager:
         session_file = self.sessions_dir / f"{session_id}.json"
         if session_file.exists():
             session_file.unlink()
+            (self.sessions_dir / f"{session_id}.jsonl").unlink(missing_ok=True)
             logger.info(f"🗑️  Deleted session {session_id}")
             return True
         logger.warning(f"Session {session_id} not found for deletion")
@@ -261,18 +301,96 @@ class SessionManager:
         Returns:
             Dict with session metadata or None if not found.
         """
-        session = self.load_session(session_id)
-        if not session:
+        header = self._read_header(session_id)
+        if header is None:
             return None
+        return self._summary(header)
 
-        return {
+    def _write_header(self, session: Session) -> None:
+        """Atomically write a session header."""
+        counts = Counter(msg.role for msg in session.messages)
+        header = {
             "session_id": session.session_id,
             "repo_root": session.repo_root,
             "model": session.model,
             "created_at": session.created_at.isoformat(),
             "updated_at": session.updated_at.isoformat(),
-            "message_count": len(session.messages),
-            "user_message_count": len(session.get_user_messages()),
-            "assistant_message_count": len(session.get_assistant_messages()),
+            "message_counts": dict(counts),
             "metadata": session.metadata,
         }
+        session_file = self.sessions_dir / f"{session.session_id}.json"
+        tmp_file = session_file.with_suffix(".json.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(header, f, separators=(",", ":"))
+        tmp_file.replace(session_file)
+
+    def _read_header(self, session_id: str) -> dict[str, Any] | None:
+        """Read a session header (or a legacy session file)."""
+        session_file = self.sessions_dir / f"{session_id}.json"
+        try:
+            with open(session_file) as f:
+                header: dict[str, Any] = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to load session {session_id}: {e}")
+            return None
+        return header
+
+    def _read_log(self, session_id: str) -> tuple[list[dict[str, Any]], bool]:
+        """Read a session's message log, skipping corrupt (e.g. torn) lines.
+
+        Returns:
+            Tuple of (messages, whether every line was intact).
+        """
+        messages = []
+        intact = True
+        try:
+            with open(self.sessions_dir / f"{session_id}.jsonl") as f:
+                for line in f:
+                    try:
+                        messages.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning(f"Skipping corrupt message in session {session_id}")
+                        intact = False
+        except FileNotFoundError:
+            pass
+        return messages, intact
+
+    def _list_headers(self, repo_root: str | None) -> list[dict[str, Any]]:
+        """Headers of all sessions (optionally for one repo), newest first."""
+        headers = []
+        for session_file in self.sessions_dir.glob("*.json"):
+            try:
+                with open(session_file) as f:
+                    header = json.load(f)
+                if repo_root is None or header["repo_root"] == repo_root:
+                    datetime.fromisoformat(header["updated_at"])
+                    headers.append(header)
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping invalid session file {session_file}: {e}")
+                continue
+
+        # Sort by updated_at (most recent first)
+        headers.sort(key=lambda h: datetime.fromisoformat(h["updated_at"]), reverse=True)
+        return headers
+
+    @staticmethod
+    def _summary(header: dict[str, Any]) -> dict[str, Any]:
+        """Build a session summary from its header."""
+        counts = header.get("message_counts")
+        if counts is None:
+            # Legacy session file with embedded messages
+            counts = Counter(msg.get("role") for msg in header.get("messages", []))
+
+        return {
+            "session_id": header["session_id"],
+            "repo_root": header["repo_root"],
+            "model": header["model"],
+            "created_at": header["created_at"],
+            "updated_at": header["updated_at"],
+            "message_count": sum(counts.values()),
+            "user_message_count": counts.get("user", 0),
+            "assistant_message_count": counts.get("assistant", 0),
+            "metadata": header.get("metadata", {}),
+        }
@@ -3,15 +3,19 @@ CLI strategy pattern infrastructure for ninja-coder.
 
 This package provides the abstraction layer for supporting multiple CLI tools
 (Aider, OpenCode, Claude Code, etc.) through a strategy pattern.
+
+Concrete strategies are imported on first use (see ``CLIStrategyRegistry``).
 """
 
+from typing import Any
+
 from ninja_coder.strategies.base import (
     CLICapabilities,
     CLICommandResult,
     CLIStrategy,
     ParsedResult,
 )
-from ninja_coder.strategies.claude_strategy import ClaudeStrategy
+from ninja_coder.strategies.matcher import PatternHit, PatternMatcher
 from ninja_coder.strategies.registry import CLIStrategyRegistry
 
 
@@ -22,4 +26,15 @@ __all__ = [
     "CLIStrategyRegistry",
     "ClaudeStrategy",
     "ParsedResult",
+    "PatternHit",
+    "PatternMatcher",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import ``ClaudeStrategy`` only when it is accessed."""
+    if name == "ClaudeStrategy":
+        from ninja_coder.strategies.claude_strategy import ClaudeStrategy
+
+        return ClaudeStrategy
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
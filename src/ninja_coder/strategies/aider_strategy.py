@@ -9,7 +9,6 @@ from __future__ import annotations
 
 import os
 import re
-import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -18,16 +17,77 @@ from ninja_coder.strategies.base import (
     CLICommandResult,
     ParsedResult,
 )
+from ninja_coder.strategies.matcher import PatternMatcher, error_context
 from ninja_common.defaults import FALLBACK_CODER_MODELS
 from ninja_common.logging_utils import get_logger
 from ninja_common.path_utils import ensure_internal_dirs, safe_join
 
 
 if TYPE_CHECKING:
+    from ninja_coder.change_detection import WorkspaceSnapshot
     from ninja_coder.driver import NinjaConfig
 
 logger = get_logger(__name__)
 
+# Aider-specific errors, detected even with exit_code=0 (all are retryable)
+_AIDER_ERROR_MATCHER = PatternMatcher(
+    [
+        # Authentication and authorization errors (HIGH PRIORITY)
+        r"AuthenticationError",
+        r"authentication\s+failed",
+        r"User\s+not\s+found",
+        r"Unauthorized",
+        r"401",
+        r"403\s+Forbidden",
+        r"invalid\s+api\s+key",
+        r"api\s+key.*?(not\s+found|invalid|missing)",
+        # Credit and billing errors (HIGH PRIORITY)
+        r"insufficient\s+credits",
+        r"requires\s+more\s+credits",
+        r"can\s+only\s+afford",
+        r"credit\s+limit",
+        r"billing\s+error",
+        r"payment\s+required",
+        # General API errors (HIGH PRIORITY)
+        r"APIError",
+        r"OpenrouterException",
+        r"litellm\..*?Error",
+        r"API\s+request\s+failed",
+        # Summarization failures (most common)
+        r"summarization\s+failed",
+        r"summarizer\s+.*?\s+failed",
+        r"cannot\s+schedule\s+new\s+futures\s+after\s+shutdown",
+        r"unexpectedly\s+failed\s+for\s+all\s+models",
+        # Threading/async errors (often fatal but hidden)
+        r"thread\s+.*?\s+error",
+        r"event\s+loop\s+.*?\s+closed",
+        r"event\s+loop\s+is\s+closed",
+        # Model response errors
+        r"incomplete\s+response",
+        r"response\s+.*?\s+truncated",
+        # File operation errors
+        r"failed\s+to\s+(write|create|modify)",
+        r"permission\s+denied.*?(writing|creating|modifying)",
+        # Git errors (when --no-git might not work)
+        r"git\s+.*?\s+error",
+        r"repository\s+.*?\s+error",
+    ]
+)
+
+# File changes (what was modified)
+_FILE_CHANGE_MATCHER = PatternMatcher(
+    [
+        # Aider-specific patterns (most reliable)
+        r"Applied edit to\s+([^\s]+)",  # "Applied edit to storage.py"
+        r"Added\s+([^\s]+)\s+to the chat",  # "Added models.py to the chat"
+        r"Create[d]?\s+([^\s]+\.[\w]+)",  # "Created file.py" or "Create file.py"
+        # Generic patterns
+        r"(?:wrote|created|modified|updated|edited)\s+['\"]?([^\s'\"]+)['\"]?",
+        r"(?:writing|creating|modifying|updating|editing)\s+['\"]?([^\s'\"]+)['\"]?",
+        r"file:\s*['\"]?([^\s'\"]+)['\"]?",
+    ]
+)
+
 
 class AiderStrategy:
     """Strategy for Aider CLI tool.
@@ -55,6 +115,7 @@ class AiderStrategy:
             supports_native_zai=False,
             max_context_files=50,
             preferred_task_types=["sequential", "quick"],
+            model_prefixes=("openrouter/",),
         )
 
     @property
@@ -97,6 +158,8 @@ class AiderStrategy:
             ValueError: If no API key is configured.
         """
         model_name = model or self.config.model
+        # Aider takes OpenRouter ids with the provider prefix; don't add it twice
+        openrouter_model = f"openrouter/{model_name.removeprefix('openrouter/')}"
 
         cmd = [
             self.bin_path,
@@ -108,7 +171,7 @@ class AiderStrategy:
             "--no-suggest-shell-commands",  # Don't suggest shell commands
             "--no-check-update",  # Don't check for updates
             "--model",
-            f"openrouter/{model_name}",  # OpenRouter model
+            openrouter_model,  # OpenRouter model
         ]
 
         # For plan execution tasks, add architect mode
@@ -130,7 +193,7 @@ class AiderStrategy:
                 providers = [p.strip() for p in provider_order.split(",")]
                 settings = [
                     {
-                        "name": f"openrouter/{model_name}",
+                        "name": openrouter_model,
                         "extra_params": {
                             "provider": {
                                 "order": providers,
@@ -202,6 +265,7 @@ class AiderStrategy:
         stderr: str,
         exit_code: int,
         repo_root: str | None = None,
+        snapshot: WorkspaceSnapshot | None = None,
     ) -> ParsedResult:
         """Parse Aider output with comprehensive error detection.
 
@@ -210,70 +274,25 @@ class AiderStrategy:
             stderr: Standard error from Aider execution.
             exit_code: Exit code from Aider execution.
             repo_root: Repository root path (optional, used for file verification).
+            snapshot: Workspace snapshot taken before the run (optional, used to
+                detect touched files when the output names none).
 
         Returns:
             ParsedResult with success status, summary, and file changes.
         """
         success = exit_code == 0
         combined_output = stdout + "\n" + stderr
+        lowered_output = combined_output.lower()
 
         # ENHANCED: Detect aider-specific errors even with exit_code=0
-        aider_error_patterns = [
-            # Authentication and authorization errors (HIGH PRIORITY)
-            r"AuthenticationError",
-            r"authentication\s+failed",
-            r"User\s+not\s+found",
-            r"Unauthorized",
-            r"401",
-            r"403\s+Forbidden",
-            r"invalid\s+api\s+key",
-            r"api\s+key.*?(not\s+found|invalid|missing)",
-            # Credit and billing errors (HIGH PRIORITY)
-            r"insufficient\s+credits",
-            r"requires\s+more\s+credits",
-            r"can\s+only\s+afford",
-            r"credit\s+limit",
-            r"billing\s+error",
-            r"payment\s+required",
-            # General API errors (HIGH PRIORITY)
-            r"APIError",
-            r"OpenrouterException",
-            r"litellm\..*?Error",
-            r"API\s+request\s+failed",
-            # Summarization failures (most common)
-            r"summarization\s+failed",
-            r"summarizer\s+.*?\s+failed",
-            r"cannot\s+schedule\s+new\s+futures\s+after\s+shutdown",
-            r"unexpectedly\s+failed\s+for\s+all\s+models",
-            # Threading/async errors (often fatal but hidden)
-            r"thread\s+.*?\s+error",
-            r"event\s+loop\s+.*?\s+closed",
-            r"event\s+loop\s+is\s+closed",
-            # Model response errors
-            r"incomplete\s+response",
-            r"response\s+.*?\s+truncated",
-            # File operation errors
-            r"failed\s+to\s+(write|create|modify)",
-            r"permission\s+denied.*?(writing|creating|modifying)",
-            # Git errors (when --no-git might not work)
-            r"git\s+.*?\s+error",
-            r"repository\s+.*?\s+error",
-        ]
-
         aider_error_detected = False
         aider_error_msg = ""
 
-        for pattern in aider_error_patterns:
-            match = re.search(pattern, combined_output, re.IGNORECASE)
-            if match:
-                aider_error_detected = True
-                # Extract context around the error (80 chars before/after for context)
-                start = max(0, match.start() - 80)
-                end = min(len(combined_output), match.end() + 80)
-                aider_error_msg = combined_output[start:end].strip()
-                # Clean up extra whitespace
-                aider_error_msg = " ".join(aider_error_msg.split())
-                break
+        error_hit = _AIDER_ERROR_MATCHER.first(combined_output, lowered_output)
+        if error_hit:
+            aider_error_detected = True
+            # Extract context around the error (80 chars before/after for context)
+            aider_error_msg = error_context(combined_output, error_hit, 80)
 
         # Override success if aider error detected
         if aider_error_detected:
@@ -284,22 +303,10 @@ class AiderStrategy:
 
         # Extract file changes (what was modified)
         suspected_paths: list[str] = []
-        file_patterns = [
-            # Aider-specific patterns (most reliable)
-            r"Applied edit to\s+([^\s]+)",  # "Applied edit to storage.py"
-            r"Added\s+([^\s]+)\s+to the chat",  # "Added models.py to the chat"
-            r"Create[d]?\s+([^\s]+\.[\w]+)",  # "Created file.py" or "Create file.py"
-            # Generic patterns
-            r"(?:wrote|created|modified|updated|edited)\s+['\"]?([^\s'\"]+)['\"]?",
-            r"(?:writing|creating|modifying|updating|editing)\s+['\"]?([^\s'\"]+)['\"]?",
-            r"file:\s*['\"]?([^\s'\"]+)['\"]?",
-        ]
-        for pattern in file_patterns:
-            matches = re.findall(pattern, combined_output, re.IGNORECASE)
-            for match in matches:
-                # Filter to only actual file paths (must have extension or path separator)
-                if match and ("/" in match or "." in match) and not match.endswith("."):
-                    suspected_paths.append(match)
+        for match in _FILE_CHANGE_MATCHER.values(combined_output, lowered_output):
+            # Filter to only actual file paths (must have extension or path separator)
+            if match and ("/" in match or "." in match) and not match.endswith("."):
+                suspected_paths.append(match)
 
         # Deduplicate paths
         suspected_paths = list(set(suspected_paths))
@@ -322,31 +329,14 @@ class AiderStrategy:
 
             suspected_paths = verified_paths
 
-            # If regex found nothing and task succeeded, scan for recent file changes
+            # If regex found nothing and task succeeded, diff the pre-run snapshot
             # This fallback catches files when regex pattern matching fails
-            if not suspected_paths and success:
-                cutoff_time = time.time() - 60  # Files modified in last 60 seconds
-                recent_files: list[str] = []
-                try:
-                    for root, dirs, files in os.walk(repo_root):
-                        # Skip hidden directories (including .git, .cache, etc.)
-                        dirs[:] = [d for d in dirs if not d.startswith('.')]
-                        for file in files:
-                            file_path = Path(root) / file
-                            try:
-                                if file_path.stat().st_mtime > cutoff_time:
-                                    recent_files.append(str(file_path.relative_to(repo_root)))
-                            except (OSError, ValueError):
-                                # Skip files we can't stat (permission errors, etc.)
-                                continue
-
-                    if recent_files:
-                        suspected_paths = recent_files[:10]  # Limit to 10 most recent
-                        logger.info(
-                            f"Detected {len(recent_files)} recently modified files via filesystem scan"
-                        )
-                except Exception as e:
-                    logger.warning(f"Filesystem scan failed: {e}")
+            if not suspected_paths and success and snapshot is not None:
+                suspected_paths = snapshot.changed_paths()
+                if suspected_paths:
+                    logger.info(
+                        f"Detected {len(suspected_paths)} modified files via workspace snapshot"
+                    )
 
         # DEBUG: Log parsed paths
         if suspected_paths:
@@ -410,14 +400,11 @@ class AiderStrategy:
                     notes = error_lines[-1][:200]  # Last line, max 200 chars
 
             # Detect specific OpenRouter/API errors
-            if "finish_reason" in combined_output.lower():
+            if "finish_reason" in lowered_output:
                 notes = "⚠️ Incomplete API response (token limit or timeout). Try smaller context or different model."
 
             # Detect invalid model ID errors
-            if (
-                "is not a valid model" in combined_output.lower()
-                or "model not found" in combined_output.lower()
-            ):
+            if "is not a valid model" in lowered_output or "model not found" in lowered_output:
                 model_match = re.search(
                     r"['\"]?([a-z]+/[a-z0-9._-]+)['\"]?\s+is not a valid",
                     combined_output,
@@ -429,8 +416,8 @@ class AiderStrategy:
                 summary = f"❌ Model '{bad_model}' not found on OpenRouter"
 
             # Detect API key errors (backward compatibility)
-            if "api key" in combined_output.lower() and (
-                "not found" in combined_output.lower() or "invalid" in combined_output.lower()
+            if "api key" in lowered_output and (
+                "not found" in lowered_output or "invalid" in lowered_output
             ):
                 notes = "❌ OpenRouter API key missing or invalid. Set OPENROUTER_API_KEY in ~/.ninja-mcp.env"
                 summary = "❌ API key error"
@@ -441,9 +428,7 @@ class AiderStrategy:
         if success and not suspected_paths and len(combined_output) > 100:
             # Check if output suggests files should have been created/modified
             action_keywords = ["write", "creat", "modif", "updat", "edit", "add", "implement"]
-            has_action_intent = any(
-                keyword in combined_output.lower() for keyword in action_keywords
-            )
+            has_action_intent = any(keyword in lowered_output for keyword in action_keywords)
 
             # If there was intent to modify files but none were touched (neither via
             # regex patterns nor filesystem scan), mark as failure
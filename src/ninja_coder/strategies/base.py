@@ -14,6 +14,8 @@ from typing import TYPE_CHECKING, Any, Protocol
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from ninja_coder.change_detection import WorkspaceSnapshot
+
 
 @dataclass
 class CLICapabilities:
@@ -40,6 +42,22 @@ class CLICapabilities:
     preferred_task_types: list[str] = field(default_factory=list)
     """Preferred task types for this CLI (e.g., ['parallel', 'sequential', 'quick'])."""
 
+    model_prefixes: tuple[str, ...] | None = None
+    """Provider prefixes of the model ids the CLI can run (None: any id)."""
+
+    def supports_model(self, model: str) -> bool:
+        """Whether the CLI can run a model other than its configured default.
+
+        Args:
+            model: Model id (e.g. "openrouter/anthropic/claude-haiku-4.5").
+
+        Returns:
+            False for CLIs without model routing or with another provider prefix.
+        """
+        if not self.supports_model_routing:
+            return False
+        return self.model_prefixes is None or model.startswith(self.model_prefixes)
+
 
 @dataclass
 class CLICommandResult:
@@ -129,6 +147,7 @@ class CLIStrategy(Protocol):
         stderr: str,
         exit_code: int,
         repo_root: str | None = None,
+        snapshot: WorkspaceSnapshot | None = None,
     ) -> ParsedResult:
         """Parse CLI output to extract results.
 
@@ -137,6 +156,8 @@ class CLIStrategy(Protocol):
             stderr: Standard error from CLI execution.
             exit_code: Exit code from CLI execution.
             repo_root: Repository root path (optional, used for file verification).
+            snapshot: Workspace snapshot taken before the run (optional, used to
+                detect touched files when the output names none).
 
         Returns:
             ParsedResult with success status, summary, and file changes.
@@ -18,14 +18,46 @@ from ninja_coder.strategies.base import (
     CLICommandResult,
     ParsedResult,
 )
+from ninja_coder.strategies.matcher import PatternMatcher, error_context
 from ninja_common.logging_utils import get_logger
 
 
 if TYPE_CHECKING:
+    from ninja_coder.change_detection import WorkspaceSnapshot
     from ninja_coder.driver import NinjaConfig
 
 logger = get_logger(__name__)
 
+_ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+# Claude Code error patterns
+_ERROR_MATCHER = PatternMatcher(
+    [
+        ("auth", r"AuthenticationError"),
+        ("auth", r"authentication\s+failed"),
+        ("auth", r"not\s+authenticated"),
+        ("auth", r"invalid\s+api\s+key"),
+        ("retryable", r"rate\s+limit"),
+        ("retryable", r"timeout"),
+        ("retryable", r"connection\s+refused"),
+        ("model", r"model\s+not\s+found"),
+        ("permission", r"permission\s+denied"),
+        ("error", r"Error:"),
+    ]
+)
+
+_FILE_CHANGE_MATCHER = PatternMatcher(
+    [
+        r"(?:wrote|created|modified|updated|edited)\s+['\"]?([^\s'\"]+)['\"]?",
+        r"(?:writing|creating|modifying|updating|editing)\s+['\"]?([^\s'\"]+)['\"]?",
+        r"file:\s*['\"]?([^\s'\"]+)['\"]?",
+        # Claude Code tool call format
+        r"\|\s+(?:Edit|Write)\s+([^\s]+)",
+        r"Edited:\s+([^\s]+)",
+        r"Created:\s+([^\s]+)",
+    ]
+)
+
 
 # Claude Code models (Anthropic only)
 CLAUDE_CODE_MODELS = [
@@ -189,6 +221,7 @@ class ClaudeStrategy:
         stderr: str,
         exit_code: int,
         repo_root: str | None = None,
+        snapshot: WorkspaceSnapshot | None = None,
     ) -> ParsedResult:
         """Parse Claude Code output.
 
@@ -197,6 +230,8 @@ class ClaudeStrategy:
             stderr: Standard error from Claude Code execution.
             exit_code: Exit code from Claude Code execution.
             repo_root: Repository root path (optional, used for file verification).
+            snapshot: Workspace snapshot taken before the run (optional, used to
+                detect touched files when the output names none).
 
         Returns:
             ParsedResult with success status, summary, and file changes.
@@ -204,64 +239,33 @@ class ClaudeStrategy:
         success = exit_code == 0
         combined_output = stdout + "\n" + stderr
 
-        # Claude Code error patterns
-        error_patterns = [
-            r"AuthenticationError",
-            r"authentication\s+failed",
-            r"not\s+authenticated",
-            r"invalid\s+api\s+key",
-            r"rate\s+limit",
-            r"timeout",
-            r"connection\s+refused",
-            r"model\s+not\s+found",
-            r"permission\s+denied",
-            r"Error:",
-        ]
+        # Strip ANSI color codes once so every pattern sees clean text
+        clean_output = _ANSI_ESCAPE.sub("", combined_output)
+        lowered_output = clean_output.lower()
 
         retryable_error = False
         error_msg = ""
 
-        for pattern in error_patterns:
-            match = re.search(pattern, combined_output, re.IGNORECASE)
-            if match:
-                # Rate limits and timeouts are retryable
-                if any(
-                    retry_pattern in pattern
-                    for retry_pattern in [r"rate\s+limit", "timeout", r"connection\s+refused"]
-                ):
-                    retryable_error = True
-
-                # Extract context around the error
-                start = max(0, match.start() - 60)
-                end = min(len(combined_output), match.end() + 60)
-                error_msg = combined_output[start:end].strip()
-                error_msg = " ".join(error_msg.split())
-                break
+        error_hit = _ERROR_MATCHER.first(clean_output, lowered_output)
+        if error_hit:
+            # Rate limits and timeouts are retryable
+            retryable_error = error_hit.label == "retryable"
+            # Extract context around the error
+            error_msg = error_context(clean_output, error_hit, 60)
 
         # Extract file changes
-        # Strip ANSI color codes for easier pattern matching
-        ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-        clean_output = ansi_escape.sub("", combined_output)
-
         suspected_paths: list[str] = []
-        file_patterns = [
-            r"(?:wrote|created|modified|updated|edited)\s+['\"]?([^\s'\"]+)['\"]?",
-            r"(?:writing|creating|modifying|updating|editing)\s+['\"]?([^\s'\"]+)['\"]?",
-            r"file:\s*['\"]?([^\s'\"]+)['\"]?",
-            # Claude Code tool call format
-            r"\|\s+(?:Edit|Write)\s+([^\s]+)",
-            r"Edited:\s+([^\s]+)",
-            r"Created:\s+([^\s]+)",
-        ]
-        for pattern in file_patterns:
-            matches = re.findall(pattern, clean_output, re.IGNORECASE)
-            for match in matches:
-                if match and ("/" in match or "." in match):
-                    suspected_paths.append(match)
+        for match in _FILE_CHANGE_MATCHER.values(clean_output, lowered_output):
+            if match and ("/" in match or "." in match):
+                suspected_paths.append(match)
 
         # Deduplicate paths
         suspected_paths = list(set(suspected_paths))
 
+        # If regex found nothing and task succeeded, diff the pre-run snapshot
+        if not suspected_paths and success and snapshot is not None:
+            suspected_paths = snapshot.changed_paths()
+
         # Build summary
         if success:
             if suspected_paths:
@@ -280,10 +284,7 @@ class ClaudeStrategy:
         # Build notes from error messages
         notes = ""
         if not success:
-            if (
-                "not authenticated" in combined_output.lower()
-                or "authentication" in combined_output.lower()
-            ):
+            if "not authenticated" in lowered_output or "authentication" in lowered_output:
                 notes = "❌ Authentication failed. Run 'claude auth' to authenticate."
                 summary = "❌ Authentication error"
             elif error_msg:
@@ -334,3 +335,17 @@ class ClaudeStrategy:
             "sequential": 900,  # 15 minutes
             "parallel": 600,  # 10 minutes (Claude Code is single-threaded)
         }.get(task_type, 600)
+
+    def get_inactivity_timeout(self, task_type: str) -> float | None:
+        """Get output inactivity timeout for task type.
+
+        Claude Code in --print mode writes its response only when it finishes,
+        so silence is expected and only the maximum timeout applies.
+
+        Args:
+            task_type: Type of task ('quick', 'sequential', 'parallel').
+
+        Returns:
+            None (inactivity timeout disabled).
+        """
+        return None
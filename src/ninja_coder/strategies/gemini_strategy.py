@@ -8,8 +8,6 @@ which provides fast, accurate code completion and editing.
 from __future__ import annotations
 
 import os
-import re
-import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -18,14 +16,58 @@ from ninja_coder.strategies.base import (
     CLICommandResult,
     ParsedResult,
 )
+from ninja_coder.strategies.matcher import PatternMatcher, error_context
 from ninja_common.logging_utils import get_logger
 
 
 if TYPE_CHECKING:
+    from ninja_coder.change_detection import WorkspaceSnapshot
     from ninja_coder.driver import NinjaConfig
 
 logger = get_logger(__name__)
 
+_FILE_CHANGE_MATCHER = PatternMatcher(
+    [
+        r"(?:wrote|created|modified|updated|edited)\s+['\"]?([^'\"]+)['\"]?",
+        r"(?:writing|creating|modifying|updating|editing)\s+['\"]?([^'\"]+)['\"]?",
+        r"file:\s*['\"]?([^'\"]+)['\"]?",
+    ]
+)
+
+# Gemini-specific errors (comprehensive)
+_ERROR_MATCHER = PatternMatcher(
+    [
+        # Authentication and authorization errors (HIGH PRIORITY)
+        ("auth", r"AuthenticationError"),
+        ("auth", r"authentication\s+failed"),
+        ("auth", r"User\s+not\s+found"),
+        ("auth", r"Unauthorized"),
+        ("auth", r"401"),
+        ("auth", r"403\s+Forbidden"),
+        ("auth", r"invalid\s+api\s+key"),
+        ("auth", r"api\s+key.*?(not\s+found|invalid|missing)"),
+        # Credit and billing errors (HIGH PRIORITY)
+        ("billing", r"insufficient\s+credits"),
+        ("billing", r"requires\s+more\s+credits"),
+        ("billing", r"can\s+only\s+afford"),
+        ("billing", r"credit\s+limit"),
+        ("billing", r"billing\s+error"),
+        ("billing", r"payment\s+required"),
+        # General API errors (HIGH PRIORITY)
+        ("api", r"APIError"),
+        ("api", r"api\s+error"),
+        ("api", r"API\s+request\s+failed"),
+        # Rate limiting and quotas
+        ("retryable", r"rate\s+limit"),
+        ("retryable", r"quota\s+exceeded"),
+        ("context", r"context\s+limit"),
+        ("retryable", r"timeout"),
+        # Model errors
+        ("model", r"model\s+not\s+found"),
+        ("model", r"invalid\s+model"),
+    ]
+)
+
 
 class GeminiStrategy:
     """Strategy for Google Gemini CLI tool.
@@ -53,6 +95,7 @@ class GeminiStrategy:
             supports_native_zai=False,
             max_context_files=50,
             preferred_task_types=["quick", "sequential"],
+            model_prefixes=("gemini-",),  # Google model names only
         )
 
     @property
@@ -136,6 +179,7 @@ class GeminiStrategy:
         stderr: str,
         exit_code: int,
         repo_root: str | None = None,
+        snapshot: WorkspaceSnapshot | None = None,
     ) -> ParsedResult:
         """Parse Gemini output to extract results.
 
@@ -144,6 +188,8 @@ class GeminiStrategy:
             stderr: Standard error from Gemini execution.
             exit_code: Process exit code.
             repo_root: Repository root path (optional, used for file verification).
+            snapshot: Workspace snapshot taken before the run (optional, used to
+                detect touched files when the output names none).
 
         Returns:
             ParsedResult with success status, summary, and file changes.
@@ -151,18 +197,13 @@ class GeminiStrategy:
         success = exit_code == 0
         combined_output = stdout + "\n" + stderr
 
+        lowered_output = combined_output.lower()
+
         # Extract file changes (similar to Aider pattern)
         suspected_paths: list[str] = []
-        file_patterns = [
-            r"(?:wrote|created|modified|updated|edited)\s+['\"]?([^'\"]+)['\"]?",
-            r"(?:writing|creating|modifying|updating|editing)\s+['\"]?([^'\"]+)['\"]?",
-            r"file:\s*['\"]?([^'\"]+)['\"]?",
-        ]
-        for pattern in file_patterns:
-            matches = re.findall(pattern, combined_output, re.IGNORECASE)
-            for match in matches:
-                if match and ("/" in match or "." in match):
-                    suspected_paths.append(match)
+        for match in _FILE_CHANGE_MATCHER.values(combined_output, lowered_output):
+            if match and ("/" in match or "." in match):
+                suspected_paths.append(match)
 
         # Deduplicate paths
         suspected_paths = list(set(suspected_paths))
@@ -185,82 +226,24 @@ class GeminiStrategy:
 
             suspected_paths = verified_paths
 
-            # If regex found nothing and task succeeded, scan for recent file changes
+            # If regex found nothing and task succeeded, diff the pre-run snapshot
             # This fallback catches files when regex pattern matching fails
-            if not suspected_paths and success:
-                cutoff_time = time.time() - 60  # Files modified in last 60 seconds
-                recent_files: list[str] = []
-                try:
-                    for root, dirs, files in os.walk(repo_root):
-                        # Skip hidden directories (including .git, .cache, etc.)
-                        dirs[:] = [d for d in dirs if not d.startswith('.')]
-                        for file in files:
-                            file_path = Path(root) / file
-                            try:
-                                if file_path.stat().st_mtime > cutoff_time:
-                                    recent_files.append(str(file_path.relative_to(repo_root)))
-                            except (OSError, ValueError):
-                                # Skip files we can't stat (permission errors, etc.)
-                                continue
-
-                    if recent_files:
-                        suspected_paths = recent_files[:10]  # Limit to 10 most recent
-                        logger.info(
-                            f"Detected {len(recent_files)} recently modified files via filesystem scan"
-                        )
-                except Exception as e:
-                    logger.warning(f"Filesystem scan failed: {e}")
-
-        # Detect Gemini-specific errors (comprehensive)
-        gemini_error_patterns = [
-            # Authentication and authorization errors (HIGH PRIORITY)
-            r"AuthenticationError",
-            r"authentication\s+failed",
-            r"User\s+not\s+found",
-            r"Unauthorized",
-            r"401",
-            r"403\s+Forbidden",
-            r"invalid\s+api\s+key",
-            r"api\s+key.*?(not\s+found|invalid|missing)",
-            # Credit and billing errors (HIGH PRIORITY)
-            r"insufficient\s+credits",
-            r"requires\s+more\s+credits",
-            r"can\s+only\s+afford",
-            r"credit\s+limit",
-            r"billing\s+error",
-            r"payment\s+required",
-            # General API errors (HIGH PRIORITY)
-            r"APIError",
-            r"api\s+error",
-            r"API\s+request\s+failed",
-            # Rate limiting and quotas
-            r"rate\s+limit",
-            r"quota\s+exceeded",
-            r"context\s+limit",
-            r"timeout",
-            # Model errors
-            r"model\s+not\s+found",
-            r"invalid\s+model",
-        ]
+            if not suspected_paths and success and snapshot is not None:
+                suspected_paths = snapshot.changed_paths()
+                if suspected_paths:
+                    logger.info(
+                        f"Detected {len(suspected_paths)} modified files via workspace snapshot"
+                    )
 
         retryable_error = False
         error_msg = ""
 
-        for pattern in gemini_error_patterns:
-            match = re.search(pattern, combined_output, re.IGNORECASE)
-            if match:
-                # Rate limits and timeouts are retryable
-                if any(
-                    retry_word in pattern.lower() for retry_word in ["rate", "timeout", "quota"]
-                ):
-                    retryable_error = True
-
-                # Extract context around error
-                start = max(0, match.start() - 80)
-                end = min(len(combined_output), match.end() + 80)
-                error_msg = combined_output[start:end].strip()
-                error_msg = " ".join(error_msg.split())
-                break
+        error_hit = _ERROR_MATCHER.first(combined_output, lowered_output)
+        if error_hit:
+            # Rate limits, quotas and timeouts are retryable
+            retryable_error = error_hit.label == "retryable"
+            # Extract context around error
+            error_msg = error_context(combined_output, error_hit, 80)
 
         # Build summary
         if success:
@@ -310,9 +293,7 @@ class GeminiStrategy:
         if success and not suspected_paths and len(combined_output) > 100:
             # Check if output suggests files should have been created/modified
             action_keywords = ["write", "creat", "modif", "updat", "edit", "add", "implement"]
-            has_action_intent = any(
-                keyword in combined_output.lower() for keyword in action_keywords
-            )
+            has_action_intent = any(keyword in lowered_output for keyword in action_keywords)
 
             # If there was intent to modify files but none were touched (neither via
             # regex patterns nor filesystem scan), mark as failure
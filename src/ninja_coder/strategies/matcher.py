@@ -0,0 +1,333 @@
+"""
+Precompiled multi-pattern matcher shared by CLI strategies.
+
+Strategies classify CLI output against lists of regexes (error patterns,
+file-change patterns, session patterns). Running ``re.search`` once per
+pattern means one full pass over the transcript per pattern, which gets
+expensive on multi-MB outputs as the lists grow.
+
+``PatternMatcher`` compiles a pattern set once. Each pattern is reduced to
+the literal text every match must start with (its "anchor"), and all
+anchors are combined into a single alternation. One pass of that
+alternation over the output finds every candidate position; the full
+pattern is then only tried at those positions. Patterns without a literal
+anchor fall back to their own compiled regex.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+_REGEX_META = frozenset(".^$*+?{}[]|()\\")
+_QUANTIFIERS = frozenset("?*{")
+
+
+@dataclass(frozen=True)
+class PatternHit:
+    """A single pattern match found while scanning output."""
+
+    label: str
+    """Classification label of the pattern that matched."""
+
+    index: int
+    """Position of the pattern in the matcher (lower = higher priority)."""
+
+    start: int
+    """Start offset of the match in the scanned text."""
+
+    end: int
+    """End offset of the match in the scanned text."""
+
+    groups: tuple[str | None, ...] = ()
+    """Capture groups of the match."""
+
+    text: str = ""
+    """The whole matched text."""
+
+    @property
+    def value(self) -> str:
+        """First capture group, or the whole match for patterns without groups.
+
+        Like ``re.findall`` for patterns with at most one group; an unmatched
+        group gives the empty string.
+        """
+        return (self.groups[0] or "") if self.groups else self.text
+
+
+def _split_top_level(pattern: str) -> list[str] | None:
+    """Split ``pattern`` on top-level ``|``; None if it cannot be analyzed."""
+    parts: list[str] = []
+    depth = 0
+    in_class = False
+    current: list[str] = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            current.append(pattern[i : i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            parts.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(ch)
+        i += 1
+    if depth != 0 or in_class:
+        return None
+    parts.append("".join(current))
+    return parts
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the literal text every match of ``pattern`` must start with."""
+    literal: list[str] = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            escaped = pattern[i + 1 : i + 2]
+            if not escaped or escaped.isalnum():
+                break  # Character class (\s, \d, ...) or backreference
+            nxt = i + 2
+            char = escaped
+        elif ch in _REGEX_META:
+            break
+        else:
+            nxt = i + 1
+            char = ch
+        if pattern[nxt : nxt + 1] in _QUANTIFIERS:
+            break  # Optional/repeated character cannot be part of the anchor
+        literal.append(char)
+        i = nxt
+    return "".join(literal)
+
+
+def _anchors_for(pattern: str) -> list[str]:
+    """Compute the anchor literals for a pattern.
+
+    Returns an empty list when the pattern has no usable anchor (it must
+    then be scanned on its own).
+    """
+    if pattern.startswith("(?") and not pattern.startswith("(?:"):
+        return []  # Inline flags, lookarounds, named groups: don't guess
+
+    if _split_top_level(pattern) != [pattern]:
+        return []
+
+    # Leading group of plain literal alternatives: "(?:wrote|created)\s+..."
+    if pattern.startswith(("(?:", "(")):
+        open_len = 3 if pattern.startswith("(?:") else 1
+        close = pattern.find(")")
+        body = pattern[open_len:close] if close != -1 else ""
+        alternatives = body.split("|")
+        if (
+            close != -1
+            and pattern[close + 1 : close + 2] not in _QUANTIFIERS
+            and all(alt and not (_REGEX_META & set(alt)) for alt in alternatives)
+        ):
+            return alternatives
+        return []
+
+    prefix = _literal_prefix(pattern)
+    return [prefix] if prefix else []
+
+
+class PatternMatcher:
+    """Pattern set compiled once and scanned in a single pass.
+
+    Patterns keep their list order as priority: ``first()`` returns the
+    same match as looping over the patterns with ``re.search`` and stopping
+    at the first pattern that matches, and ``values()`` returns the same
+    strings as concatenating ``re.findall`` over every pattern (for patterns
+    with several groups, only the first group is kept).
+
+    Example:
+        matcher = PatternMatcher([("retryable", r"rate\\s+limit"), ("auth", r"401")])
+        hit = matcher.first(output)
+        if hit and hit.label == "retryable":
+            ...
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[str | tuple[str, str]],
+        flags: int = re.IGNORECASE,
+    ):
+        """Compile a pattern set.
+
+        Args:
+            patterns: Regexes in priority order, either bare strings (the
+                pattern doubles as its label) or ``(label, pattern)`` tuples.
+            flags: Regex flags applied to every pattern.
+        """
+        self.flags = flags
+        self._ignore_case = bool(flags & re.IGNORECASE)
+        self.labels: list[str] = []
+        self.patterns: list[str] = []
+        self._compiled: list[re.Pattern[str]] = []
+        self._unanchored: list[int] = []
+
+        by_anchor: dict[str, list[int]] = {}
+        for index, entry in enumerate(patterns):
+            label, pattern = (entry, entry) if isinstance(entry, str) else entry
+            self.labels.append(label)
+            self.patterns.append(pattern)
+            self._compiled.append(re.compile(pattern, flags))
+
+            anchors = _anchors_for(pattern)
+            if not anchors:
+                self._unanchored.append(index)
+                continue
+            for anchor in anchors:
+                key = anchor.lower() if self._ignore_case else anchor
+                by_anchor.setdefault(key, []).append(index)
+
+        # A hit on an anchor also tries every pattern whose anchor is a prefix
+        # of it ("api" patterns are candidates where "apierror" matched).
+        self._candidates: dict[str, list[int]] = {
+            anchor: sorted(
+                {i for other, idxs in by_anchor.items() if anchor.startswith(other) for i in idxs}
+            )
+            for anchor in by_anchor
+        }
+
+        self._anchor_regex: re.Pattern[str] | None = None
+        self._anchor_regex_nocase: re.Pattern[str] | None = None
+        if by_anchor:
+            # Longest first so the alternation reports the most specific anchor;
+            # the lookahead keeps matches zero-width so overlapping anchors are seen.
+            alternation = "|".join(
+                re.escape(anchor) for anchor in sorted(by_anchor, key=len, reverse=True)
+            )
+            self._anchor_regex = re.compile(f"(?=({alternation}))")
+            if self._ignore_case:
+                self._anchor_regex_nocase = re.compile(f"(?=({alternation}))", re.IGNORECASE)
+
+    def __len__(self) -> int:
+        """Number of patterns in the set."""
+        return len(self.patterns)
+
+    def scan(self, text: str, lowered: str | None = None) -> list[PatternHit]:
+        """Find every hit of every pattern in a single pass.
+
+        Hits of the same pattern never overlap (like ``re.finditer``).
+
+        Args:
+            text: Text to scan.
+            lowered: ``text.lower()``, if the caller already has it.
+
+        Returns:
+            All hits ordered by position, then by pattern priority.
+        """
+        hits: list[PatternHit] = []
+
+        if self._anchor_regex is not None:
+            anchor_regex = self._anchor_regex
+            haystack = text
+            fold_anchor = False
+            if self._ignore_case:
+                if lowered is None:
+                    lowered = text.lower()
+                if len(lowered) == len(text):
+                    haystack = lowered
+                else:
+                    # Case folding changed offsets (rare unicode); match anchors in place
+                    anchor_regex = self._anchor_regex_nocase  # type: ignore[assignment]
+                    fold_anchor = True
+
+            next_allowed = [0] * len(self.patterns)
+            for anchor_match in anchor_regex.finditer(haystack):
+                pos = anchor_match.start()
+                anchor = anchor_match.group(1)
+                if fold_anchor:
+                    anchor = anchor.lower()
+                for index in self._candidates[anchor]:
+                    if pos < next_allowed[index]:
+                        continue
+                    match = self._compiled[index].match(text, pos)
+                    if match is None:
+                        continue
+                    hits.append(self._hit(index, match))
+                    next_allowed[index] = max(match.end(), pos + 1)
+
+        for index in self._unanchored:
+            hits.extend(self._hit(index, match) for match in self._compiled[index].finditer(text))
+
+        if self._unanchored:
+            hits.sort(key=lambda hit: (hit.start, hit.index))
+        return hits
+
+    def first(self, text: str, lowered: str | None = None) -> PatternHit | None:
+        """Return the earliest hit of the highest-priority matching pattern.
+
+        Args:
+            text: Text to scan.
+            lowered: ``text.lower()``, if the caller already has it.
+
+        Returns:
+            The hit, or None if no pattern matches.
+        """
+        best: PatternHit | None = None
+        for hit in self.scan(text, lowered):
+            if best is None or hit.index < best.index:
+                best = hit
+                if best.index == 0:
+                    break
+        return best
+
+    def values(self, text: str, lowered: str | None = None) -> list[str]:
+        """Return the first capture group (or whole match) of every hit, in pattern order.
+
+        Args:
+            text: Text to scan.
+            lowered: ``text.lower()``, if the caller already has it.
+
+        Returns:
+            Captured values grouped by pattern priority, then by position.
+        """
+        hits = sorted(self.scan(text, lowered), key=lambda hit: (hit.index, hit.start))
+        return [hit.value for hit in hits]
+
+    def _hit(self, index: int, match: re.Match[str]) -> PatternHit:
+        """Build a PatternHit from a regex match."""
+        return PatternHit(
+            label=self.labels[index],
+            index=index,
+            start=match.start(),
+            end=match.end(),
+            groups=match.groups(),
+            text=match.group(0),
+        )
+
+
+def error_context(text: str, hit: PatternHit, radius: int) -> str:
+    """Extract whitespace-normalized context around a hit.
+
+    Args:
+        text: Text the hit was found in.
+        hit: The pattern hit.
+        radius: Characters of context to keep on each side.
+
+    Returns:
+        Context snippet with runs of whitespace collapsed.
+    """
+    start = max(0, hit.start - radius)
+    end = min(len(text), hit.end + radius)
+    return " ".join(text[start:end].split())
@@ -9,7 +9,6 @@ from __future__ import annotations
 
 import os
 import re
-import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -19,14 +18,84 @@ from ninja_coder.strategies.base import (
     CLICommandResult,
     ParsedResult,
 )
+from ninja_coder.strategies.matcher import PatternMatcher, error_context
 from ninja_common.logging_utils import get_logger
 
 
 if TYPE_CHECKING:
+    from ninja_coder.change_detection import WorkspaceSnapshot
     from ninja_coder.driver import NinjaConfig
 
 logger = get_logger(__name__)
 
+_ANSI_ESCAPE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+
+# Provider prefixes OpenCode resolves itself; other ids get NINJA_CODER_OPENCODE_PROVIDER
+_PROVIDER_PREFIXES = (
+    "openrouter/",
+    "anthropic/",
+    "openai/",
+    "google/",
+    "zhipu/",
+    "zai/",
+    "deepseek/",
+    "cohere/",
+    "mistral/",
+)
+
+# OpenCode-specific error patterns (comprehensive)
+_ERROR_MATCHER = PatternMatcher(
+    [
+        # Authentication and authorization errors (HIGH PRIORITY)
+        ("auth", r"AuthenticationError"),
+        ("auth", r"authentication\s+failed"),
+        ("auth", r"User\s+not\s+found"),
+        ("auth", r"Unauthorized"),
+        ("auth", r"401"),
+        ("auth", r"403\s+Forbidden"),
+        ("auth", r"invalid\s+api\s+key"),
+        ("auth", r"api\s+key.*?(not\s+found|invalid|missing)"),
+        # Credit and billing errors (HIGH PRIORITY)
+        ("billing", r"insufficient\s+credits"),
+        ("billing", r"requires\s+more\s+credits"),
+        ("billing", r"can\s+only\s+afford"),
+        ("billing", r"credit\s+limit"),
+        ("billing", r"billing\s+error"),
+        ("billing", r"payment\s+required"),
+        # General API errors (HIGH PRIORITY)
+        ("api", r"APIError"),
+        ("api", r"OpenrouterException"),
+        ("api", r"litellm\..*?Error"),
+        ("api", r"API\s+request\s+failed"),
+        ("api", r"api\s+error"),
+        # Rate limiting and timeouts
+        ("retryable", r"rate\s+limit"),
+        ("retryable", r"timeout"),
+        ("retryable", r"connection\s+refused"),
+        # Model errors
+        ("model", r"model\s+not\s+found"),
+        ("model", r"invalid\s+model"),
+    ]
+)
+
+_FILE_CHANGE_MATCHER = PatternMatcher(
+    [
+        r"(?:wrote|created|modified|updated|edited)\s+['\"]?([^\s'\"]+)['\"]?",
+        r"(?:writing|creating|modifying|updating|editing)\s+['\"]?([^\s'\"]+)['\"]?",
+        r"file:\s*['\"]?([^\s'\"]+)['\"]?",
+        # OpenCode-specific tool call format: "| Edit     filename.py"
+        r"\|\s+(?:Edit|Write|NotebookEdit)\s+([^\s]+)",
+    ]
+)
+
+_SESSION_MATCHER = PatternMatcher(
+    [
+        r"Session:\s+(\S+)",
+        r"session.*?:\s*(\S+)",
+        r"session[_-]id[:\s]+(\S+)",
+    ]
+)
+
 
 class DialogueSession:
     """Manages a persistent dialogue session for multi-turn conversations."""
@@ -113,6 +182,7 @@ class OpenCodeStrategy:
             supports_dialogue_mode=True,  # Supports persistent dialogue sessions
             max_context_files=100,
             preferred_task_types=["parallel", "sequential"],  # Also supports sequential
+            model_prefixes=_PROVIDER_PREFIXES,
         )
 
     @property
@@ -167,8 +237,7 @@ class OpenCodeStrategy:
         opencode_provider = os.environ.get("NINJA_CODER_OPENCODE_PROVIDER", "openrouter")
 
         # Check if model already has a known provider prefix
-        known_providers = ["openrouter", "anthropic", "openai", "google", "zhipu", "zai", "deepseek", "cohere", "mistral"]
-        has_provider = any(model_name.startswith(f"{p}/") for p in known_providers)
+        has_provider = model_name.startswith(_PROVIDER_PREFIXES)
 
         if not has_provider and opencode_provider:
             # Model doesn't have provider prefix, add it
@@ -272,6 +341,7 @@ class OpenCodeStrategy:
         stderr: str,
         exit_code: int,
         repo_root: str | None = None,
+        snapshot: WorkspaceSnapshot | None = None,
     ) -> ParsedResult:
         """Parse OpenCode output.
 
@@ -283,6 +353,8 @@ class OpenCodeStrategy:
             stderr: Standard error from OpenCode execution.
             exit_code: Exit code from OpenCode execution.
             repo_root: Repository root path (optional, used for file verification).
+            snapshot: Workspace snapshot taken before the run (optional, used to
+                detect touched files when the output names none).
 
         Returns:
             ParsedResult with success status, summary, and file changes.
@@ -290,77 +362,25 @@ class OpenCodeStrategy:
         success = exit_code == 0
         combined_output = stdout + "\n" + stderr
 
-        # OpenCode-specific error patterns (comprehensive)
-        error_patterns = [
-            # Authentication and authorization errors (HIGH PRIORITY)
-            r"AuthenticationError",
-            r"authentication\s+failed",
-            r"User\s+not\s+found",
-            r"Unauthorized",
-            r"401",
-            r"403\s+Forbidden",
-            r"invalid\s+api\s+key",
-            r"api\s+key.*?(not\s+found|invalid|missing)",
-            # Credit and billing errors (HIGH PRIORITY)
-            r"insufficient\s+credits",
-            r"requires\s+more\s+credits",
-            r"can\s+only\s+afford",
-            r"credit\s+limit",
-            r"billing\s+error",
-            r"payment\s+required",
-            # General API errors (HIGH PRIORITY)
-            r"APIError",
-            r"OpenrouterException",
-            r"litellm\..*?Error",
-            r"API\s+request\s+failed",
-            r"api\s+error",
-            # Rate limiting and timeouts
-            r"rate\s+limit",
-            r"timeout",
-            r"connection\s+refused",
-            # Model errors
-            r"model\s+not\s+found",
-            r"invalid\s+model",
-        ]
+        # Strip ANSI color codes once so every pattern sees clean text
+        clean_output = _ANSI_ESCAPE.sub("", combined_output)
+        lowered_output = clean_output.lower()
 
         retryable_error = False
         error_msg = ""
 
-        for pattern in error_patterns:
-            match = re.search(pattern, combined_output, re.IGNORECASE)
-            if match:
-                # Rate limits and timeouts are retryable
-                if any(
-                    retry_pattern in pattern
-                    for retry_pattern in [r"rate\s+limit", "timeout", r"connection\s+refused"]
-                ):
-                    retryable_error = True
-
-                # Extract context around the error
-                start = max(0, match.start() - 60)
-                end = min(len(combined_output), match.end() + 60)
-                error_msg = combined_output[start:end].strip()
-                error_msg = " ".join(error_msg.split())
-                break
+        error_hit = _ERROR_MATCHER.first(clean_output, lowered_output)
+        if error_hit:
+            # Rate limits and timeouts are retryable
+            retryable_error = error_hit.label == "retryable"
+            # Extract context around the error
+            error_msg = error_context(clean_output, error_hit, 60)
 
         # Extract file changes (similar pattern to Aider)
-        # First, strip ANSI color codes for easier pattern matching
-        ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-        clean_output = ansi_escape.sub("", combined_output)
-
         suspected_paths: list[str] = []
-        file_patterns = [
-            r"(?:wrote|created|modified|updated|edited)\s+['\"]?([^\s'\"]+)['\"]?",
-            r"(?:writing|creating|modifying|updating|editing)\s+['\"]?([^\s'\"]+)['\"]?",
-            r"file:\s*['\"]?([^\s'\"]+)['\"]?",
-            # OpenCode-specific tool call format: "| Edit     filename.py"
-            r"\|\s+(?:Edit|Write|NotebookEdit)\s+([^\s]+)",
-        ]
-        for pattern in file_patterns:
-            matches = re.findall(pattern, clean_output, re.IGNORECASE)
-            for match in matches:
-                if match and ("/" in match or "." in match):
-                    suspected_paths.append(match)
+        for match in _FILE_CHANGE_MATCHER.values(clean_output, lowered_output):
+            if match and ("/" in match or "." in match):
+                suspected_paths.append(match)
 
         # Deduplicate paths
         suspected_paths = list(set(suspected_paths))
@@ -383,45 +403,21 @@ class OpenCodeStrategy:
 
             suspected_paths = verified_paths
 
-            # If regex found nothing and task succeeded, scan for recent file changes
+            # If regex found nothing and task succeeded, diff the pre-run snapshot
             # This fallback catches files when regex pattern matching fails
-            if not suspected_paths and success:
-                cutoff_time = time.time() - 60  # Files modified in last 60 seconds
-                recent_files: list[str] = []
-                try:
-                    for root, dirs, files in os.walk(repo_root):
-                        # Skip hidden directories (including .git, .cache, etc.)
-                        dirs[:] = [d for d in dirs if not d.startswith('.')]
-                        for file in files:
-                            file_path = Path(root) / file
-                            try:
-                                if file_path.stat().st_mtime > cutoff_time:
-                                    recent_files.append(str(file_path.relative_to(repo_root)))
-                            except (OSError, ValueError):
-                                # Skip files we can't stat (permission errors, etc.)
-                                continue
-
-                    if recent_files:
-                        suspected_paths = recent_files[:10]  # Limit to 10 most recent
-                        logger.info(
-                            f"Detected {len(recent_files)} recently modified files via filesystem scan"
-                        )
-                except Exception as e:
-                    logger.warning(f"Filesystem scan failed: {e}")
+            if not suspected_paths and success and snapshot is not None:
+                suspected_paths = snapshot.changed_paths()
+                if suspected_paths:
+                    logger.info(
+                        f"Detected {len(suspected_paths)} modified files via workspace snapshot"
+                    )
 
         # Extract session ID from output
         session_id = None
-        session_patterns = [
-            r"Session:\s+(\S+)",
-            r"session.*?:\s*(\S+)",
-            r"session[_-]id[:\s]+(\S+)",
-        ]
-        for pattern in session_patterns:
-            match = re.search(pattern, clean_output, re.IGNORECASE)
-            if match:
-                session_id = match.group(1)
-                logger.debug(f"Extracted session ID: {session_id}")
-                break
+        session_hit = _SESSION_MATCHER.first(clean_output, lowered_output)
+        if session_hit:
+            session_id = session_hit.value
+            logger.debug(f"Extracted session ID: {session_id}")
 
         # Build summary
         if success:
@@ -473,9 +469,7 @@ class OpenCodeStrategy:
         if success and not suspected_paths and len(combined_output) > 100:
             # Check if output suggests files should have been created/modified
             action_keywords = ["write", "creat", "modif", "updat", "edit", "add", "implement"]
-            has_action_intent = any(
-                keyword in combined_output.lower() for keyword in action_keywords
-            )
+            has_action_intent = any(keyword in lowered_output for keyword in action_keywords)
 
             # If there was intent to modify files but none were touched (neither via
             # regex patterns nor filesystem scan), mark as failure
@@ -0,0 +1,232 @@
+"""
+History-driven timeout estimation for coder CLI runs.
+
+Static timeouts are either far too generous (hung runs hold a slot for many
+minutes) or too tight for big plans. ``TimeoutEstimator`` records how long
+CLI runs actually took, bucketed by (cli, model, task_type, step count,
+context size), and estimates the timeout for the next run as a high
+quantile of that history plus a safety margin.
+
+Until a bucket has enough samples, the caller's static default is used.
+History is stored per repository next to the task metrics
+(``<internal_dir>/metrics/durations.jsonl``).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from ninja_common.logging_utils import get_logger
+from ninja_common.path_utils import get_internal_dir
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+logger = get_logger(__name__)
+
+
+class CLITimeoutError(TimeoutError):
+    """Raised when a CLI run exceeds its maximum or inactivity timeout."""
+
+    def __init__(self, message: str, inactive: bool = False):
+        """
+        Initialize the error.
+
+        Args:
+            message: Human-readable reason.
+            inactive: True for the inactivity timeout, False for the maximum timeout.
+        """
+        super().__init__(message)
+        self.inactive = inactive
+
+
+@dataclass(frozen=True)
+class RunProfile:
+    """What a CLI run looks like, for timeout bucketing."""
+
+    cli: str
+    """CLI strategy name."""
+
+    model: str
+    """Model used for the run."""
+
+    task_type: str
+    """Task type ('quick', 'sequential_plan', 'parallel_plan', ...)."""
+
+    steps: int = 1
+    """Number of plan steps in the run."""
+
+    context_chars: int = 0
+    """Size of the prompt sent to the CLI."""
+
+    def bucket(self) -> str:
+        """History bucket key (step count and context size on a log scale)."""
+        steps_bucket = self.steps if self.steps <= 3 else 1 << (self.steps - 1).bit_length()
+        context_bucket = (self.context_chars // 1024).bit_length()
+        return f"{self.cli}|{self.model}|{self.task_type}|s{steps_bucket}|c{context_bucket}"
+
+
+class TimeoutEstimator:
+    """Learns per-profile run durations and turns them into timeouts."""
+
+    MAX_SAMPLES: ClassVar[int] = 50
+    """Samples kept per bucket (most recent)."""
+
+    COMPACT_AFTER_LINES: ClassVar[int] = 5000
+    """Rewrite the history file once it grows past this many lines."""
+
+    def __init__(
+        self,
+        history_file: Path,
+        *,
+        quantile: float | None = None,
+        margin: float | None = None,
+        min_samples: int | None = None,
+        min_timeout: int | None = None,
+        max_timeout: int | None = None,
+    ):
+        """
+        Initialize the estimator.
+
+        Args:
+            history_file: JSONL file with recorded run durations.
+            quantile: Duration quantile to cover (default: NINJA_TIMEOUT_QUANTILE or 0.95).
+            margin: Multiplier applied to the quantile (default: NINJA_TIMEOUT_MARGIN or 1.5).
+            min_samples: Samples needed before history overrides the default
+                (default: NINJA_TIMEOUT_MIN_SAMPLES or 5).
+            min_timeout: Lower bound for estimates in seconds
+                (default: NINJA_MIN_TIMEOUT_SEC or 60).
+            max_timeout: Upper bound for estimates in seconds
+                (default: NINJA_MAX_TIMEOUT_SEC or 3600).
+        """
+        self.history_file = history_file
+        self.quantile = quantile or float(os.environ.get("NINJA_TIMEOUT_QUANTILE", "0.95"))
+        self.margin = margin or float(os.environ.get("NINJA_TIMEOUT_MARGIN", "1.5"))
+        self.min_samples = min_samples or int(os.environ.get("NINJA_TIMEOUT_MIN_SAMPLES", "5"))
+        self.min_timeout = min_timeout or int(os.environ.get("NINJA_MIN_TIMEOUT_SEC", "60"))
+        self.max_timeout = max_timeout or int(os.environ.get("NINJA_MAX_TIMEOUT_SEC", "3600"))
+
+        self._samples: dict[str, deque[float]] | None = None
+        self._lines = 0
+
+    @classmethod
+    def for_repo(cls, repo_root: str | Path) -> TimeoutEstimator:
+        """Create an estimator backed by the repository's metrics directory."""
+        return cls(get_internal_dir(repo_root) / "metrics" / "durations.jsonl")
+
+    def estimate(self, profile: RunProfile, default: int) -> int:
+        """
+        Estimate the maximum timeout for a run.
+
+        Args:
+            profile: Run profile.
+            default: Static timeout used while history is insufficient.
+
+        Returns:
+            Timeout in seconds.
+        """
+        key = profile.bucket()
+        durations = self._load().get(key)
+        if not durations or len(durations) < self.min_samples:
+            return default
+
+        learned = _quantile(sorted(durations), self.quantile) * self.margin
+        timeout = int(min(max(learned, self.min_timeout), self.max_timeout))
+        logger.debug(
+            f"Adaptive timeout {timeout}s for {key} ({len(durations)} samples, default {default}s)"
+        )
+        return timeout
+
+    def record(self, profile: RunProfile, duration_sec: float, timed_out: bool = False) -> None:
+        """
+        Record a finished run.
+
+        Args:
+            profile: Run profile.
+            duration_sec: Wall-clock duration of the run.
+            timed_out: Whether the run hit its maximum timeout (the duration is
+                then a lower bound, which still pushes the estimate up).
+        """
+        self._load()[profile.bucket()].append(duration_sec)
+
+        entry = {
+            "timestamp": time.time(),
+            "cli": profile.cli,
+            "model": profile.model,
+            "task_type": profile.task_type,
+            "steps": profile.steps,
+            "context_chars": profile.context_chars,
+            "duration_sec": round(duration_sec, 2),
+            "timed_out": timed_out,
+        }
+        try:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            with self.history_file.open("a") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._lines += 1
+            if self._lines > self.COMPACT_AFTER_LINES:
+                self._compact()
+        except OSError as e:
+            logger.warning(f"Failed to record run duration: {e}")
+
+    def _load(self) -> dict[str, deque[float]]:
+        """Load history from disk on first use."""
+        if self._samples is not None:
+            return self._samples
+
+        self._samples = defaultdict(lambda: deque(maxlen=self.MAX_SAMPLES))
+        if not self.history_file.exists():
+            return self._samples
+
+        try:
+            with self.history_file.open() as f:
+                for line in f:
+                    self._lines += 1
+                    entry = _parse_entry(line)
+                    if entry is None:
+                        continue
+                    profile, duration = entry
+                    self._samples[profile.bucket()].append(duration)
+        except OSError as e:
+            logger.warning(f"Failed to load run durations: {e}")
+        return self._samples
+
+    def _compact(self) -> None:
+        """Keep only the most recent entries in the history file."""
+        keep = self.COMPACT_AFTER_LINES // 2
+        with self.history_file.open() as f:
+            lines = deque(f, maxlen=keep)
+        tmp_file = self.history_file.with_suffix(".tmp")
+        tmp_file.write_text("".join(lines))
+        tmp_file.replace(self.history_file)
+        self._lines = len(lines)
+
+
+def _parse_entry(line: str) -> tuple[RunProfile, float] | None:
+    """Parse one history line into (profile, duration)."""
+    try:
+        data: dict[str, Any] = json.loads(line)
+        profile = RunProfile(
+            cli=data["cli"],
+            model=data["model"],
+            task_type=data["task_type"],
+            steps=int(data.get("steps", 1)),
+            context_chars=int(data.get("context_chars", 0)),
+        )
+        return profile, float(data["duration_sec"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _quantile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank quantile of pre-sorted values."""
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
@@ -15,8 +15,9 @@ import time
 import uuid
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
-from ninja_coder.driver import InstructionBuilder, NinjaDriver, NinjaResult
+from ninja_coder.driver import InstructionBuilder, NinjaDriver, NinjaResult, PreparedTask
 from ninja_coder.models import (
     AgentInfo,
     ApplyPatchRequest,
@@ -37,10 +38,14 @@ from ninja_coder.models import (
     StepResult,
     TestResult,
 )
+from ninja_coder.retry import RetryPolicy, classify_failure
+from ninja_coder.scheduler import TaskPriority, TaskScheduler, get_task_scheduler
+from ninja_common.inflight import InFlightRegistry, request_key
 from ninja_common.logging_utils import get_logger
 from ninja_common.metrics import MetricsTracker, create_task_metrics
 from ninja_common.path_utils import validate_repo_root
 from ninja_common.security import InputValidator, monitored, rate_limited
+from ninja_common.spans import current_trace, record_span, span, traced
 
 
 logger = get_logger(__name__)
@@ -56,14 +61,63 @@ class ToolExecutor:
     IMPORTANT: All responses are kept concise - only summaries, never source code.
     """
 
-    def __init__(self, driver: NinjaDriver | None = None):
+    def __init__(self, driver: NinjaDriver | None = None, scheduler: TaskScheduler | None = None):
         """
         Initialize the tool executor.
 
         Args:
             driver: NinjaDriver instance. If None, creates one from env.
+            scheduler: Admission scheduler for CLI runs. If None, uses the global one.
         """
         self.driver = driver or NinjaDriver()
+        self.scheduler = scheduler or get_task_scheduler()
+        # Duplicate simple_task calls attach to the running execution (in any
+        # worker); successful results are kept briefly so late retries don't
+        # re-run the CLI
+        self._simple_task_registry: InFlightRegistry[SimpleTaskResult] = InFlightRegistry(
+            result_ttl=float(os.environ.get("NINJA_RESULT_CACHE_TTL_SEC", "120")),
+            dump=lambda result: result.model_dump_json(),
+            load=SimpleTaskResult.model_validate_json,
+        )
+
+    async def _execute_scheduled(
+        self, priority: TaskPriority, repo_root: str, **kwargs: Any
+    ) -> NinjaResult:
+        """
+        Run the driver once the task scheduler admits the execution.
+
+        The admission (queue wait and a snapshot of the scheduler's queue
+        metrics) is written to the structured log.
+
+        Args:
+            priority: Scheduling priority.
+            repo_root: Repository root path.
+            **kwargs: Remaining NinjaDriver.execute_async arguments.
+
+        Returns:
+            Driver result.
+        """
+        queued = time.perf_counter()
+        async with self.scheduler.slot(repo_root, priority) as wait_sec:
+            record_span("queue_wait", queued)
+            self._log_admission(priority, repo_root, wait_sec, kwargs.get("step_id"))
+            return await self.driver.execute_async(repo_root=repo_root, **kwargs)
+
+    def _log_admission(
+        self, priority: TaskPriority, repo_root: str, wait_sec: float, step_id: str | None
+    ) -> None:
+        """Write a scheduler admission and the current queue metrics to the structured log."""
+        stats = self.scheduler.get_stats()
+        self.driver.structured_logger.info(
+            f"Task admitted after {wait_sec * 1000:.0f} ms "
+            f"(queue depth {stats['queue_depth']}, running {stats['running']})",
+            task_id=step_id,
+            event="scheduler_admission",
+            priority=TaskPriority(priority).name,
+            repo_root=repo_root,
+            wait_sec=round(wait_sec, 6),
+            scheduler=stats,
+        )
 
     def _result_to_step_result(self, step_id: str, result: NinjaResult) -> StepResult:
         """
@@ -91,7 +145,6 @@ class ToolExecutor:
         )
 
     @rate_limited(max_calls=50, time_window=60)
-    @monitored
     async def simple_task(
         self, request: SimpleTaskRequest, client_id: str = "default"
     ) -> SimpleTaskResult:
@@ -101,6 +154,10 @@ class ToolExecutor:
         This tool runs the AI code CLI in quick mode for fast code writing.
         The CLI has full responsibility for reading/writing files.
 
+        Identical requests (same idempotency key, or same repo, task and scope
+        when no key is given) share one execution: a duplicate attaches to the
+        running task, and a late retry gets the recent successful result.
+
         Returns ONLY a concise summary - NO source code is returned.
 
         Args:
@@ -114,6 +171,31 @@ class ToolExecutor:
             PermissionError: If rate limit is exceeded.
             ValueError: If inputs are invalid.
         """
+        if request.idempotency_key:
+            key = request_key("coder_simple_task", client_id, request.idempotency_key)
+        else:
+            key = request_key(
+                "coder_simple_task",
+                client_id,
+                os.path.normpath(request.repo_root),
+                request.task,
+                request.context_paths,
+                request.allowed_globs,
+                request.deny_globs,
+            )
+
+        return await self._simple_task_registry.run(
+            key,
+            lambda: self._execute_simple_task(request, client_id),
+            cache_if=lambda result: result.status == "ok",
+        )
+
+    @monitored
+    @traced
+    async def _execute_simple_task(
+        self, request: SimpleTaskRequest, client_id: str
+    ) -> SimpleTaskResult:
+        """Run a simple task once (see simple_task)."""
         logger.info(f"Executing simple task in {request.repo_root} for client {client_id}")
 
         # Generate task ID and start timer
@@ -122,20 +204,21 @@ class ToolExecutor:
 
         # Validate and sanitize inputs
         try:
-            # Validate repo root with security checks
-            repo_path = InputValidator.validate_repo_root(request.repo_root)
+            with span("validate_input"):
+                # Validate repo root with security checks
+                repo_path = InputValidator.validate_repo_root(request.repo_root)
 
-            # Validate task is not empty
-            if not request.task or not request.task.strip():
-                raise ValueError("Task description cannot be empty")
+                # Validate task is not empty
+                if not request.task or not request.task.strip():
+                    raise ValueError("Task description cannot be empty")
 
-            # Sanitize task description
-            InputValidator.sanitize_string(request.task, max_length=50000)
+                # Sanitize task description
+                InputValidator.sanitize_string(request.task, max_length=50000)
 
-            # Validate context paths
-            if request.context_paths:
-                for path in request.context_paths:
-                    InputValidator.sanitize_path(path, base_dir=repo_path)
+                # Validate context paths
+                if request.context_paths:
+                    for path in request.context_paths:
+                        InputValidator.sanitize_path(path, base_dir=repo_path)
 
         except ValueError as e:
             # Record failed metrics
@@ -167,34 +250,33 @@ class ToolExecutor:
             )
 
         # Build instruction (reuse on retry)
-        builder = InstructionBuilder(request.repo_root, ExecutionMode.QUICK)
-        instruction = builder.build_quick_task(
-            task=request.task,
-            context_paths=request.context_paths,
-            allowed_globs=request.allowed_globs,
-            deny_globs=request.deny_globs,
-        )
+        with span("build_instruction"):
+            builder = InstructionBuilder(request.repo_root, ExecutionMode.QUICK)
+            instruction = builder.build_quick_task(
+                task=request.task,
+                context_paths=request.context_paths,
+                allowed_globs=request.allowed_globs,
+                deny_globs=request.deny_globs,
+            )
 
         # Retry configuration (configurable via environment variables)
-        max_retries = int(os.environ.get("NINJA_MAX_RETRIES", "2"))
-        retry_delay_sec = int(os.environ.get("NINJA_RETRY_DELAY_SEC", "5"))
+        policy = RetryPolicy.from_env().for_cli(self.driver._strategy.capabilities)
+        prepared = PreparedTask()  # Safety check and task file are done once
+        model: str | None = None  # None = automatic model selection
+        tried_models: list[str] = []
 
-        # Execute with retry logic for aider errors
+        # Execute with backoff, failing over to fallback models when needed
         last_result = None
         attempt = 0
-        for attempt in range(max_retries + 1):  # +1 for initial attempt
-            if attempt > 0:
-                logger.info(
-                    f"Retrying task (attempt {attempt + 1}/{max_retries + 1}) after aider error for client {client_id}"
-                )
-                await asyncio.sleep(retry_delay_sec)
-
-            # Execute via AI code CLI
-            result = await self.driver.execute_async(
+        for attempt in range(policy.max_retries + 1):  # +1 for initial attempt
+            result = await self._execute_scheduled(
+                TaskPriority.INTERACTIVE,
                 repo_root=request.repo_root,
                 step_id=f"simple_task_attempt_{attempt}",
                 instruction=instruction,
                 task_type="quick",  # Simple tasks are always quick
+                model=model,
+                prepared=prepared,
             )
 
             last_result = result
@@ -205,23 +287,26 @@ class ToolExecutor:
                     logger.info(f"Task succeeded on attempt {attempt + 1} for client {client_id}")
                 break
 
-            # Check if this is a retryable aider error
-            if hasattr(result, "aider_error_detected") and result.aider_error_detected:
-                logger.warning(
-                    f"Aider error detected on attempt {attempt + 1} for client {client_id}: {result.notes[:100]}"
+            if result.model_used:
+                tried_models.append(result.model_used)
+            kind = classify_failure(result)
+            decision = policy.decide(attempt + 1, kind, tried_models)
+            if decision is None:
+                logger.error(
+                    f"Not retrying {kind.value} failure on attempt {attempt + 1} "
+                    f"for client {client_id}: {result.summary[:100]}"
                 )
-                # Continue to retry (unless we're out of attempts)
-                if attempt < max_retries:
-                    continue
-                else:
-                    logger.error(
-                        f"Max retries ({max_retries}) exceeded for aider errors for client {client_id}"
-                    )
-            else:
-                # Non-retryable error (validation, API key, model not found, etc.)
-                logger.error(f"Non-retryable error for client {client_id}: {result.summary[:100]}")
                 break
 
+            model = decision.model or model
+            logger.warning(
+                f"{kind.value} failure on attempt {attempt + 1} for client {client_id}, retrying "
+                f"in {decision.delay_sec:.1f}s with {model or 'the same model'}: "
+                f"{result.notes[:100]}"
+            )
+            with span("retry_backoff"):
+                await asyncio.sleep(decision.delay_sec)
+
         # Record metrics with retry info
         duration = time.time() - start_time
         file_scope = ",".join(request.allowed_globs) if request.allowed_globs else None
@@ -229,7 +314,10 @@ class ToolExecutor:
         # Add retry info to notes if we retried
         final_notes = last_result.notes
         if attempt > 0:
-            retry_info = f" [Succeeded after {attempt} {'retry' if attempt == 1 else 'retries'}]"
+            outcome = "Succeeded" if last_result.success else "Failed"
+            retries = f"{attempt} {'retry' if attempt == 1 else 'retries'}"
+            via = f" on fallback model {model}" if model else ""
+            retry_info = f" [{outcome} after {retries}{via}]"
             final_notes = (
                 f"{final_notes}{retry_info}" if final_notes else f"Task completed{retry_info}"
             )
@@ -271,26 +359,38 @@ class ToolExecutor:
         error_message: str | None = None,
         client_id: str = "default",
     ) -> None:
-        """Record metrics for a task execution."""
+        """Record metrics for a task execution, and the stage timings of a traced one."""
         try:
-            tracker = MetricsTracker(Path(repo_root))
-            metrics = create_task_metrics(
+            with span("record_metrics"):
+                tracker = MetricsTracker(Path(repo_root))
+                metrics = create_task_metrics(
+                    task_id=task_id,
+                    model=self.driver.config.model,
+                    tool_name=tool_name,
+                    task_description=task_description,
+                    output=output,
+                    duration_sec=duration_sec,
+                    success=success,
+                    execution_mode=execution_mode,
+                    repo_root=repo_root,
+                    file_scope=file_scope,
+                    error_message=error_message,
+                )
+                tracker.record_task(metrics)
+        except Exception as e:
+            logger.warning(f"Failed to record metrics for client {client_id}: {e}")
+
+        trace = current_trace()
+        if trace is not None:
+            self.driver.structured_logger.log_timings(
+                trace,
                 task_id=task_id,
-                model=self.driver.config.model,
+                cli_name=self.driver._strategy.name,
                 tool_name=tool_name,
-                task_description=task_description,
-                output=output,
-                duration_sec=duration_sec,
                 success=success,
-                execution_mode=execution_mode,
-                repo_root=repo_root,
-                file_scope=file_scope,
-                error_message=error_message,
             )
-            tracker.record_task(metrics)
-        except Exception as e:
-            logger.warning(f"Failed to record metrics for client {client_id}: {e}")
 
+    @traced
     async def execute_plan_sequential(
         self, request: SequentialPlanRequest, client_id: str = "default"
     ) -> PlanExecutionResult:
@@ -332,11 +432,12 @@ class ToolExecutor:
         from ninja_coder.prompt_builder import PromptBuilder
         from ninja_coder.result_parser import ResultParser
 
-        builder_prompt = PromptBuilder(request.repo_root)
-        prompt = builder_prompt.build_sequential_plan(
-            steps=request.steps,
-            mode=request.mode,
-        )
+        with span("build_plan_prompt"):
+            builder_prompt = PromptBuilder(request.repo_root)
+            prompt = builder_prompt.build_sequential_plan(
+                steps=request.steps,
+                mode=request.mode,
+            )
 
         # 2. Build instruction
         instruction_builder = InstructionBuilder(request.repo_root, request.mode)
@@ -349,12 +450,14 @@ class ToolExecutor:
 
         # 3. Execute ONCE
         try:
-            result = await self.driver.execute_async(
+            result = await self._execute_scheduled(
+                TaskPriority.PLAN,
                 repo_root=request.repo_root,
                 step_id=f"sequential_plan_{plan_task_id[:8]}",
                 instruction=instruction,
                 timeout_sec=self._estimate_sequential_timeout(request),
                 task_type="sequential_plan",
+                step_count=len(request.steps),
             )
         except Exception as e:
             logger.error(f"Sequential plan execution failed: {e}")
@@ -368,8 +471,9 @@ class ToolExecutor:
         # 4. Parse structured result
         if result.success:
             try:
-                parser = ResultParser()
-                plan_result = parser.parse_plan_result(result.stdout)
+                with span("parse_plan_result"):
+                    parser = ResultParser()
+                    plan_result = parser.parse_plan_result(result.stdout)
             except Exception as e:
                 logger.warning(f"Failed to parse structured result: {e}")
                 # Fallback: create basic result
@@ -412,11 +516,12 @@ class ToolExecutor:
         return plan_result
 
     def _estimate_sequential_timeout(self, request: SequentialPlanRequest) -> int:
-        """Estimate timeout for sequential plan."""
+        """Estimate default timeout for sequential plan (refined by the driver from history)."""
         base = 300
         per_step = 60
         return base + (per_step * len(request.steps))
 
+    @traced
     async def execute_plan_parallel(
         self, request: ParallelPlanRequest, client_id: str = "default"
     ) -> PlanExecutionResult:
@@ -445,12 +550,13 @@ class ToolExecutor:
         from ninja_coder.prompt_builder import PromptBuilder
         from ninja_coder.result_parser import ResultParser
 
-        builder_prompt = PromptBuilder(request.repo_root)
-        prompt = builder_prompt.build_parallel_plan(
-            tasks=request.steps,
-            fanout=request.fanout,
-            mode=request.mode,
-        )
+        with span("build_plan_prompt"):
+            builder_prompt = PromptBuilder(request.repo_root)
+            prompt = builder_prompt.build_parallel_plan(
+                tasks=request.steps,
+                fanout=request.fanout,
+                mode=request.mode,
+            )
 
         # 2. Build instruction
         instruction_builder = InstructionBuilder(request.repo_root, request.mode)
@@ -463,12 +569,14 @@ class ToolExecutor:
 
         # 3. Execute ONCE
         try:
-            result = await self.driver.execute_async(
+            result = await self._execute_scheduled(
+                TaskPriority.PLAN,
                 repo_root=request.repo_root,
                 step_id=f"parallel_plan_{plan_task_id[:8]}",
                 instruction=instruction,
                 timeout_sec=self._estimate_parallel_timeout(request),
                 task_type="parallel_plan",
+                step_count=len(request.steps),
             )
         except Exception as e:
             logger.error(f"Parallel plan execution failed: {e}")
@@ -482,8 +590,9 @@ class ToolExecutor:
         # 4. Parse structured result
         if result.success:
             try:
-                parser = ResultParser()
-                plan_result = parser.parse_plan_result(result.stdout)
+                with span("parse_plan_result"):
+                    parser = ResultParser()
+                    plan_result = parser.parse_plan_result(result.stdout)
             except Exception as e:
                 logger.warning(f"Failed to parse structured result: {e}")
                 # Fallback: create basic result
@@ -526,7 +635,7 @@ class ToolExecutor:
         return plan_result
 
     def _estimate_parallel_timeout(self, request: ParallelPlanRequest) -> int:
-        """Estimate timeout for parallel plan."""
+        """Estimate default timeout for parallel plan (refined by the driver from history)."""
         base = 300
         per_task = 30  # Parallel is faster
         return base + (per_task * max(1, len(request.steps) // request.fanout))
@@ -698,7 +807,8 @@ class ToolExecutor:
             )
 
             # Execute task
-            result = await self.driver.execute_async(
+            result = await self._execute_scheduled(
+                TaskPriority.PLAN,
                 repo_root=request.repo_root,
                 step_id=step_id,
                 instruction=instruction,
@@ -771,11 +881,21 @@ class ToolExecutor:
                 level=request.level,
             )
 
+            # Per-stage latency of the matching traced tool calls
+            timings = {}
+            if request.timings:
+                timings = self.driver.structured_logger.timing_stats(
+                    session_id=request.session_id,
+                    task_id=request.task_id,
+                    cli_name=request.cli_name,
+                )
+
             return QueryLogsResult(
                 status="ok",
                 entries=entries,
                 total_count=total_count,
                 returned_count=len(entries),
+                timings=timings,
                 message=f"✅ Found {total_count} matching log entries (returned {len(entries)})",
             )
 
@@ -1,18 +1,57 @@
-"""Common infrastructure for Ninja MCP modules."""
+"""Common infrastructure for Ninja MCP modules.
+
+The names below are imported from their submodules on first access, so that
+importing one submodule (as every server does at startup) does not load the
+daemon manager, metrics, rate balancer and security modules as well.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 
 __version__ = "0.2.0"
 
-from ninja_common.daemon import DaemonManager
-from ninja_common.logging_utils import get_logger, setup_logging
-from ninja_common.metrics import MetricsTracker, TaskMetrics
-from ninja_common.rate_balancer import (
-    RateBalancer,
-    RateLimitConfig,
-    get_rate_balancer,
-    rate_balanced,
-    reset_rate_balancer,
-)
-from ninja_common.security import InputValidator, RateLimiter, ResourceMonitor
+if TYPE_CHECKING:
+    from ninja_common.daemon import DaemonManager
+    from ninja_common.logging_utils import get_logger, setup_logging
+    from ninja_common.metrics import MetricsTracker, TaskMetrics
+    from ninja_common.rate_balancer import (
+        RateBalancer,
+        RateLimitConfig,
+        get_rate_balancer,
+        rate_balanced,
+        reset_rate_balancer,
+    )
+    from ninja_common.security import InputValidator, RateLimiter, ResourceMonitor
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "DaemonManager": "ninja_common.daemon",
+    "get_logger": "ninja_common.logging_utils",
+    "setup_logging": "ninja_common.logging_utils",
+    "MetricsTracker": "ninja_common.metrics",
+    "TaskMetrics": "ninja_common.metrics",
+    "RateBalancer": "ninja_common.rate_balancer",
+    "RateLimitConfig": "ninja_common.rate_balancer",
+    "get_rate_balancer": "ninja_common.rate_balancer",
+    "rate_balanced": "ninja_common.rate_balancer",
+    "reset_rate_balancer": "ninja_common.rate_balancer",
+    "InputValidator": "ninja_common.security",
+    "RateLimiter": "ninja_common.security",
+    "ResourceMonitor": "ninja_common.security",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its submodule on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
 
 
 __all__ = [
@@ -10,13 +10,139 @@ from pathlib import Path
 from typing import Any
 
 from ninja_common.defaults import DEFAULT_PORTS
+from ninja_common.http_server import READY_FD_ENV, READY_MESSAGE, WORKERS_ENV
 from ninja_common.logging_utils import get_logger
 
 
 logger = get_logger(__name__)
 
 
-async def stdio_to_http_proxy(url: str) -> None:
+class SSEEvent:
+    """A dispatched Server-Sent Event."""
+
+    __slots__ = ("data", "event")
+
+    def __init__(self, event: str, data: bytes):
+        """
+        Create an event.
+
+        Args:
+            event: Event type ("message" when the stream does not name one).
+            data: Event data (multiple data lines joined with newlines).
+        """
+        self.event = event
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"SSEEvent(event={self.event!r}, data={self.data[:60]!r})"
+
+
+class SSEParser:
+    """Incremental Server-Sent Events parser.
+
+    Bytes are appended to one buffer and scanned for line endings from where
+    the previous scan stopped, so each byte is examined once however the
+    stream is chunked. Comment lines (pings) are ignored; fields other than
+    ``event`` and ``data`` are skipped.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty parser."""
+        self._buffer = bytearray()
+        self._scan_from = 0
+        self._event = b""
+        self._data: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> list[SSEEvent]:
+        """
+        Add received bytes.
+
+        Args:
+            chunk: Next piece of the stream.
+
+        Returns:
+            Events completed by this chunk, in order.
+        """
+        buffer = self._buffer
+        buffer += chunk
+        events: list[SSEEvent] = []
+        start = 0
+        while True:
+            newline = buffer.find(b"\n", max(start, self._scan_from))
+            if newline == -1:
+                break
+            line = bytes(buffer[start:newline])
+            start = newline + 1
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+
+        if start:
+            del buffer[:start]
+        self._scan_from = len(buffer)
+        return events
+
+    def _process_line(self, line: bytes) -> SSEEvent | None:
+        """Apply one line; returns an event when a blank line dispatches one."""
+        if not line:
+            if not self._data:
+                self._event = b""
+                return None
+            event = SSEEvent(
+                (self._event or b"message").decode("utf-8", "replace"), b"\n".join(self._data)
+            )
+            self._event = b""
+            self._data = []
+            return event
+
+        if line.startswith(b":"):
+            return None  # Comment (keep-alive ping)
+
+        field, _, value = line.partition(b":")
+        if value.startswith(b" "):
+            value = value[1:]
+        if field == b"data":
+            self._data.append(value)
+        elif field == b"event":
+            self._event = value
+        return None
+
+
+async def _open_stdin_reader(limit: int) -> asyncio.StreamReader:
+    """Wrap stdin in an asyncio StreamReader.
+
+    Pipes are read by the event loop directly. Other stdin types (regular
+    files, some terminals) cannot be registered with the loop, so a thread
+    feeds the reader instead.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=limit)
+    # Duplicate the descriptor so closing the transport leaves fd 0 open
+    pipe = os.fdopen(os.dup(sys.stdin.fileno()), "rb", 0)
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    except (OSError, ValueError, NotImplementedError):
+        pipe.close()
+
+        def pump() -> None:
+            stream = sys.stdin.buffer
+            while chunk := stream.read1(65536):
+                loop.call_soon_threadsafe(reader.feed_data, chunk)
+            loop.call_soon_threadsafe(reader.feed_eof)
+
+        loop.run_in_executor(None, pump)
+    return reader
+
+
+async def stdio_to_http_proxy(
+    url: str,
+    pipeline_depth: int | None = None,
+    stdin: asyncio.StreamReader | None = None,
+    stdout: Any = None,
+    uds: str | None = None,
+) -> None:
     """Forward stdio to HTTP/SSE daemon.
 
     This acts as a proxy that bridges stdio (used by MCP clients like Claude Code)
@@ -26,114 +152,136 @@ async def stdio_to_http_proxy(url: str) -> None:
     connect to the same singleton daemon. The proxy should be resilient and not
     close the daemon connection when stdin closes.
 
+    Messages are forwarded as raw bytes in both directions (no JSON parsing).
+    With a pipeline depth above 1, up to that many POSTs are in flight at once;
+    the default of 1 keeps requests strictly ordered, which MCP's
+    initialization handshake relies on.
+
     Args:
         url: HTTP/SSE endpoint URL (e.g., http://127.0.0.1:8100/sse)
+        pipeline_depth: Maximum concurrent POSTs (default: NINJA_PROXY_PIPELINE or 1).
+        stdin: Reader for client messages (default: process stdin).
+        stdout: Binary stream for daemon messages (default: process stdout).
+        uds: Unix domain socket to connect through (the URL host is then ignored).
     """
-    import sys
-
     import aiohttp
 
+    if pipeline_depth is None:
+        pipeline_depth = int(os.environ.get("NINJA_PROXY_PIPELINE", "1"))
+    out = stdout if stdout is not None else sys.stdout.buffer
+
     # Extract base URL
     base_url = url.rsplit("/sse", 1)[0]
     messages_url = None
+    endpoint_ready = asyncio.Event()
     stdin_closed = False
 
+    connector = aiohttp.UnixConnector(path=uds) if uds else None
     async with aiohttp.ClientSession(
-        timeout=aiohttp.ClientTimeout(total=None, sock_read=None)
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=None, sock_read=None),
     ) as session:
         # Connect to SSE stream for server messages
         async with session.get(url) as sse_response:
             # Task to read from SSE and write to stdout
             async def forward_from_daemon():
                 nonlocal messages_url
-                buffer = b""
+                parser = SSEParser()
 
                 try:
                     async for chunk in sse_response.content.iter_any():
-                        buffer += chunk
-
-                        # Process complete lines
-                        while b"\n" in buffer:
-                            line, buffer = buffer.split(b"\n", 1)
-                            line_str = line.decode("utf-8").strip()
-
-                            if not line_str:
+                        for event in parser.feed(chunk):
+                            data = event.data.strip()
+                            if not data:
                                 continue
 
                             # Extract session endpoint from SSE
-                            if line_str.startswith("data: ") and messages_url is None:
-                                endpoint = line_str[6:].strip()
-                                if endpoint.startswith("/messages"):
-                                    messages_url = f"{base_url}{endpoint}"
-                                    logger.debug(f"Session endpoint: {messages_url}")
-                                    continue
-
-                            # Forward data messages to stdout (skip pings and endpoint events)
-                            if line_str.startswith("data: "):
-                                data = line_str[6:].strip()
-                                if data and data != "[DONE]" and not data.startswith(": ping"):
-                                    try:
-                                        sys.stdout.write(data + "\n")
-                                        sys.stdout.flush()
-                                    except (BrokenPipeError, OSError):
-                                        # stdout closed, but keep listening for daemon
-                                        logger.debug(
-                                            "stdout closed, but keeping SSE connection alive"
-                                        )
+                            if messages_url is None and (
+                                event.event == "endpoint" or data.startswith(b"/messages")
+                            ):
+                                messages_url = f"{base_url}{data.decode()}"
+                                logger.debug(f"Session endpoint: {messages_url}")
+                                endpoint_ready.set()
+                                continue
+
+                            # Forward data messages to stdout
+                            if data == b"[DONE]":
+                                continue
+                            try:
+                                out.write(data + b"\n")
+                                out.flush()
+                            except (BrokenPipeError, OSError):
+                                # stdout closed, but keep listening for daemon
+                                logger.debug("stdout closed, but keeping SSE connection alive")
                 except Exception as e:
                     logger.error(f"SSE connection error: {e}")
                     raise
 
+            async def post(body: bytes) -> None:
+                # POST message to daemon (fire-and-forget, response comes via SSE)
+                async with session.post(
+                    messages_url,
+                    data=body,
+                    headers={"Content-Type": "application/json"},
+                ) as resp:
+                    # Accept 200 or 202 (Accepted)
+                    if resp.status not in (200, 202):
+                        logger.error(f"HTTP error: {resp.status}")
+                        text = await resp.text()
+                        logger.error(f"Error response: {text}")
+                    # Don't wait for body - response comes through SSE
+
             # Task to read from stdin and POST to daemon
             async def forward_to_daemon():
                 nonlocal stdin_closed
 
                 # Wait for session endpoint to be set
-                max_wait = 100  # 10 seconds
-                wait_count = 0
-                while messages_url is None and wait_count < max_wait:
-                    await asyncio.sleep(0.1)
-                    wait_count += 1
-
-                if messages_url is None:
+                try:
+                    await asyncio.wait_for(endpoint_ready.wait(), timeout=10)
+                except TimeoutError:
                     logger.error("Timeout waiting for session endpoint")
                     return
 
-                while True:
+                reader = stdin or await _open_stdin_reader(limit=64 * 1024 * 1024)
+                slots = asyncio.Semaphore(max(1, pipeline_depth))
+                in_flight: set[asyncio.Task] = set()
+
+                async def post_in_slot(body: bytes) -> None:
                     try:
-                        # Read line from stdin (non-blocking)
-                        line = await asyncio.to_thread(sys.stdin.readline)
+                        await post(body)
+                    except Exception as e:
+                        logger.error(f"Error forwarding to daemon: {e}")
+                    finally:
+                        slots.release()
+
+                try:
+                    while True:
+                        line = await reader.readline()
                         if not line:
                             # stdin closed - this is NORMAL when client disconnects
                             logger.debug("stdin closed, proxy finishing input forwarding")
-                            stdin_closed = True
                             # Don't break the SSE connection - let it continue receiving
                             return
 
-                        # POST message to daemon (fire-and-forget, response comes via SSE)
-                        async with session.post(
-                            messages_url,
-                            json=json.loads(line),
-                            headers={"Content-Type": "application/json"},
-                        ) as resp:
-                            # Accept 200 or 202 (Accepted)
-                            if resp.status not in (200, 202):
-                                logger.error(f"HTTP error: {resp.status}")
-                                text = await resp.text()
-                                logger.error(f"Error response: {text}")
-                            # Don't wait for body - response comes through SSE
-
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Invalid JSON from stdin: {e}")
-                        continue
-                    except (BrokenPipeError, ConnectionError, OSError) as e:
-                        logger.debug(f"Connection error (expected when client disconnects): {e}")
-                        stdin_closed = True
-                        return
-                    except Exception as e:
-                        logger.error(f"Error forwarding to daemon: {e}")
-                        stdin_closed = True
-                        return
+                        body = line.strip()
+                        if not body:
+                            continue
+                        if pipeline_depth <= 1:
+                            await post(body)
+                            continue
+                        await slots.acquire()
+                        task = asyncio.create_task(post_in_slot(body))
+                        in_flight.add(task)
+                        task.add_done_callback(in_flight.discard)
+
+                except (BrokenPipeError, ConnectionError, OSError) as e:
+                    logger.debug(f"Connection error (expected when client disconnects): {e}")
+                except Exception as e:
+                    logger.error(f"Error forwarding to daemon: {e}")
+                finally:
+                    if in_flight:
+                        await asyncio.gather(*in_flight, return_exceptions=True)
+                    stdin_closed = True
 
             # Run both directions concurrently
             # Use return_exceptions to prevent one task failure from killing the other
@@ -183,9 +331,16 @@ class DaemonManager:
         return self.daemon_dir / f"{module}.pid"
 
     def _get_sock_file(self, module: str) -> Path:
-        """Get socket file path for module (deprecated, kept for compatibility)."""
+        """Get Unix domain socket path for module."""
         return self.daemon_dir / f"{module}.sock"
 
+    def _use_uds(self) -> bool:
+        """Whether new daemons serve on Unix sockets (NINJA_DAEMON_TRANSPORT=uds)."""
+        import socket
+
+        transport = os.environ.get("NINJA_DAEMON_TRANSPORT", "tcp").lower()
+        return transport == "uds" and hasattr(socket, "AF_UNIX")
+
     def _get_port(self, module: str) -> int:
         """Get HTTP port for module from config or use default."""
         # Try to read from config file
@@ -271,6 +426,13 @@ class DaemonManager:
 
     def _is_running(self, pid: int) -> bool:
         """Check if process is running."""
+        try:
+            # Reap our own exited children (e.g. a daemon started and stopped
+            # by this process), which would otherwise linger as zombies
+            if os.waitpid(pid, os.WNOHANG)[0] == pid:
+                return False
+        except ChildProcessError:
+            pass
         try:
             os.kill(pid, 0)
             return True
@@ -289,6 +451,30 @@ class DaemonManager:
         except Exception:
             return False
 
+    def _is_socket_live(self, path: Path) -> bool:
+        """Check if a server accepts connections on a Unix socket."""
+        import socket
+
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.settimeout(1)
+                s.connect(str(path))
+                return True
+        except OSError:
+            return False
+
+    def _is_listening(self, module: str, port: int) -> bool:
+        """Check if module's daemon accepts connections on its socket file or port."""
+        sock_file = self._get_sock_file(module)
+        if sock_file.exists():
+            return self._is_socket_live(sock_file)
+        return self._is_port_in_use(port)
+
+    def _address(self, module: str, port: int) -> str:
+        """Human-readable address a module's daemon listens on."""
+        sock_file = self._get_sock_file(module)
+        return str(sock_file) if sock_file.exists() else f"port {port}"
+
     def _find_process_using_port(self, port: int) -> int | None:
         """Find PID of process using the given port."""
         import subprocess
@@ -327,6 +513,26 @@ class DaemonManager:
 
         return None
 
+    def _is_daemon_process(self, pid: int, port_pid: int | None) -> bool:
+        """Check if port_pid is the daemon itself or one of its HTTP workers."""
+        if port_pid is None:
+            return False
+        if port_pid == pid:
+            return True
+        import subprocess
+
+        try:
+            result = subprocess.run(
+                ["ps", "-o", "ppid=", "-p", str(port_pid)],
+                check=False,
+                capture_output=True,
+                text=True,
+                timeout=2,
+            )
+            return result.returncode == 0 and int(result.stdout.strip()) == pid
+        except (subprocess.TimeoutExpired, FileNotFoundError, ValueError):
+            return False
+
     def _cleanup_zombies(self, module: str) -> None:
         """Clean up zombie processes for a module."""
         port = self._get_port(module)
@@ -350,6 +556,28 @@ class DaemonManager:
             except OSError as e:
                 logger.warning(f"Could not kill process {pid}: {e}")
 
+    def _get_workers(self, module: str) -> int:
+        """Get HTTP worker count for module (NINJA_<MODULE>_WORKERS or NINJA_HTTP_WORKERS)."""
+        for env_key in (f"NINJA_{module.upper()}_WORKERS", WORKERS_ENV):
+            if env_key in os.environ:
+                try:
+                    return max(1, int(os.environ[env_key]))
+                except ValueError:
+                    pass
+        return 1
+
+    def _server_command(self, module: str, port: int) -> list[str]:
+        """Command line that runs a module's server in HTTP mode."""
+        cmd = [sys.executable, "-m", f"ninja_{module}.server", "--http"]
+        if self._use_uds():
+            cmd += ["--uds", str(self._get_sock_file(module))]
+        else:
+            cmd += ["--port", str(port)]
+        workers = self._get_workers(module)
+        if workers > 1:
+            cmd += ["--workers", str(workers)]
+        return cmd
+
     def start(self, module: str) -> bool:
         """Start daemon for module.
 
@@ -357,29 +585,77 @@ class DaemonManager:
         If a daemon is already running (by PID or port check), returns success.
         Cleans up zombie processes before starting.
 
+        Returns as soon as the server signals that it is accepting connections
+        (see ``ninja_common.http_server``), or when it exits or times out.
+
         Args:
             module: Module name (coder, researcher, secretary)
 
         Returns:
             True if started successfully
         """
+        return self.start_many([module])[module]
+
+    def start_many(self, modules: list[str], timeout: float | None = None) -> dict[str, bool]:
+        """Start daemons for several modules in parallel.
+
+        All servers are launched first, then their readiness pipes are awaited
+        together, so the total wait is that of the slowest server.
+
+        Args:
+            modules: Module names.
+            timeout: Seconds to wait for readiness (default:
+                NINJA_DAEMON_START_TIMEOUT or 30).
+
+        Returns:
+            Mapping of module name to whether it is running.
+        """
+        if timeout is None:
+            timeout = float(os.environ.get("NINJA_DAEMON_START_TIMEOUT", "30"))
+
+        results: dict[str, bool] = {}
+        launched: dict[int, tuple[str, int, int]] = {}  # ready fd -> (module, pid, port)
+        for module in modules:
+            outcome = self._launch(module)
+            if isinstance(outcome, bool):
+                results[module] = outcome
+            else:
+                ready_fd, pid, port = outcome
+                launched[ready_fd] = (module, pid, port)
+
+        results.update(self._await_ready(launched, timeout))
+        return {module: results[module] for module in modules}
+
+    def _launch(self, module: str) -> bool | tuple[int, int, int]:
+        """Launch a module's server unless it is already running.
+
+        Returns:
+            True/False if no server was launched (already running / error),
+            else (readiness pipe read fd, pid, port).
+        """
         port = self._get_port(module)
+        uds = self._use_uds()
 
         # Check if already running by PID
         pid = self._read_pid(module)
         if pid and self._is_running(pid):
-            # Verify it's actually listening on the port
-            if self._is_port_in_use(port):
-                logger.info(f"{module} daemon already running (PID {pid}) on port {port}")
+            # Verify it's actually listening on its socket or port
+            if self._is_listening(module, port):
+                address = self._address(module, port)
+                logger.info(f"{module} daemon already running (PID {pid}) on {address}")
                 return True
             else:
                 logger.warning(f"{module} daemon PID {pid} exists but not listening, cleaning up")
                 self._get_pid_file(module).unlink(missing_ok=True)
 
-        # Check if port is in use by another process
-        if self._is_port_in_use(port):
+        # Nothing is serving on a leftover socket file; the new server recreates it
+        self._get_sock_file(module).unlink(missing_ok=True)
+
+        # Check if port is in use by another process (a socket file needs no port)
+        if not uds and self._is_port_in_use(port):
             port_pid = self._find_process_using_port(port)
-            if port_pid and port_pid != pid:
+            owned = pid is not None and self._is_daemon_process(pid, port_pid)
+            if port_pid and not owned:
                 # Port is used by something else - find a free port instead
                 logger.warning(f"Port {port} in use by another process (PID {port_pid})")
                 try:
@@ -389,7 +665,7 @@ class DaemonManager:
                 except RuntimeError as e:
                     logger.error(f"Could not find free port for {module}: {e}")
                     return False
-            elif port_pid == pid:
+            elif owned:
                 logger.info(f"{module} daemon already running (PID {pid}) on port {port}")
                 return True
 
@@ -401,62 +677,111 @@ class DaemonManager:
         log_file = self._get_log_file(module)
 
         # Start server process with HTTP mode
-        cmd = [
-            sys.executable,
-            "-m",
-            f"ninja_{module}.server",
-            "--http",
-            "--port",
-            str(port),
-        ]
+        cmd = self._server_command(module, port)
 
         try:
+            # The server writes to this pipe once it accepts connections
+            ready_read, ready_write = os.pipe()
+
             # Fork process
             new_pid = os.fork()
             if new_pid == 0:
-                # Child process
-                # Detach from parent session
-                os.setsid()
-
-                # Redirect stdout/stderr to log file
-                log_fd = os.open(str(log_file), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
-                os.dup2(log_fd, sys.stdout.fileno())
-                os.dup2(log_fd, sys.stderr.fileno())
-                os.close(log_fd)
-
-                # Close stdin
-                null_fd = os.open(os.devnull, os.O_RDONLY)
-                os.dup2(null_fd, sys.stdin.fileno())
-                os.close(null_fd)
-
-                # Execute server
-                os.execvp(cmd[0], cmd)
+                # Child process (never returns: exec or exit)
+                try:
+                    # Detach from parent session
+                    os.setsid()
+
+                    # Redirect stdout/stderr to log file (by descriptor number:
+                    # sys.stdout may be replaced, e.g. under test capture)
+                    log_fd = os.open(str(log_file), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                    os.dup2(log_fd, 1)
+                    os.dup2(log_fd, 2)
+                    os.close(log_fd)
+
+                    # Close stdin
+                    null_fd = os.open(os.devnull, os.O_RDONLY)
+                    os.dup2(null_fd, 0)
+                    os.close(null_fd)
+
+                    # Hand the readiness pipe to the server
+                    os.close(ready_read)
+                    os.set_inheritable(ready_write, True)
+                    env = {**os.environ, READY_FD_ENV: str(ready_write)}
+
+                    # Execute server
+                    os.execvpe(cmd[0], cmd, env)
+                finally:
+                    os._exit(127)
             else:
                 # Parent process
+                os.close(ready_write)
                 self._write_pid(module, new_pid)
+                return ready_read, new_pid, port
+        except OSError as e:
+            logger.error(f"Failed to start {module} daemon: {e}")
+            return False
 
-                # Wait for daemon to start (retry up to 5 seconds)
-                import time
+    def _await_ready(
+        self, launched: dict[int, tuple[str, int, int]], timeout: float
+    ) -> dict[str, bool]:
+        """Wait for launched servers to signal readiness, exit, or time out.
 
-                for attempt in range(10):
-                    time.sleep(0.5)
-                    if self._is_running(new_pid) and self._is_port_in_use(port):
-                        logger.info(f"Started {module} daemon (PID {new_pid}) on port {port}")
-                        return True
+        Args:
+            launched: Readiness pipe read fd -> (module, pid, port).
+            timeout: Seconds to wait overall.
 
-                # Final check - process might be running but port binding is slow
-                if self._is_running(new_pid):
-                    logger.warning(
-                        f"{module} daemon running (PID {new_pid}) but port {port} not ready yet, assuming success"
-                    )
-                    return True
+        Returns:
+            Mapping of module name to whether it is running.
+        """
+        import select
+        import time
 
-                logger.error(f"{module} daemon failed to start properly")
+        results: dict[str, bool] = {}
+        started = time.monotonic()
+        pending = dict(launched)
+        try:
+            while pending:
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                readable, _, _ = select.select(list(pending), [], [], remaining)
+                for fd in readable:
+                    module, pid, port = pending.pop(fd)
+                    message = os.read(fd, 64)
+                    os.close(fd)
+                    elapsed_ms = (time.monotonic() - started) * 1000
+                    if message.startswith(READY_MESSAGE):
+                        logger.info(
+                            f"Started {module} daemon (PID {pid}) on "
+                            f"{self._address(module, port)} in {elapsed_ms:.0f}ms"
+                        )
+                        results[module] = True
+                    else:
+                        # Pipe closed without readiness: the server exited
+                        logger.error(
+                            f"{module} daemon failed to start properly "
+                            f"(see {self._get_log_file(module)})"
+                        )
+                        self._get_pid_file(module).unlink(missing_ok=True)
+                        results[module] = False
+        finally:
+            for fd, (module, pid, port) in pending.items():
+                os.close(fd)
+                if module in results:
+                    continue
+                if self._is_running(pid) and self._is_listening(module, port):
+                    address = self._address(module, port)
+                    logger.info(f"Started {module} daemon (PID {pid}) on {address}")
+                    results[module] = True
+                    continue
+                logger.error(f"{module} daemon not ready after {timeout:.0f}s, stopping it")
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
                 self._get_pid_file(module).unlink(missing_ok=True)
-                return False
-        except OSError as e:
-            logger.error(f"Failed to start {module} daemon: {e}")
-            return False
+                results[module] = False
+        return results
 
     def stop(self, module: str) -> bool:
         """Stop daemon for module.
@@ -510,6 +835,8 @@ class DaemonManager:
         """
         pid = self._read_pid(module)
         port = self._get_port(module)
+        sock_file = self._get_sock_file(module)
+        socket_path = str(sock_file) if sock_file.exists() else None
 
         # Get version
         version = self._get_module_version(module)
@@ -519,6 +846,7 @@ class DaemonManager:
                 "running": False,
                 "pid": None,
                 "port": port,
+                "socket": None,
                 "url": f"http://127.0.0.1:{port}/sse",
                 "log": str(self._get_log_file(module)),
                 "version": version,
@@ -529,6 +857,7 @@ class DaemonManager:
             "running": running,
             "pid": pid if running else None,
             "port": port,
+            "socket": socket_path if running else None,
             "url": f"http://127.0.0.1:{port}/sse" if running else None,
             "log": str(self._get_log_file(module)),
             "version": version,
@@ -651,17 +980,12 @@ def main() -> int:
             success = manager.start(args.module)
             return 0 if success else 1
         else:
-            # Start all modules
+            # Start all modules in parallel
             print("Starting all daemons...")
-            all_success = True
-            for module in manager.list_modules():
-                print(f"  Starting {module}...", end=" ", flush=True)
-                if manager.start(module):
-                    print("✓")
-                else:
-                    print("✗")
-                    all_success = False
-            return 0 if all_success else 1
+            results = manager.start_many(manager.list_modules())
+            for module, started in results.items():
+                print(f"  Starting {module}... {'✓' if started else '✗'}")
+            return 0 if all(results.values()) else 1
 
     elif args.command == "stop":
         if args.module:
@@ -715,12 +1039,16 @@ def main() -> int:
             print(f"Error: {args.module} daemon not running", file=sys.stderr)
             return 1
 
-        # Forward stdio to HTTP/SSE endpoint
-        port = manager._get_port(args.module)
-        url = f"http://127.0.0.1:{port}/sse"
+        # Forward stdio to HTTP/SSE endpoint, over the daemon's Unix socket if it has one
+        uds = status["socket"]
+        if uds:
+            url = "http://localhost/sse"
+        else:
+            port = manager._get_port(args.module)
+            url = f"http://127.0.0.1:{port}/sse"
 
         try:
-            asyncio.run(stdio_to_http_proxy(url))
+            asyncio.run(stdio_to_http_proxy(url, uds=uds))
             return 0
         except Exception as e:
             print(f"Error connecting to daemon: {e}", file=sys.stderr)
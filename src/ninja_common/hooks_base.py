@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import subprocess
 import sys
 from abc import ABC, abstractmethod
@@ -10,6 +12,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from ninja_common.path_utils import get_internal_dir
+
 
 @dataclass
 class HookResult:
@@ -166,3 +170,109 @@ def get_staged_files(repo_root: str | Path | None = None) -> list[str]:
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
     return []
+
+
+def get_changed_files(repo_root: str | Path | None = None) -> list[str] | None:
+    """
+    Get files with uncommitted changes (staged, unstaged, or untracked).
+
+    Deleted files are left out.
+
+    Returns:
+        List of file paths relative to repo root, or None if changes cannot
+        be determined (not a git repository, git missing).
+    """
+    try:
+        result = subprocess.run(
+            ["git", "status", "--porcelain=v1", "-z", "--untracked-files=all"],
+            check=False,
+            cwd=repo_root,
+            capture_output=True,
+            text=True,
+            timeout=5.0,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+    if result.returncode != 0:
+        return None
+
+    files = []
+    entries = iter(result.stdout.split("\0"))
+    for entry in entries:
+        if len(entry) < 4:
+            continue
+        status, path = entry[:2], entry[3:]
+        if "R" in status or "C" in status:
+            next(entries, None)  # the original path of a rename/copy
+        if "D" not in status:
+            files.append(path)
+    return files
+
+
+class ResultCache:
+    """
+    Tool results keyed by file path and content hash, persisted per repo.
+
+    Entries are invalidated as a whole when any of ``config_files`` (the
+    tool's configuration) changes.
+    """
+
+    max_entries = 5000
+
+    def __init__(
+        self,
+        repo_root: str | Path,
+        name: str,
+        config_files: tuple[str, ...] = ("pyproject.toml", "ruff.toml", ".ruff.toml"),
+    ):
+        self.repo_root = Path(repo_root)
+        self.path = get_internal_dir(repo_root) / f"{name}_cache.json"
+        config = hashlib.sha256()
+        for config_file in config_files:
+            try:
+                config.update((self.repo_root / config_file).read_bytes())
+            except OSError:
+                config.update(b"\0")
+        self.config_hash = config.hexdigest()
+        self._entries: dict[str, Any] = {}
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get("config") == self.config_hash:
+                self._entries = data["entries"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def key(self, file_path: str) -> str | None:
+        """Cache key for a file's current content (None if it cannot be read)."""
+        try:
+            digest = hashlib.sha256((self.repo_root / file_path).read_bytes()).hexdigest()
+        except OSError:
+            return None
+        return f"{file_path}:{digest}"
+
+    def get(self, key: str | None) -> Any:
+        """Cached result for a key, or None."""
+        return self._entries.get(key) if key is not None else None
+
+    def put(self, key: str | None, value: Any) -> None:
+        """Store a result."""
+        if key is None:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache if it changed, keeping the newest entries."""
+        if not self._dirty:
+            return
+        entries = dict(list(self._entries.items())[-self.max_entries :])
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps({"config": self.config_hash, "entries": entries}))
+            tmp.replace(self.path)
+            self._dirty = False
+        except OSError:
+            tmp.unlink(missing_ok=True)
@@ -0,0 +1,481 @@
+"""
+HTTP serving for MCP servers run as daemons.
+
+``DaemonManager`` starts each server with the write end of a pipe whose
+descriptor number is passed in ``NINJA_READY_FD``. ``serve_asgi`` writes a
+readiness line to it once uvicorn is accepting connections, so the manager
+can return as soon as the server is up instead of polling its port. If the
+server dies first, the pipe simply closes and the manager sees EOF.
+
+With more than one worker (``--workers`` or ``NINJA_HTTP_WORKERS``),
+``run_http`` becomes a pre-fork supervisor: it binds the public socket once,
+forks the workers that all accept on it, restarts workers that die, and
+reports readiness once every worker is up. An SSE session lives in the
+worker that accepted its stream, so each worker advertises a message
+endpoint prefixed with its index (``/w<N>/messages``); a POST that lands on
+another worker is forwarded to the owner over that worker's private
+loopback socket. Workers run with ``NINJA_SHARED_STATE`` set, so rate limits
+are enforced across them (see ``ninja_common.shared_state``).
+
+Given a Unix domain socket path (``--uds``), the server listens there
+instead of on a TCP port. The socket file is created with mode 0600, so only
+the owning user can connect.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import select
+import signal
+import socket
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ninja_common.logging_utils import get_logger
+from ninja_common.shared_state import SHARED_STATE_ENV
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+
+logger = get_logger(__name__)
+
+READY_FD_ENV = "NINJA_READY_FD"
+READY_MESSAGE = b"ready\n"
+WORKERS_ENV = "NINJA_HTTP_WORKERS"
+
+# "/w<index>/<rest>": a message endpoint owned by worker <index>
+_WORKER_PATH = re.compile(r"^/w(\d+)(/.*)$")
+
+# Headers not copied when forwarding a request to a sibling worker
+_HOP_HEADERS = frozenset({b"host", b"content-length", b"connection", b"transfer-encoding"})
+
+
+@dataclass
+class WorkerContext:
+    """Identity of the current process within a multi-worker server."""
+
+    index: int
+    peer_ports: list[int]
+    sockets: list[socket.socket] = field(default_factory=list)
+
+
+# Set in forked workers; None in single-process servers and the supervisor
+_worker: WorkerContext | None = None
+
+
+def current_worker() -> WorkerContext | None:
+    """Get this process's worker context, or None when not a worker."""
+    return _worker
+
+
+def default_workers() -> int:
+    """Worker count from NINJA_HTTP_WORKERS (default 1: single process)."""
+    try:
+        return max(1, int(os.environ.get(WORKERS_ENV, "1")))
+    except ValueError:
+        return 1
+
+
+def message_path(path: str = "/messages") -> str:
+    """
+    Message endpoint to advertise to SSE clients.
+
+    Args:
+        path: Endpoint path the server's own routing handles.
+
+    Returns:
+        ``path`` itself, or in a worker the path prefixed with the worker
+        index so that POSTs can be routed back to the session's owner.
+    """
+    if _worker is None:
+        return path
+    return f"/w{_worker.index}{path}"
+
+
+def notify_ready() -> None:
+    """Tell the process that started this server that it is accepting connections.
+
+    Does nothing when the server was not started with a readiness pipe.
+    """
+    fd = os.environ.pop(READY_FD_ENV, None)
+    if fd is None:
+        return
+    try:
+        os.write(int(fd), READY_MESSAGE)
+        os.close(int(fd))
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not send readiness notification: {e}")
+
+
+def bind_unix_socket(path: str, backlog: int = 2048) -> socket.socket:
+    """
+    Create a listening Unix domain socket accessible only to the current user.
+
+    A stale socket file left by a previous server is replaced.
+
+    Args:
+        path: Socket file path.
+        backlog: Listen backlog.
+
+    Returns:
+        Listening socket.
+    """
+    Path(path).unlink(missing_ok=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Create the file as 0600 rather than chmod-ing it after bind
+    old_umask = os.umask(0o177)
+    try:
+        sock.bind(path)
+    except OSError:
+        sock.close()
+        raise
+    finally:
+        os.umask(old_umask)
+    sock.listen(backlog)
+    return sock
+
+
+def session_affinity(app: Callable[..., Any], worker: WorkerContext) -> Callable[..., Any]:
+    """
+    Wrap an ASGI app so worker-prefixed requests reach the worker that owns them.
+
+    Requests for this worker have the prefix stripped and go to ``app``;
+    requests for a sibling are forwarded to its private port; all others
+    go to ``app`` unchanged.
+
+    Args:
+        app: The server's ASGI application.
+        worker: This worker's context.
+
+    Returns:
+        ASGI application.
+    """
+    client: Any = None
+
+    async def route(scope: dict[str, Any], receive: Any, send: Any) -> None:
+        nonlocal client
+        match = _WORKER_PATH.match(scope.get("path", "")) if scope["type"] == "http" else None
+        if match is None:
+            await app(scope, receive, send)
+            return
+
+        index, rest = int(match.group(1)), match.group(2)
+        if index == worker.index:
+            await app({**scope, "path": rest, "raw_path": rest.encode()}, receive, send)
+            return
+        if index >= len(worker.peer_ports):
+            await _respond(send, 404, b"Unknown worker")
+            return
+
+        import httpx
+
+        if client is None:
+            client = httpx.AsyncClient(timeout=None)
+        await _forward(client, worker.peer_ports[index], scope, receive, send)
+
+    return route
+
+
+async def _forward(client: Any, port: int, scope: dict[str, Any], receive: Any, send: Any) -> None:
+    """Replay an HTTP request against a sibling worker and relay its response."""
+    body = bytearray()
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+
+    url = f"http://127.0.0.1:{port}{scope['path']}"
+    if scope.get("query_string"):
+        url += "?" + scope["query_string"].decode("latin-1")
+    headers = [
+        (name.decode("latin-1"), value.decode("latin-1"))
+        for name, value in scope.get("headers", [])
+        if name.lower() not in _HOP_HEADERS
+    ]
+    try:
+        response = await client.request(scope["method"], url, content=bytes(body), headers=headers)
+    except Exception as e:
+        logger.warning(f"Forwarding to worker on port {port} failed: {e}")
+        await _respond(send, 502, b"Worker unavailable")
+        return
+    await _respond(
+        send,
+        response.status_code,
+        response.content,
+        [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in response.headers.items()
+            if name.encode("latin-1").lower() not in _HOP_HEADERS
+        ],
+    )
+
+
+async def _respond(
+    send: Any, status: int, body: bytes, headers: list[tuple[bytes, bytes]] | None = None
+) -> None:
+    """Send a complete HTTP response."""
+    if headers is None:
+        headers = [(b"content-type", b"text/plain; charset=utf-8")]
+    headers = [*headers, (b"content-length", str(len(body)).encode())]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def serve_asgi(
+    app: Callable[..., Any],
+    host: str,
+    port: int,
+    log_level: str = "info",
+    uds: str | None = None,
+) -> None:
+    """
+    Serve an ASGI app with uvicorn, signalling readiness once listening.
+
+    In a worker, the app is wrapped with ``session_affinity`` and served on
+    the sockets inherited from the supervisor; ``host``, ``port`` and
+    ``uds`` are then only informational.
+
+    Args:
+        app: ASGI application.
+        host: Host to bind to.
+        port: Port to bind to.
+        log_level: Uvicorn log level.
+        uds: Unix domain socket path to listen on instead of host/port.
+    """
+    import uvicorn
+
+    class NotifyingServer(uvicorn.Server):
+        async def startup(self, sockets: Any = None) -> None:
+            await super().startup(sockets=sockets)
+            if self.started:
+                notify_ready()
+
+    worker = _worker
+    if worker is None and uds is not None:
+        sock = bind_unix_socket(uds)
+        try:
+            config = uvicorn.Config(app, log_level=log_level)
+            await NotifyingServer(config).serve(sockets=[sock])
+        finally:
+            sock.close()
+            Path(uds).unlink(missing_ok=True)
+        return
+    if worker is None:
+        config = uvicorn.Config(app, host=host, port=port, log_level=log_level)
+        await NotifyingServer(config).serve()
+        return
+
+    config = uvicorn.Config(session_affinity(app, worker), log_level=log_level)
+    await NotifyingServer(config).serve(sockets=worker.sockets)
+
+
+def run_http(
+    main_http: Callable[[str, int, str | None], Coroutine[Any, Any, None]],
+    host: str,
+    port: int,
+    workers: int = 1,
+    uds: str | None = None,
+) -> None:
+    """
+    Run an HTTP server in this process, or supervise several worker processes.
+
+    Args:
+        main_http: The server's ``main_http(host, port, uds)`` coroutine function.
+        host: Host to bind to.
+        port: Port to bind to.
+        workers: Number of worker processes; 1 serves in-process.
+        uds: Unix domain socket path to listen on instead of host/port.
+    """
+    if workers <= 1:
+        asyncio.run(main_http(host, port, uds))
+        return
+    WorkerSupervisor(main_http, host, port, workers, uds).run()
+
+
+class WorkerSupervisor:
+    """Pre-fork supervisor for a multi-worker HTTP server.
+
+    The supervisor never starts an event loop: it binds the sockets, forks,
+    and then only waits on readiness pipes and reaps children, so each
+    worker builds its server from a clean state.
+    """
+
+    def __init__(
+        self,
+        main_http: Callable[[str, int, str | None], Coroutine[Any, Any, None]],
+        host: str,
+        port: int,
+        workers: int,
+        uds: str | None = None,
+    ):
+        """
+        Initialize the supervisor.
+
+        Args:
+            main_http: The server's ``main_http(host, port, uds)`` coroutine function.
+            host: Host to bind to.
+            port: Port to bind to.
+            workers: Number of worker processes.
+            uds: Unix domain socket path to listen on instead of host/port.
+        """
+        self.main_http = main_http
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.uds = uds
+        self._pids: dict[int, int] = {}  # pid -> worker index
+        self._ready_fds: dict[int, int] = {}  # readiness pipe read fd -> worker index
+        self._stopping = False
+
+    def run(self) -> None:
+        """Serve until SIGTERM/SIGINT, restarting workers that exit."""
+        if self.uds is not None:
+            public = bind_unix_socket(self.uds)
+        else:
+            public = socket.create_server((self.host, self.port), backlog=2048)
+        private = [socket.create_server(("127.0.0.1", 0)) for _ in range(self.workers)]
+        peer_ports = [s.getsockname()[1] for s in private]
+        outer_ready = os.environ.pop(READY_FD_ENV, None)
+
+        def stop(signum: int, frame: Any) -> None:
+            self._stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        address = self.uds or f"{self.host}:{self.port}"
+        logger.info(f"Starting {self.workers} HTTP workers on {address}")
+        for index in range(self.workers):
+            self._spawn(index, public, private, peer_ports)
+
+        all_ready = False
+        pending = set(range(self.workers))
+        try:
+            while not self._stopping:
+                readable = self._wait(0.5)
+                for fd in readable:
+                    index = self._ready_fds.pop(fd)
+                    message = os.read(fd, 64)
+                    os.close(fd)
+                    if message.startswith(READY_MESSAGE):
+                        pending.discard(index)
+
+                if not all_ready and not pending:
+                    all_ready = True
+                    logger.info(f"All {self.workers} HTTP workers ready")
+                    if outer_ready is not None:
+                        os.environ[READY_FD_ENV] = outer_ready
+                        notify_ready()
+
+                for pid, status in self._reap():
+                    index = self._pids.pop(pid)
+                    if self._stopping:
+                        continue
+                    if not all_ready:
+                        # A worker that cannot start will not start on retry either
+                        logger.error(f"HTTP worker {index} exited during startup (status {status})")
+                        self._stopping = True
+                        continue
+                    logger.warning(f"HTTP worker {index} exited (status {status}), restarting")
+                    self._spawn(index, public, private, peer_ports)
+        finally:
+            self._shutdown()
+            for fd in self._ready_fds:
+                os.close(fd)
+            public.close()
+            if self.uds is not None:
+                Path(self.uds).unlink(missing_ok=True)
+            for s in private:
+                s.close()
+
+    def _spawn(
+        self,
+        index: int,
+        public: socket.socket,
+        private: list[socket.socket],
+        peer_ports: list[int],
+    ) -> None:
+        """Fork worker ``index``."""
+        global _worker
+
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # Worker process (never returns)
+            code = 1
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                os.close(ready_read)
+                for fd in self._ready_fds:
+                    os.close(fd)
+                for i, s in enumerate(private):
+                    if i != index:
+                        s.close()
+                os.environ[READY_FD_ENV] = str(ready_write)
+                os.environ[SHARED_STATE_ENV] = "1"
+                _worker = WorkerContext(index, peer_ports, [public, private[index]])
+                asyncio.run(self.main_http(self.host, self.port, self.uds))
+                code = 0
+            except KeyboardInterrupt:
+                code = 0
+            except BaseException as e:
+                logger.error(f"HTTP worker {index} failed: {e}", exc_info=True)
+            finally:
+                os._exit(code)
+
+        os.close(ready_write)
+        self._ready_fds[ready_read] = index
+        self._pids[pid] = index
+
+    def _wait(self, timeout: float) -> list[int]:
+        """Wait for readiness messages; returns readable pipe fds."""
+        if not self._ready_fds:
+            time.sleep(timeout)
+            return []
+        try:
+            readable, _, _ = select.select(list(self._ready_fds), [], [], timeout)
+        except InterruptedError:
+            return []
+        return readable
+
+    def _reap(self) -> list[tuple[int, int]]:
+        """Collect exited workers as (pid, exit status) pairs."""
+        exited = []
+        while self._pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            if pid in self._pids:
+                exited.append((pid, os.waitstatus_to_exitcode(status)))
+        return exited
+
+    def _shutdown(self, grace: float = 10.0) -> None:
+        """Stop all workers, escalating to SIGKILL after ``grace`` seconds."""
+        for pid in self._pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        deadline = time.monotonic() + grace
+        while self._pids and time.monotonic() < deadline:
+            for pid, _ in self._reap():
+                self._pids.pop(pid, None)
+            time.sleep(0.05)
+        for pid in self._pids:
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+        self._pids.clear()
@@ -0,0 +1,203 @@
+"""
+In-flight request coalescing with short-lived result caching.
+
+When an orchestrator retries a tool call that timed out on its side, the
+original execution is usually still running. ``InFlightRegistry`` attaches
+duplicate requests (same key) to the running execution instead of starting
+a second one, and keeps completed results for a short TTL so late retries
+are answered from memory.
+
+The shared execution runs as its own task, so a caller that gives up
+(cancellation) does not abort the work other callers are waiting on.
+
+In a multi-worker server (shared state enabled, see
+``ninja_common.shared_state``) a registry that can serialize its results
+also claims each request in the shared store. A duplicate that lands on
+another worker then waits for the claiming worker's result, polling every
+``poll_interval`` seconds, instead of running the request a second time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from ninja_common.logging_utils import get_logger
+from ninja_common.shared_state import SharedStore, get_shared_store
+
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def request_key(*parts: Any) -> str:
+    """Build a stable key from JSON-serializable request fields.
+
+    Args:
+        *parts: Values identifying the request (paths, task text, scopes...).
+
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class InFlightRegistry(Generic[T]):
+    """Registry of running and recently completed executions keyed by request."""
+
+    def __init__(
+        self,
+        result_ttl: float = 120.0,
+        max_results: int = 256,
+        dump: Callable[[T], str] | None = None,
+        load: Callable[[str], T] | None = None,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            result_ttl: Seconds to keep completed results (0 disables caching).
+            max_results: Maximum number of cached results (oldest evicted first).
+            dump: Serializes a result for other workers (with ``load``,
+                enables coalescing across workers).
+            load: Restores a result serialized by ``dump``.
+            poll_interval: Seconds between checks on a request running in
+                another worker.
+        """
+        self.result_ttl = result_ttl
+        self.max_results = max_results
+        self.dump = dump
+        self.load = load
+        self.poll_interval = poll_interval
+        self._inflight: dict[str, asyncio.Task[T]] = {}
+        self._results: OrderedDict[str, tuple[float, T]] = OrderedDict()
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    def __contains__(self, key: str) -> bool:
+        """Whether a request is running or has a cached result."""
+        return key in self._inflight or self._cached(key) is not None
+
+    async def run(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        cache_if: Callable[[T], bool] | None = None,
+    ) -> T:
+        """
+        Run ``factory`` once per key, sharing the outcome with duplicates.
+
+        Args:
+            key: Request key (idempotency key or ``request_key(...)``).
+            factory: Creates the awaitable doing the actual work.
+            cache_if: Predicate deciding whether a result is kept for the TTL
+                (default: every result). Exceptions are never cached.
+
+        Returns:
+            Result of the (possibly shared) execution.
+        """
+        cached = self._cached(key)
+        if cached is not None:
+            self.cache_hits += 1
+            logger.info(f"Serving request {key[:12]} from result cache")
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            shared = get_shared_store() if self.dump and self.load else None
+            if shared is None:
+                task = asyncio.ensure_future(factory())
+            else:
+                task = asyncio.ensure_future(self._run_shared(shared, key, factory, cache_if))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._on_done(key, done, cache_if))
+        else:
+            self.coalesced += 1
+            logger.info(f"Attaching duplicate request {key[:12]} to in-flight execution")
+
+        # Shield so one caller's cancellation doesn't abort the shared execution
+        return await asyncio.shield(task)
+
+    async def _run_shared(
+        self,
+        shared: SharedStore,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        cache_if: Callable[[T], bool] | None,
+    ) -> T:
+        """Run a request claimed in the shared store, or wait for the worker running it."""
+        assert self.dump is not None and self.load is not None
+        waiting = False
+        while not await asyncio.to_thread(shared.claim_request, key):
+            claimed, payload = await asyncio.to_thread(shared.request_result, key)
+            if payload is not None:
+                self.cache_hits += 1
+                logger.info(f"Serving request {key[:12]} from another worker's result")
+                return self.load(payload)
+            if claimed and not waiting:
+                waiting = True
+                self.coalesced += 1
+                logger.info(f"Attaching duplicate request {key[:12]} to another worker")
+            if claimed:
+                await asyncio.sleep(self.poll_interval)
+
+        payload = None
+        try:
+            result = await factory()
+            if self.result_ttl > 0 and (cache_if is None or cache_if(result)):
+                payload = self.dump(result)
+            return result
+        finally:
+            await asyncio.to_thread(shared.finish_request, key, payload, self.result_ttl)
+
+    def get_stats(self) -> dict[str, int]:
+        """Get registry counters."""
+        return {
+            "inflight": len(self._inflight),
+            "cached_results": len(self._results),
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+        }
+
+    def clear(self) -> None:
+        """Drop all cached results (running executions are left alone)."""
+        self._results.clear()
+
+    def _cached(self, key: str) -> tuple[float, T] | None:
+        """Return a cached (expiry, result) entry, pruning expired ones."""
+        now = time.monotonic()
+        while self._results:
+            oldest_key, (expires_at, _) = next(iter(self._results.items()))
+            if expires_at > now:
+                break
+            del self._results[oldest_key]
+        return self._results.get(key)
+
+    def _on_done(
+        self,
+        key: str,
+        task: asyncio.Task[T],
+        cache_if: Callable[[T], bool] | None,
+    ) -> None:
+        """Move a finished execution from in-flight to the result cache."""
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or self.result_ttl <= 0:
+            return
+        result = task.result()
+        if cache_if is not None and not cache_if(result):
+            return
+        self._results.pop(key, None)
+        self._results[key] = (time.monotonic() + self.result_ttl, result)
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
@@ -0,0 +1,241 @@
+"""
+Bounded storage for per-task log artifacts.
+
+Every task writes a text log and a JSON metadata file (with the CLI's full
+stdout/stderr) to ``<internal_dir>/logs`` and an instruction file to
+``<internal_dir>/tasks``. Without limits these directories grow forever on
+busy repositories.
+
+This module keeps them bounded:
+
+- ``truncate_output`` keeps the head and tail of oversized output (the
+  prompt echo and the final result/error), dropping the middle.
+- ``write_artifact`` writes compact, gzip-compressed files.
+- ``schedule_retention`` prunes artifacts by age and total size in a
+  background thread, at most once per interval per directory (across all
+  workers of a multi-worker server).
+
+Configuration (environment):
+
+- ``NINJA_LOG_MAX_OUTPUT_CHARS``: characters of stdout/stderr kept per task (default 200000).
+- ``NINJA_LOG_COMPRESSION``: ``gzip`` (default) or ``none``.
+- ``NINJA_LOG_RETENTION_DAYS``: maximum artifact age (default 14).
+- ``NINJA_LOG_MAX_TOTAL_MB``: maximum size of each artifact directory (default 200).
+- ``NINJA_LOG_GC_INTERVAL_SEC``: minimum time between sweeps (default 3600).
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from ninja_common.shared_state import get_shared_store
+
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+# Task artifacts are named "<YYYYmmdd_HHMMSS>_<step>..." (other files are left alone)
+_ARTIFACT_NAME = re.compile(r"^\d{8}_\d{6}_.+\.(?:log|json)(?:\.gz)?$")
+
+_last_sweep: dict[str, float] = {}
+_sweep_lock = threading.Lock()
+
+
+def max_output_chars() -> int:
+    """Characters of each output stream kept in task logs."""
+    return int(os.environ.get("NINJA_LOG_MAX_OUTPUT_CHARS", "200000"))
+
+
+def compression_enabled() -> bool:
+    """Whether task log artifacts are gzip-compressed."""
+    return os.environ.get("NINJA_LOG_COMPRESSION", "gzip").lower() not in ("none", "off", "false")
+
+
+def truncate_output(
+    text: str,
+    limit: int,
+    transform: Callable[[str], str] | None = None,
+    margin: int = 4096,
+) -> str:
+    """
+    Keep the head and tail of a long text.
+
+    Args:
+        text: Text to truncate.
+        limit: Maximum characters kept (split evenly between head and tail).
+        transform: Function applied to the kept parts (e.g. redaction). It
+            sees ``margin`` extra characters around each cut, so matches that
+            straddle a cut are still transformed as a whole.
+        margin: Extra context given to ``transform`` at each cut.
+
+    Returns:
+        The (transformed) text, with a marker where the middle was dropped.
+    """
+    if len(text) <= limit:
+        return transform(text) if transform else text
+
+    head_len = limit // 2
+    tail_len = limit - head_len
+    head = text[: head_len + margin]
+    tail = text[len(text) - tail_len - margin :]
+    if transform:
+        head = transform(head)
+        tail = transform(tail)
+    dropped = len(text) - limit
+    return f"{head[:head_len]}\n... [{dropped} characters truncated] ...\n{tail[-tail_len:]}"
+
+
+def write_artifact(path: Path, content: str | dict[str, Any]) -> Path:
+    """
+    Write a log artifact, compact and (by default) gzip-compressed.
+
+    Args:
+        path: Target path without compression suffix.
+        content: Text, or a JSON-serializable dict (written without indentation).
+
+    Returns:
+        Path actually written (``.gz`` appended when compressed).
+    """
+    if not isinstance(content, str):
+        content = json.dumps(content, separators=(",", ":"), default=str)
+
+    if compression_enabled():
+        path = path.with_name(path.name + ".gz")
+        # Level 6 balances write time and size for text logs
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(content)
+    else:
+        path.write_text(content, encoding="utf-8")
+    return path
+
+
+def read_artifact(path: str | Path) -> str:
+    """
+    Read a log artifact written by ``write_artifact``.
+
+    Args:
+        path: Artifact path (compressed or not).
+
+    Returns:
+        Artifact text.
+    """
+    if str(path).endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def prune_artifacts(
+    directory: Path,
+    max_age_days: float,
+    max_total_bytes: int,
+    now: float | None = None,
+) -> tuple[int, int]:
+    """
+    Delete task artifacts older than the age limit, then oldest first until
+    the directory fits the size budget.
+
+    Args:
+        directory: Artifact directory.
+        max_age_days: Maximum artifact age in days.
+        max_total_bytes: Maximum total size of artifacts in the directory.
+        now: Current time (for tests).
+
+    Returns:
+        Tuple of (files deleted, bytes freed).
+    """
+    now = now or time.time()
+    cutoff = now - max_age_days * 86400
+
+    artifacts: list[tuple[float, int, Path]] = []
+    for path in _iter_artifacts(directory):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        artifacts.append((stat.st_mtime, stat.st_size, path))
+    artifacts.sort()
+
+    total = sum(size for _, size, _ in artifacts)
+    deleted = freed = 0
+    for mtime, size, path in artifacts:
+        if mtime >= cutoff and total <= max_total_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        deleted += 1
+        freed += size
+    return deleted, freed
+
+
+def schedule_retention(directories: Iterable[Path]) -> threading.Thread | None:
+    """
+    Prune artifact directories in a background thread, if not done recently.
+
+    Args:
+        directories: Artifact directories of one repository.
+
+    Returns:
+        The started thread, or None if a sweep ran within the interval.
+    """
+    directories = list(directories)
+    key = "|".join(str(d) for d in directories)
+    interval = float(os.environ.get("NINJA_LOG_GC_INTERVAL_SEC", "3600"))
+    with _sweep_lock:
+        last = _last_sweep.get(key)
+        if last is not None and time.monotonic() - last < interval:
+            return None
+        _last_sweep[key] = time.monotonic()
+
+    # Sibling HTTP workers share the interval, so only one of them sweeps
+    shared = get_shared_store()
+    if shared is not None and not shared.claim_interval(f"log-retention:{key}", interval):
+        return None
+
+    max_age_days = float(os.environ.get("NINJA_LOG_RETENTION_DAYS", "14"))
+    max_total_bytes = int(float(os.environ.get("NINJA_LOG_MAX_TOTAL_MB", "200")) * 1024 * 1024)
+
+    def sweep() -> None:
+        for directory in directories:
+            try:
+                deleted, freed = prune_artifacts(directory, max_age_days, max_total_bytes)
+            except OSError as e:
+                logger.debug(f"Log retention sweep of {directory} failed: {e}")
+                continue
+            if deleted:
+                logger.info(
+                    f"🧹 Pruned {deleted} task artifacts ({freed / 1024 / 1024:.1f} MB) "
+                    f"from {directory}"
+                )
+
+    thread = threading.Thread(target=sweep, name="ninja-log-retention", daemon=True)
+    thread.start()
+    return thread
+
+
+def _iter_artifacts(directory: Path) -> Iterable[Path]:
+    """Task artifact files in a directory."""
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return []
+    return [
+        directory / entry.name
+        for entry in entries
+        if entry.is_file(follow_symlinks=False) and _ARTIFACT_NAME.match(entry.name)
+    ]
@@ -6,15 +6,20 @@ Provides structured logging with file output for debugging and audit trails.
 
 from __future__ import annotations
 
-import json
 import logging
-import re
 import sys
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
+from ninja_common.log_store import (
+    max_output_chars,
+    schedule_retention,
+    truncate_output,
+    write_artifact,
+)
 from ninja_common.path_utils import ensure_internal_dirs
+from ninja_common.redaction import redact
 
 
 # Configure root logger
@@ -66,7 +71,9 @@ class TaskLogger:
     Writes detailed logs to centralized cache directory:
     ~/.cache/ninja-mcp/<repo_hash>-<repo_name>/logs/
 
-    This prevents polluting project directories with log files.
+    This prevents polluting project directories with log files. Logs are
+    gzip-compressed, subprocess output is capped (head and tail kept), and old
+    artifacts are pruned in the background (see ``ninja_common.log_store``).
     """
 
     def __init__(self, repo_root: str | Path, step_id: str):
@@ -84,6 +91,7 @@ class TaskLogger:
         # Ensure directories exist
         dirs = ensure_internal_dirs(repo_root)
         self.logs_dir = dirs["logs"]
+        self.tasks_dir = dirs["tasks"]
 
         # Create log file path
         safe_step_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in step_id)
@@ -92,6 +100,10 @@ class TaskLogger:
         # Also create a JSON metadata file
         self.metadata_file = self.logs_dir / f"{self.timestamp}_{safe_step_id}.json"
 
+        # Paths actually written by save() (with compression suffix)
+        self.saved_log_file: Path | None = None
+        self.saved_metadata_file: Path | None = None
+
         self._entries: list[dict[str, Any]] = []
         self._metadata: dict[str, Any] = {
             "step_id": step_id,
@@ -109,31 +121,7 @@ class TaskLogger:
         Returns:
             Redacted text.
         """
-        if not isinstance(text, str):
-            return text
-
-        # Patterns to redact
-        patterns = [
-            # API keys (common formats)
-            # Note: OpenRouter keys have format sk-or-v1-... with hyphens
-            (r"(sk-[a-zA-Z0-9_-]{20,})", "[REDACTED_API_KEY]"),
-            (r"(api[_-]key[a-zA-Z0-9]{10,})", "[REDACTED_API_KEY]"),
-            (r"(token[a-zA-Z0-9]{10,})", "[REDACTED_TOKEN]"),
-            # Passwords in various formats
-            (
-                r'(["\']?(password|passwd|pwd)["\']?\s*[:=]\s*["\'][^"\']{3,}["\'])',
-                "[REDACTED_PASSWORD]",
-            ),
-            (r'(["\']?(secret|key)["\']?\s*[:=]\s*["\'][^"\']{3,}["\'])', "[REDACTED_SECRET]"),
-            # Email addresses (basic pattern)
-            (r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})", "[REDACTED_EMAIL]"),
-        ]
-
-        redacted_text = text
-        for pattern, replacement in patterns:
-            redacted_text = re.sub(pattern, replacement, redacted_text, flags=re.IGNORECASE)
-
-        return redacted_text
+        return redact(text)
 
     def log(self, level: str, message: str, **extra: Any) -> None:
         """
@@ -206,17 +194,19 @@ class TaskLogger:
             stdout: Standard output.
             stderr: Standard error.
         """
-        # Redact sensitive data from command, stdout, and stderr
+        # Redact sensitive data from command, stdout, and stderr; long output
+        # keeps its head and tail only (redacted before cutting)
+        limit = max_output_chars()
         redacted_command = [self._redact_sensitive_data(str(arg)) for arg in command]
-        redacted_stdout = self._redact_sensitive_data(stdout)
-        redacted_stderr = self._redact_sensitive_data(stderr)
+        redacted_stdout = truncate_output(stdout, limit, self._redact_sensitive_data)
+        redacted_stderr = truncate_output(stderr, limit, self._redact_sensitive_data)
 
         self.info(
             "Subprocess completed",
             command=redacted_command,
             exit_code=exit_code,
-            stdout_length=len(redacted_stdout),
-            stderr_length=len(redacted_stderr),
+            stdout_length=len(stdout),
+            stderr_length=len(stderr),
         )
 
         # Store redacted output in metadata
@@ -232,37 +222,34 @@ class TaskLogger:
         Save logs to files.
 
         Returns:
-            Path to the log file.
+            Path to the log file (``.log.gz`` unless compression is disabled).
         """
         # Write human-readable log
-        with self.log_file.open("w") as f:
-            for entry in self._entries:
-                ts = entry.get("time", "")
-                level = entry.get("level", "INFO")
-                msg = entry.get("message", "")
-                f.write(f"[{ts}] {level}: {msg}\n")
-
-                # Write extra fields
-                for key, value in entry.items():
-                    if key not in ("time", "level", "message"):
-                        # Redact sensitive data in saved logs as well
-                        if isinstance(value, str):
-                            redacted_value = self._redact_sensitive_data(value)
-                        else:
-                            redacted_value = value
-                        f.write(f"  {key}: {redacted_value}\n")
+        lines = []
+        for entry in self._entries:
+            ts = entry.get("time", "")
+            level = entry.get("level", "INFO")
+            msg = entry.get("message", "")
+            lines.append(f"[{ts}] {level}: {msg}\n")
+
+            # Write extra fields (already redacted when logged)
+            for key, value in entry.items():
+                if key not in ("time", "level", "message"):
+                    lines.append(f"  {key}: {value}\n")
+        log_path = write_artifact(self.log_file, "".join(lines))
 
         # Write JSON metadata
         self._metadata["entries"] = self._entries
-        with self.metadata_file.open("w") as f:
-            json.dump(self._metadata, f, indent=2, default=str)
+        self.saved_metadata_file = write_artifact(self.metadata_file, self._metadata)
+        self.saved_log_file = log_path
 
-        return str(self.log_file)
+        schedule_retention([self.logs_dir, self.tasks_dir])
+        return str(log_path)
 
     @property
     def log_path(self) -> str:
         """Get the log file path."""
-        return str(self.log_file)
+        return str(self.saved_log_file or self.log_file)
 
 
 def create_task_logger(repo_root: str | Path, step_id: str) -> TaskLogger:
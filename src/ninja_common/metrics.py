@@ -9,6 +9,7 @@ executed through the Ninja MCP servers, including:
 """
 
 import csv
+import io
 import json
 import re
 from dataclasses import asdict, dataclass
@@ -271,9 +272,18 @@ class MetricsTracker:
         Args:
             metrics: TaskMetrics instance to record
         """
+        row = io.StringIO()
+        csv.DictWriter(row, fieldnames=self._get_fieldnames()).writerow(asdict(metrics))
+
+        # One locked write per row, so rows from concurrent server workers never interleave
         with self.metrics_file.open("a", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=self._get_fieldnames())
-            writer.writerow(asdict(metrics))
+            try:
+                import fcntl
+
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            except ImportError:
+                pass  # fcntl not available (Windows)
+            f.write(row.getvalue())
 
     def get_summary(self) -> dict:
         """
@@ -0,0 +1,208 @@
+"""
+Single-pass redaction of secrets in logged text.
+
+Task logs carry full CLI transcripts, often several MB per task. Running one
+``re.sub`` per secret pattern means one full pass over the text per pattern,
+and the text used to be redacted again each time it was re-logged or saved.
+
+``Redactor`` compiles its rules once. Every rule names the literal text its
+matches contain (its "anchors": ``sk-``, ``token``, ``@``...). A redaction
+lowercases the text once, finds all anchor occurrences with ``str.find``,
+and only tries a rule's full regex where one of its anchors occurs. Matches
+are resolved leftmost-first (rule order breaks ties), as a single
+alternation of all rules would, and each character is redacted at most once.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+@dataclass(frozen=True)
+class RedactionRule:
+    """A secret pattern and its replacement."""
+
+    pattern: str
+    """Regex matching the secret (matched case-insensitively)."""
+
+    replacement: str
+    """Text substituted for each match."""
+
+    anchors: tuple[str, ...] = ()
+    """Lowercase literals, one of which every match contains (empty: scan with the regex)."""
+
+    prefix_chars: str = ""
+    """Characters a match may include before its anchor."""
+
+    max_prefix: int | None = 0
+    """How many prefix characters at most (None: unbounded; only the longest is tried)."""
+
+    compiled: re.Pattern[str] = field(init=False, repr=False, compare=False)
+    """Compiled pattern."""
+
+    def __post_init__(self) -> None:
+        """Compile the pattern."""
+        object.__setattr__(self, "compiled", re.compile(self.pattern, re.IGNORECASE))
+
+
+_EMAIL_LOCAL_CHARS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-"
+
+DEFAULT_RULES: list[RedactionRule] = [
+    # API keys (common formats)
+    # Note: OpenRouter keys have format sk-or-v1-... with hyphens
+    RedactionRule(r"sk-[a-zA-Z0-9_-]{20,}", "[REDACTED_API_KEY]", ("sk-",)),
+    RedactionRule(r"api[_-]key[a-zA-Z0-9]{10,}", "[REDACTED_API_KEY]", ("api_key", "api-key")),
+    RedactionRule(r"token[a-zA-Z0-9]{10,}", "[REDACTED_TOKEN]", ("token",)),
+    # Passwords in various formats
+    RedactionRule(
+        r"[\"']?(?:password|passwd|pwd)[\"']?\s*[:=]\s*[\"'][^\"']{3,}[\"']",
+        "[REDACTED_PASSWORD]",
+        ("passw", "pwd"),
+        prefix_chars="\"'",
+        max_prefix=1,
+    ),
+    RedactionRule(
+        r"[\"']?(?:secret|key)[\"']?\s*[:=]\s*[\"'][^\"']{3,}[\"']",
+        "[REDACTED_SECRET]",
+        ("secret", "key"),
+        prefix_chars="\"'",
+        max_prefix=1,
+    ),
+    # Email addresses (basic pattern); a match spans the whole local part
+    RedactionRule(
+        r"(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+        "[REDACTED_EMAIL]",
+        ("@",),
+        prefix_chars=_EMAIL_LOCAL_CHARS,
+        max_prefix=None,
+    ),
+]
+
+
+class Redactor:
+    """Compiled set of redaction rules applied in one pass."""
+
+    def __init__(self, rules: Iterable[RedactionRule] = DEFAULT_RULES):
+        """
+        Compile redaction rules.
+
+        Args:
+            rules: Rules in priority order (at a given position, the first
+                matching rule wins).
+        """
+        self.rules = list(rules)
+
+        self._anchors: dict[str, list[int]] = {}
+        self._unanchored: list[int] = []
+        for index, rule in enumerate(self.rules):
+            if not rule.anchors:
+                self._unanchored.append(index)
+            for anchor in rule.anchors:
+                self._anchors.setdefault(anchor.lower(), []).append(index)
+
+        # Used when lowercasing changes string length (rare unicode)
+        self._fallback = re.compile(
+            "|".join(f"(?P<r{i}>{rule.pattern})" for i, rule in enumerate(self.rules)),
+            re.IGNORECASE,
+        )
+
+    def redact(self, text: str) -> str:
+        """
+        Redact every secret in a text.
+
+        Args:
+            text: Text to redact (non-strings are returned unchanged).
+
+        Returns:
+            Redacted text.
+        """
+        if not isinstance(text, str) or not text:
+            return text
+
+        parts: list[str] = []
+        pos = 0
+        for start, end, replacement in self.spans(text):
+            parts.append(text[pos:start])
+            parts.append(replacement)
+            pos = end
+        if not parts:
+            return text
+        parts.append(text[pos:])
+        return "".join(parts)
+
+    def spans(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """
+        Find the secrets in a text.
+
+        Args:
+            text: Text to scan.
+
+        Yields:
+            Non-overlapping ``(start, end, replacement)`` in text order.
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            for found in self._fallback.finditer(text):
+                rule = self.rules[int(found.lastgroup[1:])]  # type: ignore[index]
+                yield found.start(), found.end(), rule.replacement
+            return
+
+        pos = 0
+        for start, index in sorted(self._candidates(text, lowered)):
+            if start < pos:
+                continue
+            rule = self.rules[index]
+            match = rule.compiled.match(text, start)
+            if match is None or match.end() == start:
+                continue
+            yield start, match.end(), rule.replacement
+            pos = match.end()
+
+    def _candidates(self, text: str, lowered: str) -> set[tuple[int, int]]:
+        """Positions where a rule may match, as (start, rule index)."""
+        candidates: set[tuple[int, int]] = set()
+        for anchor, indexes in self._anchors.items():
+            at = lowered.find(anchor)
+            while at != -1:
+                for index in indexes:
+                    rule = self.rules[index]
+                    first = at
+                    while (
+                        first > 0
+                        and text[first - 1] in rule.prefix_chars
+                        and (rule.max_prefix is None or at - first < rule.max_prefix)
+                    ):
+                        first -= 1
+                    if rule.max_prefix is None:
+                        candidates.add((first, index))
+                    else:
+                        candidates.update((start, index) for start in range(first, at + 1))
+                at = lowered.find(anchor, at + 1)
+
+        for index in self._unanchored:
+            for match in self.rules[index].compiled.finditer(text):
+                candidates.add((match.start(), index))
+        return candidates
+
+
+# Default rules compiled once per process
+_redactor: Redactor | None = None
+
+
+def get_redactor() -> Redactor:
+    """Get the shared redactor with the default rules."""
+    global _redactor
+    if _redactor is None:
+        _redactor = Redactor()
+    return _redactor
+
+
+def redact(text: str) -> str:
+    """Redact secrets from text with the default rules."""
+    return get_redactor().redact(text)
@@ -29,6 +29,7 @@ except ImportError:
 
 from ninja_common.logging_utils import get_logger
 from ninja_common.path_utils import validate_repo_root as _validate
+from ninja_common.shared_state import get_shared_store
 
 
 logger = get_logger(__name__)
@@ -43,16 +44,19 @@ class RateLimiter:
     Implements sliding window rate limiting to prevent abuse.
     """
 
-    def __init__(self, max_calls: int = 100, time_window: int = 60):
+    def __init__(self, max_calls: int = 100, time_window: int = 60, scope: str = "default"):
         """
         Initialize rate limiter.
 
         Args:
             max_calls: Maximum number of calls allowed in time window.
             time_window: Time window in seconds.
+            scope: Limit name; limiters with the same scope share counts
+                across worker processes when shared state is enabled.
         """
         self.max_calls = max_calls
         self.time_window = time_window
+        self.scope = scope
         self.calls: dict[str, list[float]] = defaultdict(list)
         self._lock = asyncio.Lock()
 
@@ -69,6 +73,19 @@ class RateLimiter:
         Returns:
             True if within limit, False if exceeded.
         """
+        shared = get_shared_store()
+        if shared is not None:
+            # Multi-worker server: the window lives in the cross-process store
+            admitted = await asyncio.to_thread(
+                shared.try_acquire, self.scope, client_id, self.max_calls, self.time_window
+            )
+            if not admitted:
+                logger.warning(
+                    f"Rate limit exceeded for client {client_id}: "
+                    f"{self.max_calls} calls in last {self.time_window}s (all workers)"
+                )
+            return admitted
+
         async with self._lock:
             now = time.time()
             client_calls = self.calls[client_id]
@@ -91,6 +108,9 @@ class RateLimiter:
 
     async def reset(self, client_id: str = "default") -> None:
         """Reset rate limit for a client."""
+        shared = get_shared_store()
+        if shared is not None:
+            await asyncio.to_thread(shared.reset, self.scope, client_id)
         async with self._lock:
             if client_id in self.calls:
                 del self.calls[client_id]
@@ -179,7 +199,11 @@ def rate_limited(max_calls: int = 100, time_window: int = 60):
     """
 
     def decorator(func: F) -> F:
-        limiter = RateLimiter(max_calls=max_calls, time_window=time_window)
+        limiter = RateLimiter(
+            max_calls=max_calls,
+            time_window=time_window,
+            scope=f"{func.__module__}.{func.__qualname__}",
+        )
 
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
@@ -381,6 +405,23 @@ class ResourceMonitor:
 
         return stats
 
+    def memory_percent(self) -> float | None:
+        """
+        Get current system memory usage.
+
+        Cheap enough to call on every scheduling decision (no CPU sampling).
+
+        Returns:
+            Memory usage percentage, or None if psutil is unavailable.
+        """
+        if not PSUTIL_AVAILABLE:
+            return None
+        try:
+            return float(psutil.virtual_memory().percent)
+        except Exception as e:
+            logger.debug(f"Error reading memory usage: {e}")
+            return None
+
     async def acquire_task_slot(self) -> bool:
         """
         Acquire a slot for a concurrent task.
@@ -0,0 +1,316 @@
+"""
+Cross-process state for multi-worker servers.
+
+A server running several HTTP workers (see ``ninja_common.http_server``) has
+one copy of every in-memory structure per worker. State that enforces a
+global limit must instead live somewhere all workers see. ``SharedStore``
+keeps it in a SQLite database (WAL mode, one short write transaction per
+operation):
+
+- sliding-window call timestamps, so a rate limit holds across workers;
+- interval claims, so periodic housekeeping such as log retention runs once
+  per interval rather than once per worker;
+- task slots, so the coder's task scheduler caps CLI runs and serializes
+  repositories across workers (see ``ninja_coder.scheduler``);
+- request claims and results, so a retried call that lands on another
+  worker attaches to the running execution (see ``ninja_common.inflight``).
+
+Slots and running requests record the owning process; entries of processes
+that died (a crashed worker) are dropped the next time they are checked.
+
+The supervisor enables it for its workers by setting ``NINJA_SHARED_STATE``;
+single-process servers keep their in-memory state.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from ninja_common.path_utils import get_cache_dir
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+SHARED_STATE_ENV = "NINJA_SHARED_STATE"
+
+
+class SharedStore:
+    """Limits, claims and task slots shared by worker processes through SQLite."""
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) the shared database.
+
+        Args:
+            path: SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), timeout=10, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_calls ("
+            "scope TEXT NOT NULL, client_id TEXT NOT NULL, ts REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS rate_calls_key ON rate_calls (scope, client_id, ts)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS claims (key TEXT PRIMARY KEY, ts REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS task_slots ("
+            "holder TEXT PRIMARY KEY, repo TEXT NOT NULL, pid INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS requests ("
+            "key TEXT PRIMARY KEY, pid INTEGER NOT NULL, result TEXT, expires REAL)"
+        )
+
+    def try_acquire(
+        self,
+        scope: str,
+        client_id: str,
+        max_calls: int,
+        time_window: float,
+        now: float | None = None,
+    ) -> bool:
+        """
+        Record a call if the window has room.
+
+        Args:
+            scope: Limit name (e.g. the rate-limited function).
+            client_id: Client identifier.
+            max_calls: Maximum calls in the window.
+            time_window: Window length in seconds.
+            now: Current time (for tests).
+
+        Returns:
+            True if the call was admitted.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            # BEGIN IMMEDIATE serializes concurrent checks across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM rate_calls WHERE scope = ? AND client_id = ? AND ts <= ?",
+                    (scope, client_id, now - time_window),
+                )
+                (count,) = self._conn.execute(
+                    "SELECT COUNT(*) FROM rate_calls WHERE scope = ? AND client_id = ?",
+                    (scope, client_id),
+                ).fetchone()
+                admitted: bool = count < max_calls
+                if admitted:
+                    self._conn.execute(
+                        "INSERT INTO rate_calls (scope, client_id, ts) VALUES (?, ?, ?)",
+                        (scope, client_id, now),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return admitted
+
+    def reset(self, scope: str, client_id: str) -> None:
+        """Forget all calls of a client."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM rate_calls WHERE scope = ? AND client_id = ?", (scope, client_id)
+            )
+
+    def claim_interval(self, key: str, interval: float, now: float | None = None) -> bool:
+        """
+        Claim a periodic job unless some process claimed it within the interval.
+
+        Args:
+            key: Job name.
+            interval: Minimum seconds between runs.
+            now: Current time (for tests).
+
+        Returns:
+            True if the caller should run the job.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO claims (key, ts) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET ts = excluded.ts WHERE claims.ts <= ?",
+                (key, now, now - interval),
+            )
+        return cursor.rowcount > 0
+
+    def try_acquire_slot(
+        self, holder: str, repo: str, max_slots: int, serialize_repos: bool = True
+    ) -> bool:
+        """
+        Take a task slot if fewer than ``max_slots`` are held.
+
+        Args:
+            holder: Unique slot holder id.
+            repo: Repository the task works on.
+            max_slots: Maximum slots held by all processes together.
+            serialize_repos: Also require that no slot holds the same repository.
+
+        Returns:
+            True if the slot was taken (release it with ``release_slot``).
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for (pid,) in self._conn.execute("SELECT DISTINCT pid FROM task_slots").fetchall():
+                    if not _pid_alive(pid):
+                        self._conn.execute("DELETE FROM task_slots WHERE pid = ?", (pid,))
+                (held,) = self._conn.execute("SELECT COUNT(*) FROM task_slots").fetchone()
+                admitted: bool = held < max_slots
+                if admitted and serialize_repos:
+                    admitted = (
+                        self._conn.execute(
+                            "SELECT 1 FROM task_slots WHERE repo = ?", (repo,)
+                        ).fetchone()
+                        is None
+                    )
+                if admitted:
+                    self._conn.execute(
+                        "INSERT INTO task_slots (holder, repo, pid) VALUES (?, ?, ?)",
+                        (holder, repo, os.getpid()),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return admitted
+
+    def release_slot(self, holder: str) -> None:
+        """Give back a task slot (no-op if it is not held)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM task_slots WHERE holder = ?", (holder,))
+
+    def claim_request(self, key: str, now: float | None = None) -> bool:
+        """
+        Claim the execution of a request unless another process runs it or has its result.
+
+        Args:
+            key: Request key.
+            now: Current time (for tests).
+
+        Returns:
+            True if the caller should execute the request and then call
+            ``finish_request``.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._drop_stale_request(key, now)
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO requests (key, pid) VALUES (?, ?)", (key, os.getpid())
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount > 0
+
+    def request_result(self, key: str, now: float | None = None) -> tuple[bool, str | None]:
+        """
+        Look up a request claimed by some process.
+
+        Args:
+            key: Request key.
+            now: Current time (for tests).
+
+        Returns:
+            ``(claimed, result)``: whether the request is running or has a
+            result, and the result once there is one.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._drop_stale_request(key, now)
+                row = self._conn.execute(
+                    "SELECT result FROM requests WHERE key = ?", (key,)
+                ).fetchone()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return False, None
+        result: str | None = row[0]
+        return True, result
+
+    def finish_request(
+        self, key: str, result: str | None, ttl: float, now: float | None = None
+    ) -> None:
+        """
+        End a claimed request.
+
+        Args:
+            key: Request key.
+            result: Serialized result to share for ``ttl`` seconds, or None to
+                let the next caller run the request again.
+            ttl: Seconds to keep the result.
+            now: Current time (for tests).
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if result is None or ttl <= 0:
+                self._conn.execute("DELETE FROM requests WHERE key = ?", (key,))
+            else:
+                self._conn.execute(
+                    "UPDATE requests SET result = ?, expires = ? WHERE key = ?",
+                    (result, now + ttl, key),
+                )
+
+    def _drop_stale_request(self, key: str, now: float) -> None:
+        """Delete a request whose result expired or whose process died (in a transaction)."""
+        row = self._conn.execute(
+            "SELECT pid, result, expires FROM requests WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return
+        pid, result, expires = row
+        if (result is not None and expires <= now) or (result is None and not _pid_alive(pid)):
+            self._conn.execute("DELETE FROM requests WHERE key = ?", (key,))
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Opened lazily, once per process
+_shared_store: SharedStore | None = None
+
+
+def shared_state_enabled() -> bool:
+    """Whether this process shares limits with sibling workers."""
+    return os.environ.get(SHARED_STATE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def get_shared_store() -> SharedStore | None:
+    """Get the shared store, or None when shared state is disabled."""
+    global _shared_store
+    if not shared_state_enabled():
+        return None
+    if _shared_store is None:
+        _shared_store = SharedStore(get_cache_dir() / "shared_state.db")
+    return _shared_store
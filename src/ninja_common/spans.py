@@ -0,0 +1,200 @@
+"""
+Span-based timing of task execution stages.
+
+A ``Trace`` collects the spans (named, timed stages) of one tool call. The
+tool method runs under ``@traced``, which makes a new trace current for
+everything it awaits, including the driver and work handed to threads with
+``asyncio.to_thread``; code anywhere below it marks stages with ``span()``
+or ``record_span()``. Outside a trace both do nothing, so instrumented code
+costs nothing when nobody is measuring.
+
+Traces are written to the structured log (see
+``StructuredLogger.log_timings``) and summarized per stage with
+``summarize_stages``; no external tracing backend is involved.
+
+Example:
+    @traced
+    async def run_tool(self, task_id):
+        with span("write_task_file"):
+            ...
+        structured_logger.log_timings(current_trace(), task_id=task_id)
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable, Iterator
+
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+PERCENTILES = (50, 90, 99)
+
+_current: ContextVar[Trace | None] = ContextVar("ninja_trace", default=None)
+
+
+@dataclass
+class Span:
+    """One timed stage, in milliseconds from the start of its trace."""
+
+    name: str
+    start_ms: float
+    duration_ms: float
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dict (attributes inlined)."""
+        return {
+            "name": self.name,
+            "start_ms": round(self.start_ms, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            **self.attrs,
+        }
+
+
+@dataclass
+class Trace:
+    """Spans recorded during one tool call."""
+
+    started: float = field(default_factory=time.perf_counter)
+    spans: list[Span] = field(default_factory=list)
+
+    def add(self, name: str, start: float, end: float, **attrs: Any) -> None:
+        """
+        Record a span measured by the caller.
+
+        Args:
+            name: Stage name.
+            start: ``time.perf_counter()`` when the stage started.
+            end: ``time.perf_counter()`` when it ended.
+            **attrs: Extra fields stored with the span.
+        """
+        self.spans.append(Span(name, (start - self.started) * 1000, (end - start) * 1000, attrs))
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[None]:
+        """Time the enclosed block as a span (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter(), **attrs)
+
+    @property
+    def elapsed_ms(self) -> float:
+        """Time since the trace started."""
+        return (time.perf_counter() - self.started) * 1000
+
+    def stage_totals(self) -> dict[str, float]:
+        """Total milliseconds per stage name (repeated stages, e.g. retries, add up)."""
+        totals: dict[str, float] = {}
+        for span_ in self.spans:
+            totals[span_.name] = totals.get(span_.name, 0.0) + span_.duration_ms
+        return {name: round(ms, 3) for name, ms in totals.items()}
+
+
+def current_trace() -> Trace | None:
+    """The trace of the running tool call, if any."""
+    return _current.get()
+
+
+@contextmanager
+def start_trace() -> Iterator[Trace]:
+    """Make a new trace current for the enclosed block."""
+    trace = Trace()
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def traced(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    """
+    Decorator running an async function in a new trace.
+
+    Args:
+        func: Async function to trace.
+
+    Returns:
+        Wrapped function.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        with start_trace():
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[None]:
+    """Time the enclosed block as a span of the current trace (no-op without one)."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name, **attrs):
+        yield
+
+
+def record_span(name: str, start: float, end: float | None = None, **attrs: Any) -> None:
+    """
+    Record a span of the current trace measured by the caller (no-op without one).
+
+    Args:
+        name: Stage name.
+        start: ``time.perf_counter()`` when the stage started.
+        end: ``time.perf_counter()`` when it ended (now if None).
+        **attrs: Extra fields stored with the span.
+    """
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, start, time.perf_counter() if end is None else end, **attrs)
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Linearly interpolated percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize_stages(samples: Iterable[dict[str, float]]) -> dict[str, dict[str, float]]:
+    """
+    Aggregate per-call stage totals into latency statistics.
+
+    Args:
+        samples: Stage totals (milliseconds) of each call, as from ``stage_totals``.
+
+    Returns:
+        Stage name -> count, p50, p90, p99, max and mean, over the calls
+        that had the stage.
+    """
+    values: dict[str, list[float]] = {}
+    for sample in samples:
+        for stage, ms in sample.items():
+            values.setdefault(stage, []).append(ms)
+
+    summary = {}
+    for stage, stage_values in values.items():
+        stats: dict[str, float] = {"count": len(stage_values)}
+        stats.update({f"p{p}": round(percentile(stage_values, p), 3) for p in PERCENTILES})
+        stats["max"] = max(stage_values)
+        stats["mean"] = round(sum(stage_values) / len(stage_values), 3)
+        summary[stage] = stats
+    return summary
@@ -0,0 +1,222 @@
+"""
+Startup profiling for MCP server entry points.
+
+Every editor session spawns the stdio servers, so their startup time adds
+directly to the time before the first tool is available. This module
+measures it two ways:
+
+- ``profile_imports`` runs ``python -X importtime -c "import <module>"`` in a
+  fresh interpreter and parses the per-module timings.
+- ``time_to_list_tools`` starts a server command over stdio and times the
+  ``initialize`` / ``tools/list`` exchange.
+
+Usage:
+    python -m ninja_common.startup_profile ninja_coder.server --top 15
+    python -m ninja_common.startup_profile ninja_coder.server --list-tools
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import select
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+
+# Lines look like: import time: <self us> | <cumulative us> | <indented module>
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportTiming:
+    """Import cost of one module, in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    """Parsed ``-X importtime`` output for one import."""
+
+    module: str
+    timings: list[ImportTiming] = field(default_factory=list)
+
+    @property
+    def modules(self) -> set[str]:
+        """Names of all modules imported."""
+        return {t.module for t in self.timings}
+
+    @property
+    def total_us(self) -> int:
+        """Cumulative import time of the profiled module."""
+        for timing in self.timings:
+            if timing.module == self.module:
+                return timing.cumulative_us
+        return sum(t.self_us for t in self.timings)
+
+    def top(self, n: int = 20) -> list[ImportTiming]:
+        """The ``n`` modules with the highest self time."""
+        return sorted(self.timings, key=lambda t: t.self_us, reverse=True)[:n]
+
+
+def parse_importtime(module: str, output: str) -> ImportProfile:
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        module: The module whose import was profiled.
+        output: Interpreter stderr.
+
+    Returns:
+        Parsed profile (lines that are not import timings are ignored).
+    """
+    profile = ImportProfile(module)
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            profile.timings.append(
+                ImportTiming(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+            )
+    return profile
+
+
+def profile_imports(module: str, env: dict[str, str] | None = None) -> ImportProfile:
+    """
+    Import a module in a fresh interpreter with ``-X importtime``.
+
+    Args:
+        module: Module to import (e.g. "ninja_coder.server").
+        env: Environment for the interpreter (default: this process's).
+
+    Returns:
+        Parsed profile.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=False,
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+    )
+    if result.returncode != 0:
+        lines = [ln for ln in result.stderr.splitlines() if not ln.startswith("import time:")]
+        raise RuntimeError(f"Importing {module} failed:\n" + "\n".join(lines[-20:]))
+    return parse_importtime(module, result.stderr)
+
+
+def time_to_list_tools(command: list[str], timeout: float = 60) -> tuple[float, int]:
+    """
+    Time from spawning a stdio MCP server to its ``tools/list`` response.
+
+    Args:
+        command: Server command line (stdio mode).
+        timeout: Seconds to wait for the response.
+
+    Returns:
+        (seconds elapsed, number of tools listed).
+
+    Raises:
+        TimeoutError: If the server does not answer in time.
+        RuntimeError: If the server exits or answers with an error.
+    """
+    messages = [
+        {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "ninja-startup-profile", "version": "1"},
+            },
+        },
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+    ]
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        command,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        assert proc.stdin is not None and proc.stdout is not None
+        proc.stdin.write(b"".join(json.dumps(m).encode() + b"\n" for m in messages))
+        proc.stdin.flush()
+
+        fd = proc.stdout.fileno()
+        buffer = b""
+        deadline = started + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError(f"No tools/list response within {timeout:.0f}s")
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise RuntimeError(f"Server exited (status {proc.wait()}) before listing tools")
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if message.get("id") != 2:
+                    continue
+                if "error" in message:
+                    raise RuntimeError(f"tools/list failed: {message['error']}")
+                return time.perf_counter() - started, len(message["result"]["tools"])
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Profile MCP server startup")
+    parser.add_argument("module", help="Server module, e.g. ninja_coder.server")
+    parser.add_argument("--top", type=int, default=20, help="Slowest modules to show")
+    parser.add_argument(
+        "--list-tools",
+        action="store_true",
+        help="Also time initialize + tools/list over stdio (python -m <module>)",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Runs to take the best of")
+    args = parser.parse_args()
+
+    profiles = [profile_imports(args.module) for _ in range(args.runs)]
+    best = min(profiles, key=lambda p: p.total_us)
+    print(f"import {args.module}: {best.total_us / 1000:.1f} ms ({len(best.modules)} modules)")
+    for timing in best.top(args.top):
+        print(
+            f"  {timing.self_us / 1000:8.1f} ms self  "
+            f"{timing.cumulative_us / 1000:8.1f} ms cumulative  {timing.module}"
+        )
+
+    if args.list_tools:
+        command = [sys.executable, "-m", args.module]
+        results = [time_to_list_tools(command) for _ in range(args.runs)]
+        elapsed, tools = min(results)
+        print(f"time to tools/list: {elapsed * 1000:.0f} ms ({tools} tools)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
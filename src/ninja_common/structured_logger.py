@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import json
 import logging
+from collections import deque
 from dataclasses import asdict, dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
@@ -17,6 +18,8 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from ninja_common.spans import Trace
+
 
 logger = logging.getLogger(__name__)
 
@@ -248,6 +251,34 @@ class StructuredLogger:
             **kwargs,
         )
 
+    def log_timings(
+        self,
+        trace: Trace,
+        session_id: str | None = None,
+        task_id: str | None = None,
+        **kwargs,
+    ):
+        """Log the stage timings of a traced tool call.
+
+        Args:
+            trace: Trace of the call.
+            session_id: Optional session identifier.
+            task_id: Optional task identifier.
+            **kwargs: Additional fields.
+        """
+        total_ms = round(trace.elapsed_ms, 3)
+        self.log(
+            "INFO",
+            f"Timings: {total_ms:.0f} ms in {len(trace.spans)} spans",
+            session_id=session_id,
+            task_id=task_id,
+            event="timings",
+            total_ms=total_ms,
+            stage_ms=trace.stage_totals(),
+            spans=[span.to_dict() for span in trace.spans],
+            **kwargs,
+        )
+
     def query_logs(
         self,
         session_id: str | None = None,
@@ -355,6 +386,59 @@ class StructuredLogger:
 
         return count
 
+    def timing_stats(
+        self,
+        session_id: str | None = None,
+        task_id: str | None = None,
+        cli_name: str | None = None,
+        limit: int = 1000,
+    ) -> dict[str, dict[str, float]]:
+        """Per-stage latency statistics over logged task timings.
+
+        Args:
+            session_id: Filter by session ID.
+            task_id: Filter by task ID.
+            cli_name: Filter by CLI name.
+            limit: Number of most recent matching calls to aggregate.
+
+        Returns:
+            Stage name -> count, p50, p90, p99, max and mean in milliseconds
+            ("total" is the whole call).
+        """
+        from ninja_common.spans import summarize_stages
+
+        if not self.log_file.exists():
+            return {}
+
+        samples: deque[dict[str, float]] = deque(maxlen=limit)
+
+        try:
+            with open(self.log_file) as f:
+                for line in f:
+                    # Cheap pre-filter: most entries are not timings
+                    if '"event": "timings"' not in line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+                    extra = entry.get("extra") or {}
+                    if extra.get("event") != "timings":
+                        continue
+                    if session_id and entry.get("session_id") != session_id:
+                        continue
+                    if task_id and entry.get("task_id") != task_id:
+                        continue
+                    if cli_name and entry.get("cli_name") != cli_name:
+                        continue
+
+                    samples.append({**extra.get("stage_ms", {}), "total": extra["total_ms"]})
+        except Exception as e:
+            logger.error(f"Failed to read timings: {e}")
+
+        return summarize_stages(samples)
+
     def get_recent_errors(self, limit: int = 10) -> list[dict[str, Any]]:
         """Get recent error log entries.
 
@@ -17,18 +17,7 @@ from ninja_prompts.models import (
 )
 from ninja_prompts.prompt_manager import PromptManager
 from ninja_prompts.template_engine import TemplateEngine
-from ninja_prompts.tools import PromptToolExecutor
-
-
-_executor = None
-
-
-def get_executor() -> PromptToolExecutor:
-    """Get or create the singleton PromptToolExecutor."""
-    global _executor
-    if _executor is None:
-        _executor = PromptToolExecutor()
-    return _executor
+from ninja_prompts.tools import PromptToolExecutor, get_executor
 
 
 __all__ = [
@@ -0,0 +1,228 @@
+"""Concurrent execution of multi-step prompt chains.
+
+A chain is a list of steps, each rendering a stored prompt. A step can use
+the output of an earlier step through ``{{prev.<step_name>}}``, either in
+its prompt template or in one of its string variables. Those references
+form a dependency DAG: every step starts as soon as the steps it references
+have finished, so independent steps run concurrently (bounded by a
+semaphore) and a chain takes critical-path time rather than the sum of its
+steps.
+
+Step outputs are memoized by (template hash, inputs hash). Re-running a
+chain whose early steps are unchanged reuses their outputs and only
+executes the steps whose template or inputs changed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from ninja_prompts.models import ChainStepOutput, PromptChainStep, PromptTemplate
+
+
+if TYPE_CHECKING:
+    from ninja_prompts.prompt_manager import PromptManager
+    from ninja_prompts.template_engine import TemplateEngine
+
+
+PREV_PREFIX = "prev."
+
+# Executes one step: (step, rendered prompt) -> output
+StepRunner = Callable[[PromptChainStep, str], Awaitable[str]]
+
+
+class ChainError(ValueError):
+    """A chain cannot be executed (unknown prompt, bad reference, cycle)."""
+
+
+async def render_only(step: PromptChainStep, rendered: str) -> str:
+    """Default step runner: the step's output is its rendered prompt."""
+    return rendered
+
+
+@dataclass
+class ChainPlan:
+    """A validated chain: each step's prompt and dependencies."""
+
+    prompts: dict[str, PromptTemplate]
+    deps: dict[str, set[str]]
+    order: list[str]  # dependencies before dependents
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+class ChainExecutor:
+    """Runs prompt chains as a DAG with memoized step outputs."""
+
+    def __init__(
+        self,
+        manager: PromptManager,
+        engine: TemplateEngine,
+        run_step: StepRunner = render_only,
+        max_concurrency: int = 4,
+        cache_size: int = 256,
+    ):
+        """Initialize the executor.
+
+        Args:
+            manager: Source of the prompts the steps refer to.
+            engine: Template engine used to render steps.
+            run_step: Coroutine producing a step's output from its rendered prompt.
+            max_concurrency: Maximum number of steps running at once.
+            cache_size: Number of step outputs to memoize.
+        """
+        self.manager = manager
+        self.engine = engine
+        self.run_step = run_step
+        self.max_concurrency = max_concurrency
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+
+    def _references(self, template: str, step: PromptChainStep) -> set[str]:
+        """Names of the steps referenced through ``prev.*``."""
+        names = set(self.engine.compile(template).required)
+        for value in step.variables.values():
+            if isinstance(value, str):
+                names |= self.engine.compile(value).required
+        return {name[len(PREV_PREFIX) :] for name in names if name.startswith(PREV_PREFIX)}
+
+    def plan(self, steps: list[PromptChainStep]) -> ChainPlan:
+        """Resolve each step's prompt and dependencies.
+
+        Args:
+            steps: The chain's steps.
+
+        Returns:
+            The chain's plan.
+
+        Raises:
+            ChainError: On duplicate step names, unknown prompts or steps, or cycles.
+        """
+        prompts: dict[str, PromptTemplate] = {}
+        for step in steps:
+            if step.name in prompts:
+                raise ChainError(f"Duplicate step name: {step.name}")
+            prompt = self.manager.get_prompt(step.prompt_id)
+            if prompt is None:
+                raise ChainError(f"Step '{step.name}': prompt not found: {step.prompt_id}")
+            prompts[step.name] = prompt
+
+        deps: dict[str, set[str]] = {}
+        for step in steps:
+            refs = self._references(prompts[step.name].template, step)
+            unknown = refs - prompts.keys()
+            if unknown:
+                raise ChainError(
+                    f"Step '{step.name}' references unknown step(s): {', '.join(sorted(unknown))}"
+                )
+            deps[step.name] = refs
+
+        order: list[str] = []
+        pending = dict(deps)
+        while pending:
+            ready = [name for name, refs in pending.items() if refs.issubset(order)]
+            if not ready:
+                raise ChainError(
+                    f"Chain has a dependency cycle among: {', '.join(sorted(pending))}"
+                )
+            for name in ready:
+                order.append(name)
+                del pending[name]
+        return ChainPlan(prompts, deps, order)
+
+    async def execute(
+        self,
+        steps: list[PromptChainStep],
+        on_output: Callable[[ChainStepOutput], None] | None = None,
+    ) -> list[ChainStepOutput]:
+        """Execute a chain.
+
+        Args:
+            steps: The chain's steps.
+            on_output: Called with each step's output as soon as it finishes.
+
+        Returns:
+            Step outputs in completion order.
+
+        Raises:
+            ChainError: If the chain cannot be planned.
+        """
+        plan = self.plan(steps)
+        deps = plan.deps
+        by_name = {step.name: step for step in steps}
+        outputs: dict[str, str] = {}
+        finished: list[ChainStepOutput] = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks: dict[str, asyncio.Task[None]] = {}
+
+        async def run(name: str) -> None:
+            if deps[name]:
+                await asyncio.gather(*(tasks[dep] for dep in deps[name]))
+            step = by_name[name]
+            prev = {f"{PREV_PREFIX}{dep}": outputs[dep] for dep in deps[name]}
+            prompt = plan.prompts[name]
+            variables = self._variables(step, prompt, prev)
+
+            key = (
+                _digest(prompt.template),
+                _digest(json.dumps(variables, sort_keys=True, default=str)),
+            )
+            cached = key in self._cache
+            if cached:
+                self._cache.move_to_end(key)
+                output = self._cache[key]
+            else:
+                async with semaphore:
+                    rendered = self.engine.render(prompt.template, variables)
+                    output = await self.run_step(step, rendered)
+                self._remember(key, output)
+
+            outputs[name] = output
+            result = ChainStepOutput(step_name=name, output=output, cached=cached)
+            finished.append(result)
+            if on_output is not None:
+                on_output(result)
+
+        # Tasks await the tasks of their dependencies, so create them in
+        # dependency order.
+        for name in plan.order:
+            tasks[name] = asyncio.create_task(run(name))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        return finished
+
+    def _variables(
+        self, step: PromptChainStep, prompt: PromptTemplate, prev: dict[str, str]
+    ) -> dict[str, Any]:
+        """A step's inputs: prompt defaults, its own variables, then prev outputs."""
+        variables: dict[str, Any] = {
+            var.name: var.default for var in prompt.variables if var.default is not None
+        }
+        for name, value in step.variables.items():
+            # Variables can refer to earlier outputs too
+            if isinstance(value, str) and any(
+                slot in prev for slot in self.engine.compile(value).slots
+            ):
+                variables[name] = self.engine.render(value, prev)
+            else:
+                variables[name] = value
+        variables.update(prev)
+        return variables
+
+    def _remember(self, key: tuple[str, str], output: str) -> None:
+        self._cache[key] = output
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
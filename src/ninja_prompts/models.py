@@ -114,6 +114,7 @@ class ChainStepOutput(BaseModel):
 
     step_name: str = Field(..., description="Name of the step")
     output: str = Field(..., description="Output from the step")
+    cached: bool = Field(False, description="Whether the output was reused from an earlier run")
 
 
 class PromptChainResult(BaseModel):
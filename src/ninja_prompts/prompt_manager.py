@@ -1,20 +1,74 @@
-"""Prompt management for loading, saving, and managing prompts."""
-
+"""Prompt management for loading, saving, and managing prompts.
+
+Prompts are parsed once and kept in an in-memory id -> template index.
+Each YAML file is cached with the mtime and size it had when parsed:
+directory mtimes reveal added and removed files, and a file is re-parsed
+only when its own stat changes. Parsed prompts are also written to a JSON
+snapshot in the cache directory, so a fresh process validates the snapshot
+with ``stat`` calls instead of parsing every YAML file again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 
 import yaml
 
+from ninja_common.logging_utils import get_logger
+from ninja_common.path_utils import get_cache_dir
 from ninja_prompts.models import PromptTemplate, PromptVariable
 
 
+logger = get_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class _CachedFile:
+    """A prompt file as of its last parse."""
+
+    mtime_ns: int
+    size: int
+    scope: str
+    prompt: PromptTemplate | None  # None if the file did not parse
+
+
 class PromptManager:
     """Manages prompt templates from user and builtin sources."""
 
-    def __init__(self):
-        """Initialize prompt manager with user and builtin directories."""
-        self.user_dir = Path.home() / ".ninja-mcp" / "prompts"
+    def __init__(
+        self,
+        user_dir: Path | None = None,
+        builtin_dir: Path | None = None,
+        snapshot_path: Path | None = None,
+    ):
+        """Initialize prompt manager with user and builtin directories.
+
+        Args:
+            user_dir: User prompt directory (default: ~/.ninja-mcp/prompts).
+            builtin_dir: Builtin prompt directory (default: package data).
+            snapshot_path: Parsed-prompt snapshot file (default: in the cache dir).
+        """
+        self.user_dir = user_dir or Path.home() / ".ninja-mcp" / "prompts"
         # Try to find builtin prompts in package data directory
-        self.builtin_dir = Path(__file__).parent.parent.parent / "data" / "builtin_prompts"
+        self.builtin_dir = (
+            builtin_dir or Path(__file__).parent.parent.parent / "data" / "builtin_prompts"
+        )
+        self.snapshot_path = snapshot_path or get_cache_dir() / "prompt_snapshot.json"
+
+        self._lock = threading.Lock()
+        self._files: dict[Path, _CachedFile] = {}
+        self._dir_state: dict[Path, tuple[int | None, list[Path]]] = {}
+        self._index: dict[str, PromptTemplate] = {}
+        self._index_paths: dict[str, Path] = {}
+        self._index_dirty = True
+        self._snapshot_dirty = False
+        self._load_snapshot()
 
     def load_prompts(self, scope: str = "all") -> dict[str, PromptTemplate]:
         """Load prompts from specified scope.
@@ -25,58 +79,178 @@ class PromptManager:
         Returns:
             Dictionary of prompt_id -> PromptTemplate
         """
-        prompts: dict[str, PromptTemplate] = {}
-
-        if scope in ("global", "all"):
-            prompts.update(self._load_from_directory(self.builtin_dir, "global"))
+        with self._lock:
+            self._refresh(check_all_files=True)
+            if scope == "all":
+                return dict(self._index)
+
+            prompts: dict[str, PromptTemplate] = {}
+            for path in self._all_files():
+                cached = self._files.get(path)
+                if cached and cached.prompt and cached.scope == scope:
+                    prompts[cached.prompt.id] = cached.prompt
+            return prompts
 
-        if scope in ("user", "all"):
-            prompts.update(self._load_from_directory(self.user_dir, "user"))
+    def _list_directory(self, directory: Path) -> list[Path]:
+        """YAML prompt files in a directory (empty if it cannot be read)."""
+        try:
+            return sorted(directory.glob("*.yml"))
+        except OSError:
+            # Handle directory read errors gracefully
+            return []
 
-        return prompts
+    def _parse_file(self, yaml_file: Path, scope: str) -> PromptTemplate | None:
+        """Parse one YAML prompt file (None if unparseable)."""
+        try:
+            with open(yaml_file) as f:
+                data = yaml.safe_load(f)
+            if not data:
+                return None
+            # Convert variables list to PromptVariable objects if needed
+            if "variables" in data and isinstance(data["variables"], list):
+                data["variables"] = [
+                    PromptVariable(**v) if isinstance(v, dict) else v for v in data["variables"]
+                ]
+            # Set scope
+            data["scope"] = scope
+            # Extract ID from filename if not in data
+            if "id" not in data:
+                data["id"] = yaml_file.stem
+            return PromptTemplate(**data)
+        except Exception:
+            # Skip unparseable YAML files
+            return None
 
-    def _load_from_directory(self, directory: Path, scope: str) -> dict[str, PromptTemplate]:
-        """Load all YAML prompt files from a directory.
+    def _directories(self) -> list[tuple[Path, str]]:
+        """Prompt directories in override order (user last, so it wins)."""
+        return [(self.builtin_dir, "global"), (self.user_dir, "user")]
 
-        Args:
-            directory: Directory path to load from
-            scope: "user" or "global"
+    def _all_files(self) -> list[Path]:
+        """Known prompt files in override order."""
+        return [
+            path for directory, _ in self._directories() for path in self._dir_state[directory][1]
+        ]
 
-        Returns:
-            Dictionary of prompt_id -> PromptTemplate
-        """
-        prompts: dict[str, PromptTemplate] = {}
+    def _refresh(self, check_all_files: bool = False, check: Path | None = None) -> None:
+        """Bring the cache up to date with the prompt directories.
 
-        if not directory.exists():
-            return prompts
+        Directory listings are re-read when a directory's mtime changes. Files
+        are stat-checked (all of them, or only ``check``) and re-parsed when
+        their mtime or size changed. Must be called with the lock held.
 
+        Args:
+            check_all_files: Stat every known file, not only those of changed directories.
+            check: A single file to stat-check.
+        """
+        to_check: list[tuple[Path, str]] = []
+        for directory, scope in self._directories():
+            try:
+                dir_mtime: int | None = directory.stat().st_mtime_ns
+            except OSError:
+                dir_mtime = None
+
+            state = self._dir_state.get(directory)
+            if state is None or state[0] != dir_mtime:
+                files = self._list_directory(directory) if dir_mtime is not None else []
+                self._dir_state[directory] = (dir_mtime, files)
+                self._index_dirty = True
+                to_check.extend((path, scope) for path in files)
+            elif check_all_files:
+                to_check.extend((path, scope) for path in state[1])
+            elif check is not None and check.parent == directory:
+                to_check.append((check, scope))
+
+        for path, scope in to_check:
+            self._check_file(path, scope)
+
+        if self._index_dirty:
+            self._rebuild_index()
+        if self._snapshot_dirty:
+            self._save_snapshot()
+
+    def _check_file(self, path: Path, scope: str) -> None:
+        """Re-parse a file if it changed since it was cached."""
         try:
-            for yaml_file in directory.glob("*.yml"):
-                try:
-                    with open(yaml_file) as f:
-                        data = yaml.safe_load(f)
-                        if data:
-                            # Convert variables list to PromptVariable objects if needed
-                            if "variables" in data and isinstance(data["variables"], list):
-                                data["variables"] = [
-                                    PromptVariable(**v) if isinstance(v, dict) else v
-                                    for v in data["variables"]
-                                ]
-                            # Set scope
-                            data["scope"] = scope
-                            # Extract ID from filename if not in data
-                            if "id" not in data:
-                                data["id"] = yaml_file.stem
-                            prompt = PromptTemplate(**data)
-                            prompts[prompt.id] = prompt
-                except Exception:
-                    # Skip unparseable YAML files
-                    continue
-        except Exception:
-            # Handle directory read errors gracefully
-            pass
-
-        return prompts
+            st = path.stat()
+        except OSError:
+            # Removed since the directory was listed
+            if self._files.pop(path, None) is not None:
+                self._index_dirty = True
+            return
+        cached = self._files.get(path)
+        if (
+            cached is not None
+            and cached.mtime_ns == st.st_mtime_ns
+            and cached.size == st.st_size
+            and cached.scope == scope
+        ):
+            return
+        self._files[path] = _CachedFile(
+            st.st_mtime_ns, st.st_size, scope, self._parse_file(path, scope)
+        )
+        self._index_dirty = True
+        self._snapshot_dirty = True
+
+    def _rebuild_index(self) -> None:
+        """Rebuild the id -> prompt index from the cached files."""
+        known = set()
+        self._index = {}
+        self._index_paths = {}
+        for path in self._all_files():
+            known.add(path)
+            cached = self._files.get(path)
+            if cached and cached.prompt:
+                self._index[cached.prompt.id] = cached.prompt
+                self._index_paths[cached.prompt.id] = path
+        # Forget files that no longer exist
+        for path in set(self._files) - known:
+            del self._files[path]
+            self._snapshot_dirty = True
+        self._index_dirty = False
+
+    def _load_snapshot(self) -> None:
+        """Seed the file cache from the on-disk snapshot, if present and valid."""
+        try:
+            data = json.loads(self.snapshot_path.read_text())
+            if data.get("version") != SNAPSHOT_VERSION:
+                return
+            for path, entry in data["files"].items():
+                prompt = entry["prompt"]
+                self._files[Path(path)] = _CachedFile(
+                    entry["mtime_ns"],
+                    entry["size"],
+                    entry["scope"],
+                    PromptTemplate.model_validate(prompt) if prompt is not None else None,
+                )
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable prompt snapshot {self.snapshot_path}: {e}")
+            self._files.clear()
+
+    def _save_snapshot(self) -> None:
+        """Write the file cache to the snapshot (atomically)."""
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "files": {
+                str(path): {
+                    "mtime_ns": cached.mtime_ns,
+                    "size": cached.size,
+                    "scope": cached.scope,
+                    "prompt": cached.prompt.model_dump(mode="json") if cached.prompt else None,
+                }
+                for path, cached in self._files.items()
+            },
+        }
+        tmp = self.snapshot_path.with_name(f"{self.snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data))
+            tmp.replace(self.snapshot_path)
+            self._snapshot_dirty = False
+        except OSError as e:
+            logger.debug(f"Could not write prompt snapshot {self.snapshot_path}: {e}")
+            tmp.unlink(missing_ok=True)
 
     def get_prompt(self, prompt_id: str) -> PromptTemplate | None:
         """Retrieve a specific prompt by ID.
@@ -87,8 +261,9 @@ class PromptManager:
         Returns:
             PromptTemplate if found, None otherwise
         """
-        prompts = self.load_prompts("all")
-        return prompts.get(prompt_id)
+        with self._lock:
+            self._refresh(check=self._index_paths.get(prompt_id))
+            return self._index.get(prompt_id)
 
     def list_prompts(self) -> list[PromptTemplate]:
         """List all available prompts.
@@ -96,8 +271,9 @@ class PromptManager:
         Returns:
             List of PromptTemplate objects
         """
-        prompts = self.load_prompts("all")
-        return list(prompts.values())
+        with self._lock:
+            self._refresh(check_all_files=True)
+            return list(self._index.values())
 
     def save_prompt(self, prompt: PromptTemplate) -> str:
         """Save a prompt to user directory.
@@ -116,8 +292,12 @@ class PromptManager:
 
         # Write to YAML file
         yaml_file = self.user_dir / f"{prompt.id}.yml"
-        with open(yaml_file, "w") as f:
-            yaml.safe_dump(prompt_data, f, default_flow_style=False)
+        with self._lock:
+            with open(yaml_file, "w") as f:
+                yaml.safe_dump(prompt_data, f, default_flow_style=False)
+            # Re-list even if the directory mtime did not visibly change
+            self._dir_state.pop(self.user_dir, None)
+            self._refresh(check=yaml_file)
 
         return prompt.id
 
@@ -131,7 +311,10 @@ class PromptManager:
             True if deleted, False if not found
         """
         yaml_file = self.user_dir / f"{prompt_id}.yml"
-        if yaml_file.exists():
+        with self._lock:
+            if not yaml_file.exists():
+                return False
             yaml_file.unlink()
-            return True
-        return False
+            self._dir_state.pop(self.user_dir, None)
+            self._refresh()
+        return True
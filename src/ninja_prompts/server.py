@@ -14,14 +14,14 @@ from ninja_prompts.models import (
     PromptRegistryRequest,
     PromptSuggestRequest,
 )
-from ninja_prompts.tools import PromptToolExecutor
+from ninja_prompts.tools import get_executor
 
 
 # Initialize server
 server = Server("ninja-prompts")
 
 # Initialize executor
-_executor = PromptToolExecutor()
+_executor = get_executor()
 
 
 # Define tools
@@ -68,7 +68,7 @@ TOOLS = [
     ),
     types.Tool(
         name="prompt_suggest",
-        description="Get AI-powered suggestions for relevant prompts based on context",
+        description="Suggest relevant prompts for a context, ranked locally by keyword relevance",
         inputSchema={
             "type": "object",
             "properties": {
@@ -166,14 +166,15 @@ async def main_stdio():
         await server.run(read_stream, write_stream, server.create_initialization_options())
 
 
-async def main_http(host: str, port: int) -> None:
-    """Run the MCP server over HTTP with SSE."""
-    import uvicorn
+async def main_http(host: str, port: int, uds: str | None = None) -> None:
+    """Run the MCP server over HTTP with SSE (on a Unix socket if ``uds`` is given)."""
     from mcp.server.sse import SseServerTransport
     from starlette.requests import Request
     from starlette.responses import Response
 
-    sse = SseServerTransport("/messages")
+    from ninja_common.http_server import message_path, serve_asgi
+
+    sse = SseServerTransport(message_path("/messages"))
 
     async def handle_sse(request: Request):
         """Handle SSE connection."""
@@ -219,9 +220,7 @@ async def main_http(host: str, port: int) -> None:
         else:
             await Response("Not Found", status_code=404)(scope, receive, send)
 
-    config = uvicorn.Config(app, host=host, port=port, log_level="info")
-    server_instance = uvicorn.Server(config)
-    await server_instance.serve()
+    await serve_asgi(app, host, port, uds=uds)
 
 
 def run() -> None:
@@ -246,12 +245,28 @@ def run() -> None:
         default="127.0.0.1",
         help="Host to bind to (default: 127.0.0.1)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="HTTP worker processes (default: NINJA_HTTP_WORKERS or 1)",
+    )
+    parser.add_argument(
+        "--uds",
+        type=str,
+        default=None,
+        help="Serve HTTP on this Unix domain socket instead of a TCP port",
+    )
 
     args = parser.parse_args()
 
     try:
         if args.http:
-            asyncio.run(main_http(args.host, args.port))
+            from ninja_common.http_server import default_workers, run_http
+
+            run_http(
+                main_http, args.host, args.port, args.workers or default_workers(), uds=args.uds
+            )
         else:
             asyncio.run(main_stdio())
     except KeyboardInterrupt:
@@ -0,0 +1,179 @@
+"""Local relevance ranking of prompts for prompt_suggest.
+
+Prompts are kept in an inverted index (term -> prompt id -> weighted term
+frequency) built from their name, tags, description and template. A
+context is ranked against it with BM25, so a suggestion is a handful of
+dictionary lookups rather than a model call. The index is updated one
+prompt at a time as prompts are created, updated or deleted.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any
+
+from ninja_prompts.models import PromptSuggestion, PromptTemplate
+
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Matches in a prompt's name or tags count more than matches in its template
+FIELD_WEIGHTS = {"name": 3, "tags": 3, "description": 2, "template": 1}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric terms of a text (single characters dropped)."""
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1]
+
+
+def _context_text(value: Any) -> str:
+    """Flatten a context value (strings, numbers, lists, dicts) to text."""
+    if isinstance(value, dict):
+        return " ".join(f"{k} {_context_text(v)}" for k, v in value.items())
+    if isinstance(value, list | tuple | set):
+        return " ".join(_context_text(v) for v in value)
+    return str(value)
+
+
+class SuggestionIndex:
+    """BM25 inverted index over prompts."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._lock = threading.Lock()
+        self._postings: dict[str, dict[str, int]] = {}
+        self._terms: dict[str, Counter[str]] = {}  # prompt id -> its term frequencies
+        self._lengths: dict[str, int] = {}
+        self._total_length = 0
+        self._prompts: dict[str, PromptTemplate] = {}
+
+    def __len__(self) -> int:
+        return len(self._prompts)
+
+    def _add(self, prompt: PromptTemplate) -> None:
+        terms: Counter[str] = Counter()
+        fields = {
+            "name": prompt.name,
+            "tags": " ".join(prompt.tags),
+            "description": prompt.description,
+            "template": prompt.template,
+        }
+        for field, text in fields.items():
+            for term in tokenize(text):
+                terms[term] += FIELD_WEIGHTS[field]
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[prompt.id] = tf
+        length = sum(terms.values())
+        self._terms[prompt.id] = terms
+        self._lengths[prompt.id] = length
+        self._total_length += length
+        self._prompts[prompt.id] = prompt
+
+    def _remove(self, prompt_id: str) -> None:
+        terms = self._terms.pop(prompt_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            posting = self._postings[term]
+            del posting[prompt_id]
+            if not posting:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(prompt_id)
+        del self._prompts[prompt_id]
+
+    def update(self, prompt_id: str, prompt: PromptTemplate | None) -> None:
+        """Re-index one prompt.
+
+        Args:
+            prompt_id: The prompt that changed.
+            prompt: Its current version, or None if it no longer exists.
+        """
+        with self._lock:
+            self._remove(prompt_id)
+            if prompt is not None:
+                self._add(prompt)
+
+    def sync(self, prompts: list[PromptTemplate]) -> None:
+        """Bring the index in line with the full prompt list.
+
+        Only prompts that were added, removed or replaced are re-indexed
+        (PromptManager returns the same object for an unchanged prompt).
+
+        Args:
+            prompts: All current prompts.
+        """
+        current = {prompt.id: prompt for prompt in prompts}
+        with self._lock:
+            for prompt_id in self._prompts.keys() - current.keys():
+                self._remove(prompt_id)
+            for prompt_id, prompt in current.items():
+                if self._prompts.get(prompt_id) is not prompt:
+                    self._remove(prompt_id)
+                    self._add(prompt)
+
+    def rank(self, context: dict[str, Any], limit: int = 5) -> list[PromptSuggestion]:
+        """Rank prompts against a context.
+
+        Args:
+            context: Context information (task, language, file type, ...).
+            limit: Maximum number of suggestions.
+
+        Returns:
+            Suggestions, best first. Scores are relative to the best match,
+            which scores 1.0.
+        """
+        query = set(tokenize(_context_text(context)))
+        with self._lock:
+            count = len(self._prompts)
+            if not count or not query or limit <= 0:
+                return []
+            avg_length = self._total_length / count
+
+            scores: dict[str, float] = {}
+            matched: dict[str, list[str]] = {}
+            for term in query:
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                for prompt_id, tf in posting.items():
+                    norm = K1 * (1 - B + B * self._lengths[prompt_id] / avg_length)
+                    scores[prompt_id] = scores.get(prompt_id, 0.0) + idf * tf * (K1 + 1) / (
+                        tf + norm
+                    )
+                    matched.setdefault(prompt_id, []).append(term)
+
+            best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            prompts = {prompt_id: self._prompts[prompt_id] for prompt_id, _ in best}
+
+        if not best:
+            return []
+        top = best[0][1]
+        return [
+            PromptSuggestion(
+                prompt_id=prompt_id,
+                name=prompts[prompt_id].name,
+                relevance_score=round(score / top, 4),
+                reason="Matches: " + ", ".join(sorted(matched[prompt_id])),
+                suggested_variables=_suggest_variables(prompts[prompt_id], context),
+            )
+            for prompt_id, score in best
+        ]
+
+
+def _suggest_variables(prompt: PromptTemplate, context: dict[str, Any]) -> dict[str, str]:
+    """Fill a prompt's variables from same-named context keys, else their defaults."""
+    values = {}
+    for var in prompt.variables:
+        if var.name in context:
+            values[var.name] = str(context[var.name])
+        elif var.default is not None:
+            values[var.name] = var.default
+    return values
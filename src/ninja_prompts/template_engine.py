@@ -1,10 +1,62 @@
 import logging
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 
 logger = logging.getLogger(__name__)
 
+# Matches {{variable_name}} patterns (including prev.step_name)
+VARIABLE_PATTERN = re.compile(r"\{\{([.\w]+)\}\}")
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    A template split into literal chunks and variable slots.
+
+    ``literals`` always has one more entry than ``slots``: rendering
+    interleaves them as literals[0], slots[0], literals[1], ...
+    """
+
+    literals: tuple[str, ...]
+    slots: tuple[str, ...]
+    required: frozenset[str]
+
+    def render(self, variables: dict[str, Any]) -> str:
+        """Render the template, leaving missing variables as-is."""
+        parts = [self.literals[0]]
+        for name, literal in zip(self.slots, self.literals[1:]):
+            if name in variables:
+                parts.append(str(variables[name]))
+            else:
+                logger.warning(f"Missing variable: {name}")
+                parts.append("{{" + name + "}}")
+            parts.append(literal)
+        return "".join(parts)
+
+
+@lru_cache(maxsize=512)
+def compile_template(template_str: str) -> CompiledTemplate:
+    """
+    Compile a template string, caching the result per template.
+
+    Args:
+        template_str: The template string containing {{variable}} patterns
+
+    Returns:
+        The compiled template
+    """
+    # re.split with one capture group alternates literal, name, literal, ...
+    pieces = VARIABLE_PATTERN.split(template_str)
+    slots = tuple(pieces[1::2])
+    return CompiledTemplate(
+        literals=tuple(pieces[0::2]),
+        slots=slots,
+        required=frozenset(slots),
+    )
+
 
 class TemplateEngine:
     """
@@ -14,12 +66,27 @@ class TemplateEngine:
     - Simple variable substitution: {{variable_name}}
     - Chain step output access: {{prev.step_name}}
     - Variable validation and extraction
+
+    Templates are compiled once (see ``compile_template``) and rendered with
+    a join, so repeated renders of the same template do no regex work.
     """
 
     def __init__(self):
         """Initialize the template engine."""
         pass
 
+    def compile(self, template_str: str) -> CompiledTemplate:
+        """
+        Get the compiled form of a template.
+
+        Args:
+            template_str: The template string to compile
+
+        Returns:
+            The (cached) compiled template
+        """
+        return compile_template(template_str)
+
     def render(self, template_str: str, variables: dict[str, Any]) -> str:
         """
         Render a template string by substituting variables.
@@ -29,25 +96,11 @@ class TemplateEngine:
             variables: Dictionary of variable names and their values
 
         Returns:
-            Rendered string with variables substituted
-
-        Raises:
-            KeyError: If a required variable is missing and error_on_missing is True
+            Rendered string with variables substituted; missing variables are
+            left as-is
         """
-        # Pattern to match {{variable_name}} patterns (including prev.step_name)
-        pattern = r"\{\{([.\w]+)\}\}"
-
-        def replace_variable(match):
-            var_name = match.group(1)
-            if var_name in variables:
-                return str(variables[var_name])
-            else:
-                logger.warning(f"Missing variable: {var_name}")
-                return match.group(0)  # Leave as-is if missing
-
         try:
-            result = re.sub(pattern, replace_variable, template_str)
-            return result
+            return compile_template(template_str).render(variables)
         except Exception as e:
             logger.error(f"Error rendering template: {e}")
             raise
@@ -68,9 +121,8 @@ class TemplateEngine:
             - missing_variables: List of variable names that are required but missing
             - extra_variables: List of variable names that are provided but not used
         """
-        required_variables = self.extract_variables(template_str)
+        required_variable_names = compile_template(template_str).required
         provided_variable_names = set(provided_variables.keys())
-        required_variable_names = set(required_variables)
 
         missing_variables = list(required_variable_names - provided_variable_names)
         extra_variables = list(provided_variable_names - required_variable_names)
@@ -93,7 +145,4 @@ class TemplateEngine:
         Returns:
             List of variable names found in the template
         """
-        # Pattern to match {{variable_name}} patterns (including prev.step_name)
-        pattern = r"\{\{([.\w]+)\}\}"
-        matches = re.findall(pattern, template_str)
-        return list(matches)
+        return list(compile_template(template_str).slots)
@@ -5,6 +5,7 @@ from uuid import uuid4
 
 from ninja_common.logging_utils import get_logger
 from ninja_common.security import monitored, rate_limited
+from ninja_prompts.chain import ChainError, ChainExecutor
 from ninja_prompts.models import (
     PromptChainRequest,
     PromptChainResult,
@@ -15,6 +16,7 @@ from ninja_prompts.models import (
     PromptTemplate,
 )
 from ninja_prompts.prompt_manager import PromptManager
+from ninja_prompts.suggest import SuggestionIndex
 from ninja_prompts.template_engine import TemplateEngine
 
 
@@ -28,6 +30,8 @@ class PromptToolExecutor:
         """Initialize executor with manager and engine."""
         self.manager = PromptManager()
         self.engine = TemplateEngine()
+        self.chains = ChainExecutor(self.manager, self.engine)
+        self.suggestions = SuggestionIndex()
 
     @rate_limited(60, 60)
     @monitored
@@ -80,6 +84,7 @@ class PromptToolExecutor:
 
                 # Save via manager
                 self.manager.save_prompt(new_prompt)
+                self.suggestions.update(prompt_id, self.manager.get_prompt(prompt_id))
 
                 return PromptRegistryResult(
                     status="ok",
@@ -131,6 +136,9 @@ class PromptToolExecutor:
 
                 # Save
                 self.manager.save_prompt(updated_prompt)
+                self.suggestions.update(
+                    request.prompt_id, self.manager.get_prompt(request.prompt_id)
+                )
 
                 return PromptRegistryResult(
                     status="ok",
@@ -166,6 +174,10 @@ class PromptToolExecutor:
 
                 # Delete
                 success = self.manager.delete_prompt(request.prompt_id)
+                # A builtin prompt with the same ID becomes visible again
+                self.suggestions.update(
+                    request.prompt_id, self.manager.get_prompt(request.prompt_id)
+                )
 
                 if success:
                     return PromptRegistryResult(
@@ -214,9 +226,15 @@ class PromptToolExecutor:
     async def prompt_suggest(
         self, request: PromptSuggestRequest, client_id: str = "default"
     ) -> PromptSuggestResult:
-        """Get AI-powered suggestions for relevant prompts based on context."""
+        """Get suggestions for relevant prompts based on context.
+
+        Prompts are ranked locally with BM25 (see ``SuggestionIndex``); the
+        index is synced with the prompt files first, which only re-indexes
+        prompts that changed on disk.
+        """
         try:
-            suggestions = []
+            self.suggestions.sync(self.manager.list_prompts())
+            suggestions = self.suggestions.rank(request.context, request.max_suggestions or 5)
             return PromptSuggestResult(
                 status="ok",
                 suggestions=[s.model_dump() for s in suggestions],
@@ -230,17 +248,49 @@ class PromptToolExecutor:
     async def prompt_chain(
         self, request: PromptChainRequest, client_id: str = "default"
     ) -> PromptChainResult:
-        """Execute multi-step prompt workflows."""
+        """Execute multi-step prompt workflows.
+
+        Steps run as a DAG built from their ``{{prev.step_name}}`` references;
+        see ``ChainExecutor``.
+        """
         try:
+            if request.action != "execute":
+                return PromptChainResult(
+                    status="ok",
+                    chain_id=request.chain_id,
+                    executed_steps=[],
+                )
+            if not request.steps:
+                return PromptChainResult(
+                    status="error",
+                    chain_id=request.chain_id,
+                    executed_steps=[],
+                    message="steps are required for execute",
+                )
+            executed_steps = await self.chains.execute(request.steps)
             return PromptChainResult(
                 status="ok",
+                chain_id=request.chain_id,
+                executed_steps=executed_steps,
+            )
+        except ChainError as e:
+            return PromptChainResult(
+                status="error",
+                chain_id=request.chain_id,
                 executed_steps=[],
+                message=str(e),
             )
         except Exception as e:
             logger.error(f"Error in prompt_chain: {e}")
             return PromptChainResult(status="error", executed_steps=[])
 
 
+_executor: PromptToolExecutor | None = None
+
+
 def get_executor() -> PromptToolExecutor:
     """Get the singleton instance of the executor."""
-    return PromptToolExecutor()
+    global _executor
+    if _executor is None:
+        _executor = PromptToolExecutor()
+    return _executor
@@ -4,6 +4,9 @@ Search providers for the Researcher module.
 Implements multiple search providers:
 - DuckDuckGo (free, no API key required)
 - Serper.dev (Google Search API, requires API key)
+
+``ddgs`` and ``httpx`` are imported on first use, so starting the server does
+not pay for them.
 """
 
 from __future__ import annotations
@@ -12,14 +15,24 @@ import os
 from abc import ABC, abstractmethod
 from typing import Any, ClassVar
 
-import httpx
-from ddgs import DDGS
-
 from ninja_common.logging_utils import get_logger
 
 
 logger = get_logger(__name__)
 
+# ddgs.DDGS, imported by _ddgs_class on first use
+DDGS: Any = None
+
+
+def _ddgs_class() -> Any:
+    """Get the DuckDuckGo client class, importing ddgs on first use."""
+    global DDGS
+    if DDGS is None:
+        from ddgs import DDGS as ddgs_class
+
+        DDGS = ddgs_class
+    return DDGS
+
 
 class SearchProvider(ABC):
     """Base class for search providers."""
@@ -54,7 +67,7 @@ class DuckDuckGoProvider(SearchProvider):
 
     def __init__(self):
         """Initialize DuckDuckGo provider."""
-        self.ddgs = DDGS()
+        self.ddgs = _ddgs_class()()
 
     async def search(self, query: str, max_results: int = 10) -> list[dict[str, Any]]:
         """
@@ -132,6 +145,8 @@ class SerperProvider(SearchProvider):
             logger.error("Serper API key not configured")
             return []
 
+        import httpx
+
         try:
             logger.info(f"Searching Serper.dev for: {query}")
 
@@ -210,6 +225,8 @@ class PerplexityProvider(SearchProvider):
             logger.error("Perplexity API key not configured")
             return []
 
+        import httpx
+
         try:
             logger.info(f"Searching Perplexity AI for: {query}")
 
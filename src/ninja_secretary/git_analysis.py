@@ -0,0 +1,300 @@
+"""
+Git change analysis for the secretary hooks.
+
+Hooks run on every agent action, so the git work they do is kept small:
+
+- ``HEAD`` and plain ref names are resolved by reading ``.git`` directly
+  (loose refs, then ``packed-refs``), without starting git.
+- Other revision expressions (``HEAD~3``, short SHAs) go through one
+  long-lived ``git cat-file --batch-check`` process per repository.
+- ``git diff --numstat <since> HEAD`` results are cached on disk keyed by
+  the resolved (since, HEAD) commits, so repeating the analysis on an
+  unchanged history does not run ``git diff`` at all.
+
+Working tree diffs (no ``since``) change with every edit and are not cached.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any
+
+from ninja_common.path_utils import get_internal_dir
+
+
+_SHA = re.compile(r"^[0-9a-f]{40}$")
+_REF_NAME = re.compile(r"^[\w./-]+$")
+
+# Numstat results kept per repository
+NUMSTAT_CACHE_SIZE = 64
+
+
+def find_git_dir(repo_root: str | Path) -> Path | None:
+    """
+    Find the git directory for a path (handles ``.git`` files of worktrees).
+
+    Args:
+        repo_root: A directory inside the repository.
+
+    Returns:
+        The git directory, or None if the path is not in a repository.
+    """
+    for directory in (Path(repo_root).resolve(), *Path(repo_root).resolve().parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:") :].strip())
+                return git_dir if git_dir.is_absolute() else (directory / git_dir).resolve()
+    return None
+
+
+def parse_numstat(output: str) -> list[dict[str, Any]]:
+    """
+    Parse ``git diff --numstat`` output.
+
+    Binary files ("-" counts) count as 0 lines; malformed lines are skipped.
+
+    Args:
+        output: Command stdout.
+
+    Returns:
+        One {"file", "lines_added", "lines_removed"} dict per changed file.
+    """
+    changes = []
+    for line in output.splitlines():
+        parts = line.split("\t")
+        if len(parts) < 3:
+            continue
+        try:
+            added = int(parts[0]) if parts[0] != "-" else 0
+            removed = int(parts[1]) if parts[1] != "-" else 0
+        except ValueError:
+            continue
+        changes.append({"file": parts[2], "lines_added": added, "lines_removed": removed})
+    return changes
+
+
+class _CatFileBatch:
+    """A ``git cat-file --batch-check`` process answering revision lookups."""
+
+    def __init__(self, repo_root: Path):
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", "--batch-check"],
+            cwd=repo_root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+
+    def resolve(self, rev: str) -> str | None:
+        """Object name for a revision, or None if it does not exist."""
+        if "\n" in rev or self._proc.poll() is not None:
+            return None
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        self._proc.stdin.write(rev + "\n")
+        self._proc.stdin.flush()
+        # "<sha> <type> <size>" or "<rev> missing" / "<rev> ambiguous"
+        answer = self._proc.stdout.readline().split()
+        if len(answer) == 3 and _SHA.match(answer[0]):
+            return answer[0]
+        return None
+
+    def close(self) -> None:
+        if self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+
+
+class GitAnalyzer:
+    """Cached git queries for one repository."""
+
+    def __init__(self, repo_root: str | Path):
+        """
+        Initialize the analyzer.
+
+        Args:
+            repo_root: Repository root directory.
+        """
+        self.repo_root = Path(repo_root)
+        self.git_dir = find_git_dir(repo_root)
+        self.common_dir = self.git_dir
+        if self.git_dir is not None and (self.git_dir / "commondir").is_file():
+            common = Path((self.git_dir / "commondir").read_text().strip())
+            self.common_dir = common if common.is_absolute() else (self.git_dir / common).resolve()
+        self._batch: _CatFileBatch | None = None
+        self._lock = threading.Lock()
+
+    def _read_ref(self, ref: str) -> str | None:
+        """Resolve a full ref name (e.g. refs/heads/main) from the ref files."""
+        assert self.git_dir is not None and self.common_dir is not None
+        for base in (self.git_dir, self.common_dir):
+            try:
+                value = (base / ref).read_text().strip()
+            except (OSError, ValueError):
+                continue
+            if value.startswith("ref: "):
+                return self._read_ref(value[5:])
+            return value if _SHA.match(value) else None
+        try:
+            with (self.common_dir / "packed-refs").open() as f:
+                for line in f:
+                    sha, _, name = line.rstrip("\n").partition(" ")
+                    if name == ref and _SHA.match(sha):
+                        return sha
+        except OSError:
+            pass
+        return None
+
+    def head(self) -> tuple[str | None, str | None]:
+        """
+        Current branch and commit, read from the ref files.
+
+        Returns:
+            (branch name, or "HEAD" when detached; commit SHA), with None for
+            anything that could not be read.
+        """
+        if self.git_dir is None:
+            return None, None
+        try:
+            value = (self.git_dir / "HEAD").read_text().strip()
+        except OSError:
+            return None, None
+        if value.startswith("ref: "):
+            ref = value[5:]
+            branch = ref.removeprefix("refs/heads/")
+            return branch, self._read_ref(ref)
+        return "HEAD", value if _SHA.match(value) else None
+
+    def resolve(self, rev: str) -> str | None:
+        """
+        Resolve a revision to an object name.
+
+        Plain refs are read from disk; anything else is asked of the
+        repository's ``git cat-file --batch-check`` process.
+
+        Args:
+            rev: Revision (ref name, SHA, or expression such as HEAD~2).
+
+        Returns:
+            The object name, or None if it cannot be resolved.
+        """
+        if self.git_dir is None:
+            return None
+        if _SHA.match(rev):
+            return rev
+        sha = None
+        if rev == "HEAD":
+            sha = self.head()[1]
+        elif _REF_NAME.match(rev) and ".." not in rev:
+            # Same precedence as git's revision parsing
+            candidates = [rev] if rev.startswith("refs/") else []
+            candidates += [f"refs/tags/{rev}", f"refs/heads/{rev}", f"refs/remotes/{rev}"]
+            sha = next(filter(None, map(self._read_ref, candidates)), None)
+        if sha is not None:
+            return sha
+
+        with self._lock:
+            try:
+                if self._batch is None:
+                    self._batch = _CatFileBatch(self.repo_root)
+                return self._batch.resolve(rev)
+            except (OSError, BrokenPipeError):
+                return None
+
+    def numstat(self, since: str | None = None) -> list[dict[str, Any]]:
+        """
+        Per-file line counts of ``git diff --numstat [since HEAD]``.
+
+        Args:
+            since: Compare this revision with HEAD (default: working tree
+                against the index, which is never cached).
+
+        Returns:
+            Parsed numstat entries (see ``parse_numstat``).
+
+        Raises:
+            subprocess.CalledProcessError: If git fails.
+            FileNotFoundError: If git is not installed.
+        """
+        key = None
+        if since:
+            since_sha = self.resolve(since)
+            head_sha = self.resolve("HEAD")
+            if since_sha and head_sha:
+                key = f"{since_sha}..{head_sha}"
+                cached = self._load_cache().get(key)
+                if cached is not None:
+                    return cached
+
+        cmd = ["git", "diff", "--numstat"]
+        if since:
+            cmd.extend([since, "HEAD"])
+        result = subprocess.run(cmd, cwd=self.repo_root, capture_output=True, text=True, check=True)
+        changes = parse_numstat(result.stdout)
+        if key is not None:
+            self._store(key, changes)
+        return changes
+
+    @property
+    def _cache_file(self) -> Path:
+        return get_internal_dir(self.repo_root) / "numstat_cache.json"
+
+    def _load_cache(self) -> dict[str, list[dict[str, Any]]]:
+        try:
+            data = json.loads(self._cache_file.read_text())
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _store(self, key: str, changes: list[dict[str, Any]]) -> None:
+        cache = self._load_cache()
+        cache.pop(key, None)
+        cache[key] = changes
+        # Oldest entries first; keep the most recent ones
+        cache = dict(list(cache.items())[-NUMSTAT_CACHE_SIZE:])
+        path = self._cache_file
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(cache))
+            tmp.replace(path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Stop the repository's cat-file process."""
+        with self._lock:
+            if self._batch is not None:
+                self._batch.close()
+                self._batch = None
+
+
+_analyzers: dict[Path, GitAnalyzer] = {}
+_analyzers_lock = threading.Lock()
+
+
+def get_git_analyzer(repo_root: str | Path) -> GitAnalyzer:
+    """Get the shared analyzer for a repository."""
+    root = Path(repo_root).resolve()
+    with _analyzers_lock:
+        analyzer = _analyzers.get(root)
+        if analyzer is None:
+            analyzer = _analyzers[root] = GitAnalyzer(root)
+        return analyzer
+
+
+@atexit.register
+def _close_analyzers() -> None:
+    for analyzer in list(_analyzers.values()):
+        analyzer.close()
@@ -16,6 +16,7 @@ from pathlib import Path
 from typing import Any
 
 from ninja_common.path_utils import PathTraversalError, get_internal_dir, safe_resolve
+from ninja_secretary.git_analysis import get_git_analyzer
 
 
 @dataclass
@@ -110,29 +111,31 @@ class SessionReportCommand(HookCommand):
                 elif item.is_dir():
                     dir_count += 1
 
-            # Get git info if available
-            branch = "unknown"
-            commit = "unknown"
-            try:
-                result = subprocess.run(
-                    ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                    cwd=self.repo_root,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                branch = result.stdout.strip()
-
-                result = subprocess.run(
-                    ["git", "rev-parse", "HEAD"],
-                    cwd=self.repo_root,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                )
-                commit = result.stdout.strip()[:8]
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                pass
+            # Get git info if available, from the ref files when possible
+            branch, head_sha = get_git_analyzer(repo_path).head()
+            commit = head_sha[:8] if head_sha else "unknown"
+            branch = branch or "unknown"
+            if head_sha is None:
+                try:
+                    result = subprocess.run(
+                        ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+                        cwd=self.repo_root,
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                    )
+                    branch = result.stdout.strip()
+
+                    result = subprocess.run(
+                        ["git", "rev-parse", "HEAD"],
+                        cwd=self.repo_root,
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                    )
+                    commit = result.stdout.strip()[:8]
+                except (subprocess.CalledProcessError, FileNotFoundError):
+                    pass
 
             # Create report data
             report_data = {
@@ -177,55 +180,13 @@ class AnalyzeChangesCommand(HookCommand):
     def execute(self) -> HookResult:
         """Execute change analysis."""
         try:
-            # Build git diff command
-            cmd = ["git", "diff", "--numstat"]
-            if self.since:
-                cmd.extend([self.since, "HEAD"])
-
-            # Execute git diff
-            result = subprocess.run(
-                cmd, cwd=self.repo_root, capture_output=True, text=True, check=True
-            )
-
-            # Parse the output
-            lines = result.stdout.strip().split("\n")
-            if not lines or (len(lines) == 1 and not lines[0]):
-                return HookResult(
-                    success=True,
-                    data={"files_changed": 0, "lines_added": 0, "lines_removed": 0, "changes": []},
-                )
-
-            changes = []
-            total_added = 0
-            total_removed = 0
-
-            for line in lines:
-                if not line.strip():
-                    continue
-
-                parts = line.split("\t")
-                if len(parts) >= 3:
-                    try:
-                        added = int(parts[0]) if parts[0] != "-" else 0
-                        removed = int(parts[1]) if parts[1] != "-" else 0
-                        filename = parts[2]
-
-                        total_added += added
-                        total_removed += removed
-
-                        changes.append(
-                            {"file": filename, "lines_added": added, "lines_removed": removed}
-                        )
-                    except ValueError:
-                        # Skip malformed lines
-                        continue
-
+            changes = get_git_analyzer(self.repo_root).numstat(self.since)
             return HookResult(
                 success=True,
                 data={
                     "files_changed": len(changes),
-                    "lines_added": total_added,
-                    "lines_removed": total_removed,
+                    "lines_added": sum(c["lines_added"] for c in changes),
+                    "lines_removed": sum(c["lines_removed"] for c in changes),
                     "changes": changes,
                 },
             )
@@ -266,17 +266,19 @@ async def main_stdio() -> None:
         )
 
 
-async def main_http(host: str, port: int) -> None:
-    """Run the MCP server over HTTP with SSE."""
-    import uvicorn
+async def main_http(host: str, port: int, uds: str | None = None) -> None:
+    """Run the MCP server over HTTP with SSE (on a Unix socket if ``uds`` is given)."""
     from mcp.server.sse import SseServerTransport
     from starlette.requests import Request
     from starlette.responses import Response
 
-    logger.info(f"Starting ninja-secretary server (HTTP/SSE mode) on {host}:{port}")
+    from ninja_common.http_server import message_path, serve_asgi
+
+    address = uds or f"{host}:{port}"
+    logger.info(f"Starting ninja-secretary server (HTTP/SSE mode) on {address}")
 
     server = create_server()
-    sse = SseServerTransport("/messages")
+    sse = SseServerTransport(message_path("/messages"))
 
     async def handle_sse(request):
         async with sse.connect_sse(request.scope, request.receive, request._send) as streams:
@@ -296,9 +298,7 @@ async def main_http(host: str, port: int) -> None:
         else:
             await Response("Not Found", status_code=404)(scope, receive, send)
 
-    config = uvicorn.Config(app, host=host, port=port, log_level="info")
-    server_instance = uvicorn.Server(config)
-    await server_instance.serve()
+    await serve_asgi(app, host, port, uds=uds)
 
 
 def run() -> None:
@@ -321,11 +321,25 @@ def run() -> None:
         default="127.0.0.1",
         help="Host to bind to (default: 127.0.0.1)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="HTTP worker processes (default: NINJA_HTTP_WORKERS or 1)",
+    )
+    parser.add_argument(
+        "--uds",
+        type=str,
+        default=None,
+        help="Serve HTTP on this Unix domain socket instead of a TCP port",
+    )
 
     args = parser.parse_args()
 
     if args.http:
-        asyncio.run(main_http(args.host, args.port))
+        from ninja_common.http_server import default_workers, run_http
+
+        run_http(main_http, args.host, args.port, args.workers or default_workers(), uds=args.uds)
     else:
         asyncio.run(main_stdio())
 
@@ -0,0 +1 @@
+"""Micro-benchmarks for ninja hot paths."""
@@ -0,0 +1,194 @@
+"""
+Fixtures for the micro-benchmark suite.
+
+Benchmarks need pytest-benchmark and only run with ``--benchmark-only``
+(see scripts/run_benchmarks.sh); a regular test run skips them. Fixtures are
+built once per session at realistic sizes (10 MB transcripts, a 1M-line
+JSONL log). Set NINJA_BENCH_SCALE (e.g. 0.01) to shrink them for a quick
+check.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from ninja_coder.benchmark.stub import STUB_CLI_PATH
+from ninja_coder.benchmark.stub_cli import synthetic_transcript
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    collect_ignore_glob = ["test_*.py"]
+
+
+BENCH_DIR = Path(__file__).parent
+SCALE = float(os.environ.get("NINJA_BENCH_SCALE", "1"))
+
+MB = 1024 * 1024
+TRANSCRIPT_SIZE = int(10 * MB * SCALE)
+LOG_LINES = int(1_000_000 * SCALE)
+METRICS_ROWS = int(200_000 * SCALE)
+SSE_MESSAGES = int(20_000 * SCALE)
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip benchmarks unless the run asked for them."""
+    if config.getoption("benchmark_only", False):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run with --benchmark-only")
+    for item in items:
+        if BENCH_DIR in item.path.parents:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def bench_cache(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """Keep the ninja cache (logs, metrics) of benchmarked code in a temp dir."""
+    cache = tmp_path_factory.mktemp("cache")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("XDG_CACHE_HOME", str(cache))
+        yield cache
+
+
+@pytest.fixture(scope="session")
+def bench_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A repository with 50 source files of ~20 KB."""
+    repo = tmp_path_factory.mktemp("repo")
+    src = repo / "src" / "pkg"
+    src.mkdir(parents=True)
+    body = "".join(
+        f"def handler_{i}(request):\n    return compute(request.payload, {i})\n\n"
+        for i in range(300)
+    )
+    for i in range(50):
+        (src / f"module_{i}.py").write_text(f'"""Module {i}."""\n\n{body}')
+    return repo
+
+
+@pytest.fixture(scope="session")
+def transcript() -> str:
+    """A 10 MB CLI transcript."""
+    return synthetic_transcript(TRANSCRIPT_SIZE)
+
+
+@pytest.fixture(scope="session")
+def plan_output(transcript: str) -> str:
+    """A transcript ending in the JSON result of a 200-step plan."""
+    steps = [f"step-{i}" for i in range(200)]
+    result = {
+        "overall_status": "partial",
+        "steps_completed": steps[:190],
+        "steps_failed": steps[190:],
+        "step_summaries": {step: f"Updated handlers for {step}" for step in steps},
+        "files_modified": [f"src/pkg/module_{i}.py" for i in range(50)],
+        "notes": "Ten steps failed on flaky tests",
+    }
+    return f"{transcript}\n```json\n{json.dumps(result, indent=2)}\n```\n"
+
+
+@pytest.fixture(scope="session")
+def jsonl_log(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    A 1M-line structured log.
+
+    Entries cycle through 100 sessions, 5 CLIs and all levels; the task
+    "task-needle" only appears in the last 10 lines.
+    """
+    log_dir = tmp_path_factory.mktemp("logs")
+    log_file = log_dir / "ninja-bench.jsonl"
+    clis = ["aider", "claude", "opencode", "gemini", "copilot"]
+    levels = ["INFO", "INFO", "INFO", "DEBUG", "WARNING", "ERROR"]
+    with log_file.open("w") as f:
+        batch = []
+        for i in range(LOG_LINES):
+            task_id = "task-needle" if i >= LOG_LINES - 10 else f"task-{i // 20}"
+            entry = {
+                "timestamp": f"2025-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+                "level": levels[i % len(levels)],
+                "logger_name": "ninja_coder",
+                "message": f"Step {i} finished",
+                "session_id": f"session-{i % 100}",
+                "task_id": task_id,
+                "cli_name": clis[i % len(clis)],
+                "extra": {"duration_sec": i % 97 / 10, "exit_code": 0},
+            }
+            batch.append(json.dumps(entry))
+            if len(batch) == 10_000:
+                f.write("\n".join(batch) + "\n")
+                batch = []
+        if batch:
+            f.write("\n".join(batch) + "\n")
+    return log_file
+
+
+@pytest.fixture(scope="session")
+def metrics_tracker(bench_repo: Path, bench_cache: Path):
+    """A MetricsTracker whose tasks.csv holds 200k tasks."""
+    from ninja_common.metrics import MetricsTracker
+
+    tracker = MetricsTracker(bench_repo)
+    models = ["anthropic/claude-sonnet-4-5", "openai/gpt-4o", "qwen/qwen3-coder"]
+    tools = ["coder_simple_task", "coder_execute_plan_sequential", "coder_execute_plan_parallel"]
+    with tracker.metrics_file.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=tracker._get_fieldnames())
+        writer.writeheader()
+        for i in range(METRICS_ROWS):
+            writer.writerow(
+                {
+                    "task_id": f"task-{i}",
+                    "timestamp": f"2025-01-{i % 28 + 1:02d}T12:00:00",
+                    "model": models[i % len(models)],
+                    "tool_name": tools[i % len(tools)],
+                    "task_description": f"Refactor handler {i}",
+                    "input_tokens": 1200 + i % 900,
+                    "output_tokens": 300 + i % 200,
+                    "total_tokens": 1500 + i % 1100,
+                    "cache_read_tokens": 0,
+                    "cache_write_tokens": 0,
+                    "input_cost": 0.0036,
+                    "output_cost": 0.0045,
+                    "cache_read_cost": 0.0,
+                    "cache_write_cost": 0.0,
+                    "total_cost": 0.0081,
+                    "duration_sec": 12.5 + i % 30,
+                    "success": i % 10 != 0,
+                    "execution_mode": "quick",
+                    "repo_root": str(bench_repo),
+                    "file_scope": "src/**/*.py",
+                    "error_message": "" if i % 10 else "Tests failed",
+                }
+            )
+    return tracker
+
+
+@pytest.fixture(scope="session")
+def sse_stream() -> bytes:
+    """A daemon SSE stream: the endpoint event, then 20k JSON-RPC responses."""
+    events = [b"event: endpoint\r\ndata: /messages/?session_id=bench\r\n\r\n"]
+    for i in range(SSE_MESSAGES):
+        message = {
+            "jsonrpc": "2.0",
+            "id": i,
+            "result": {"content": [{"type": "text", "text": f"Step {i} done. " * 20}]},
+        }
+        events.append(b"event: message\r\ndata: " + json.dumps(message).encode() + b"\r\n\r\n")
+        if i % 100 == 0:
+            events.append(b": ping - 2025-01-01 00:00:00\r\n\r\n")
+    return b"".join(events)
+
+
+@pytest.fixture(scope="session")
+def stub_cli() -> Path:
+    """Path to the stub CLI script."""
+    return STUB_CLI_PATH
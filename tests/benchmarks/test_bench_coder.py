@@ -0,0 +1,94 @@
+"""Benchmarks for coder output parsing and prompt assembly."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from ninja_coder.driver import NinjaConfig
+from ninja_coder.models import ExecutionMode, PlanStep
+from ninja_coder.prompt_builder import PromptBuilder
+from ninja_coder.result_parser import ResultParser
+from ninja_coder.strategies.aider_strategy import AiderStrategy
+from ninja_coder.strategies.claude_strategy import ClaudeStrategy
+from ninja_coder.strategies.opencode_strategy import OpenCodeStrategy
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+STRATEGIES = {
+    "aider": AiderStrategy,
+    "claude": ClaudeStrategy,
+    "opencode": OpenCodeStrategy,
+}
+
+
+@pytest.mark.parametrize("cli", sorted(STRATEGIES))
+def test_parse_output(benchmark, cli, transcript):
+    strategy = STRATEGIES[cli](cli, NinjaConfig(bin_path=cli))
+
+    result = benchmark(strategy.parse_output, transcript, "", 0)
+
+    assert result.success
+    assert result.touched_paths
+
+
+def test_parse_plan_result(benchmark, plan_output):
+    result = benchmark(ResultParser().parse_plan_result, plan_output)
+
+    assert result.overall_status == "partial"
+    assert len(result.steps) == 200
+
+
+def test_stub_cli_capture_and_parse(benchmark, stub_cli, transcript):
+    """Spawn the stub CLI, capture a transcript-sized output and parse it."""
+    strategy = AiderStrategy("aider", NinjaConfig(bin_path="aider"))
+
+    def run():
+        proc = subprocess.run(
+            [sys.executable, str(stub_cli), "--size", str(len(transcript))],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        return strategy.parse_output(proc.stdout, proc.stderr, proc.returncode)
+
+    result = benchmark.pedantic(run, rounds=5)
+
+    assert result.success
+
+
+def _steps(repo: Path, count: int) -> list[PlanStep]:
+    return [
+        PlanStep(
+            id=f"step-{i}",
+            title=f"Update handlers in module {i}",
+            task=f"Add a timeout to every handler in module_{i}.py and cover it with tests.",
+            context_paths=[f"src/pkg/module_{i}.py", f"src/pkg/module_{(i + 1) % 50}.py"],
+            allowed_globs=["src/**/*.py", "tests/**/*.py"],
+        )
+        for i in range(count)
+    ]
+
+
+def test_build_sequential_plan(benchmark, bench_repo):
+    builder = PromptBuilder(str(bench_repo))
+    steps = _steps(bench_repo, 20)
+
+    prompt = benchmark(builder.build_sequential_plan, steps, ExecutionMode.FULL)
+
+    assert "step-19" in prompt
+
+
+def test_build_parallel_plan(benchmark, bench_repo):
+    builder = PromptBuilder(str(bench_repo))
+    tasks = _steps(bench_repo, 20)
+
+    prompt = benchmark(builder.build_parallel_plan, tasks, 4, ExecutionMode.QUICK)
+
+    assert "step-19" in prompt
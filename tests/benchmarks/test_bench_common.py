@@ -0,0 +1,81 @@
+"""Benchmarks for logging, metrics and daemon proxy framing."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from ninja_common.daemon import SSEParser
+from ninja_common.logging_utils import TaskLogger
+from ninja_common.structured_logger import StructuredLogger
+from tests.test_common.test_redaction import legacy_redact
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def task_logger(bench_repo):
+    return TaskLogger(bench_repo, "bench")
+
+
+def test_redact_transcript(benchmark, task_logger, transcript):
+    redacted = benchmark(task_logger._redact_sensitive_data, transcript)
+
+    assert "[REDACTED_API_KEY]" in redacted
+
+
+def test_redact_transcript_per_pattern(benchmark, transcript):
+    """Baseline for test_redact_transcript: one re.sub pass per secret pattern."""
+    redacted = benchmark.pedantic(legacy_redact, args=(transcript,), rounds=3)
+
+    assert "[REDACTED_API_KEY]" in redacted
+
+
+def test_log_subprocess(benchmark, task_logger, transcript):
+    benchmark(task_logger.log_subprocess, ["aider", "--yes"], 0, transcript, "")
+
+    assert task_logger._metadata["subprocess"]["exit_code"] == 0
+
+
+@pytest.fixture
+def structured_logger(jsonl_log: Path) -> StructuredLogger:
+    logger = StructuredLogger("bench", jsonl_log.parent)
+    logger.log_file = jsonl_log
+    return logger
+
+
+def test_query_logs_first_page(benchmark, structured_logger):
+    entries = benchmark(structured_logger.query_logs, cli_name="claude", limit=100)
+
+    assert len(entries) == 100
+
+
+def test_query_logs_full_scan(benchmark, structured_logger):
+    """A filter that only matches at the end of the file reads all of it."""
+    entries = benchmark.pedantic(
+        structured_logger.query_logs, kwargs={"task_id": "task-needle"}, rounds=3
+    )
+
+    assert len(entries) == 10
+
+
+def test_metrics_summary(benchmark, metrics_tracker):
+    summary = benchmark(metrics_tracker.get_summary)
+
+    assert summary["total_tasks"] > 0
+
+
+@pytest.mark.parametrize("chunk_size", [1400, 65536])
+def test_sse_framing(benchmark, sse_stream, chunk_size):
+    chunks = [sse_stream[i : i + chunk_size] for i in range(0, len(sse_stream), chunk_size)]
+
+    def parse():
+        parser = SSEParser()
+        return sum(len(parser.feed(chunk)) for chunk in chunks)
+
+    events = benchmark(parse)
+
+    assert events == sse_stream.count(b"\r\n\r\n") - sse_stream.count(b"\r\n: ping")
@@ -6,7 +6,8 @@ import pytest
 Tests for activity-based timeout in NinjaDriver.
 
 Tests the smart timeout functionality that only triggers after 20 seconds
-of no output activity, while still respecting maximum timeout as a safety net.
+of no output activity (opt-in via NINJA_INACTIVITY_TIMEOUT_SEC), while still
+respecting maximum timeout as a safety net.
 """
 
 
@@ -20,11 +21,12 @@ from ninja_coder.driver import NinjaConfig, NinjaDriver
 
 @pytest.fixture
 def driver(tmp_path, monkeypatch):
-    """Create NinjaDriver instance with temp cache."""
+    """Create NinjaDriver instance with temp cache and a 20s inactivity timeout."""
     monkeypatch.setattr(
         "ninja_common.path_utils.get_cache_dir",
         lambda: tmp_path / "cache",
     )
+    monkeypatch.setenv("NINJA_INACTIVITY_TIMEOUT_SEC", "20")
 
     config = NinjaConfig(
         bin_path="aider",
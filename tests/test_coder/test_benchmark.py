@@ -0,0 +1,156 @@
+"""Tests for the benchmark matrix runner."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ninja_coder.benchmark import (
+    BenchmarkResult,
+    BenchmarkRunner,
+    BenchmarkTask,
+    compare_runs,
+    load_results,
+    summarize,
+)
+from ninja_coder.benchmark.framework import confidence_interval
+from ninja_coder.driver import NinjaResult
+
+
+TASKS = [
+    BenchmarkTask(id="one", name="One", description="d", task_spec="s"),
+    BenchmarkTask(id="two", name="Two", description="d", task_spec="s"),
+]
+
+
+class StubRunner(BenchmarkRunner):
+    """Edits its repository copy instead of running a CLI."""
+
+    async def run_benchmark(self, task, cli_bin, model, repo_root):
+        marker = Path(repo_root) / "marker.txt"
+        with marker.open("a") as f:
+            f.write(task.id)
+        seen = marker.read_text()
+        return BenchmarkResult(
+            task_id=task.id,
+            cli_tool=cli_bin,
+            model=model,
+            success=True,
+            duration_sec=0.01,
+            error_message=f"{os.getpid()}:{seen}",
+        )
+
+
+def result(task_id="one", duration=1.0, success=True, **kwargs):
+    return BenchmarkResult(
+        task_id=task_id,
+        cli_tool="aider",
+        model="m",
+        success=success,
+        duration_sec=duration,
+        **kwargs,
+    )
+
+
+def write_run(path, run_id, results):
+    with path.open("a") as f:
+        for r in results:
+            f.write(json.dumps({"run_id": run_id, **asdict(r)}) + "\n")
+
+
+def test_confidence_interval():
+    assert confidence_interval([]) == (0.0, 0.0)
+    assert confidence_interval([2.0]) == (2.0, 0.0)
+    mean, half_width = confidence_interval([1.0, 2.0, 3.0])
+    assert mean == 2.0
+    assert half_width == pytest.approx(4.303 * 1.0 / 3**0.5)
+
+
+def test_summarize_groups_trials():
+    summaries = summarize(
+        [
+            result(duration=1.0, validation_passed=True),
+            result(duration=3.0, success=False),
+            result("two"),
+        ]
+    )
+
+    assert [(s.task_id, s.trials) for s in summaries] == [("one", 2), ("two", 1)]
+    assert summaries[0].success_rate == 0.5
+    assert summaries[0].validation_rate == 0.5
+    assert summaries[0].mean_duration_sec == 2.0
+    assert summaries[0].duration_ci95_sec > 0
+
+
+def test_compare_runs_flags_regressions(tmp_path):
+    path = tmp_path / "results.jsonl"
+    write_run(path, "base", [result(duration=d) for d in (1.0, 1.1, 0.9)])
+    write_run(path, "base", [result("two", duration=d) for d in (1.0, 1.1, 0.9)])
+    write_run(path, "new", [result(duration=d) for d in (3.0, 3.1, 2.9)])
+    write_run(path, "new", [result("two", duration=d) for d in (1.0, 1.2, 0.8)])
+
+    assert len(load_results(path)) == 12
+    assert len(load_results(path, "new")) == 6
+    regressions = compare_runs(path, "base", "new")
+    assert [r["task_id"] for r in regressions] == ["one"]
+    assert regressions[0]["current"]["mean_duration_sec"] == pytest.approx(3.0)
+
+
+async def test_run_comparison_isolates_cells(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "README.md").write_text("# repo\n")
+    runner = StubRunner(tmp_path / "out")
+
+    results = await runner.run_comparison(
+        TASKS, ["aider"], ["m"], str(repo), trials=2, concurrency=2
+    )
+
+    assert sorted(results) == ["one", "two"]
+    cells = [r for task_results in results.values() for r in task_results]
+    assert [r.trial for r in results["one"]] == [0, 1]
+    # Each cell saw only its own edit, in its own process
+    assert {r.error_message.split(":")[1] for r in cells} == {"one", "two"}
+    assert len({r.error_message.split(":")[0] for r in cells}) == 4
+    assert not (repo / "marker.txt").exists()
+    assert all(r.cpu_sec > 0 and r.peak_rss_mb > 0 for r in cells)
+
+    records = [json.loads(line) for line in runner.results_file.read_text().splitlines()]
+    assert len(records) == 4
+    assert len({r["run_id"] for r in records}) == 1
+    report = (runner.output_dir / "benchmark_report.md").read_text()
+    assert "± " in report
+    assert "| Validation |" in report
+
+
+async def test_run_benchmark_records_token_usage(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    cli_result = NinjaResult(
+        success=True,
+        summary="done",
+        stdout="input tokens: 1000\noutput tokens: 500\n",
+    )
+
+    class FakeDriver:
+        def __init__(self, config):
+            self.strategy = type("Strategy", (), {"name": "aider"})()
+
+        async def execute_async(self, **kwargs):
+            return cli_result
+
+    with (
+        patch("ninja_coder.benchmark.framework.NinjaDriver", FakeDriver),
+        patch("ninja_common.metrics.fetch_openrouter_pricing", return_value={}),
+    ):
+        outcome = await BenchmarkRunner(tmp_path / "out").run_benchmark(
+            TASKS[0], "aider", "unknown-model", str(tmp_path)
+        )
+
+    assert outcome.success
+    assert (outcome.input_tokens, outcome.output_tokens, outcome.tokens_used) == (1000, 500, 1500)
+    assert outcome.cost_estimate == pytest.approx((1000 * 1.0 + 500 * 2.0) / 1_000_000)
@@ -0,0 +1,128 @@
+"""Tests for snapshot-based touched-file detection."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from ninja_coder.change_detection import WorkspaceSnapshot, _parse_porcelain
+from ninja_coder.driver import NinjaConfig
+from ninja_coder.strategies.aider_strategy import AiderStrategy
+
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path) -> Path:
+    """Create a git repository with one committed file."""
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test User")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("print('app')\n")
+    (tmp_path / "README.md").write_text("# readme\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+def test_parse_porcelain_strips_prefix():
+    """Porcelain paths are made relative to repo_root and filtered to it."""
+    output = " M sub/a.py\0?? sub/new/b.py\0 M other/c.py\0R  sub/d.py\0sub/old.py\0"
+
+    assert _parse_porcelain(output, "sub/") == ["a.py", "new/b.py", "d.py"]
+    assert _parse_porcelain("", "") == []
+
+
+def test_detects_modified_and_new_files(git_repo: Path):
+    """Modified tracked files and new untracked files are reported."""
+    snapshot = WorkspaceSnapshot.capture(str(git_repo))
+    assert snapshot.is_git
+
+    (git_repo / "src" / "app.py").write_text("print('changed')\n")
+    (git_repo / "src" / "new_module.py").write_text("x = 1\n")
+
+    assert snapshot.changed_paths() == ["src/app.py", "src/new_module.py"]
+
+
+def test_ignores_files_dirty_before_run(git_repo: Path):
+    """Pre-existing uncommitted changes are not attributed to the run."""
+    (git_repo / "README.md").write_text("# local edit\n")
+    (git_repo / "scratch.txt").write_text("notes\n")
+
+    snapshot = WorkspaceSnapshot.capture(str(git_repo))
+    (git_repo / "src" / "app.py").write_text("print('changed')\n")
+
+    assert snapshot.changed_paths() == ["src/app.py"]
+
+
+def test_reports_dirty_file_changed_again(git_repo: Path):
+    """A file dirty before the run is reported if the run edits it again."""
+    (git_repo / "README.md").write_text("# local edit\n")
+    snapshot = WorkspaceSnapshot.capture(str(git_repo))
+
+    (git_repo / "README.md").write_text("# local edit, then the agent's edit\n")
+
+    assert snapshot.changed_paths() == ["README.md"]
+
+
+def test_reports_files_committed_during_run(git_repo: Path):
+    """Files the CLI committed itself are found through the HEAD diff."""
+    snapshot = WorkspaceSnapshot.capture(str(git_repo))
+
+    (git_repo / "src" / "app.py").write_text("print('committed')\n")
+    _git(git_repo, "commit", "-q", "-am", "agent commit")
+
+    assert snapshot.changed_paths() == ["src/app.py"]
+
+
+def test_deleted_files_are_not_reported(git_repo: Path):
+    """Deletions are not touched files."""
+    snapshot = WorkspaceSnapshot.capture(str(git_repo))
+
+    (git_repo / "README.md").unlink()
+
+    assert snapshot.changed_paths() == []
+
+
+def test_subdirectory_repo_root(git_repo: Path):
+    """A repo_root below the git top level gets paths relative to itself."""
+    snapshot = WorkspaceSnapshot.capture(str(git_repo / "src"))
+    (git_repo / "src" / "app.py").write_text("print('changed')\n")
+    (git_repo / "README.md").write_text("# outside\n")
+
+    assert snapshot.changed_paths() == ["app.py"]
+
+
+def test_non_git_directory_uses_mtime(tmp_path: Path):
+    """Outside git, files modified after the snapshot are reported."""
+    (tmp_path / ".hidden").mkdir()
+    snapshot = WorkspaceSnapshot.capture(str(tmp_path))
+    assert not snapshot.is_git
+
+    (tmp_path / "new.py").write_text("x = 1\n")
+    (tmp_path / ".hidden" / "skip.py").write_text("y = 2\n")
+
+    assert snapshot.changed_paths() == ["new.py"]
+
+
+def test_strategy_falls_back_to_snapshot(git_repo: Path):
+    """parse_output uses the snapshot when the output names no files."""
+    strategy = AiderStrategy("aider", NinjaConfig.from_env())
+    snapshot = WorkspaceSnapshot.capture(str(git_repo))
+    (git_repo / "src" / "app.py").write_text("print('changed')\n")
+
+    parsed = strategy.parse_output("Done.", "", 0, repo_root=str(git_repo), snapshot=snapshot)
+
+    assert parsed.touched_paths == ["src/app.py"]
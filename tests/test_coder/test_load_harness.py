@@ -0,0 +1,215 @@
+"""Tests for the stub CLI, its strategy and the pipeline load generator."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from ninja_coder.benchmark.load import CallRecord, LoadReport, percentile, prepare_repos, run_load
+from ninja_coder.benchmark.stub import (
+    STUB_CLI_PATH,
+    StubScenario,
+    StubStrategy,
+    register_stub_strategy,
+    split_timing,
+    stub_runs,
+)
+from ninja_coder.benchmark.stub_cli import TIMING_PREFIX, parse_size
+from ninja_coder.driver import NinjaConfig, NinjaDriver
+from ninja_coder.models import QueryLogsRequest
+from ninja_coder.scheduler import TaskScheduler
+from ninja_coder.strategies import CLIStrategyRegistry
+from ninja_coder.tools import ToolExecutor
+
+
+@pytest.fixture
+def stub_registered(monkeypatch):
+    monkeypatch.setattr(CLIStrategyRegistry, "_strategies", dict(CLIStrategyRegistry._strategies))
+    monkeypatch.setattr(StubStrategy, "scenario", StubScenario(size=4096))
+    register_stub_strategy()
+
+
+class TestStubCli:
+    def test_parse_size(self):
+        assert parse_size("4096") == 4096
+        assert parse_size("64K") == 64 * 1024
+        assert parse_size("1.5mb") == int(1.5 * 1024 * 1024)
+
+    def test_output_touch_timing_and_exit_code(self, tmp_path):
+        proc = subprocess.run(
+            [sys.executable, str(STUB_CLI_PATH), "--size=2K", "--touch=2", "--timing"]
+            + ["--exit-code=3", "--model", "m", "--message", "do it"],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert proc.returncode == 3
+        assert len(proc.stdout) >= 2048
+        assert "Applied edit to src/pkg/module_0.py" in proc.stdout
+        assert sorted(p.name for p in (tmp_path / "src" / "pkg").iterdir()) == [
+            "module_0.py",
+            "module_1.py",
+        ]
+        stderr, timing = split_timing(proc.stderr)
+        assert stderr == ""
+        assert timing["started"] <= timing["first_output"] <= timing["exited"]
+
+    def test_replays_script_at_rate(self, tmp_path):
+        script = tmp_path / "transcript.txt"
+        script.write_text("x" * 2000)
+
+        proc = subprocess.run(
+            [sys.executable, str(STUB_CLI_PATH), f"--script={script}"]
+            + ["--rate=10K", "--chunk=500", "--timing"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert proc.stdout == "x" * 2000
+        timing = split_timing(proc.stderr)[1]
+        # Four chunks at 10 KB/s: the last one is written 0.15s after the first
+        assert timing["exited"] - timing["first_output"] >= 0.14
+
+
+def test_split_timing_leaves_other_stderr():
+    stderr = f"warning: slow\n{TIMING_PREFIX}{json.dumps({'started': 1.0})}\n"
+
+    assert split_timing(stderr) == ("warning: slow\n", {"started": 1.0})
+    assert split_timing("plain") == ("plain", None)
+
+
+def test_registered_strategy_selected_by_binary_name(stub_registered):
+    strategy = CLIStrategyRegistry.get_strategy(str(STUB_CLI_PATH), NinjaConfig())
+
+    assert isinstance(strategy, StubStrategy)
+    assert strategy.name == "stub"
+    # Built-in names still win
+    assert CLIStrategyRegistry.get_strategy("/usr/bin/aider", NinjaConfig()).name == "aider"
+
+
+def test_stub_command_cycles_exit_codes(stub_registered, monkeypatch):
+    monkeypatch.setattr(StubStrategy, "scenario", StubScenario(exit_codes=(0, 2)))
+    monkeypatch.setattr(StubStrategy, "_runs", iter(range(10)))
+    strategy = StubStrategy(str(STUB_CLI_PATH), NinjaConfig())
+
+    commands = [strategy.build_command("task", "/repo").command for _ in range(3)]
+
+    assert commands[0][:2] == [sys.executable, str(STUB_CLI_PATH)]
+    assert [c for cmd in commands for c in cmd if c.startswith("--exit-code")] == [
+        "--exit-code=0",
+        "--exit-code=2",
+        "--exit-code=0",
+    ]
+    assert commands[0][-2:] == ["--message", "task"]
+
+
+def test_parse_output_records_timing_in_context():
+    strategy = StubStrategy(str(STUB_CLI_PATH), NinjaConfig())
+    runs: list[dict[str, float]] = []
+    token = stub_runs.set(runs)
+    try:
+        # The timestamp contains "401", which the aider parser would read as an HTTP error
+        stderr = f"{TIMING_PREFIX}{json.dumps({'started': 1.401, 'exited': 2.0})}\n"
+        parsed = strategy.parse_output("Applied edit to a.py\n", stderr, 0)
+    finally:
+        stub_runs.reset(token)
+
+    assert parsed.success
+    assert parsed.touched_paths == ["a.py"]
+    assert runs == [{"started": 1.401, "exited": 2.0}]
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([5.0], 99) == 5.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
+
+
+def test_call_record_stages():
+    record = CallRecord(
+        call=0,
+        started=10.0,
+        finished=14.0,
+        runs=[
+            {"started": 10.5, "first_output": 10.7, "exited": 11.0},
+            {"started": 12.0, "first_output": 12.1, "exited": 13.0},
+        ],
+    )
+
+    stages = record.stages()
+
+    assert stages["before_spawn"] == pytest.approx(0.5)
+    assert stages["first_output"] == pytest.approx(0.2)
+    assert stages["cli"] == pytest.approx(1.5)
+    assert stages["after_exit"] == pytest.approx(1.0)
+    assert stages["overhead"] == pytest.approx(2.5)
+    assert stages["total"] == pytest.approx(4.0)
+
+
+def test_report_aggregates_statuses_and_stages():
+    records = [
+        CallRecord(call=i, started=0.0, finished=1.0 + i, status="ok" if i else "error")
+        for i in range(4)
+    ]
+
+    report = LoadReport.from_records(records, concurrency=2, wall_sec=2.0)
+
+    assert report.statuses == {"ok": 3, "error": 1}
+    assert report.throughput == 2.0
+    assert report.stages["total"]["max"] == 4.0
+    assert "cli" not in report.stages
+    assert "total" in report.format()
+
+
+async def test_run_load_through_the_pipeline(tmp_path, monkeypatch, stub_registered):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("NINJA_MAX_RETRIES", "0")
+    # The safety check auto-commits in git repos
+    for var in ("GIT_AUTHOR", "GIT_COMMITTER"):
+        monkeypatch.setenv(f"{var}_NAME", "ninja-load")
+        monkeypatch.setenv(f"{var}_EMAIL", "ninja-load@localhost")
+    monkeypatch.setattr(StubStrategy, "scenario", StubScenario(size=4096, exit_codes=(0, 0, 1)))
+    monkeypatch.setattr(StubStrategy, "_runs", iter(range(100)))
+    driver = NinjaDriver(NinjaConfig(bin_path=str(STUB_CLI_PATH)))
+    executor = ToolExecutor(driver, TaskScheduler(max_workers=2))
+    repos = prepare_repos(tmp_path / "repos", 2)
+
+    report = await run_load(executor, repos, calls=6, concurrency=2)
+
+    assert report.calls == 6
+    assert report.cli_runs == 6
+    assert report.statuses == {"ok": 4, "error": 2}
+    for stage in ("before_spawn", "first_output", "cli", "after_exit", "overhead", "total"):
+        assert report.stages[stage]["p50"] >= 0
+    assert report.stages["total"]["max"] >= report.stages["cli"]["max"]
+    assert report.scheduler["admitted"] == 6
+
+    # Each call logged its pipeline spans
+    expected = {
+        "validate_input",
+        "queue_wait",
+        "safety_check",
+        "write_task_file",
+        "select_model",
+        "spawn",
+        "first_output",
+        "cli_run",
+        "parse_output",
+        "save_logs",
+        "record_metrics",
+        "total",
+    }
+    assert expected <= set(report.spans)
+    assert report.spans["cli_run"]["count"] == 6
+    assert "span (ms)" in report.format()
+
+    result = await executor.query_logs(QueryLogsRequest(timings=True, cli_name="stub"))
+    assert result.timings["total"]["count"] == 6
+    assert result.timings["cli_run"]["p50"] <= result.timings["total"]["p50"]
@@ -0,0 +1,242 @@
+"""Tests for the telemetry-driven model router."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from ninja_coder.driver import NinjaDriver
+from ninja_coder.model_router import ModelRouter, ModelStats, estimate_run_cost
+from ninja_coder.model_selector import ModelSelector
+from ninja_coder.models import TaskComplexity
+from ninja_coder.strategies.base import CLICapabilities
+
+
+ROUTING_CLI = CLICapabilities(
+    supports_streaming=True,
+    supports_file_context=True,
+    supports_model_routing=True,
+    supports_native_zai=False,
+)
+
+
+@pytest.fixture
+def router(tmp_path):
+    return ModelRouter(
+        state_file=tmp_path / "router.json",
+        cost_weight=0.3,
+        latency_weight=0.2,
+        rng=random.Random(42),
+    )
+
+
+class TestModelStats:
+    def test_empty_stats(self):
+        stats = ModelStats()
+        assert stats.runs == 0
+        assert stats.failure_rate == 0.0
+        assert stats.duration_percentile(95) == 0.0
+
+    def test_rates_and_percentiles(self):
+        stats = ModelStats()
+        for i in range(1, 11):
+            stats.outcomes.append((float(i), i % 5 != 0, i == 5, 0.1))
+
+        assert stats.runs == 10
+        assert stats.failure_rate == pytest.approx(0.2)
+        assert stats.retryable_rate == pytest.approx(0.1)
+        assert stats.cost_per_task == pytest.approx(0.1)
+        assert 5 <= stats.duration_percentile(50) <= 6
+        assert stats.duration_percentile(95) >= 9
+
+    def test_window_is_bounded(self):
+        stats = ModelStats()
+        for _ in range(500):
+            stats.outcomes.append((1.0, True, False, 0.0))
+        assert stats.runs == 100
+
+
+class TestModelRouter:
+    def test_requires_candidates(self, router):
+        with pytest.raises(ValueError):
+            router.choose("quick", [])
+
+    def test_prefers_reliable_model(self, router):
+        for _ in range(30):
+            router.record("quick", "good", 10.0, success=True, cost_usd=0.01)
+            router.record(
+                "quick", "flaky", 10.0, success=False, retryable_error=True, cost_usd=0.01
+            )
+
+        picks = [router.choose("quick", ["good", "flaky"])[0] for _ in range(50)]
+        assert picks.count("good") >= 45
+
+    def test_cost_weight_breaks_ties(self, tmp_path):
+        router = ModelRouter(
+            state_file=tmp_path / "router.json",
+            cost_weight=1.0,
+            latency_weight=0.0,
+            rng=random.Random(0),
+        )
+        for _ in range(50):
+            router.record("quick", "cheap", 10.0, success=True, cost_usd=0.01)
+            router.record("quick", "pricey", 10.0, success=True, cost_usd=1.0)
+
+        picks = [router.choose("quick", ["cheap", "pricey"])[0] for _ in range(50)]
+        assert picks.count("cheap") >= 45
+
+    def test_explores_untried_models(self, router):
+        for _ in range(5):
+            router.record("quick", "known", 100.0, success=False)
+
+        picks = {router.choose("quick", ["known", "new"])[0] for _ in range(20)}
+        assert "new" in picks
+
+    def test_stats_are_per_task_type(self, router):
+        router.record("quick", "m", 5.0, success=True)
+        router.record("parallel", "m", 50.0, success=False)
+
+        stats = router.get_stats()
+        assert stats["quick"]["m"]["failure_rate"] == 0.0
+        assert stats["parallel"]["m"]["failure_rate"] == 1.0
+
+    def test_state_persists_across_instances(self, router):
+        router.record("sequential", "m", 12.5, success=True, cost_usd=0.25)
+
+        restored = ModelRouter(state_file=router.state_file)
+        stats = restored.stats("sequential", "m")
+        assert stats.runs == 1
+        assert stats.cost_per_task == pytest.approx(0.25)
+
+    def test_workers_share_one_history(self, router):
+        """Routers in different processes add to the file instead of overwriting it."""
+        other_worker = ModelRouter(state_file=router.state_file)
+
+        router.record("quick", "m", 5.0, success=True)
+        other_worker.record("quick", "m", 7.0, success=False)
+        router.record("quick", "m", 9.0, success=True)
+
+        restored = ModelRouter(state_file=router.state_file)
+        assert restored.stats("quick", "m").runs == 3
+        assert router.stats("quick", "m").runs == 3
+
+    def test_corrupt_state_is_ignored(self, tmp_path):
+        state_file = tmp_path / "router.json"
+        state_file.write_text("{not json")
+
+        router = ModelRouter(state_file=state_file)
+        assert router.get_stats() == {}
+
+
+class TestEstimateRunCost:
+    def test_falls_back_to_output_length(self):
+        cost = estimate_run_cost("anthropic/claude-sonnet-4-5", "x" * 4000)
+        assert cost == pytest.approx(1000 * 15.0 / 1_000_000)
+
+    def test_uses_static_pricing(self):
+        output = "input_tokens: 1000000\noutput_tokens: 0"
+        cost = estimate_run_cost("openrouter/anthropic/claude-sonnet-4-5", output)
+        assert cost == pytest.approx(3.0)
+
+
+class TestSelectorIntegration:
+    def test_adaptive_selection_uses_router(self, router, monkeypatch):
+        monkeypatch.delenv("NINJA_MODEL_QUICK", raising=False)
+        monkeypatch.setenv("NINJA_ROUTER_MODELS", "model-a,model-b")
+        for _ in range(30):
+            router.record("quick", "model-a", 10.0, success=False)
+            router.record("quick", "model-b", 10.0, success=True)
+
+        selector = ModelSelector(default_model="model-a", router=router, capabilities=ROUTING_CLI)
+        recommendation = selector.select_model(TaskComplexity.QUICK)
+
+        assert recommendation.model == "model-b"
+        assert "Adaptive routing" in recommendation.reason
+
+    def test_adaptive_selection_skips_models_the_cli_cannot_run(self, router, monkeypatch):
+        monkeypatch.delenv("NINJA_MODEL_QUICK", raising=False)
+        monkeypatch.delenv("NINJA_ROUTER_MODELS", raising=False)
+        claude_cli = CLICapabilities(
+            supports_streaming=True,
+            supports_file_context=True,
+            supports_model_routing=False,
+            supports_native_zai=False,
+        )
+
+        selector = ModelSelector(
+            default_model="claude-sonnet", router=router, capabilities=claude_cli
+        )
+        for _ in range(10):
+            assert selector.select_model(TaskComplexity.QUICK).model == "claude-sonnet"
+
+    def test_adaptive_selection_without_capabilities_uses_default(self, router, monkeypatch):
+        monkeypatch.delenv("NINJA_MODEL_QUICK", raising=False)
+        monkeypatch.setenv("NINJA_ROUTER_MODELS", "model-a,model-b")
+        for _ in range(30):
+            router.record("quick", "model-a", 10.0, success=False)
+            router.record("quick", "model-b", 10.0, success=True)
+
+        selector = ModelSelector(default_model="model-a", router=router)
+        assert selector.select_model(TaskComplexity.QUICK).model == "model-a"
+
+    def test_adaptive_selection_filters_by_provider_prefix(self, router, monkeypatch):
+        monkeypatch.delenv("NINJA_MODEL_QUICK", raising=False)
+        monkeypatch.setenv("NINJA_ROUTER_MODELS", "openrouter/model-a,gemini-model-b")
+        for _ in range(30):
+            router.record("quick", "openrouter/model-a", 10.0, success=False)
+            router.record("quick", "gemini-model-b", 10.0, success=True)
+        aider_cli = CLICapabilities(
+            supports_streaming=True,
+            supports_file_context=True,
+            supports_model_routing=True,
+            supports_native_zai=False,
+            model_prefixes=("openrouter/",),
+        )
+
+        selector = ModelSelector(router=router, capabilities=aider_cli)
+        assert selector.select_model(TaskComplexity.QUICK).model == "openrouter/model-a"
+
+    def test_env_override_beats_router(self, router, monkeypatch):
+        monkeypatch.setenv("NINJA_MODEL_QUICK", "pinned-model")
+
+        selector = ModelSelector(router=router)
+        assert selector.select_model(TaskComplexity.QUICK).model == "pinned-model"
+
+    def test_from_env_enables_router(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("NINJA_MODEL_ROUTING", "adaptive")
+        monkeypatch.setattr(
+            "ninja_coder.model_router._model_router", ModelRouter(tmp_path / "r.json")
+        )
+        assert ModelSelector.from_env().router is not None
+
+        monkeypatch.setenv("NINJA_MODEL_ROUTING", "static")
+        assert ModelSelector.from_env().router is None
+
+
+class TestDriverTaskTypes:
+    @pytest.mark.parametrize(
+        ("task_type", "complexity"),
+        [
+            ("quick", TaskComplexity.QUICK),
+            ("sequential", TaskComplexity.SEQUENTIAL),
+            ("sequential_plan", TaskComplexity.SEQUENTIAL),
+            ("parallel", TaskComplexity.PARALLEL),
+            ("parallel_plan", TaskComplexity.PARALLEL),
+        ],
+    )
+    def test_plan_task_types_map_to_plan_complexity(self, task_type, complexity):
+        assert NinjaDriver._task_complexity(task_type) == complexity
+
+    def test_plan_outcomes_are_recorded_under_their_complexity(self, router, monkeypatch):
+        monkeypatch.setenv("NINJA_MODEL_ROUTING", "adaptive")
+        monkeypatch.setattr("ninja_coder.driver.get_model_router", lambda: router)
+        driver = NinjaDriver.__new__(NinjaDriver)
+
+        driver._record_model_outcome("parallel_plan", "m", 30.0, True, retryable_error=False)
+        driver._record_model_outcome("sequential_plan", "m", 60.0, False, retryable_error=True)
+
+        stats = router.get_stats()
+        assert "quick" not in stats
+        assert stats["parallel"]["m"]["runs"] == 1
+        assert stats["sequential"]["m"]["retryable_rate"] == 1.0
@@ -0,0 +1,201 @@
+"""Tests for the simple_task retry policy."""
+
+from __future__ import annotations
+
+import random
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ninja_coder.driver import NinjaConfig, NinjaResult
+from ninja_coder.models import SimpleTaskRequest
+from ninja_coder.retry import FailureKind, RetryPolicy, classify_failure
+from ninja_coder.strategies.aider_strategy import AiderStrategy
+from ninja_coder.strategies.claude_strategy import ClaudeStrategy
+from ninja_coder.strategies.gemini_strategy import GeminiStrategy
+from ninja_coder.strategies.opencode_strategy import OpenCodeStrategy
+from ninja_coder.tools import ToolExecutor
+from ninja_common.defaults import FALLBACK_CODER_MODELS
+
+
+def failed(summary: str = "❌ Task failed", notes: str = "", **kwargs) -> NinjaResult:
+    return NinjaResult(success=False, summary=summary, notes=notes, **kwargs)
+
+
+class TestClassifyFailure:
+    @pytest.mark.parametrize(
+        ("result", "kind"),
+        [
+            (
+                failed(stderr="Error 429: Too Many Requests", aider_error_detected=True),
+                FailureKind.RATE_LIMIT,
+            ),
+            (failed(notes="Rate limit exceeded, retry later"), FailureKind.RATE_LIMIT),
+            (
+                failed(summary="❌ Model 'foo/bar' not found on OpenRouter"),
+                FailureKind.MODEL_UNAVAILABLE,
+            ),
+            (
+                failed(stdout="foo/bar is not a valid model ID", aider_error_detected=True),
+                FailureKind.MODEL_UNAVAILABLE,
+            ),
+            (
+                failed(stderr="Connection reset by peer", aider_error_detected=True),
+                FailureKind.TRANSIENT,
+            ),
+            (failed(stdout="Added a timeout of 429 ms to the client"), FailureKind.PERMANENT),
+            (
+                failed(summary="⏱️ Task timed out", notes="No output for 20s (inactivity timeout)"),
+                FailureKind.TRANSIENT,
+            ),
+            (
+                failed(summary="⏱️ Task timed out", notes="Exceeded maximum timeout of 600s"),
+                FailureKind.PERMANENT,
+            ),
+            (
+                failed(
+                    stderr="AuthenticationError: invalid api key, 429", aider_error_detected=True
+                ),
+                FailureKind.PERMANENT,
+            ),
+            (failed(summary="❌ Syntax error in patch"), FailureKind.PERMANENT),
+        ],
+    )
+    def test_classification(self, result, kind):
+        assert classify_failure(result) == kind
+
+    def test_retryable_flag_without_match_is_transient(self):
+        result = failed(summary="❌ Aider internal error", aider_error_detected=True)
+        assert classify_failure(result) == FailureKind.TRANSIENT
+
+
+class TestRetryPolicy:
+    def test_backoff_grows_and_is_capped(self):
+        policy = RetryPolicy(base_delay_sec=1.0, max_delay_sec=8.0, rng=random.Random(1))
+
+        for retry in range(1, 8):
+            cap = min(8.0, 2 ** (retry - 1))
+            delays = [policy.backoff(retry, FailureKind.TRANSIENT) for _ in range(50)]
+            assert all(0 <= d <= cap for d in delays)
+
+    def test_rate_limit_backoff_has_floor(self):
+        policy = RetryPolicy(base_delay_sec=4.0, rng=random.Random(1))
+        delays = [policy.backoff(1, FailureKind.RATE_LIMIT) for _ in range(50)]
+        assert all(2.0 <= d <= 4.0 for d in delays)
+
+    def test_jitter_spreads_retries(self):
+        policy = RetryPolicy(base_delay_sec=10.0, rng=random.Random(1))
+        delays = {round(policy.backoff(2, FailureKind.TRANSIENT), 3) for _ in range(20)}
+        assert len(delays) > 10
+
+    def test_permanent_is_not_retried(self):
+        assert RetryPolicy().decide(1, FailureKind.PERMANENT, []) is None
+
+    def test_retry_budget(self):
+        policy = RetryPolicy(max_retries=1)
+        assert policy.decide(1, FailureKind.TRANSIENT, []) is not None
+        assert policy.decide(2, FailureKind.TRANSIENT, []) is None
+
+    def test_transient_keeps_model(self):
+        decision = RetryPolicy(fallback_models=["b"]).decide(1, FailureKind.TRANSIENT, ["a"])
+        assert decision.model is None
+
+    def test_model_unavailable_fails_over_immediately(self):
+        policy = RetryPolicy(fallback_models=["a", "b", "c"])
+        decision = policy.decide(1, FailureKind.MODEL_UNAVAILABLE, ["x", "a"])
+        assert decision.model == "b"
+        assert decision.delay_sec == 0
+
+    def test_model_unavailable_without_fallback_gives_up(self):
+        policy = RetryPolicy(fallback_models=["a"])
+        assert policy.decide(1, FailureKind.MODEL_UNAVAILABLE, ["a"]) is None
+
+    def test_rate_limit_fails_over_when_possible(self):
+        policy = RetryPolicy(fallback_models=["b"], rng=random.Random(1))
+        assert policy.decide(1, FailureKind.RATE_LIMIT, ["a"]).model == "b"
+        assert policy.decide(2, FailureKind.RATE_LIMIT, ["a", "b"]).model is None
+
+    @pytest.mark.parametrize(
+        ("strategy", "usable"),
+        [
+            (ClaudeStrategy, []),
+            (GeminiStrategy, []),
+            (AiderStrategy, [m for m in FALLBACK_CODER_MODELS if m.startswith("openrouter/")]),
+            (
+                OpenCodeStrategy,
+                [m for m in FALLBACK_CODER_MODELS if not m.startswith("opencode/")],
+            ),
+        ],
+    )
+    def test_for_cli_keeps_models_the_cli_can_run(self, strategy, usable):
+        capabilities = strategy("cli", NinjaConfig()).capabilities
+
+        assert RetryPolicy().for_cli(capabilities).fallback_models == usable
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("NINJA_MAX_RETRIES", "4")
+        monkeypatch.setenv("NINJA_RETRY_DELAY_SEC", "0.5")
+        monkeypatch.setenv("NINJA_FALLBACK_MODELS", "m1, m2")
+        policy = RetryPolicy.from_env()
+        assert policy.max_retries == 4
+        assert policy.base_delay_sec == 0.5
+        assert policy.fallback_models == ["m1", "m2"]
+
+        monkeypatch.setenv("NINJA_MODEL_FAILOVER", "false")
+        assert RetryPolicy.from_env().fallback_models == []
+
+
+async def test_simple_task_fails_over_and_reuses_prepared_task(tmp_path, monkeypatch):
+    """A model-not-found failure retries on a fallback model with the same artifacts."""
+    monkeypatch.setenv("NINJA_RETRY_DELAY_SEC", "0")
+    monkeypatch.setenv("NINJA_FALLBACK_MODELS", "fallback/model")
+
+    results = [
+        failed(summary="❌ Model 'bad/model' not found on OpenRouter", model_used="bad/model"),
+        NinjaResult(success=True, summary="✅ Done", model_used="fallback/model"),
+    ]
+    driver = MagicMock()
+    driver.execute_async = AsyncMock(side_effect=results)
+    executor = ToolExecutor(driver=driver)
+
+    result = await executor.simple_task(SimpleTaskRequest(task="Add docs", repo_root=str(tmp_path)))
+
+    assert result.status == "ok"
+    assert "fallback/model" in result.notes
+    first, second = (call.kwargs for call in driver.execute_async.await_args_list)
+    assert first["model"] is None
+    assert second["model"] == "fallback/model"
+    assert first["prepared"] is second["prepared"]
+
+
+async def test_simple_task_does_not_retry_permanent_failure(tmp_path, monkeypatch):
+    monkeypatch.setenv("NINJA_RETRY_DELAY_SEC", "0")
+
+    driver = MagicMock()
+    driver.execute_async = AsyncMock(return_value=failed(summary="❌ API key error"))
+    executor = ToolExecutor(driver=driver)
+
+    result = await executor.simple_task(SimpleTaskRequest(task="Add docs", repo_root=str(tmp_path)))
+
+    assert result.status == "error"
+    assert driver.execute_async.await_count == 1
+
+
+async def test_rate_limited_claude_run_retries_the_same_model(tmp_path, monkeypatch):
+    """Claude Code only runs Anthropic models, so a rate limit is not failed over."""
+    monkeypatch.setenv("NINJA_RETRY_DELAY_SEC", "0")
+    monkeypatch.delenv("NINJA_FALLBACK_MODELS", raising=False)
+
+    results = [
+        failed(notes="Rate limit exceeded, retry later", model_used="claude-sonnet-4"),
+        NinjaResult(success=True, summary="✅ Done", model_used="claude-sonnet-4"),
+    ]
+    driver = MagicMock()
+    driver._strategy = ClaudeStrategy("claude", NinjaConfig())
+    driver.execute_async = AsyncMock(side_effect=results)
+    executor = ToolExecutor(driver=driver)
+
+    result = await executor.simple_task(SimpleTaskRequest(task="Add docs", repo_root=str(tmp_path)))
+
+    assert result.status == "ok"
+    assert [call.kwargs["model"] for call in driver.execute_async.await_args_list] == [None, None]
@@ -0,0 +1,159 @@
+"""Tests for the coder task scheduler (admission control)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ninja_coder.scheduler import TaskPriority, TaskScheduler
+from ninja_coder.tools import ToolExecutor
+from ninja_common.structured_logger import StructuredLogger
+
+
+def _monitor(memory_percent: float | None = 10.0) -> MagicMock:
+    monitor = MagicMock()
+    monitor.memory_percent.return_value = memory_percent
+    return monitor
+
+
+async def _hold(scheduler: TaskScheduler, repo: str, priority: int, log: list, release):
+    async with scheduler.slot(repo, priority):
+        log.append(repo)
+        await release.wait()
+
+
+async def test_bounds_concurrent_executions(tmp_path):
+    """No more than max_workers executions run at once."""
+    scheduler = TaskScheduler(max_workers=2, monitor=_monitor())
+    release = asyncio.Event()
+    started: list[str] = []
+    repos = [str(tmp_path / f"repo{i}") for i in range(3)]
+
+    tasks = [asyncio.create_task(_hold(scheduler, r, 0, started, release)) for r in repos]
+    await asyncio.sleep(0.01)
+
+    assert len(started) == 2
+    assert scheduler.get_stats()["queue_depth"] == 1
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert len(started) == 3
+    assert scheduler.get_stats()["running"] == 0
+
+
+async def test_interactive_tasks_jump_the_queue(tmp_path):
+    """Waiting interactive tasks are admitted before earlier plans."""
+    scheduler = TaskScheduler(max_workers=1, monitor=_monitor())
+    gate = asyncio.Event()
+    release = asyncio.Event()
+    release.set()
+    order: list[str] = []
+
+    blocker = asyncio.create_task(_hold(scheduler, str(tmp_path / "busy"), 0, order, gate))
+    await asyncio.sleep(0)
+    plan = asyncio.create_task(
+        _hold(scheduler, str(tmp_path / "plan"), TaskPriority.PLAN, order, release)
+    )
+    quick = asyncio.create_task(
+        _hold(scheduler, str(tmp_path / "quick"), TaskPriority.INTERACTIVE, order, release)
+    )
+    await asyncio.sleep(0)
+
+    gate.set()
+    await asyncio.gather(blocker, plan, quick)
+
+    assert order == [str(tmp_path / "busy"), str(tmp_path / "quick"), str(tmp_path / "plan")]
+
+
+async def test_serializes_per_repo(tmp_path):
+    """Two executions on the same repo never overlap."""
+    scheduler = TaskScheduler(max_workers=4, monitor=_monitor())
+    release = asyncio.Event()
+    started: list[str] = []
+    repo = str(tmp_path)
+
+    first = asyncio.create_task(_hold(scheduler, repo, 0, started, release))
+    second = asyncio.create_task(_hold(scheduler, repo, 0, started, release))
+    other = asyncio.create_task(_hold(scheduler, str(tmp_path / "other"), 0, started, release))
+    await asyncio.sleep(0.01)
+
+    assert started == [repo, str(tmp_path / "other")]
+
+    release.set()
+    await asyncio.gather(first, second, other)
+    assert started.count(repo) == 2
+
+
+async def test_memory_backpressure_holds_new_tasks(tmp_path):
+    """Above the watermark only one execution runs until memory recovers."""
+    monitor = _monitor(memory_percent=95.0)
+    scheduler = TaskScheduler(max_workers=4, monitor=monitor, poll_interval=0.01)
+    release = asyncio.Event()
+    started: list[str] = []
+
+    tasks = [
+        asyncio.create_task(_hold(scheduler, str(tmp_path / f"r{i}"), 0, started, release))
+        for i in range(2)
+    ]
+    await asyncio.sleep(0.03)
+    assert len(started) == 1
+    assert scheduler.backpressure_events >= 1
+
+    monitor.memory_percent.return_value = 50.0
+    await asyncio.sleep(0.03)
+    assert len(started) == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+async def test_cancelled_waiter_leaves_queue(tmp_path):
+    """Cancelling a queued execution frees its place without leaking slots."""
+    scheduler = TaskScheduler(max_workers=1, monitor=_monitor())
+    release = asyncio.Event()
+    started: list[str] = []
+
+    running = asyncio.create_task(_hold(scheduler, str(tmp_path / "a"), 0, started, release))
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(_hold(scheduler, str(tmp_path / "b"), 0, started, release))
+    await asyncio.sleep(0)
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    release.set()
+    await running
+
+    stats = scheduler.get_stats()
+    assert stats["queue_depth"] == 0
+    assert stats["running"] == 0
+    assert stats["admitted"] == 1
+
+
+async def test_admissions_are_logged_with_queue_metrics(tmp_path):
+    """Each admission writes its wait and the queue metrics to the structured log."""
+    driver = MagicMock()
+    driver.execute_async = AsyncMock(return_value="result")
+    driver.structured_logger = StructuredLogger("test", tmp_path / "logs")
+    executor = ToolExecutor(driver, TaskScheduler(max_workers=1, monitor=_monitor()))
+
+    results = await asyncio.gather(
+        *(
+            executor._execute_scheduled(
+                TaskPriority.PLAN, repo_root=str(tmp_path / f"r{i}"), step_id=f"step-{i}"
+            )
+            for i in range(2)
+        )
+    )
+
+    assert results == ["result", "result"]
+    entries = driver.structured_logger.query_logs()
+    assert [e["task_id"] for e in entries] == ["step-0", "step-1"]
+    extra = entries[1]["extra"]
+    assert extra["event"] == "scheduler_admission"
+    assert extra["priority"] == "PLAN"
+    assert extra["wait_sec"] >= 0
+    assert extra["scheduler"]["admitted"] == 2
+    assert extra["scheduler"]["max_workers"] == 1
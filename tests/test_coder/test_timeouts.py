@@ -0,0 +1,89 @@
+"""Tests for history-driven timeout estimation."""
+
+from __future__ import annotations
+
+from ninja_coder.driver import NinjaConfig, NinjaDriver
+from ninja_coder.timeouts import RunProfile, TimeoutEstimator
+
+
+PROFILE = RunProfile(cli="aider", model="test/model", task_type="quick", context_chars=2000)
+
+
+def _estimator(tmp_path, **kwargs) -> TimeoutEstimator:
+    return TimeoutEstimator(tmp_path / "durations.jsonl", **kwargs)
+
+
+def test_uses_default_without_enough_history(tmp_path):
+    """The static default applies until min_samples runs are recorded."""
+    estimator = _estimator(tmp_path, min_samples=3)
+    estimator.record(PROFILE, 30)
+    estimator.record(PROFILE, 40)
+
+    assert estimator.estimate(PROFILE, default=300) == 300
+
+
+def test_estimate_is_high_quantile_plus_margin(tmp_path):
+    """Learned timeout is the quantile of durations times the margin."""
+    estimator = _estimator(tmp_path, quantile=0.9, margin=2.0, min_samples=5, min_timeout=1)
+    for duration in [10, 20, 30, 40, 50, 60, 70, 80, 90, 100]:
+        estimator.record(PROFILE, duration)
+
+    assert estimator.estimate(PROFILE, default=900) == 180
+
+
+def test_estimate_is_clamped(tmp_path):
+    """Estimates stay within [min_timeout, max_timeout]."""
+    fast = _estimator(tmp_path, min_samples=1, min_timeout=60, max_timeout=600)
+    fast.record(PROFILE, 2)
+    assert fast.estimate(PROFILE, default=300) == 60
+
+    slow = _estimator(tmp_path / "slow", min_samples=1, min_timeout=60, max_timeout=600)
+    slow.record(PROFILE, 5000, timed_out=True)
+    assert slow.estimate(PROFILE, default=300) == 600
+
+
+def test_buckets_separate_plan_sizes(tmp_path):
+    """Runs with very different step counts don't share history."""
+    estimator = _estimator(tmp_path, min_samples=1, margin=1.0, min_timeout=1)
+    small = RunProfile(cli="aider", model="m", task_type="sequential_plan", steps=2)
+    large = RunProfile(cli="aider", model="m", task_type="sequential_plan", steps=12)
+    estimator.record(small, 100)
+
+    assert estimator.estimate(small, default=500) == 100
+    assert estimator.estimate(large, default=1000) == 1000
+
+
+def test_history_persists_across_instances(tmp_path):
+    """Recorded durations are loaded back from the history file."""
+    first = _estimator(tmp_path, min_samples=2, margin=1.0, min_timeout=1)
+    first.record(PROFILE, 42)
+    first.record(PROFILE, 44)
+    (tmp_path / "durations.jsonl").open("a").write("not json\n")
+
+    second = _estimator(tmp_path, min_samples=2, margin=1.0, min_timeout=1)
+
+    assert second.estimate(PROFILE, default=300) == 44
+
+
+def test_history_file_is_compacted(tmp_path, monkeypatch):
+    """The history file is trimmed once it grows past the limit."""
+    monkeypatch.setattr(TimeoutEstimator, "COMPACT_AFTER_LINES", 10)
+    estimator = _estimator(tmp_path)
+    for i in range(11):
+        estimator.record(PROFILE, i)
+
+    lines = (tmp_path / "durations.jsonl").read_text().splitlines()
+    assert len(lines) == 5
+
+
+def test_inactivity_timeout_is_opt_in(monkeypatch):
+    """Non-streaming CLIs are silent during model calls, so no inactivity kill by default."""
+    monkeypatch.delenv("NINJA_INACTIVITY_TIMEOUT_SEC", raising=False)
+    aider = NinjaDriver(NinjaConfig(bin_path="aider"))
+    claude = NinjaDriver(NinjaConfig(bin_path="claude"))
+
+    assert aider._get_inactivity_timeout("quick") is None
+
+    monkeypatch.setenv("NINJA_INACTIVITY_TIMEOUT_SEC", "45")
+    assert aider._get_inactivity_timeout("quick") == 45.0
+    assert claude._get_inactivity_timeout("quick") is None
@@ -0,0 +1,94 @@
+"""Tests for readiness-signalled daemon startup."""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import pytest
+
+from ninja_common.daemon import DaemonManager
+
+
+READY_SERVER = (
+    "import time; time.sleep({delay}); "
+    "from ninja_common.http_server import notify_ready; notify_ready(); time.sleep(60)"
+)
+
+
+class FakeDaemonManager(DaemonManager):
+    """Runs small scripts instead of the real servers."""
+
+    def __init__(self, cache_dir, scripts):
+        super().__init__(cache_dir)
+        self.scripts = scripts
+
+    def _server_command(self, module, port):
+        return [sys.executable, "-c", self.scripts[module]]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    for module, port in (("fast", 18931), ("slow", 18932), ("broken", 18933)):
+        monkeypatch.setenv(f"NINJA_{module.upper()}_PORT", str(port))
+    manager = FakeDaemonManager(
+        tmp_path,
+        {
+            "fast": READY_SERVER.format(delay=0),
+            "slow": READY_SERVER.format(delay=0.5),
+            "broken": "raise SystemExit(1)",
+        },
+    )
+    yield manager
+    for module in manager.scripts:
+        manager.stop(module)
+
+
+def test_start_returns_on_readiness(manager):
+    started = time.monotonic()
+    assert manager.start("fast")
+    assert time.monotonic() - started < 5
+    assert manager.status("fast")["running"]
+
+
+def test_start_fails_fast_when_server_exits(manager):
+    started = time.monotonic()
+    assert not manager.start("broken")
+    assert time.monotonic() - started < 5
+    assert manager._read_pid("broken") is None
+
+
+def test_start_many_waits_in_parallel(manager):
+    started = time.monotonic()
+    results = manager.start_many(["slow", "fast", "broken"])
+    elapsed = time.monotonic() - started
+
+    assert results == {"slow": True, "fast": True, "broken": False}
+    assert elapsed < 5
+
+
+def test_start_times_out_and_stops_server(manager):
+    manager.scripts["fast"] = "import time; time.sleep(60)"
+
+    assert manager.start_many(["fast"], timeout=0.5) == {"fast": False}
+    assert manager._read_pid("fast") is None
+
+
+def test_start_over_unix_socket(manager, monkeypatch):
+    monkeypatch.setenv("NINJA_DAEMON_TRANSPORT", "uds")
+    sock_file = manager._get_sock_file("fast")
+    manager.scripts["fast"] = (
+        "import time; from ninja_common.http_server import bind_unix_socket, notify_ready; "
+        f"sock = bind_unix_socket({str(sock_file)!r}); notify_ready(); time.sleep(60)"
+    )
+
+    assert manager.start("fast")
+    status = manager.status("fast")
+    assert status["running"]
+    assert status["socket"] == str(sock_file)
+    assert sock_file.stat().st_mode & 0o777 == 0o600
+    # Already running: detected through the socket, not the port
+    assert manager.start("fast")
+
+    manager.stop("fast")
+    assert not sock_file.exists()
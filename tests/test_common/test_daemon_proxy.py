@@ -0,0 +1,127 @@
+"""Tests for the stdio-to-HTTP/SSE daemon proxy."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import random
+
+import pytest
+from aiohttp import web
+
+from ninja_common.daemon import SSEParser, stdio_to_http_proxy
+
+
+STREAM = (
+    b"event: endpoint\r\ndata: /messages/?session_id=abc\r\n\r\n"
+    b": ping - 2025-01-01\r\n\r\n"
+    b'event: message\r\ndata: {"id": 1, "result": "ok"}\r\n\r\n'
+    b"data: line one\ndata: line two\n\n"
+    b"retry: 1000\nid: 7\ndata: \n\n"
+)
+
+
+def parse(chunks):
+    parser = SSEParser()
+    return [(e.event, e.data) for chunk in chunks for e in parser.feed(chunk)]
+
+
+class TestSSEParser:
+    def test_parses_events(self):
+        assert parse([STREAM]) == [
+            ("endpoint", b"/messages/?session_id=abc"),
+            ("message", b'{"id": 1, "result": "ok"}'),
+            ("message", b"line one\nline two"),
+            ("message", b""),
+        ]
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_chunking_does_not_matter(self, seed):
+        rng = random.Random(seed)
+        chunks = []
+        pos = 0
+        while pos < len(STREAM):
+            size = rng.randint(1, 7)
+            chunks.append(STREAM[pos : pos + size])
+            pos += size
+
+        assert parse(chunks) == parse([STREAM])
+
+    def test_large_event_in_small_chunks(self):
+        payload = b"x" * 200_000
+        stream = b"data: " + payload + b"\n\n"
+        chunks = [stream[i : i + 1024] for i in range(0, len(stream), 1024)]
+
+        assert parse(chunks) == [("message", payload)]
+
+
+@pytest.mark.parametrize(
+    ("pipeline_depth", "transport"), [(1, "tcp"), (4, "tcp"), (1, "uds"), (4, "uds")]
+)
+async def test_proxy_forwards_raw_messages(pipeline_depth, transport, tmp_path):
+    """Client lines are POSTed as-is and daemon events written to stdout."""
+    received: list[bytes] = []
+    outbox: asyncio.Queue[bytes] = asyncio.Queue()
+
+    async def sse(request):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(b"event: endpoint\r\ndata: /messages/?session_id=s1\r\n\r\n")
+        while True:
+            body = await outbox.get()
+            await response.write(b"event: message\r\ndata: " + body + b"\r\n\r\n")
+
+    async def messages(request):
+        body = await request.read()
+        received.append(body)
+        await outbox.put(body)
+        return web.Response(status=202)
+
+    app = web.Application()
+    app.router.add_get("/sse", sse)
+    app.router.add_post("/messages/", messages)
+    runner = web.AppRunner(app, handler_cancellation=True)
+    await runner.setup()
+    if transport == "uds":
+        uds = str(tmp_path / "daemon.sock")
+        site = web.UnixSite(runner, uds)
+        await site.start()
+        url = "http://localhost/sse"
+    else:
+        uds = None
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/sse"
+
+    requests = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize"},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"x": "y" * 100_000}},
+    ]
+    stdin = asyncio.StreamReader(limit=1024 * 1024)
+    for request in requests:
+        stdin.feed_data(json.dumps(request).encode() + b"\n")
+    stdin.feed_eof()
+    stdout = io.BytesIO()
+
+    try:
+        await asyncio.wait_for(
+            stdio_to_http_proxy(
+                url,
+                pipeline_depth=pipeline_depth,
+                stdin=stdin,
+                stdout=stdout,
+                uds=uds,
+            ),
+            timeout=10,
+        )
+    finally:
+        await runner.cleanup()
+
+    forwarded = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    if pipeline_depth == 1:
+        assert received == [json.dumps(r).encode() for r in requests]
+        assert forwarded == requests
+    else:
+        assert sorted(received) == sorted(json.dumps(r).encode() for r in requests)
+        assert sorted(forwarded, key=lambda r: r["id"]) == requests
@@ -0,0 +1,119 @@
+"""Tests for in-flight request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ninja_coder.driver import NinjaResult
+from ninja_coder.models import SimpleTaskRequest
+from ninja_coder.tools import ToolExecutor
+from ninja_common.inflight import InFlightRegistry, request_key
+
+
+def test_request_key_is_stable():
+    """Equal inputs give equal keys; any difference changes the key."""
+    assert request_key("a", ["x", "y"], {"b": 1}) == request_key("a", ["x", "y"], {"b": 1})
+    assert request_key("a", ["x", "y"]) != request_key("a", ["y", "x"])
+
+
+async def test_duplicates_share_one_execution():
+    """Concurrent calls with the same key run the factory once."""
+    registry: InFlightRegistry[int] = InFlightRegistry()
+    calls = 0
+    release = asyncio.Event()
+
+    async def work() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    first = asyncio.create_task(registry.run("k", work))
+    second = asyncio.create_task(registry.run("k", work))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(first, second) == [42, 42]
+    assert calls == 1
+    assert registry.get_stats()["coalesced"] == 1
+
+
+async def test_completed_result_served_within_ttl():
+    """A late retry gets the cached result; expired entries re-run."""
+    registry: InFlightRegistry[int] = InFlightRegistry(result_ttl=0.05)
+    work = AsyncMock(side_effect=[1, 2])
+
+    assert await registry.run("k", work) == 1
+    assert await registry.run("k", work) == 1
+    assert registry.cache_hits == 1
+
+    await asyncio.sleep(0.06)
+    assert await registry.run("k", work) == 2
+
+
+async def test_cache_predicate_and_exceptions():
+    """Rejected results and exceptions are not cached."""
+    registry: InFlightRegistry[str] = InFlightRegistry()
+    work = AsyncMock(side_effect=["error", RuntimeError("boom"), "ok"])
+
+    assert await registry.run("k", work, cache_if=lambda r: r == "ok") == "error"
+    with pytest.raises(RuntimeError):
+        await registry.run("k", work)
+    assert await registry.run("k", work, cache_if=lambda r: r == "ok") == "ok"
+    assert "k" in registry
+
+
+async def test_caller_cancellation_keeps_execution_running():
+    """Cancelling one caller doesn't abort the execution others wait on."""
+    registry: InFlightRegistry[str] = InFlightRegistry()
+    release = asyncio.Event()
+
+    async def work() -> str:
+        await release.wait()
+        return "done"
+
+    impatient = asyncio.create_task(registry.run("k", work))
+    await asyncio.sleep(0)
+    impatient.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await impatient
+
+    retry = asyncio.create_task(registry.run("k", work))
+    release.set()
+
+    assert await retry == "done"
+
+
+async def test_simple_task_retry_attaches_to_running_task(tmp_path):
+    """A retried simple_task call does not start a second CLI run."""
+    release = asyncio.Event()
+
+    async def execute_async(**kwargs):
+        await release.wait()
+        return NinjaResult(success=True, summary="✅ Done", suspected_touched_paths=["a.py"])
+
+    driver = MagicMock()
+    driver.execute_async = AsyncMock(side_effect=execute_async)
+    executor = ToolExecutor(driver=driver)
+    request = SimpleTaskRequest(task="Add a function", repo_root=str(tmp_path))
+
+    first = asyncio.create_task(executor.simple_task(request))
+    await asyncio.sleep(0.05)
+    retry = asyncio.create_task(executor.simple_task(request))
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(first, retry)
+
+    assert [r.status for r in results] == ["ok", "ok"]
+    assert driver.execute_async.await_count == 1
+
+    late = await executor.simple_task(request)
+    assert late.summary == "✅ Done"
+    assert driver.execute_async.await_count == 1
+
+    other = await executor.simple_task(request.model_copy(update={"idempotency_key": "new"}))
+    assert other.status == "ok"
+    assert driver.execute_async.await_count == 2
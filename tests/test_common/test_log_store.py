@@ -0,0 +1,125 @@
+"""Tests for bounded task log storage."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import time
+
+from ninja_common import log_store
+from ninja_common.log_store import (
+    prune_artifacts,
+    read_artifact,
+    schedule_retention,
+    truncate_output,
+    write_artifact,
+)
+from ninja_common.logging_utils import TaskLogger
+from ninja_common.redaction import redact
+
+
+class TestTruncateOutput:
+    def test_short_text_is_kept(self):
+        assert truncate_output("hello", 10) == "hello"
+
+    def test_keeps_head_and_tail(self):
+        text = "H" * 50 + "M" * 1000 + "T" * 50
+        result = truncate_output(text, 100)
+
+        assert result.startswith("H" * 50)
+        assert result.endswith("T" * 50)
+        assert "M" not in result
+        assert "[1000 characters truncated]" in result
+
+    def test_secret_across_cut_is_redacted(self):
+        key = "sk-or-v1-" + "s" * 40
+        text = "a" * 80 + key + "b" * 1000
+        result = truncate_output(text, 200, redact, margin=64)
+
+        assert "sss" not in result
+        assert result.startswith("a" * 80 + "[REDACTED_API_KEY]")
+
+
+class TestWriteArtifact:
+    def test_compressed_compact_json(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("NINJA_LOG_COMPRESSION", raising=False)
+        path = write_artifact(tmp_path / "20250101_000000_step.json", {"a": [1, 2]})
+
+        assert path.name.endswith(".json.gz")
+        with gzip.open(path, "rt") as f:
+            assert f.read() == '{"a":[1,2]}'
+        assert json.loads(read_artifact(path)) == {"a": [1, 2]}
+
+    def test_compression_can_be_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("NINJA_LOG_COMPRESSION", "none")
+        path = write_artifact(tmp_path / "20250101_000000_step.log", "text")
+
+        assert path.suffix == ".log"
+        assert read_artifact(path) == "text"
+
+
+class TestRetention:
+    def _artifact(self, directory, name, size, age_days):
+        path = directory / name
+        path.write_bytes(b"x" * size)
+        mtime = time.time() - age_days * 86400
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_prunes_by_age(self, tmp_path):
+        old = self._artifact(tmp_path, "20240101_000000_a.log.gz", 10, 30)
+        new = self._artifact(tmp_path, "20250101_000000_b.log.gz", 10, 1)
+
+        assert prune_artifacts(tmp_path, 14, 10**9) == (1, 10)
+        assert not old.exists()
+        assert new.exists()
+
+    def test_prunes_oldest_first_by_size(self, tmp_path):
+        paths = [
+            self._artifact(tmp_path, f"2025010{i}_000000_s.json.gz", 100, 5 - i)
+            for i in range(1, 5)
+        ]
+
+        deleted, freed = prune_artifacts(tmp_path, 14, 250)
+
+        assert (deleted, freed) == (2, 200)
+        assert [p.exists() for p in paths] == [False, False, True, True]
+
+    def test_leaves_other_files_alone(self, tmp_path):
+        settings = self._artifact(tmp_path, "model_settings.yml", 10, 100)
+        notes = self._artifact(tmp_path, "notes.json", 10, 100)
+
+        assert prune_artifacts(tmp_path, 1, 0) == (0, 0)
+        assert settings.exists()
+        assert notes.exists()
+
+    def test_sweep_is_throttled(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(log_store, "_last_sweep", {})
+        old = self._artifact(tmp_path, "20240101_000000_a.log.gz", 10, 30)
+
+        thread = schedule_retention([tmp_path])
+        thread.join()
+
+        assert not old.exists()
+        assert schedule_retention([tmp_path]) is None
+
+
+class TestTaskLoggerArtifacts:
+    def test_save_writes_compressed_capped_logs(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("NINJA_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setenv("NINJA_LOG_MAX_OUTPUT_CHARS", "1000")
+        monkeypatch.delenv("NINJA_LOG_COMPRESSION", raising=False)
+
+        task_logger = TaskLogger(tmp_path, "step")
+        task_logger.log_subprocess(["cli"], 0, "start " + "x" * 50_000 + " end", "")
+        log_path = task_logger.save()
+
+        assert log_path.endswith(".log.gz")
+        assert task_logger.log_path == log_path
+        metadata = json.loads(read_artifact(task_logger.saved_metadata_file))
+        stdout = metadata["subprocess"]["stdout"]
+        assert stdout.startswith("start ")
+        assert stdout.endswith(" end")
+        assert len(stdout) < 1100
+        assert "Subprocess completed" in read_artifact(log_path)
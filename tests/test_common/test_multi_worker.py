@@ -0,0 +1,288 @@
+"""Tests for multi-worker HTTP serving and cross-process shared state."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from ninja_coder.scheduler import TaskScheduler
+from ninja_common import http_server
+from ninja_common.http_server import WorkerContext, message_path, session_affinity
+from ninja_common.inflight import InFlightRegistry
+from ninja_common.security import RateLimiter
+from ninja_common.shared_state import SHARED_STATE_ENV, SharedStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SharedStore(tmp_path / "shared.db")
+
+
+def test_shared_window_is_seen_by_every_connection(tmp_path, store):
+    """Calls admitted through one connection count against another."""
+    other = SharedStore(tmp_path / "shared.db")
+
+    assert store.try_acquire("tool", "c", max_calls=2, time_window=60, now=100)
+    assert other.try_acquire("tool", "c", max_calls=2, time_window=60, now=101)
+    assert not store.try_acquire("tool", "c", max_calls=2, time_window=60, now=102)
+    # Other scopes and clients have their own windows
+    assert other.try_acquire("tool", "d", max_calls=2, time_window=60, now=102)
+    # Old calls slide out of the window
+    assert other.try_acquire("tool", "c", max_calls=2, time_window=60, now=161)
+
+
+def test_shared_window_reset(store):
+    for _ in range(2):
+        store.try_acquire("tool", "c", max_calls=2, time_window=60)
+    store.reset("tool", "c")
+    assert store.try_acquire("tool", "c", max_calls=2, time_window=60)
+
+
+def test_claim_interval(store):
+    assert store.claim_interval("gc", 60, now=100)
+    assert not store.claim_interval("gc", 60, now=130)
+    assert store.claim_interval("gc", 60, now=161)
+    assert store.claim_interval("other", 60, now=130)
+
+
+async def test_rate_limiter_uses_shared_store(tmp_path, monkeypatch):
+    """With shared state enabled, limiter instances of one scope share a window."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv(SHARED_STATE_ENV, "1")
+    monkeypatch.setattr("ninja_common.shared_state._shared_store", None)
+
+    first = RateLimiter(max_calls=1, time_window=60, scope="tool")
+    second = RateLimiter(max_calls=1, time_window=60, scope="tool")
+    assert await first.check_limit("c")
+    assert not await second.check_limit("c")
+
+
+@pytest.fixture
+def shared_state(tmp_path, monkeypatch):
+    """Enable shared state with a fresh store in a temp cache dir."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv(SHARED_STATE_ENV, "1")
+    monkeypatch.setattr("ninja_common.shared_state._shared_store", None)
+
+
+def test_task_slots_cap_and_serialize_repos(tmp_path, store):
+    other = SharedStore(tmp_path / "shared.db")
+
+    assert store.try_acquire_slot("a", "/repo1", max_slots=2)
+    assert not other.try_acquire_slot("b", "/repo1", max_slots=2)
+    assert other.try_acquire_slot("b", "/repo1", max_slots=2, serialize_repos=False)
+    assert not other.try_acquire_slot("c", "/repo2", max_slots=2)
+
+    store.release_slot("a")
+    assert other.try_acquire_slot("c", "/repo2", max_slots=2)
+
+
+def test_slots_of_dead_processes_are_dropped(store):
+    proc = subprocess.Popen([sys.executable, "-c", ""])
+    proc.wait()
+    store._conn.execute(
+        "INSERT INTO task_slots (holder, repo, pid) VALUES ('dead', '/repo', ?)", (proc.pid,)
+    )
+
+    assert store.try_acquire_slot("a", "/repo", max_slots=1)
+
+
+def test_request_claims(tmp_path, store):
+    other = SharedStore(tmp_path / "shared.db")
+
+    assert store.claim_request("k", now=100)
+    assert not other.claim_request("k", now=101)
+    assert other.request_result("k", now=101) == (True, None)
+
+    store.finish_request("k", "result", ttl=60, now=102)
+    assert other.request_result("k", now=103) == (True, "result")
+    assert not other.claim_request("k", now=103)
+    # Expired results can be claimed again
+    assert other.claim_request("k", now=163)
+
+    # Failed executions are not shared
+    other.finish_request("k", None, ttl=60, now=164)
+    assert store.request_result("k", now=164) == (False, None)
+
+
+async def test_scheduler_slots_are_shared_by_workers(shared_state):
+    """Two schedulers (one per worker) together run one execution at a time."""
+    first = TaskScheduler(max_workers=1, poll_interval=0.01)
+    second = TaskScheduler(max_workers=1, poll_interval=0.01)
+    admitted: list[str] = []
+
+    async def run(scheduler: TaskScheduler, repo: str) -> None:
+        async with scheduler.slot(repo):
+            admitted.append(repo)
+
+    async with first.slot("/repo1"):
+        waiting = asyncio.create_task(run(second, "/repo2"))
+        await asyncio.sleep(0.1)
+        assert admitted == []
+
+    await asyncio.wait_for(waiting, timeout=5)
+    assert admitted == ["/repo2"]
+
+    # A wait cancelled by its caller leaves no slot behind
+    async with first.slot("/repo1"):
+        cancelled = asyncio.create_task(run(second, "/repo2"))
+        await asyncio.sleep(0.05)
+        cancelled.cancel()
+    await asyncio.wait_for(run(second, "/repo3"), timeout=5)
+    assert admitted == ["/repo2", "/repo3"]
+
+
+async def test_duplicate_request_on_another_worker_attaches(shared_state):
+    """A retry landing on another worker waits for the first worker's result."""
+    workers = [InFlightRegistry[str](dump=str, load=str, poll_interval=0.01) for _ in range(2)]
+    release = asyncio.Event()
+    runs = 0
+
+    async def execute() -> str:
+        nonlocal runs
+        runs += 1
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(workers[0].run("key", execute))
+    await asyncio.sleep(0.05)
+    second = asyncio.create_task(workers[1].run("key", execute))
+    await asyncio.sleep(0.05)
+    release.set()
+
+    assert await asyncio.gather(first, second) == ["done", "done"]
+    assert runs == 1
+    assert workers[1].get_stats()["coalesced"] == 1
+
+
+def test_message_path_is_worker_prefixed(monkeypatch):
+    assert message_path("/messages") == "/messages"
+    monkeypatch.setattr(http_server, "_worker", WorkerContext(index=2, peer_ports=[1, 2, 3]))
+    assert message_path("/messages") == "/w2/messages"
+
+
+async def _call(app, path, body=b"", query=b""):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": path, "query_string": query, "headers": []}
+    await app(scope, receive, send)
+    return sent
+
+
+async def test_session_affinity_routing():
+    """Own sessions reach the app unprefixed; unknown workers are rejected."""
+    paths = []
+
+    async def app(scope, receive, send):
+        paths.append(scope["path"])
+
+    route = session_affinity(app, WorkerContext(index=1, peer_ports=[9001, 9002]))
+
+    await _call(route, "/w1/messages")
+    await _call(route, "/sse")
+    sent = await _call(route, "/w5/messages")
+
+    assert paths == ["/messages", "/sse"]
+    assert sent[0]["status"] == 404
+
+
+async def test_sibling_requests_are_forwarded():
+    """A POST for another worker is replayed against that worker's private port."""
+    uvicorn = pytest.importorskip("uvicorn")
+
+    async def sibling(scope, receive, send):
+        message = await receive()
+        body = b"%s?%s %s" % (scope["path"].encode(), scope["query_string"], message["body"])
+        await send({"type": "http.response.start", "status": 202, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(sibling, log_level="warning", lifespan="off"))
+    serving = asyncio.create_task(server.serve(sockets=[sock]))
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        route = session_affinity(
+            lambda *_: None, WorkerContext(index=1, peer_ports=[sock.getsockname()[1], 0])
+        )
+
+        sent = await _call(route, "/w0/messages", body=b'{"id": 1}', query=b"session_id=abc")
+    finally:
+        server.should_exit = True
+        await serving
+        sock.close()
+
+    assert sent[0]["status"] == 202
+    assert sent[1]["body"] == b'/w0/messages?session_id=abc {"id": 1}'
+
+
+SUPERVISED_SERVER = textwrap.dedent(
+    """
+    import asyncio, os, sys
+    from ninja_common import http_server
+
+    async def main_http(host, port, uds):
+        worker = http_server.current_worker()
+        assert os.environ["{shared_env}"] == "1"
+        print(f"worker {{worker.index}} pid {{os.getpid()}}", flush=True)
+        http_server.notify_ready()
+        await asyncio.sleep(60)
+
+    http_server.run_http(main_http, "127.0.0.1", 0, workers=3)
+    """
+)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_supervisor_reports_ready_and_stops_workers(tmp_path):
+    ready_read, ready_write = os.pipe()
+    env = {**os.environ, http_server.READY_FD_ENV: str(ready_write)}
+    proc = subprocess.Popen(
+        [sys.executable, "-c", SUPERVISED_SERVER.format(shared_env=SHARED_STATE_ENV)],
+        env=env,
+        pass_fds=(ready_write,),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    os.close(ready_write)
+    try:
+        readable, _, _ = select.select([ready_read], [], [], 20)
+        assert readable, "supervisor never signalled readiness"
+        assert os.read(ready_read, 64) == http_server.READY_MESSAGE
+
+        proc.send_signal(signal.SIGTERM)
+        output, _ = proc.communicate(timeout=20)
+    finally:
+        os.close(ready_read)
+        if proc.poll() is None:
+            proc.kill()
+
+    assert sorted(line.split()[1] for line in output.splitlines()) == ["0", "1", "2"]
+    # Every worker is gone once the supervisor has exited
+    for line in output.splitlines():
+        pid = int(line.split()[3])
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                os.kill(pid, 0)
+            except OSError:
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail(f"worker {pid} still running")
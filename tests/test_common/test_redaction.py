@@ -0,0 +1,97 @@
+"""Tests for the single-pass redaction engine."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from ninja_common.log_store import read_artifact
+from ninja_common.logging_utils import TaskLogger
+from ninja_common.redaction import RedactionRule, Redactor, redact
+
+
+LEGACY_PATTERNS = [
+    (r"(sk-[a-zA-Z0-9_-]{20,})", "[REDACTED_API_KEY]"),
+    (r"(api[_-]key[a-zA-Z0-9]{10,})", "[REDACTED_API_KEY]"),
+    (r"(token[a-zA-Z0-9]{10,})", "[REDACTED_TOKEN]"),
+    (
+        r'(["\']?(password|passwd|pwd)["\']?\s*[:=]\s*["\'][^"\']{3,}["\'])',
+        "[REDACTED_PASSWORD]",
+    ),
+    (r'(["\']?(secret|key)["\']?\s*[:=]\s*["\'][^"\']{3,}["\'])', "[REDACTED_SECRET]"),
+    (r"([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})", "[REDACTED_EMAIL]"),
+]
+
+
+def legacy_redact(text: str) -> str:
+    """The previous implementation: one re.sub pass per pattern."""
+    for pattern, replacement in LEGACY_PATTERNS:
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+SAMPLES = [
+    "Using key sk-or-v1-abcdefghijklmnopqrstuvwxyz0123456789",
+    "OPENROUTER api_keyABCDEFGHIJKLMNOP set",
+    "header tokenABCDEFGHIJKLMNOP",
+    'config = {"password": "hunter22"}',
+    "PWD='s3cr3t!'",
+    "secret: 'abcdef'",
+    "contact dev.team+ninja@example.co.uk for access",
+    "nothing to see here",
+    "Applied edit to src/main.py\nrate limit exceeded",
+    "",
+]
+
+
+class TestRedactor:
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_matches_legacy_redaction(self, text):
+        assert redact(text) == legacy_redact(text)
+
+    def test_non_string_passthrough(self):
+        assert redact(None) is None  # type: ignore[arg-type]
+        assert redact(42) == 42  # type: ignore[arg-type]
+
+    def test_redacts_multiple_secrets(self):
+        text = "a sk-AAAAAAAAAAAAAAAAAAAAAAAA b user@example.com c"
+        assert redact(text) == "a [REDACTED_API_KEY] b [REDACTED_EMAIL] c"
+
+    def test_custom_rules(self):
+        redactor = Redactor([RedactionRule(r"ghp_[A-Za-z0-9]{8,}", "[REDACTED_GH]", ("ghp_",))])
+        assert redactor.redact("token GHP_abcdefgh123") == "token [REDACTED_GH]"
+
+    def test_unanchored_rules_are_scanned(self):
+        redactor = Redactor(
+            [RedactionRule(r"\d{4}-\d{4}", "<card>"), RedactionRule(r"x(y)", "<2>")]
+        )
+        assert redactor.redact("1234-5678 xy") == "<card> <2>"
+
+    def test_leftmost_match_wins_across_rules(self):
+        # The email starts before the embedded token, so it is redacted whole
+        assert redact("id.tokenABCDEFGHIJKL@example.com") == "[REDACTED_EMAIL]"
+
+    def test_unicode_case_folding_fallback(self):
+        text = "İ sk-" + "a" * 24
+        assert redact(text) == "İ [REDACTED_API_KEY]"
+
+
+class TestTaskLoggerRedaction:
+    def test_subprocess_output_is_redacted(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("NINJA_CACHE_DIR", str(tmp_path / "cache"))
+        task_logger = TaskLogger(tmp_path, "step")
+        task_logger.log_subprocess(
+            ["cli", "--api-key", "sk-" + "a" * 30],
+            0,
+            "out user@example.com",
+            "err tokenABCDEFGHIJKLM",
+        )
+
+        subprocess_meta = task_logger._metadata["subprocess"]
+        assert subprocess_meta["stdout"] == "out [REDACTED_EMAIL]"
+        assert subprocess_meta["stderr"] == "err [REDACTED_TOKEN]"
+        assert "[REDACTED_API_KEY]" in subprocess_meta["command"]
+
+        log_text = read_artifact(task_logger.save())
+        assert "user@example.com" not in log_text
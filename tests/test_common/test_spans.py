@@ -0,0 +1,110 @@
+"""Tests for span-based stage timing."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from ninja_common.spans import (
+    Trace,
+    current_trace,
+    percentile,
+    record_span,
+    span,
+    start_trace,
+    summarize_stages,
+    traced,
+)
+
+
+def test_spans_without_trace_are_noops():
+    """Instrumented code runs unchanged when nothing is being traced."""
+    with span("stage"):
+        pass
+    record_span("stage", time.perf_counter())
+
+    assert current_trace() is None
+
+
+def test_trace_records_spans_in_order():
+    with start_trace() as trace:
+        with span("first", attempt=0):
+            time.sleep(0.01)
+        started = time.perf_counter()
+        record_span("second", started, started + 0.002)
+
+    assert current_trace() is None
+    assert [s.name for s in trace.spans] == ["first", "second"]
+    first, second = trace.spans
+    assert first.duration_ms >= 10
+    assert first.attrs == {"attempt": 0}
+    assert second.duration_ms == pytest.approx(2)
+    assert second.start_ms >= first.start_ms + first.duration_ms
+    assert first.to_dict()["attempt"] == 0
+
+
+def test_span_recorded_when_block_raises():
+    with start_trace() as trace:
+        with pytest.raises(ValueError), span("failing"):
+            raise ValueError("boom")
+
+    assert [s.name for s in trace.spans] == ["failing"]
+
+
+def test_stage_totals_add_repeated_stages():
+    trace = Trace(started=0.0)
+    trace.add("cli_run", 1.0, 2.0)
+    trace.add("parse_output", 2.0, 2.5)
+    trace.add("cli_run", 3.0, 5.0)
+
+    assert trace.stage_totals() == {"cli_run": 3000.0, "parse_output": 500.0}
+
+
+async def test_traced_calls_get_separate_traces():
+    """Concurrent calls each record into their own trace, including work in threads."""
+
+    @traced
+    async def call(delay: float) -> Trace:
+        with span("sleep"):
+            await asyncio.sleep(delay)
+        await asyncio.to_thread(lambda: record_span("thread", time.perf_counter()))
+        trace = current_trace()
+        assert trace is not None
+        return trace
+
+    fast, slow = await asyncio.gather(call(0.01), call(0.05))
+
+    assert fast is not slow
+    assert [s.name for s in fast.spans] == ["sleep", "thread"]
+    assert [s.name for s in slow.spans] == ["sleep", "thread"]
+    assert slow.spans[0].duration_ms > fast.spans[0].duration_ms
+    assert current_trace() is None
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0, 1.0, 2.0], 50) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 90) == pytest.approx(3.7)
+
+
+def test_summarize_stages():
+    samples = [{"cli_run": float(ms), "total": ms + 10.0} for ms in range(1, 101)]
+    samples.append({"retry_backoff": 5000.0, "total": 6000.0})
+
+    summary = summarize_stages(samples)
+
+    assert summary["cli_run"]["count"] == 100
+    assert summary["cli_run"]["p50"] == pytest.approx(50.5)
+    assert summary["cli_run"]["p99"] == pytest.approx(99.01)
+    assert summary["cli_run"]["max"] == 100.0
+    assert summary["retry_backoff"] == {
+        "count": 1,
+        "p50": 5000.0,
+        "p90": 5000.0,
+        "p99": 5000.0,
+        "max": 5000.0,
+        "mean": 5000.0,
+    }
+    assert summary["total"]["count"] == 101
@@ -0,0 +1,75 @@
+"""Startup benchmark: server entry points must not import heavy deps eagerly."""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ninja_common.startup_profile import parse_importtime, profile_imports
+
+
+SRC = str(Path(__file__).resolve().parents[2] / "src")
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        300 |     ninja_common.defaults
+import time:       500 |        800 |   ninja_common
+import time:      1000 |       1920 | ninja_coder.server
+"""
+
+
+def _env() -> dict[str, str]:
+    return {**os.environ, "PYTHONPATH": os.pathsep.join([SRC, os.environ.get("PYTHONPATH", "")])}
+
+
+def test_parse_importtime():
+    profile = parse_importtime("ninja_coder.server", SAMPLE + "some other stderr line\n")
+
+    assert profile.modules == {"_io", "ninja_common.defaults", "ninja_common", "ninja_coder.server"}
+    assert profile.total_us == 1920
+    assert [t.module for t in profile.top(2)] == ["ninja_coder.server", "ninja_common"]
+    assert [t.depth for t in profile.timings] == [1, 2, 1, 0]
+
+
+def test_registry_imports_strategies_on_first_use():
+    code = (
+        "import sys\n"
+        "from ninja_coder.strategies import CLIStrategyRegistry\n"
+        "loaded = lambda: sorted(m for m in sys.modules if m.endswith('_strategy'))\n"
+        "assert loaded() == [], loaded()\n"
+        "assert 'aider' in CLIStrategyRegistry.list_strategies()\n"
+        "CLIStrategyRegistry.get_strategy_class('aider')\n"
+        "assert loaded() == ['ninja_coder.strategies.aider_strategy'], loaded()\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=_env(), check=False
+    )
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.mark.skipif(importlib.util.find_spec("mcp") is None, reason="mcp not installed")
+@pytest.mark.parametrize(
+    ("module", "deferred"),
+    [
+        (
+            "ninja_coder.server",
+            {
+                "ninja_coder.tools",
+                "ninja_coder.driver",
+                "ninja_coder.strategies.aider_strategy",
+                "ninja_common.daemon",
+            },
+        ),
+        ("ninja_researcher.server", {"ddgs", "bs4"}),
+    ],
+)
+def test_server_import_defers_heavy_modules(module, deferred):
+    profile = profile_imports(module, env=_env())
+
+    assert not profile.modules & deferred
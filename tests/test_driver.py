@@ -20,6 +20,7 @@ from ninja_coder.driver import (
     NinjaDriver,
     NinjaResult,
 )
+from ninja_common.spans import start_trace
 
 
 # ============================================================================
@@ -527,6 +528,51 @@ async def test_execute_async_with_opencode_session_creates_session(
     assert len(result.suspected_touched_paths) >= 0  # Parser should detect file changes
 
 
+@pytest.mark.asyncio
+async def test_opencode_session_records_spans(opencode_driver, tmp_path, monkeypatch):
+    """Test that the OpenCode session path records the pipeline stages."""
+    from unittest.mock import MagicMock
+
+    async def mock_subprocess(*args, **kwargs):
+        process = MagicMock()
+        process.returncode = 0
+
+        async def communicate():
+            return b"Session: ses_abc123\n| Edit     src/user.py", b""
+
+        process.communicate = communicate
+        return process
+
+    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_subprocess)
+    monkeypatch.setattr(
+        "ninja_coder.driver.validate_task_safety",
+        lambda **kwargs: {"safe": True, "warnings": [], "recommendations": [], "git_info": {}},
+    )
+
+    with start_trace() as trace:
+        result = await opencode_driver.execute_async_with_opencode_session(
+            repo_root=str(tmp_path),
+            step_id="test-step-1",
+            instruction={"task": "Create User class", "file_scope": {}},
+            opencode_session_id=None,
+            is_initial=True,
+            task_type="quick",
+        )
+
+    assert result.success is True
+    expected = {
+        "safety_check",
+        "write_task_file",
+        "select_model",
+        "build_command",
+        "spawn",
+        "cli_run",
+        "save_logs",
+        "parse_output",
+    }
+    assert expected <= set(trace.stage_totals())
+
+
 @pytest.mark.asyncio
 async def test_execute_async_with_opencode_session_continues_session(
     opencode_driver, tmp_path, monkeypatch
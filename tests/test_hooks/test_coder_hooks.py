@@ -5,6 +5,8 @@ Tests for ninja-coder hooks CLI.
 from __future__ import annotations
 
 import json
+import subprocess
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -307,6 +309,86 @@ class TestLintCheckCommand:
         assert result.data["issues"] == []
 
 
+class TestIncrementalLint:
+    """Test that lint and format checks only touch changed content."""
+
+    @pytest.fixture
+    def repo(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+        (repo / "a.py").write_text("import os\n")
+        (repo / "b.py").write_text("x = 1\n")
+        return repo
+
+    @staticmethod
+    def fake_ruff(calls):
+        def run(cmd, cwd=None, timeout=30.0):
+            files = [arg for arg in cmd if arg.endswith(".py")]
+            calls.append(files)
+            issues = [
+                {
+                    "filename": str(Path(cwd) / f),
+                    "location": {"row": 1},
+                    "code": "F401",
+                    "message": "unused",
+                }
+                for f in files
+                if "import os" in (Path(cwd) / f).read_text()
+            ]
+            return (1 if issues else 0), json.dumps(issues), ""
+
+        return run
+
+    def test_unchanged_files_are_not_relinted(self, repo):
+        """Test that only files with new content reach ruff."""
+        calls = []
+        with patch("ninja_coder.hooks_cli.run_subprocess", self.fake_ruff(calls)):
+            first = LintCheckCommand(repo_root=str(repo)).execute()
+            second = LintCheckCommand(repo_root=str(repo)).execute()
+            (repo / "b.py").write_text("x = 2\n")
+            third = LintCheckCommand(repo_root=str(repo)).execute()
+
+        assert calls == [["a.py", "b.py"], ["b.py"]]
+        for result in (first, second, third):
+            assert result.status == "fail"
+            assert result.data["total_issues"] == 1
+            assert result.data["issues"][0]["code"] == "F401"
+
+    def test_no_changed_files_passes_without_ruff(self, repo):
+        """Test that a clean tree is not linted at all."""
+        subprocess.run(["git", "add", "."], cwd=repo, check=True)
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init"],
+            cwd=repo,
+            check=True,
+        )
+        with patch("ninja_coder.hooks_cli.run_subprocess") as mock_run_subprocess:
+            result = LintCheckCommand(repo_root=str(repo)).execute()
+
+        assert result.status == "pass"
+        mock_run_subprocess.assert_not_called()
+
+    def test_precommit_streams_and_caches_format_checks(self, repo, capsys):
+        """Test streamed JSON lines and skipping already-formatted files."""
+        subprocess.run(["git", "add", "."], cwd=repo, check=True)
+        calls = []
+        with (
+            patch("ninja_coder.hooks_cli.run_subprocess", self.fake_ruff(calls)),
+            patch("ninja_coder.hooks_cli.FormatFileCommand.execute") as mock_format_execute,
+        ):
+            mock_format_execute.return_value = type("obj", (object,), {"success": True})
+            PreCommitCommand(repo_root=str(repo), stream=True).execute()
+            result = PreCommitCommand(repo_root=str(repo)).execute()
+
+        assert mock_format_execute.call_count == 2
+        assert result.data["checks"]["format"]["status"] == "pass"
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [line["check"] for line in lines] == ["lint", "format"]
+        assert lines[0]["status"] == "fail"
+
+
 class TestPreCommitCommand:
     """Test PreCommitCommand functionality."""
 
@@ -455,7 +537,7 @@ class TestCLIIntegration:
             result = main()
 
             assert result == 0
-            mock_precommit_command.assert_called_once_with(None, False)
+            mock_precommit_command.assert_called_once_with(None, False, False)
 
     @patch("ninja_coder.hooks_cli.FormatFileCommand")
     def test_main_json_output(self, mock_format_command):
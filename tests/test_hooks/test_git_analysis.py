@@ -0,0 +1,105 @@
+"""
+Tests for the secretary's cached git analysis.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from ninja_secretary.git_analysis import GitAnalyzer, parse_numstat
+from ninja_secretary.hooks_cli import AnalyzeChangesCommand, SessionReportCommand
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "config", "user.email", "test@example.com")
+    git(repo, "config", "user.name", "Test")
+    for i, text in enumerate(["one\n", "one\ntwo\n", "one\ntwo\nthree\n"]):
+        (repo / "file.txt").write_text(text)
+        git(repo, "add", "file.txt")
+        git(repo, "commit", "-q", "-m", f"commit {i}")
+    return repo
+
+
+def test_parse_numstat():
+    output = "10\t5\tsrc/a.py\n-\t-\timage.png\nnot a numstat line\nx\t1\tbad.py\n"
+    assert parse_numstat(output) == [
+        {"file": "src/a.py", "lines_added": 10, "lines_removed": 5},
+        {"file": "image.png", "lines_added": 0, "lines_removed": 0},
+    ]
+
+
+def test_head_and_refs_are_read_without_git(repo):
+    analyzer = GitAnalyzer(repo)
+    head = git(repo, "rev-parse", "HEAD")
+
+    with patch("subprocess.Popen", side_effect=AssertionError("spawned git")):
+        assert analyzer.head() == ("main", head)
+        assert analyzer.resolve("main") == head
+
+    git(repo, "pack-refs", "--all")
+    assert analyzer.resolve("refs/heads/main") == head
+
+    git(repo, "checkout", "-q", "--detach", "HEAD~1")
+    assert analyzer.head() == ("HEAD", git(repo, "rev-parse", "HEAD"))
+
+
+def test_expressions_use_one_batch_process(repo):
+    analyzer = GitAnalyzer(repo)
+    try:
+        assert analyzer.resolve("HEAD~1") == git(repo, "rev-parse", "HEAD~1")
+        batch = analyzer._batch
+        assert analyzer.resolve("HEAD~2") == git(repo, "rev-parse", "HEAD~2")
+        assert analyzer._batch is batch
+        assert analyzer.resolve("no-such-rev") is None
+    finally:
+        analyzer.close()
+
+
+def test_numstat_is_cached_per_commit_range(repo):
+    analyzer = GitAnalyzer(repo)
+    try:
+        first = analyzer.numstat("HEAD~2")
+        assert first == [{"file": "file.txt", "lines_added": 2, "lines_removed": 0}]
+
+        # A new process (new analyzer) reuses the on-disk result
+        with patch("subprocess.run", side_effect=AssertionError("ran git diff")):
+            assert GitAnalyzer(repo).numstat(analyzer.resolve("HEAD~2")) == first
+
+        (repo / "file.txt").write_text("one\n")
+        git(repo, "commit", "-q", "-am", "shrink")
+        assert analyzer.numstat("HEAD~1") == [
+            {"file": "file.txt", "lines_added": 0, "lines_removed": 2}
+        ]
+    finally:
+        analyzer.close()
+
+
+def test_working_tree_diff_is_not_cached(repo):
+    analyzer = GitAnalyzer(repo)
+    assert analyzer.numstat() == []
+    (repo / "file.txt").write_text("changed\n")
+    assert analyzer.numstat() == [{"file": "file.txt", "lines_added": 1, "lines_removed": 3}]
+
+
+def test_hook_commands_on_a_real_repository(repo):
+    result = AnalyzeChangesCommand(str(repo), since="HEAD~1").execute()
+    assert result.success
+    assert result.data["lines_added"] == 1
+
+    report = SessionReportCommand(str(repo)).execute()
+    assert report.data["branch"] == "main"
+    assert report.data["commit"] == git(repo, "rev-parse", "HEAD")[:8]
@@ -7,7 +7,9 @@ from unittest.mock import Mock, patch
 from src.ninja_common.hooks_base import (
     HookCommand,
     HookResult,
+    ResultCache,
     detect_file_type,
+    get_changed_files,
     get_repo_root,
     get_staged_files,
     run_subprocess,
@@ -234,6 +236,68 @@ class TestGetStagedFiles:
         assert staged_files == []
 
 
+class TestGetChangedFiles:
+    """Tests for get_changed_files function."""
+
+    @patch("src.ninja_common.hooks_base.subprocess.run")
+    def test_get_changed_files_parses_porcelain(self, mock_run):
+        """Test parsing of modified, renamed, deleted and untracked entries."""
+        mock_result = Mock()
+        mock_result.returncode = 0
+        mock_result.stdout = (
+            " M src/a.py\0R  src/new.py\0src/old.py\0 D gone.py\0?? notes with space.md\0"
+        )
+        mock_run.return_value = mock_result
+
+        assert get_changed_files("/repo/root") == [
+            "src/a.py",
+            "src/new.py",
+            "notes with space.md",
+        ]
+
+    @patch("src.ninja_common.hooks_base.subprocess.run")
+    def test_get_changed_files_not_a_repository(self, mock_run):
+        """Test that None is returned when git fails."""
+        mock_result = Mock()
+        mock_result.returncode = 128
+        mock_result.stdout = ""
+        mock_run.return_value = mock_result
+
+        assert get_changed_files("/repo/root") is None
+
+
+class TestResultCache:
+    """Tests for ResultCache."""
+
+    def test_results_follow_file_content(self, tmp_path, monkeypatch):
+        """Test that results are keyed by content and persisted."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        (tmp_path / "a.py").write_text("x = 1\n")
+
+        cache = ResultCache(tmp_path, "lint")
+        cache.put(cache.key("a.py"), ["issue"])
+        cache.save()
+
+        reloaded = ResultCache(tmp_path, "lint")
+        assert reloaded.get(reloaded.key("a.py")) == ["issue"]
+        assert reloaded.key("missing.py") is None
+
+        (tmp_path / "a.py").write_text("x = 2\n")
+        assert reloaded.get(reloaded.key("a.py")) is None
+
+    def test_config_change_invalidates(self, tmp_path, monkeypatch):
+        """Test that editing the tool configuration drops cached results."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        (tmp_path / "a.py").write_text("x = 1\n")
+        cache = ResultCache(tmp_path, "lint")
+        cache.put(cache.key("a.py"), [])
+        cache.save()
+
+        (tmp_path / "pyproject.toml").write_text("[tool.ruff]\nline-length = 80\n")
+        reloaded = ResultCache(tmp_path, "lint")
+        assert reloaded.get(reloaded.key("a.py")) is None
+
+
 class ConcreteHookCommand(HookCommand):
     """Concrete implementation of HookCommand for testing."""
 
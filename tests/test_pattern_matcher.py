@@ -0,0 +1,226 @@
+"""
+Tests for the precompiled multi-pattern matcher used by CLI strategies.
+
+Checks that PatternMatcher gives the same answers as looping over the
+patterns with re.search/re.findall, and that a single scan beats that loop
+on large transcripts.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import time
+
+import pytest
+
+from ninja_coder.strategies import aider_strategy, claude_strategy, opencode_strategy
+from ninja_coder.strategies.matcher import PatternMatcher, _anchors_for, error_context
+
+
+def _naive_first(patterns: list[str], text: str) -> tuple[int, int, int] | None:
+    """Reference: first pattern (in list order) that matches, like the old loops."""
+    for index, pattern in enumerate(patterns):
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return index, match.start(), match.end()
+    return None
+
+
+def _naive_values(patterns: list[str], text: str) -> list[str]:
+    """Reference: concatenated re.findall over every pattern."""
+    values: list[str] = []
+    for pattern in patterns:
+        values.extend(re.findall(pattern, text, re.IGNORECASE))
+    return values
+
+
+SAMPLE_OUTPUTS = [
+    "",
+    "Applied edit to src/main.py\nApplied edit to tests/test_main.py",
+    "Created file.py and Wrote 'docs/readme.md'\nfile: config.yaml",
+    "litellm.APIError: OpenrouterException - 401 Unauthorized",
+    "Error: rate limit exceeded, retry later (timeout after 30s)",
+    "Summarization failed for model X\nevent loop is closed",
+    "api key was not found in env; APIERROR raised",
+    "| Edit     src/app.py\n| Write    src/new_module.py\nSession: ses_abc123",
+    "session id: ses_999\nsession_id: ses_000",
+    "\x1b[32mEdited:\x1b[0m src/colored.py\nCreated: pkg/__init__.py",
+    "wrote wrote foo.py created created bar/baz.py",
+    "Thread pool error in worker; repository sync error; git push error",
+]
+
+
+# ============================================================================
+# Equivalence with per-pattern loops
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "matcher",
+    [
+        aider_strategy._AIDER_ERROR_MATCHER,
+        opencode_strategy._ERROR_MATCHER,
+        opencode_strategy._SESSION_MATCHER,
+        claude_strategy._ERROR_MATCHER,
+    ],
+)
+@pytest.mark.parametrize("text", SAMPLE_OUTPUTS)
+def test_first_matches_sequential_search(matcher, text):
+    """first() picks the same pattern and position as the old search loop."""
+    hit = matcher.first(text)
+    expected = _naive_first(matcher.patterns, text)
+
+    if expected is None:
+        assert hit is None
+    else:
+        assert hit is not None
+        assert (hit.index, hit.start, hit.end) == expected
+
+
+@pytest.mark.parametrize(
+    "matcher",
+    [
+        aider_strategy._FILE_CHANGE_MATCHER,
+        opencode_strategy._FILE_CHANGE_MATCHER,
+        claude_strategy._FILE_CHANGE_MATCHER,
+    ],
+)
+@pytest.mark.parametrize("text", SAMPLE_OUTPUTS)
+def test_values_match_findall(matcher, text):
+    """values() returns what re.findall returned for each pattern, in order."""
+    assert matcher.values(text) == _naive_values(matcher.patterns, text)
+
+
+def test_values_of_patterns_without_groups_are_whole_matches():
+    """Like re.findall, a pattern without a group yields the matched text."""
+    matcher = PatternMatcher([("a", r"rate\s+limit"), ("b", r"code (\d+)")])
+    text = "Rate  limit hit, code 429"
+
+    assert matcher.values(text) == ["Rate  limit", "429"]
+    assert matcher.values(text) == _naive_values(matcher.patterns, text)
+
+
+def test_labels_classify_hits():
+    """Hits carry the label of the pattern that produced them."""
+    matcher = PatternMatcher([("auth", r"401"), ("retryable", r"rate\s+limit")])
+
+    hit = matcher.first("HTTP 429: Rate  Limit reached")
+
+    assert hit is not None
+    assert hit.label == "retryable"
+    assert hit.index == 1
+
+
+def test_bare_patterns_use_pattern_as_label():
+    """Plain string patterns double as their own label."""
+    matcher = PatternMatcher([r"timeout"])
+
+    assert matcher.first("request timeout").label == "timeout"
+
+
+def test_scan_returns_hits_in_position_order():
+    """scan() reports every hit, ordered by position."""
+    matcher = PatternMatcher([r"beta", r"alpha"])
+
+    hits = matcher.scan("alpha beta alpha")
+
+    assert [(h.index, h.start) for h in hits] == [(1, 0), (0, 6), (1, 11)]
+
+
+def test_case_sensitive_matcher():
+    """Without IGNORECASE, anchors and patterns respect case."""
+    matcher = PatternMatcher([r"Error:"], flags=0)
+
+    assert matcher.first("error: lowercase") is None
+    assert matcher.first("Error: upper") is not None
+
+
+def test_unanchored_patterns_fall_back_to_regex():
+    """Patterns without a literal prefix are still matched."""
+    matcher = PatternMatcher([r"\d+\s+files?", r"done"])
+
+    hits = matcher.scan("done: 3 files changed")
+
+    assert [h.index for h in hits] == [1, 0]
+
+
+def test_overlapping_anchors_are_all_tried():
+    """An anchor inside another anchor's text is still a candidate."""
+    matcher = PatternMatcher([r"apierror", r"pierr"])
+
+    assert [h.index for h in matcher.scan("APIError")] == [0, 1]
+
+
+def test_offset_changing_lowercase_falls_back():
+    """Text whose lowercase changes length still yields correct offsets."""
+    matcher = PatternMatcher([r"timeout"])
+    text = "İstanbul timeout"  # 'İ' lowercases to two code points
+
+    hit = matcher.first(text)
+
+    assert hit is not None
+    assert text[hit.start : hit.end] == "timeout"
+
+
+def test_anchor_extraction():
+    """Literal anchors are derived conservatively from each pattern."""
+    assert _anchors_for(r"rate\s+limit") == ["rate"]
+    assert _anchors_for(r"litellm\..*?Error") == ["litellm."]
+    assert _anchors_for(r"Create[d]?\s+x") == ["Create"]
+    assert _anchors_for(r"Createsd?x") == ["Creates"]
+    assert _anchors_for(r"(?:wrote|created)\s+(\S+)") == ["wrote", "created"]
+    assert _anchors_for(r"\|\s+(?:Edit|Write)") == ["|"]
+    assert _anchors_for(r"foo|bar") == []
+    assert _anchors_for(r"(?i)foo") == []
+    assert _anchors_for(r"\d+") == []
+
+
+def test_error_context_collapses_whitespace():
+    """error_context returns normalized context around the hit."""
+    matcher = PatternMatcher([r"boom"])
+    text = "aaa\n\n  bbb boom   ccc\tddd"
+
+    hit = matcher.first(text)
+
+    assert error_context(text, hit, 6) == "bbb boom ccc"
+
+
+# ============================================================================
+# Micro-benchmark
+# ============================================================================
+
+
+@pytest.mark.slow
+def test_benchmark_scan_vs_sequential_patterns():
+    """A single anchored scan is faster than one regex pass per pattern."""
+    rng = random.Random(42)
+    words = [
+        "def", "return", "self", "value", "import", "from", "class", "result",
+        "output", "path", "file", "config", "data", "item", "list", "dict",
+    ]  # fmt: skip
+    lines = [" ".join(rng.choice(words) for _ in range(10)) for _ in range(40_000)]
+    lines.insert(len(lines) // 2, "Applied edit to src/deep/module.py")
+    transcript = "\n".join(lines) + "\nrate limit exceeded\n"
+
+    matcher = aider_strategy._AIDER_ERROR_MATCHER
+    patterns = matcher.patterns
+
+    def best_of(fn, repeat: int = 3) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    naive = best_of(lambda: [re.search(p, transcript, re.IGNORECASE) for p in patterns])
+    compiled = best_of(lambda: matcher.scan(transcript))
+    mb = len(transcript) / 1_000_000
+    print(
+        f"\n{len(patterns)} patterns over {mb:.1f} MB: "
+        f"sequential {naive * 1000:.1f} ms, matcher {compiled * 1000:.1f} ms "
+        f"({mb / compiled:.1f} MB/s)"
+    )
+
+    assert compiled < naive
@@ -0,0 +1,125 @@
+"""Tests for concurrent prompt chain execution."""
+
+import asyncio
+
+import pytest
+
+from ninja_prompts.chain import ChainError, ChainExecutor
+from ninja_prompts.models import PromptChainStep, PromptTemplate, PromptVariable
+from ninja_prompts.template_engine import TemplateEngine
+
+
+class FakeManager:
+    """In-memory stand-in for PromptManager."""
+
+    def __init__(self, templates):
+        self.prompts = {
+            prompt_id: PromptTemplate(
+                id=prompt_id,
+                name=prompt_id,
+                description="",
+                template=template,
+                variables=[PromptVariable(name="lang", required=False, default="python")],
+                tags=[],
+                scope="global",
+            )
+            for prompt_id, template in templates.items()
+        }
+
+    def get_prompt(self, prompt_id):
+        return self.prompts.get(prompt_id)
+
+
+def step(name, prompt_id, **variables):
+    return PromptChainStep(name=name, prompt_id=prompt_id, variables=variables)
+
+
+@pytest.fixture
+def manager():
+    return FakeManager(
+        {
+            "scan": "Scan {{target}} ({{lang}})",
+            "review": "Review: {{prev.scan}}",
+            "summary": "Summary of {{prev.review}} and {{prev.tests}}",
+            "plain": "{{text}}",
+        }
+    )
+
+
+async def test_steps_receive_previous_outputs(manager):
+    executor = ChainExecutor(manager, TemplateEngine())
+    outputs = await executor.execute(
+        [
+            step("scan", "scan", target="api"),
+            step("review", "review"),
+            step("tests", "plain", text="Tests for {{prev.scan}}"),
+            step("summary", "summary"),
+        ]
+    )
+
+    by_name = {o.step_name: o.output for o in outputs}
+    assert by_name["scan"] == "Scan api (python)"
+    assert by_name["review"] == "Review: Scan api (python)"
+    assert by_name["tests"] == "Tests for Scan api (python)"
+    assert by_name["summary"] == (
+        "Summary of Review: Scan api (python) and Tests for Scan api (python)"
+    )
+    assert outputs[-1].step_name == "summary"
+
+
+async def test_independent_steps_run_concurrently(manager):
+    running = 0
+    peak = 0
+
+    async def slow(step, rendered):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return rendered
+
+    executor = ChainExecutor(manager, TemplateEngine(), run_step=slow, max_concurrency=2)
+    steps = [step(f"s{i}", "plain", text=str(i)) for i in range(4)]
+    outputs = await executor.execute(steps)
+
+    assert len(outputs) == 4
+    assert peak == 2
+
+
+async def test_unchanged_steps_are_reused(manager):
+    calls = []
+
+    async def record(step, rendered):
+        calls.append(step.name)
+        return rendered
+
+    executor = ChainExecutor(manager, TemplateEngine(), run_step=record)
+    await executor.execute([step("scan", "scan", target="api"), step("review", "review")])
+    outputs = await executor.execute(
+        [step("scan", "scan", target="api"), step("review", "review"), step("x", "plain", text="x")]
+    )
+
+    assert calls == ["scan", "review", "x"]
+    assert {o.step_name: o.cached for o in outputs} == {"scan": True, "review": True, "x": False}
+
+    await executor.execute([step("scan", "scan", target="cli"), step("review", "review")])
+    assert calls[3:] == ["scan", "review"]
+
+
+@pytest.mark.parametrize(
+    ("steps", "message"),
+    [
+        ([step("a", "missing")], "prompt not found"),
+        ([step("review", "review")], "unknown step"),
+        ([step("a", "plain", text="x"), step("a", "plain", text="y")], "Duplicate"),
+        (
+            [step("a", "plain", text="{{prev.b}}"), step("b", "plain", text="{{prev.a}}")],
+            "cycle",
+        ),
+    ],
+)
+async def test_invalid_chains_are_rejected(manager, steps, message):
+    executor = ChainExecutor(manager, TemplateEngine())
+    with pytest.raises(ChainError, match=message):
+        await executor.execute(steps)
@@ -0,0 +1,120 @@
+"""Tests for the cached prompt registry."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from ninja_prompts.models import PromptTemplate
+from ninja_prompts.prompt_manager import PromptManager
+
+
+def write_prompt(directory, prompt_id, **fields):
+    directory.mkdir(parents=True, exist_ok=True)
+    data = {
+        "name": prompt_id,
+        "description": f"{prompt_id} prompt",
+        "template": "Hello {{name}}",
+        "variables": [{"name": "name", "required": True}],
+        "tags": ["test"],
+        **fields,
+    }
+    path = directory / f"{prompt_id}.yml"
+    path.write_text(yaml.safe_dump(data))
+    return path
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    builtin = tmp_path / "builtin"
+    user = tmp_path / "user"
+    write_prompt(builtin, "review")
+    write_prompt(builtin, "debug")
+    return builtin, user, tmp_path / "snapshot.json"
+
+
+def make_manager(dirs):
+    builtin, user, snapshot = dirs
+    return PromptManager(user_dir=user, builtin_dir=builtin, snapshot_path=snapshot)
+
+
+def count_parses(manager):
+    return patch.object(manager, "_parse_file", wraps=manager._parse_file)
+
+
+def test_get_and_list_do_not_reparse(dirs):
+    manager = make_manager(dirs)
+    assert {p.id for p in manager.list_prompts()} == {"review", "debug"}
+
+    with count_parses(manager) as parse:
+        assert manager.get_prompt("review").scope == "global"
+        assert manager.get_prompt("missing") is None
+        assert len(manager.list_prompts()) == 2
+    assert parse.call_count == 0
+
+
+def test_changed_added_and_removed_files_are_picked_up(dirs):
+    builtin, user, _ = dirs
+    manager = make_manager(dirs)
+    manager.list_prompts()
+
+    path = write_prompt(builtin, "review", description="edited and longer than before")
+    os.utime(path, ns=(1, 1))
+    assert manager.get_prompt("review").description == "edited and longer than before"
+
+    write_prompt(user, "mine")
+    assert manager.get_prompt("mine").scope == "user"
+
+    (builtin / "debug.yml").unlink()
+    assert manager.get_prompt("debug") is None
+    assert {p.id for p in manager.list_prompts()} == {"review", "mine"}
+
+
+def test_user_prompt_overrides_builtin(dirs):
+    _, user, _ = dirs
+    manager = make_manager(dirs)
+    write_prompt(user, "review", description="mine")
+
+    assert manager.get_prompt("review").scope == "user"
+    assert manager.load_prompts("global")["review"].scope == "global"
+
+
+def test_save_and_delete_update_the_index(dirs):
+    manager = make_manager(dirs)
+    manager.list_prompts()
+    prompt = PromptTemplate(
+        id="saved",
+        name="Saved",
+        description="d",
+        template="t",
+        variables=[],
+        tags=[],
+        scope="user",
+    )
+
+    manager.save_prompt(prompt)
+    assert manager.get_prompt("saved").name == "Saved"
+
+    manager.save_prompt(prompt.model_copy(update={"name": "Renamed"}))
+    assert manager.get_prompt("saved").name == "Renamed"
+
+    assert manager.delete_prompt("saved")
+    assert manager.get_prompt("saved") is None
+    assert not manager.delete_prompt("saved")
+
+
+def test_snapshot_avoids_parsing_in_a_new_process(dirs):
+    make_manager(dirs).list_prompts()
+
+    fresh = make_manager(dirs)
+    with count_parses(fresh) as parse:
+        assert {p.id for p in fresh.list_prompts()} == {"review", "debug"}
+    assert parse.call_count == 0
+
+
+def test_corrupt_snapshot_is_ignored(dirs):
+    _, _, snapshot = dirs
+    snapshot.write_text("{not json")
+
+    assert {p.id for p in make_manager(dirs).list_prompts()} == {"review", "debug"}
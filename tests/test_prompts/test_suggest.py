@@ -0,0 +1,134 @@
+"""Tests for local prompt suggestion ranking."""
+
+import pytest
+
+from ninja_prompts.models import (
+    PromptRegistryRequest,
+    PromptSuggestRequest,
+    PromptTemplate,
+    PromptVariable,
+)
+from ninja_prompts.prompt_manager import PromptManager
+from ninja_prompts.suggest import SuggestionIndex, tokenize
+from ninja_prompts.tools import PromptToolExecutor
+
+
+def make_prompt(prompt_id, name, description, *, tags=(), template="Do it", variables=()):
+    return PromptTemplate(
+        id=prompt_id,
+        name=name,
+        description=description,
+        template=template,
+        variables=list(variables),
+        tags=list(tags),
+        scope="global",
+    )
+
+
+@pytest.fixture
+def prompts():
+    return [
+        make_prompt("review", "Code Review", "Review code for bugs", tags=["review", "quality"]),
+        make_prompt("debug", "Debug Helper", "Find the root cause of a bug", tags=["debugging"]),
+        make_prompt(
+            "docs",
+            "Write Docs",
+            "Write documentation",
+            tags=["docs"],
+            template="Document {{module}}",
+        ),
+    ]
+
+
+def test_tokenize():
+    assert tokenize("Fix the API-client, v2!") == ["fix", "the", "api", "client", "v2"]
+
+
+def test_rank_orders_by_relevance(prompts):
+    index = SuggestionIndex()
+    index.sync(prompts)
+
+    suggestions = index.rank({"task": "review this code for quality"})
+
+    assert suggestions[0].prompt_id == "review"
+    assert suggestions[0].relevance_score == 1.0
+    assert "quality" in suggestions[0].reason
+    assert all(0 <= s.relevance_score <= 1 for s in suggestions)
+    assert index.rank({"task": "nothing matches here"}) == []
+    assert len(index.rank({"task": "code bug docs"}, limit=2)) == 2
+
+
+def test_incremental_updates(prompts):
+    index = SuggestionIndex()
+    index.sync(prompts)
+
+    index.update("debug", None)
+    assert [s.prompt_id for s in index.rank({"task": "root cause"})] == []
+
+    index.update("docs", make_prompt("docs", "Changelog", "Summarize root cause of changes"))
+    assert [s.prompt_id for s in index.rank({"task": "root cause"})] == ["docs"]
+    assert index.rank({"task": "documentation"}) == []
+    assert len(index) == 2
+
+
+def test_sync_only_reindexes_changed_prompts(prompts, monkeypatch):
+    index = SuggestionIndex()
+    index.sync(prompts)
+    added = []
+    original = index._add
+    monkeypatch.setattr(index, "_add", lambda p: (added.append(p.id), original(p)))
+
+    edited = make_prompt("debug", "Debug Helper", "Trace crashes")
+    index.sync([prompts[0], edited])
+
+    assert added == ["debug"]
+    assert len(index) == 2
+    assert index.rank({"task": "crashes"})[0].prompt_id == "debug"
+
+
+def test_suggested_variables_come_from_context():
+    variables = [
+        PromptVariable(name="module", required=True),
+        PromptVariable(name="style", required=False, default="google"),
+        PromptVariable(name="audience", required=False),
+    ]
+    index = SuggestionIndex()
+    index.sync([make_prompt("docs", "Write Docs", "Write documentation", variables=variables)])
+
+    suggestion = index.rank({"task": "write documentation", "module": "auth"})[0]
+
+    assert suggestion.suggested_variables == {"module": "auth", "style": "google"}
+
+
+async def test_executor_suggestions_follow_registry_changes(tmp_path):
+    executor = PromptToolExecutor()
+    executor.manager = PromptManager(
+        user_dir=tmp_path / "user",
+        builtin_dir=tmp_path / "builtin",
+        snapshot_path=tmp_path / "snapshot.json",
+    )
+
+    created = await executor.prompt_registry(
+        PromptRegistryRequest(
+            action="create",
+            name="Migration planner",
+            description="Plan database schema migrations",
+            template="Plan a migration for {{table}}",
+            tags=["database"],
+        ),
+        client_id="test-suggest",
+    )
+    prompt_id = created.prompts[0].id
+
+    result = await executor.prompt_suggest(
+        PromptSuggestRequest(context={"task": "database migrations"}), client_id="test-suggest"
+    )
+    assert [s.prompt_id for s in result.suggestions] == [prompt_id]
+
+    await executor.prompt_registry(
+        PromptRegistryRequest(action="delete", prompt_id=prompt_id), client_id="test-suggest"
+    )
+    result = await executor.prompt_suggest(
+        PromptSuggestRequest(context={"task": "database migrations"}), client_id="test-suggest"
+    )
+    assert result.suggestions == []
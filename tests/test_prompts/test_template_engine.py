@@ -87,3 +87,23 @@ class TestTemplateEngine:
         variables = {"username": "alice@wonderland", "email": "alice+test@wonderland.com"}
         result = self.engine.render(template, variables)
         assert result == "User: alice@wonderland, Email: alice+test@wonderland.com"
+
+    def test_compiled_template_is_cached(self):
+        """Test that a template is compiled once and reused."""
+        template = "Review {{prev.scan}} for {{target}}"
+        compiled = self.engine.compile(template)
+        assert self.engine.compile(template) is compiled
+        assert compiled.slots == ("prev.scan", "target")
+        assert compiled.required == {"prev.scan", "target"}
+
+    def test_render_adjacent_and_edge_variables(self):
+        """Test rendering variables at the edges and next to each other."""
+        template = "{{a}}{{b}} and {{a}}"
+        result = self.engine.render(template, {"a": "x", "b": "y"})
+        assert result == "xy and x"
+
+    def test_render_does_not_reinterpret_values(self):
+        """Test that substituted values are not rendered again."""
+        template = "Hello {{name}}"
+        result = self.engine.render(template, {"name": "{{name}}\\1"})
+        assert result == "Hello {{name}}\\1"
@@ -7,13 +7,15 @@ Tests for session management functionality.
 Tests session creation, persistence, continuation, listing, and deletion.
 """
 
+import json
 import tempfile
+from datetime import UTC, datetime
 from pathlib import Path
 
 import pytest
 
 from ninja_coder.driver import NinjaConfig, NinjaDriver
-from ninja_coder.sessions import SessionManager
+from ninja_coder.sessions import Session, SessionManager
 
 
 def test_session_manager_initialization():
@@ -200,6 +202,97 @@ def test_session_summary():
         assert summary["metadata"]["project"] == "test"
 
 
+def test_session_messages_are_appended():
+    """Saving appends only new messages to the session log."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = SessionManager(Path(tmp_dir))
+        session = manager.create_session(repo_root="/tmp/test-repo", model="m")
+        log_file = manager.sessions_dir / f"{session.session_id}.jsonl"
+
+        session.add_message("user", "first")
+        manager.save_session(session)
+        first_log = log_file.read_text()
+
+        session.add_message("assistant", "second")
+        manager.save_session(session)
+        manager.save_session(session)
+
+        log = log_file.read_text()
+        assert log.startswith(first_log)
+        assert len(log.splitlines()) == 2
+
+        loaded = manager.load_session(session.session_id)
+        loaded.add_message("user", "third")
+        manager.save_session(loaded)
+        assert [m.content for m in manager.load_session(session.session_id).messages] == [
+            "first",
+            "second",
+            "third",
+        ]
+
+
+def test_summaries_do_not_read_messages():
+    """Summaries and listings come from session headers."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = SessionManager(Path(tmp_dir))
+        session = manager.create_session(repo_root="/tmp/repo1", model="m", system_prompt="sys")
+        session.add_message("user", "hello")
+        manager.save_session(session)
+        (manager.sessions_dir / f"{session.session_id}.jsonl").unlink()
+
+        summary = manager.get_session_summary(session.session_id)
+        assert summary["message_count"] == 2
+        assert summary["user_message_count"] == 1
+
+        summaries = manager.list_session_summaries(repo_root="/tmp/repo1")
+        assert [s["session_id"] for s in summaries] == [session.session_id]
+        assert manager.list_session_summaries(repo_root="/tmp/other") == []
+
+
+def test_legacy_session_file_is_converted():
+    """Sessions stored as a single JSON file load and convert on save."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = SessionManager(Path(tmp_dir))
+        legacy = Session(
+            session_id="legacy01",
+            repo_root="/tmp/repo",
+            model="m",
+            created_at=datetime.now(UTC),
+            updated_at=datetime.now(UTC),
+        )
+        legacy.add_message("user", "old message")
+        session_file = manager.sessions_dir / "legacy01.json"
+        session_file.write_text(json.dumps(legacy.to_dict(), indent=2))
+
+        assert manager.get_session_summary("legacy01")["message_count"] == 1
+        session = manager.load_session("legacy01")
+        session.add_message("assistant", "new message")
+        manager.save_session(session)
+
+        assert "messages" not in json.loads(session_file.read_text())
+        loaded = manager.load_session("legacy01")
+        assert [m.content for m in loaded.messages] == ["old message", "new message"]
+
+
+def test_torn_log_line_is_skipped():
+    """A partially written final message does not break loading."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = SessionManager(Path(tmp_dir))
+        session = manager.create_session(repo_root="/tmp/repo", model="m")
+        session.add_message("user", "complete")
+        manager.save_session(session)
+        with open(manager.sessions_dir / f"{session.session_id}.jsonl", "a") as f:
+            f.write('{"role": "assistant", "cont')
+
+        loaded = manager.load_session(session.session_id)
+        assert [m.content for m in loaded.messages] == ["complete"]
+
+        loaded.add_message("assistant", "after repair")
+        manager.save_session(loaded)
+        reloaded = manager.load_session(session.session_id)
+        assert [m.content for m in reloaded.messages] == ["complete", "after repair"]
+
+
 @pytest.mark.asyncio
 async def test_driver_session_integration():
     """Test NinjaDriver integration with sessions."""
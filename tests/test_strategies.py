@@ -246,6 +246,20 @@ def test_aider_build_command_basic():
     assert "--api-key" in result.command
 
 
+def test_aider_build_command_keeps_single_openrouter_prefix():
+    """Model ids that already carry the OpenRouter prefix are passed as they are."""
+    strategy = AiderStrategy("aider", NinjaConfig(bin_path="aider", openai_api_key="test-key"))
+
+    result = strategy.build_command(
+        prompt="Fix the bug",
+        repo_root="/tmp/test-repo",
+        model="openrouter/anthropic/claude-haiku-4.5",
+    )
+
+    model_idx = result.command.index("--model")
+    assert result.command[model_idx + 1] == "openrouter/anthropic/claude-haiku-4.5"
+
+
 def test_aider_build_command_with_files():
     """Test Aider command building with file context."""
     config = NinjaConfig(bin_path="aider", model="test/model", openai_api_key="test")
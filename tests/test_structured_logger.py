@@ -14,6 +14,7 @@ from datetime import UTC, datetime
 
 import pytest
 
+from ninja_common.spans import Trace
 from ninja_common.structured_logger import LogEntry, StructuredLogger
 
 
@@ -529,6 +530,45 @@ def test_log_file_daily_rotation(temp_log_dir):
     assert logger.log_file.name == expected_filename
 
 
+def test_log_timings(logger):
+    """Test a trace is logged with its spans and per-stage totals."""
+    trace = Trace(started=0.0)
+    trace.add("write_task_file", 0.001, 0.003)
+    trace.add("cli_run", 0.003, 0.103)
+
+    logger.log_timings(trace, task_id="t1", tool_name="coder_simple_task")
+
+    entry = logger.query_logs(task_id="t1")[0]
+    assert entry["message"].startswith("Timings:")
+    assert entry["extra"]["event"] == "timings"
+    assert entry["extra"]["stage_ms"] == {"write_task_file": 2.0, "cli_run": 100.0}
+    assert [s["name"] for s in entry["extra"]["spans"]] == ["write_task_file", "cli_run"]
+    assert entry["extra"]["tool_name"] == "coder_simple_task"
+
+
+def test_timing_stats(logger):
+    """Test per-stage statistics over logged timings, with filters and limit."""
+    for i in range(10):
+        trace = Trace(started=0.0)
+        trace.add("cli_run", 0.0, (i + 1) / 1000)
+        logger.log_timings(trace, task_id=f"t{i}", cli_name="aider" if i < 5 else "claude")
+    logger.info("Unrelated entry", task_id="t0")
+
+    stats = logger.timing_stats()
+    assert stats["cli_run"]["count"] == 10
+    assert stats["cli_run"]["max"] == pytest.approx(10.0)
+    assert stats["total"]["count"] == 10
+
+    assert logger.timing_stats(cli_name="aider")["cli_run"]["max"] == pytest.approx(5.0)
+    assert logger.timing_stats(task_id="t3")["cli_run"]["count"] == 1
+    assert logger.timing_stats(limit=2)["cli_run"]["p50"] == pytest.approx(9.5)
+
+
+def test_timing_stats_empty_file(logger):
+    """Test timing stats with no log file."""
+    assert logger.timing_stats() == {}
+
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v"])